@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common_utils.config import database_settings
+
+
+async def main() -> None:
+    """Adds last_touched to the existing FSM storage tables, the rows are considered touched now"""
+    for db_url, table_name in (
+        (database_settings.SQLALCHEMY_URL, database_settings.STORAGE_TABLE_NAME),
+        (database_settings.CUSTOM_BOT_STORAGE_DB_URL, database_settings.CUSTOM_BOT_STORAGE_TABLE_NAME),
+        (database_settings.SUPPORT_BOT_STORAGE_DB_URL, database_settings.SUPPORT_BOT_STORAGE_TABLE_NAME),
+    ):
+        engine = create_async_engine(db_url)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {table_name} "
+                    f"ADD COLUMN IF NOT EXISTS last_touched TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"
+                )
+            )
+        # CONCURRENTLY does not lock the table but can not run inside of a transaction
+        async with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table_name}_last_touched "
+                    f"ON {table_name} (last_touched)"
+                )
+            )
+        await engine.dispose()
+        print(f"{table_name}: last_touched has been added")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
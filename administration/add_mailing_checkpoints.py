@@ -0,0 +1,35 @@
+import asyncio
+
+from sqlalchemy import text
+
+from common_utils.config import database_settings
+
+from database.models.models import Database
+
+from logs.config import db_logger
+
+
+database: Database = Database(sqlalchemy_url=database_settings.SQLALCHEMY_URL, logger=db_logger)
+
+
+async def main() -> None:
+    """Adds the mailing checkpoint columns to the existing post_message table"""
+    async with database.engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE post_message ADD COLUMN IF NOT EXISTS mailing_cursor BIGINT"))
+        await conn.execute(
+            text("ALTER TABLE post_message ADD COLUMN IF NOT EXISTS failed_post_message_amount BIGINT DEFAULT 0")
+        )
+        await conn.execute(
+            text(
+                "ALTER TABLE post_message "
+                "ADD COLUMN IF NOT EXISTS banned_user_ids BIGINT[] NOT NULL DEFAULT '{}'::BIGINT[]"
+            )
+        )
+
+    print("post_message: mailing checkpoint columns have been added")
+
+    await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+import asyncio
+
+from sqlalchemy import text
+
+from common_utils.config import database_settings
+
+from database.models.models import Database
+
+from logs.config import db_logger
+
+
+database: Database = Database(sqlalchemy_url=database_settings.SQLALCHEMY_URL, logger=db_logger)
+
+
+async def main() -> None:
+    """
+    Adds file_unique_id to the existing post_message_media_files table, the table bot_media_files is created by
+    Database.connect. The old media files get their file_unique_id from telegram on the next send
+    """
+    async with database.engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE post_message_media_files ADD COLUMN IF NOT EXISTS file_unique_id VARCHAR"))
+
+    await database.connect()
+    print("post_message_media_files: file_unique_id column has been added")
+
+    await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
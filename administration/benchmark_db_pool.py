@@ -0,0 +1,71 @@
+import time
+import asyncio
+import statistics
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from common_utils.config import database_settings
+
+from database.models.pool import MeasuredAsyncQueuePool
+
+CONCURRENCY = 50  # simultaneous "webhook updates"
+QUERIES_PER_WORKER = 40
+
+
+def _create_engine() -> AsyncEngine:
+    return create_async_engine(
+        database_settings.SQLALCHEMY_URL,
+        poolclass=MeasuredAsyncQueuePool,
+        pool_size=database_settings.DB_POOL_SIZE,
+        max_overflow=database_settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=database_settings.DB_POOL_TIMEOUT,
+        pool_recycle=database_settings.DB_POOL_RECYCLE,
+        pool_pre_ping=database_settings.DB_POOL_PRE_PING,
+    )
+
+
+async def _worker(engine: AsyncEngine, latencies: list[float], dispose_after_query: bool) -> None:
+    for _ in range(QUERIES_PER_WORKER):
+        started_at = time.perf_counter()
+
+        async with engine.begin() as conn:
+            await conn.execute(text("SELECT 1"))
+        if dispose_after_query:  # the old behaviour of every Dao method
+            await engine.dispose()
+
+        latencies.append(time.perf_counter() - started_at)
+
+
+async def _run(dispose_after_query: bool) -> None:
+    engine = _create_engine()
+    latencies = []
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[_worker(engine, latencies, dispose_after_query) for _ in range(CONCURRENCY)])
+    total_time = time.perf_counter() - started_at
+
+    pool_metrics = engine.pool.get_metrics()  # the pool is recreated on every dispose, so it is only the last one
+    await engine.dispose()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    quantiles = statistics.quantiles(latencies_ms, n=100)
+
+    print(
+        f"{'dispose after query' if dispose_after_query else 'persistent pool':>20}: "
+        f"{len(latencies_ms) / total_time:8.1f} q/s | "
+        f"mean={statistics.mean(latencies_ms):7.2f}ms p50={quantiles[49]:7.2f}ms "
+        f"p95={quantiles[94]:7.2f}ms p99={quantiles[98]:7.2f}ms | "
+        f"pool wait avg={pool_metrics.wait_time_avg * 1000:.2f}ms max={pool_metrics.wait_time_max * 1000:.2f}ms"
+    )
+
+
+async def main() -> None:
+    print(f"{CONCURRENCY} workers x {QUERIES_PER_WORKER} queries")
+
+    await _run(dispose_after_query=True)
+    await _run(dispose_after_query=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import time
+import asyncio
+import statistics
+
+from sqlalchemy import event
+
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+
+from common_utils.config import database_settings
+from common_utils.storage.storage import AlchemyStorageAsync
+
+from database.models.round_trips import count_db_round_trips, on_cursor_execute
+
+CONCURRENCY = 50  # simultaneous users
+TRANSITIONS_PER_USER = 40
+BENCHMARK_TABLE_NAME = "benchmark_fsm_storage"
+BENCHMARK_BOT_ID = 1
+
+
+class _BenchmarkStates(StatesGroup):
+    first = State()
+    second = State()
+
+
+async def _transition(storage: AlchemyStorageAsync, key: StorageKey, step: int) -> None:
+    """The usual handler: moves the user to the next state and saves the input"""
+    await storage.set_state(key, _BenchmarkStates.first if step % 2 else _BenchmarkStates.second)
+    await storage.update_data(key, {"step": step, f"input_{step % 5}": "x" * 32})
+
+
+async def _user(storage: AlchemyStorageAsync, user_id: int, latencies: list[float], round_trips: list[int]) -> None:
+    key = StorageKey(bot_id=BENCHMARK_BOT_ID, chat_id=user_id, user_id=user_id)
+    for step in range(TRANSITIONS_PER_USER):
+        started_at = time.perf_counter()
+        with count_db_round_trips() as transition_round_trips:
+            await _transition(storage, key, step)
+        latencies.append(time.perf_counter() - started_at)
+        round_trips.append(transition_round_trips.count)
+
+    data = await storage.get_data(key)
+    assert data["step"] == TRANSITIONS_PER_USER - 1, data
+
+
+async def main() -> None:
+    storage = AlchemyStorageAsync(database_settings.SQLALCHEMY_URL, BENCHMARK_TABLE_NAME)
+    event.listen(storage.engine.sync_engine, "before_cursor_execute", on_cursor_execute)
+    await storage.connect()
+    await storage.clear_table()
+
+    latencies, round_trips = [], []
+    print(f"{CONCURRENCY} users x {TRANSITIONS_PER_USER} transitions (set_state + update_data)")
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[_user(storage, user_id, latencies, round_trips) for user_id in range(1, CONCURRENCY + 1)])
+    total_time = time.perf_counter() - started_at
+
+    await storage.clear_table()
+    await storage.close()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    quantiles = statistics.quantiles(latencies_ms, n=100)
+    print(
+        f"{len(latencies_ms) * 2 / total_time:8.1f} ops/s | {len(latencies_ms) / total_time:8.1f} transitions/s | "
+        f"round trips per transition={statistics.mean(round_trips):.1f} | "
+        f"mean={statistics.mean(latencies_ms):7.2f}ms p50={quantiles[49]:7.2f}ms "
+        f"p95={quantiles[94]:7.2f}ms p99={quantiles[98]:7.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import os
+import time
+import queue
+import asyncio
+import logging
+import threading
+import statistics
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import QueueHandler, QueueListener
+
+import logging_loki
+
+from logs.loki import BatchedLokiHandler
+
+UPDATES = 200
+LOGS_PER_UPDATE = 5  # log calls in one handler of the update
+LOKI_LATENCY = 0.05  # seconds of one push to the fake Loki
+
+
+class _FakeLoki(BaseHTTPRequestHandler):
+    """Answers every push after LOKI_LATENCY like the loaded Grafana does"""
+
+    def do_POST(self) -> None:  # noqa
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(LOKI_LATENCY)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+async def _handle_updates(logger: logging.Logger) -> list[float]:
+    """:return: seconds of every emulated update handler"""
+    durations = []
+    for update_id in range(UPDATES):
+        started_at = time.perf_counter()
+        for ind in range(LOGS_PER_UPDATE):
+            logger.info(f"update_id={update_id}: step {ind}", extra={"tags": {"bot_id": 1}})
+        durations.append(time.perf_counter() - started_at)
+        await asyncio.sleep(0)
+    return durations
+
+
+def _report(name: str, durations: list[float]) -> None:
+    durations = sorted(durations)
+    print(
+        f"{name:>8}: avg={statistics.mean(durations) * 1000:.3f}ms "
+        f"p99={durations[int(len(durations) * 0.99) - 1] * 1000:.3f}ms per update handler"
+    )
+
+
+async def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeLoki)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    loki_url = f"http://127.0.0.1:{server.server_port}/loki/api/v1/push"
+
+    off_logger = logging.getLogger("benchmark_off")
+    off_logger.disabled = True
+    _report("off", await _handle_updates(off_logger))
+
+    sync_logger = logging.getLogger("benchmark_sync")
+    sync_logger.setLevel(logging.DEBUG)
+    sync_logger.addHandler(logging.FileHandler(os.devnull))
+    sync_logger.addHandler(logging_loki.LokiHandler(url=loki_url, tags={"from": "benchmark"}, version="1"))
+    _report("sync", await _handle_updates(sync_logger))
+
+    loki_handler = BatchedLokiHandler(loki_url, tags={"from": "benchmark"})
+    queued_logger = logging.getLogger("benchmark_queued")
+    queued_logger.setLevel(logging.DEBUG)
+    queued_logger.addHandler(QueueHandler(log_queue := queue.Queue(10000)))
+    listener = QueueListener(log_queue, logging.FileHandler(os.devnull), loki_handler)
+    listener.start()
+    _report("queued", await _handle_updates(queued_logger))
+
+    listener.stop()
+    loki_handler.close()
+    print(f"queued: sent to loki={loki_handler.sent}, dropped={loki_handler.dropped}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
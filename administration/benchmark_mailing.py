@@ -0,0 +1,125 @@
+import time
+import asyncio
+
+from aiohttp import web
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from bot.post_message.mailing_engine import Mailing, MailingCheckpoint, get_bot_rate_limiter
+
+from common_utils.config import main_telegram_bot_settings
+
+RECIPIENTS = 600
+TELEGRAM_LATENCY = 0.08  # seconds of one request to the fake telegram
+TELEGRAM_LIMIT = 30  # messages per second of one bot, above it the fake telegram answers 429
+FAKE_TOKEN = "123456:AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+FAKE_BOT_ID = 1
+
+
+class _FakeTelegram:
+    """Answers sendMessage after TELEGRAM_LATENCY and applies the flood control like telegram does"""
+
+    def __init__(self) -> None:
+        self.sent_at: list[float] = []
+        self.flood_errors = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(TELEGRAM_LATENCY)
+
+        now = time.monotonic()
+        if len([sent_at for sent_at in self.sent_at[-TELEGRAM_LIMIT:] if now - sent_at < 1]) >= TELEGRAM_LIMIT:
+            self.flood_errors += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                }
+            )
+
+        self.sent_at.append(now)
+        chat_id = int((await request.post())["chat_id"])
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": len(self.sent_at),
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                },
+            }
+        )
+
+
+async def _run(name: str, mailing_coroutine, fake_telegram: _FakeTelegram) -> None:
+    fake_telegram.sent_at.clear()
+    fake_telegram.flood_errors = 0
+
+    started_at = time.perf_counter()
+    sent = await mailing_coroutine
+    total_time = time.perf_counter() - started_at
+
+    print(
+        f"{name:>22}: {sent / total_time:6.1f} msg/s | sent={sent}/{RECIPIENTS} in {total_time:5.1f}s | "
+        f"429 answers={fake_telegram.flood_errors}"
+    )
+
+
+async def _old_mailing(bot: Bot) -> int:
+    """The old loop: one user at a time with the fixed pause"""
+    sent = 0
+    for user_id in range(1, RECIPIENTS + 1):
+        try:
+            await bot.send_message(user_id, "Mailing")
+            sent += 1
+        except Exception:  # noqa
+            pass
+        await asyncio.sleep(0.05)
+    return sent
+
+
+async def _new_mailing(bot: Bot) -> int:
+    async def save_checkpoint(_: MailingCheckpoint) -> bool:
+        return True
+
+    mailing = Mailing(
+        post_message_id=1,
+        bot_id=FAKE_BOT_ID,
+        send=lambda user_id: bot.send_message(user_id, "Mailing"),
+        save_checkpoint=save_checkpoint,
+        rate_limiter=get_bot_rate_limiter(
+            FAKE_BOT_ID, main_telegram_bot_settings.MAILING_RATE, main_telegram_bot_settings.MAILING_BURST
+        ),
+        concurrency=main_telegram_bot_settings.MAILING_CONCURRENCY,
+        checkpoint_every=main_telegram_bot_settings.MAILING_CHECKPOINT_EVERY,
+    )
+    return (await mailing.run(range(1, RECIPIENTS + 1))).sent
+
+
+async def main() -> None:
+    fake_telegram = _FakeTelegram()
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", fake_telegram.handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # noqa
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{port}"))
+    bot = Bot(FAKE_TOKEN, session=session)
+
+    print(f"{RECIPIENTS} recipients, telegram latency {TELEGRAM_LATENCY * 1000:.0f}ms, limit {TELEGRAM_LIMIT} msg/s")
+    await _run("sequential + sleep", _old_mailing(bot), fake_telegram)
+    await _run("token bucket + senders", _new_mailing(bot), fake_telegram)
+
+    await session.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy import text
+
+from common_utils.config import database_settings
+
+from database.models.models import Database
+from database.models.bot_model import BotDao
+
+from logs.config import db_logger
+
+
+database: Database = Database(sqlalchemy_url=database_settings.SQLALCHEMY_URL, logger=db_logger)
+db_bot: BotDao = database.get_bot_dao()
+
+
+async def main() -> None:
+    """
+    Adds bots.token_fingerprint to the existing table and fills it for all the bots.
+    Must be run again after the change of the fingerprint key of TokenEncryptor, otherwise the bots are not found
+    """
+    async with database.engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE bots ADD COLUMN IF NOT EXISTS token_fingerprint VARCHAR(64)"))
+        await conn.execute(
+            text("CREATE UNIQUE INDEX IF NOT EXISTS bots_token_fingerprint_key ON bots (token_fingerprint)")
+        )
+
+    all_bots = await db_bot.get_bots()
+    for ind, bot in enumerate(all_bots, start=1):
+        await db_bot.update_bot(bot)  # update_bot recalculates the fingerprint
+        print(f"{ind}/{len(all_bots)}: bot_id={bot.bot_id} fingerprint has been filled")
+
+    await database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Request, Response
 
 from database.config import category_db
 from database.models.category_model import CategorySchema, CategorySchemaWithoutId, CategoryNameAlreadyExistsError
 
-from api.utils import check_admin_authorization, RESPONSES_DICT, HTTPInternalError, HTTPConflictError
+from api.utils import (
+    check_admin_authorization,
+    RESPONSES_DICT,
+    HTTPInternalError,
+    HTTPConflictError,
+    get_not_modified_response,
+)
 
 from logs.config import api_logger, extra_params
 
@@ -16,11 +22,16 @@ router = APIRouter(
 
 
 @router.get("/get_all_categories/{bot_id}")
-async def get_all_categories_api(bot_id: int) -> list[CategorySchema]:
+async def get_all_categories_api(bot_id: int, request: Request, response: Response) -> list[CategorySchema]:
     """
+    Answers 304 without the body if If-None-Match has ETag of the current catalog version
+
     :raises HTTPInternalError:
     """
     try:
+        if not_modified := await get_not_modified_response(request, response, bot_id):
+            return not_modified
+
         categories = await category_db.get_all_categories(bot_id)
         api_logger.debug(
             f"bot_id={bot_id}: has {len(categories)} categories: {categories}", extra=extra_params(bot_id=bot_id)
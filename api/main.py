@@ -1,6 +1,7 @@
 import os
 import datetime
 import secrets
+from contextlib import asynccontextmanager
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 from fastapi import FastAPI, Depends, HTTPException
@@ -16,6 +17,9 @@ from api.settings.router import router as settings_router
 from api.categories.router import router as category_router
 
 from common_utils.config import common_settings, api_settings
+from common_utils.bot_pool import bot_pool
+
+from database.config import db_engine, bot_registry
 
 from logs.config import logger_configuration
 
@@ -48,6 +52,16 @@ _app_title = "FastApi"
 _app_version = "0.1.2"
 _root_prefix = "/api"
 
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    """Keeps the database pool, the bot registry and the bot pool alive while the app is running"""
+    await bot_registry.start_listening()
+    yield
+    await bot_pool.close()
+    await db_engine.close()
+
+
 app = FastAPI(
     title=_app_title,
     version=_app_version,
@@ -55,6 +69,7 @@ app = FastAPI(
     docs_url=None,
     redoc_url=None,
     openapi_url=None,
+    lifespan=_lifespan,
 )
 
 app.include_router(settings_router, prefix=_root_prefix)
@@ -70,6 +85,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # the web app sends it back in If-None-Match of get_all_products
 )
 
 
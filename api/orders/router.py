@@ -25,7 +25,7 @@ from common_utils.exceptions.local_api_exceptions import LocalAPIException
 from database.config import order_db
 from database.models.order_model import OrderNotFoundError, OrderSchema
 
-from logs.config import api_logger, extra_params
+from logs.config import api_logger, extra_params, LazyPayload
 
 PATH = "/orders"
 router = APIRouter(
@@ -77,7 +77,9 @@ async def get_all_orders_api(bot_id: int, authorization_data: str = Header()) ->
         )
         raise HTTPInternalError
 
-    api_logger.debug(f"bot_id={bot_id}: has {len(orders)} orders -> {orders}", extra=extra_params(bot_id=bot_id))
+    api_logger.debug(
+        "bot_id=%s: has %s orders -> %s", bot_id, len(orders), LazyPayload(orders), extra=extra_params(bot_id=bot_id)
+    )
 
     return orders
 
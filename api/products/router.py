@@ -1,7 +1,7 @@
 import random
 import string
 
-from fastapi import APIRouter, UploadFile, Depends, Header
+from fastapi import APIRouter, UploadFile, Depends, Header, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.exc import IntegrityError
 
@@ -18,12 +18,13 @@ from api.utils import (
     get_fastapi_file_extension,
     HTTPUnacceptedError,
     ACCEPTED_PHOTO_EXTENSIONS,
+    get_not_modified_response,
 )
 
 from common_utils.config import common_settings
 
 from database.models.bot_model import BotNotFoundError
-from database.config import product_db, category_db, bot_db
+from database.config import product_db, category_db, bot_registry
 from database.models.product_model import (
     ProductSchema,
     ProductNotFoundError,
@@ -35,7 +36,7 @@ from database.models.product_model import (
     PRODUCT_FILTERS,
 )
 
-from logs.config import api_logger, extra_params
+from logs.config import api_logger, extra_params, LazyPayload
 
 PATH = "/products"
 router = APIRouter(
@@ -84,9 +85,14 @@ async def get_filters_api():
 
 @router.post("/get_all_products/")
 async def get_all_products_api(
-    payload: GetProductsRequest = Depends(GetProductsRequest), authorization_data: str = Header()
+    request: Request,
+    response: Response,
+    payload: GetProductsRequest = Depends(GetProductsRequest),
+    authorization_data: str = Header(),
 ) -> list[ProductSchema]:
     """
+    Answers 304 without the body if If-None-Match has ETag of the current catalog version
+
     :raises HTTPBadRequestError:
     :raises HTTPBotNotFoundError:
     :raises HTTPCustomBotIsOfflineError:
@@ -94,7 +100,7 @@ async def get_all_products_api(
     :raises HTTPInternalError:
     """
     try:
-        bot = await bot_db.get_bot(payload.bot_id)
+        bot = await bot_registry.get_bot(payload.bot_id)
     except BotNotFoundError:
         raise HTTPBotNotFoundError(bot_id=payload.bot_id)
 
@@ -104,6 +110,9 @@ async def get_all_products_api(
         else:
             raise HTTPCustomBotIsOfflineError(bot_id=bot.bot_id)
 
+    if not_modified := await get_not_modified_response(request, response, payload.bot_id, payload.model_dump_json()):
+        return not_modified
+
     try:
         if not payload.filters:
             products = await product_db.get_all_products(
@@ -174,7 +183,10 @@ async def get_all_products_api(
         raise HTTPInternalError
 
     api_logger.info(
-        f"bot_id={payload.bot_id}: has {len(products)} products -> {products}",
+        "bot_id=%s: has %s products -> %s",
+        payload.bot_id,
+        len(products),
+        LazyPayload(products),
         extra=extra_params(bot_id=payload.bot_id),
     )
 
@@ -1,11 +1,11 @@
 import aiohttp
 
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from pydantic import BaseModel
 
-from database.config import bot_db, option_db, order_option_db, order_choose_option_db, custom_bot_user_db
+from database.config import bot_registry, option_db, order_option_db, order_choose_option_db, custom_bot_user_db
 
 from database.models.bot_model import BotNotFoundError
 from database.models.option_model import OptionSchema, OptionNotFoundError
@@ -13,7 +13,13 @@ from database.models.order_option_model import OrderOptionSchema, OrderOptionTyp
 from database.models.order_choose_option_model import OrderChooseOptionSchema
 from database.models.custom_bot_user_model import CustomBotUserNotFoundError, UserLanguageValues
 
-from api.utils import HTTPBotNotFoundError, HTTPInternalError, RESPONSES_DICT, HTTPBotUserNotFoundError
+from api.utils import (
+    HTTPBotNotFoundError,
+    HTTPInternalError,
+    RESPONSES_DICT,
+    HTTPBotUserNotFoundError,
+    get_not_modified_response,
+)
 
 from common_utils.themes import ThemeParamsSchema
 from common_utils.config import custom_telegram_bot_settings
@@ -30,15 +36,21 @@ router = APIRouter(
 
 
 @router.get("/get_web_app_options/{bot_id}/")
-async def get_web_app_options_api(bot_id: int) -> OptionSchema:
+async def get_web_app_options_api(bot_id: int, request: Request, response: Response) -> OptionSchema:
     """
+    Answers 304 without the body if If-None-Match has ETag of the current catalog version and options of the bot
+    (the bot gets new options without the change of the catalog)
+
     :returns: Pydantic WebAppOptions Model with options
 
     :raises HTTPBotNotFoundError:
     :raises HTTPInternalError:
     """
     try:
-        bot = await bot_db.get_bot(bot_id)
+        bot = await bot_registry.get_bot(bot_id)
+        if not_modified := await get_not_modified_response(request, response, bot_id, bot.options_id):
+            return not_modified
+
         options = await option_db.get_option(bot.options_id)
 
         return options
@@ -53,10 +65,9 @@ async def get_web_app_options_api(bot_id: int) -> OptionSchema:
             extra=extra_params(bot_id=bot_id),
             exc_info=e,
         )
+        del response.headers["ETag"]  # the client must not keep the default options
         return OptionSchema(
             id=-1,
-            start_msg="None",
-            default_msg="None",
             post_order_msg=None,
             auto_reduce=False,
             theme_params=ThemeParamsSchema(),
@@ -106,15 +117,20 @@ class APIOrderOption(BaseModel):
 
 
 @router.get("/get_order_options/{bot_id}/")
-async def get_order_options_api(bot_id: int) -> list[APIOrderOption]:
+async def get_order_options_api(bot_id: int, request: Request, response: Response) -> list[APIOrderOption]:
     """
+    Answers 304 without the body if If-None-Match has ETag of the current catalog version
+
     :returns: list of Pydantic APIOrderOption Model with order option
 
     :raises HTTPBotNotFoundError:
     :raises HTTPInternalError:
     """
     try:
-        bot = await bot_db.get_bot(bot_id)
+        bot = await bot_registry.get_bot(bot_id)
+        if not_modified := await get_not_modified_response(request, response, bot_id):
+            return not_modified
+
         order_options = await order_option_db.get_all_order_options(bot.bot_id)
 
         api_res = []
@@ -1,3 +1,4 @@
 from .authorization import check_admin_authorization
 from .exceptions import *
 from .files import *
+from .caching import get_not_modified_response
@@ -9,7 +9,7 @@ from api.utils.exceptions import HTTPUnauthorizedError, HTTPBotNotFoundError
 
 from common_utils.config import api_settings, main_telegram_bot_settings
 
-from database.config import bot_db
+from database.config import bot_registry
 from database.models.bot_model import BotNotFoundError
 
 
@@ -38,7 +38,7 @@ async def check_admin_authorization(bot_id: int, data_string: str, custom_bot_va
             raise HTTPUnauthorizedError(detail_message="Unauthorized. 'hash' is not provided in data.")
 
         try:
-            bot = await bot_db.get_bot(bot_id)
+            bot = await bot_registry.get_bot(bot_id)
         except BotNotFoundError:
             raise HTTPBotNotFoundError(bot_id=bot_id)
 
@@ -0,0 +1,45 @@
+import hashlib
+
+from fastapi import Request, Response
+
+from database.config import bot_registry
+
+# the client keeps the response but revalidates it every time, the unchanged catalog costs 304 without the body
+CATALOG_CACHE_CONTROL = "private, no-cache"
+
+
+async def get_catalog_etag(request: Request, bot_id: int, *variant) -> str:
+    """
+    :param variant: the request parameters that the response depends on besides the path and the query (the body)
+    :return: weak ETag of the response, it is changed by every change of the catalog of the bot
+    """
+    version = await bot_registry.get_catalog_version(bot_id)
+    digest = hashlib.blake2b(repr((request.url.path, request.url.query, variant)).encode(), digest_size=8)
+    return f'W/"{bot_id}-{version}-{digest.hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """:return: True if If-None-Match of the request has the etag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+
+async def get_not_modified_response(request: Request, response: Response, bot_id: int, *variant) -> Response | None:
+    """
+    Sets ETag and Cache-Control of the catalog response. Is called before the catalog is queried, so the client with
+    the actual catalog gets the answer without the database queries
+
+    :return: 304 response if the client already has the actual response, otherwise None
+    """
+    etag = await get_catalog_etag(request, bot_id, *variant)
+    headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
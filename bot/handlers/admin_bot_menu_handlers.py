@@ -4,7 +4,7 @@ from aiohttp import ClientConnectorError
 
 from sqlalchemy.exc import IntegrityError
 
-from aiogram import F, Bot
+from aiogram import F
 from aiogram.enums import ParseMode
 from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.exceptions import TelegramUnauthorizedError, TelegramBadRequest
@@ -61,6 +61,7 @@ from common_utils.keyboards.order_manage_keyboards import (
     InlineOrderCustomBotKeyboard,
     InlineCreateReviewKeyboard,
 )
+from common_utils.bot_pool import bot_pool
 from custom_bots.utils.custom_message_texts import CustomMessageTexts
 from database.config import (
     bot_db,
@@ -131,7 +132,7 @@ async def process_web_app_request(event: Message):
                 "У вас сейчас нет добавленных каналов\n\nДобавьте, после чего попробуйте опубликовать товар заново",
                 reply_markup=await InlineChannelsListKeyboard.get_keyboard(custom_bot.bot_id),
             )
-        custom_bot_data = await Bot(token=custom_bot.token).get_me()
+        custom_bot_data = await bot_pool.get_bot(custom_bot.token).get_me()
         # TODO add language select for multi lang shops
         message = await event.answer_photo(
             photo=FSInputFile(f"{common_settings.FILES_PATH}{product.picture[0]}"),
@@ -160,7 +161,9 @@ async def get_channel_for_publish(query: CallbackQuery):
             await query.answer("Выберите канал: ", show_alert=True)
             await query.message.delete()
             await query.message.answer(
-                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineChannelsListPublishKeyboard.get_keyboard(
                     custom_bot.bot_id, callback_data.pid, callback_data.msg_id
                 ),
@@ -170,7 +173,9 @@ async def get_channel_for_publish(query: CallbackQuery):
             await query.message.answer("Отправка отменена")
             await query.message.delete()
             await query.message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, query.from_user.id),
             )
 
@@ -180,14 +185,16 @@ async def pick_channel_for_publish(query: CallbackQuery):
     callback_data = InlineChannelsListPublishKeyboard.Callback.model_validate_json(query.data)
     bot_id = callback_data.bot_id
     custom_bot = await bot_db.get_bot(bot_id)
-    channel = await Bot(token=custom_bot.token).get_chat(callback_data.chid)
+    channel = await bot_pool.get_bot(custom_bot.token).get_chat(callback_data.chid)
 
     match callback_data.a:
         case callback_data.ActionEnum.CANCEL:
             await query.message.answer("Отправка отменена")
             await query.message.delete()
             await query.message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, query.from_user.id),
             )
         case callback_data.ActionEnum.PICK_CHANNEL:
@@ -211,14 +218,16 @@ async def publish_product_in_channel(query: CallbackQuery):
     bot_id = callback_data.bot_id
     custom_bot = await bot_db.get_bot(bot_id)
     custom_bot_options = await option_db.get_option(custom_bot.options_id)
-    custom_tg_bot = Bot(token=custom_bot.token)
+    custom_tg_bot = bot_pool.get_bot(custom_bot.token)
 
     match callback_data.a:
         case callback_data.ActionEnum.BACK_TO_CHANNEL_PICK:
             await query.answer("Выберите канал", show_alert=True)
             await query.message.delete()
             await query.message.answer(
-                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineChannelsListPublishKeyboard.get_keyboard(
                     custom_bot.bot_id, callback_data.mid, callback_data.pid
                 ),
@@ -267,7 +276,7 @@ async def handle_reply_to_question(message: Message, state: FSMContext):
 
     custom_bot = await bot_db.get_bot_by_created_by(created_by=message.from_user.id)
     custom_bot_user = await custom_bot_user_db.get_custom_bot_user(custom_bot.bot_id, order.from_user)
-    await Bot(token=custom_bot.token, default=BOT_PROPERTIES).send_message(
+    await bot_pool.get_bot(custom_bot.token, BOT_PROPERTIES).send_message(
         chat_id=order.from_user,
         **CustomMessageTexts.get_response_text(custom_bot_user.user_language, order_id, message.text).as_kwargs(),
         reply_to_message_id=question_messages_data[question_message_id]["question_from_custom_bot_message_id"],
@@ -327,13 +336,13 @@ async def handler_order_cancel_callback(query: CallbackQuery, state: FSMContext)
                 order, products, lang=custom_bot_user.user_language
             )
 
-            # await Bot(bot_token, default=BOT_PROPERTIES).edit_message_text(
+            # await bot_pool.get_bot(bot_token, BOT_PROPERTIES).edit_message_text(
             #     order.convert_to_notification_text(products=products),
             #     reply_markup=None,
             #     chat_id=callback_data.chat_id,
             #     message_id=callback_data.msg_id
             # )
-            await Bot(bot_token, default=BOT_PROPERTIES).edit_message_text(
+            await bot_pool.get_bot(bot_token, BOT_PROPERTIES).edit_message_text(
                 **text, reply_markup=None, chat_id=callback_data.chat_id, message_id=callback_data.msg_id
             )
 
@@ -348,7 +357,7 @@ async def handler_order_cancel_callback(query: CallbackQuery, state: FSMContext)
                 product.count += item.amount
                 await product_db.update_product(product)
 
-            await Bot(bot_token, default=BOT_PROPERTIES).send_message(
+            await bot_pool.get_bot(bot_token, BOT_PROPERTIES).send_message(
                 chat_id=callback_data.chat_id,
                 text=f"Новый статус заказа <b>#{order.id}</b>\n<b>{order.translate_order_status()}</b>",
             )
@@ -432,7 +441,7 @@ async def handle_callback(query: CallbackQuery, state: FSMContext):
                 (await product_db.get_product(int(product_id)), product_item.amount, product_item.used_extra_options)
                 for product_id, product_item in order.items.items()
             ]
-            # await Bot(bot_token, default=BOT_PROPERTIES).edit_message_text(
+            # await bot_pool.get_bot(bot_token, BOT_PROPERTIES).edit_message_text(
             #     order.convert_to_notification_text(products=products),
             #     reply_markup=None if callback_data.a == callback_data.ActionEnum.FINISH else
             #     InlineOrderCustomBotKeyboard.get_keyboard(order.id, callback_data.msg_id, callback_data.chat_id),
@@ -442,7 +451,7 @@ async def handle_callback(query: CallbackQuery, state: FSMContext):
             text = await CommonMessageTexts.generate_order_notification_text(
                 order, products, lang=custom_bot_user.user_language
             )
-            await Bot(bot_token, default=BOT_PROPERTIES).edit_message_text(
+            await bot_pool.get_bot(bot_token, BOT_PROPERTIES).edit_message_text(
                 **text,
                 reply_markup=None
                 if callback_data.a == callback_data.ActionEnum.FINISH
@@ -463,7 +472,7 @@ async def handle_callback(query: CallbackQuery, state: FSMContext):
                 ),
             )
 
-            msg = await Bot(bot_token, default=BOT_PROPERTIES).send_message(
+            msg = await bot_pool.get_bot(bot_token, BOT_PROPERTIES).send_message(
                 chat_id=callback_data.chat_id,
                 **CustomMessageTexts.get_new_order_status_text(
                     lang=custom_bot_user.user_language,
@@ -490,7 +499,7 @@ async def handle_callback(query: CallbackQuery, state: FSMContext):
                     if zero_products:
                         await query.message.answer(**MessageTexts.generate_post_order_product_info(zero_products))
 
-                await Bot(bot_token, default=BOT_PROPERTIES).send_message(
+                await bot_pool.get_bot(bot_token, BOT_PROPERTIES).send_message(
                     reply_to_message_id=msg.message_id,
                     chat_id=callback_data.chat_id,
                     **CustomMessageTexts.get_yuo_can_add_review_text(custom_bot_user.user_language).as_kwargs(),
@@ -511,7 +520,7 @@ async def waiting_for_the_token_handler(message: Message, state: FSMContext):
     try:
         validate_token(token)
 
-        found_bot = Bot(token)
+        found_bot = bot_pool.get_bot(token)
         found_bot_data = await found_bot.get_me()
         bot_fullname, bot_username = found_bot_data.full_name, found_bot_data.username
 
@@ -557,7 +566,7 @@ async def waiting_for_the_token_handler(message: Message, state: FSMContext):
         reply_markup=await InlineBotMenuKeyboard.get_keyboard(user_bot.bot_id, user_id),
     )
 
-    await send_event(message.from_user, EventTypes.USER_CREATED_FIRST_BOT, event_bot=Bot(user_bot.token))
+    await send_event(message.from_user, EventTypes.USER_CREATED_FIRST_BOT, event_bot=bot_pool.get_bot(user_bot.token))
 
     await state.set_state(States.BOT_MENU)
     await state.set_data({"bot_id": bot_id})
@@ -626,7 +635,7 @@ async def bot_menu_callback_handler(query: CallbackQuery, state: FSMContext):
     user_id = query.from_user.id
     bot_id = callback_data.bot_id
     db_bot_data = await bot_db.get_bot(bot_id)
-    custom_tg_bot = Bot(token=db_bot_data.token)
+    custom_tg_bot = bot_pool.get_bot(db_bot_data.token)
     custom_bot_data = await custom_tg_bot.get_me()
 
     try:
@@ -692,8 +701,8 @@ async def bot_menu_callback_handler(query: CallbackQuery, state: FSMContext):
             await state.set_state(States.DELETE_BOT)
             await state.set_data(state_data)
         case callback_data.ActionEnum.BOT_STATISTICS:
-            users = await custom_bot_user_db.get_custom_bot_users(bot_id=bot_id)
-            await query.message.answer(f"Статистика:\n\n" f"👨🏻‍🦱 Всего пользователей: {len(users)}")
+            users_count = await custom_bot_user_db.count_custom_bot_users(bot_id=bot_id)
+            await query.message.answer(f"Статистика:\n\n" f"👨🏻‍🦱 Всего пользователей: {users_count}")
             await query.answer()
         case callback_data.ActionEnum.MAILING_ADD | callback_data.ActionEnum.MAILING_OPEN:
             try:
@@ -709,7 +718,7 @@ async def bot_menu_callback_handler(query: CallbackQuery, state: FSMContext):
             custom_bot = await bot_db.get_bot(bot_id=bot_id)
             await query.message.edit_text(
                 MessageTexts.bot_post_message_menu_message(PostMessageType.MAILING).format(
-                    (await Bot(custom_bot.token).get_me()).username
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
                 ),
                 reply_markup=await InlinePostMessageMenuKeyboard.get_keyboard(
                     bot_id=bot_id, post_message_type=PostMessageType.MAILING, channel_id=None
@@ -723,7 +732,9 @@ async def bot_menu_callback_handler(query: CallbackQuery, state: FSMContext):
             custom_bot = await bot_db.get_bot(bot_id)
 
             await query.message.edit_text(
-                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_CHANNELS_LIST_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineChannelsListKeyboard.get_keyboard(custom_bot.bot_id),
             )
 
@@ -733,7 +744,7 @@ async def back_to_main_menu(query: CallbackQuery):
     callback_data = InlineBackFromRefKeyboard.Callback.model_validate_json(query.data)
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
     await query.message.edit_text(
         text=MessageTexts.BOT_MENU_MESSAGE.value.format(custom_bot_data.username),
         reply_markup=await InlineBotMenuKeyboard.get_keyboard(callback_data.bot_id, query.from_user.id),
@@ -749,7 +760,7 @@ async def bot_settings_callback_handler(query: CallbackQuery, state: FSMContext)
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
     bot_options = await option_db.get_option(user_bot.options_id)
 
     match callback_data.a:
@@ -811,7 +822,7 @@ async def custom_bot_language_callback_handler(query: CallbackQuery):
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
     bot_options = await option_db.get_option(user_bot.bot_id)
 
     match callback_data.a:
@@ -841,7 +852,7 @@ async def admins_manage_callback_handler(query: CallbackQuery):
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
 
     main_bot_data = await query.bot.get_me()
 
@@ -920,7 +931,9 @@ async def bot_menu_handler(message: Message, state: FSMContext):
             )
         case ReplyBotMenuKeyboard.Callback.ActionEnum.SETTINGS.value:
             await message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
             )
 
@@ -931,7 +944,9 @@ async def bot_menu_handler(message: Message, state: FSMContext):
                 "Для навигации используйте кнопки 👇", reply_markup=ReplyBotMenuKeyboard.get_keyboard()
             )
             await message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
             )
 
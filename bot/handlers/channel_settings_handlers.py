@@ -1,8 +1,8 @@
-from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.types import CallbackQuery
 
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
+from common_utils.bot_pool import bot_pool
 
 from bot.utils import MessageTexts
 from bot.handlers.routers import channel_menu_router
@@ -30,7 +30,7 @@ async def channels_list_callback_handler(query: CallbackQuery):
 
     bot_id = callback_data.bot_id
     custom_bot = await bot_db.get_bot(bot_id)
-    custom_tg_bot = Bot(custom_bot.token)
+    custom_tg_bot = bot_pool.get_bot(custom_bot.token)
 
     match callback_data.a:
         case callback_data.ActionEnum.OPEN_CHANNEL:
@@ -44,7 +44,9 @@ async def channels_list_callback_handler(query: CallbackQuery):
             )
         case callback_data.ActionEnum.BACK_TO_MAIN_MENU:
             await query.message.edit_text(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, query.from_user.id),
                 parse_mode=ParseMode.HTML,
             )
@@ -60,20 +62,20 @@ async def channel_menu_callback_handler(query: CallbackQuery):
     channel_id = callback_data.channel_id
 
     custom_bot = await bot_db.get_bot(bot_id)
-    custom_tg_bot = Bot(custom_bot.token)
+    custom_tg_bot = bot_pool.get_bot(custom_bot.token)
     custom_bot_username = (await custom_tg_bot.get_me()).username
 
     channel_username = (await custom_tg_bot.get_chat(channel_id)).username
 
     match callback_data.a:
         case callback_data.ActionEnum.ANALYTICS:
-            plus_users = await channel_user_db.get_joined_channel_users_by_channel_id(channel_id)
-            minus_users = await channel_user_db.get_left_channel_users_by_channel_id(channel_id)
+            channel_users_count = await channel_user_db.count_channel_users_by_membership(channel_id)
 
             await query.answer(
-                text=f"Прирост подписчиков в канале @{channel_username}: {len(plus_users) - len(minus_users)}\n\n"
-                f"Отписалось - {len(minus_users)}\n"
-                f"Подписалось - {len(plus_users)}\n",
+                text=f"Прирост подписчиков в канале @{channel_username}: "
+                f"{channel_users_count.joined - channel_users_count.left}\n\n"
+                f"Отписалось - {channel_users_count.left}\n"
+                f"Подписалось - {channel_users_count.joined}\n",
                 show_alert=True,
             )
         case callback_data.ActionEnum.LEAVE_CHANNEL:
@@ -149,7 +151,7 @@ async def contest_type_callback_handler(query: CallbackQuery):
     channel_id = callback_data.channel_id
 
     custom_bot = await bot_db.get_bot(bot_id)
-    custom_tg_bot = Bot(custom_bot.token)
+    custom_tg_bot = bot_pool.get_bot(custom_bot.token)
 
     channel_username = (await custom_tg_bot.get_chat(channel_id)).username
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from aiogram import F, Bot
+from aiogram import F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import CommandStart, Command, CommandObject, StateFilter
 from aiogram.fsm.context import FSMContext
@@ -37,6 +37,7 @@ from common_utils.keyboards.remove_keyboard import OurReplyKeyboardRemove
 from common_utils.subscription.subscription import UserHasAlreadyStartedTrial
 from common_utils.exceptions.bot_exceptions import UnknownDeepLinkArgument
 from common_utils.broadcasting.broadcasting import send_event, EventTypes
+from common_utils.bot_pool import bot_pool
 
 from database.config import user_db, bot_db, user_role_db, referral_invite_db
 from database.models.bot_model import BotNotFoundError
@@ -169,7 +170,7 @@ async def _handle_admin_invite_link(message: Message, state: FSMContext, deep_li
         new_role = UserRoleSchema(user_id=message.from_user.id, bot_id=db_bot.bot_id, role=UserRoleValues.ADMINISTRATOR)
         await user_role_db.add_user_role(new_role)
 
-        custom_bot_data = await Bot(token=db_bot.token).get_me()
+        custom_bot_data = await bot_pool.get_bot(db_bot.token).get_me()
 
         await message.answer(f"✅ Теперь Вы администратор бота @{custom_bot_data.username}")
 
@@ -217,7 +218,7 @@ async def _send_bot_menu(user_id: int, state: FSMContext, user_bots: list | None
         return
     else:
         bot_id = user_bots[0].bot_id
-        user_bot = Bot(user_bots[0].token)
+        user_bot = bot_pool.get_bot(user_bots[0].token)
         user_bot_data = await user_bot.get_me()
         yield await bot.send_message(
             user_id,
@@ -350,7 +351,7 @@ async def rm_admin_command_handler(message: Message, state: FSMContext, command:
 
     await user_role_db.del_user_role(user_role.user_id, user_role.bot_id)
 
-    custom_bot_data = await Bot((await bot_db.get_bot(bot_id)).token).get_me()
+    custom_bot_data = await (await bot_pool.get_bot_by_id(bot_id)).get_me()
 
     await message.answer(
         f"🔔 Пользователь больше не администратор ({user_id}) для бота " f"@{custom_bot_data.username}"
@@ -1,6 +1,5 @@
 import re
 
-from aiogram import Bot
 from aiogram.types import Message, CallbackQuery, InputMediaPhoto, FSInputFile
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
@@ -40,6 +39,7 @@ from common_utils.keyboards.keyboards import (
     InlineEditThemeColorMenuKeyboard,
 )
 from common_utils.keyboards.remove_keyboard import OurReplyKeyboardRemove
+from common_utils.bot_pool import bot_pool
 
 from database.config import bot_db, option_db, order_option_db, order_choose_option_db
 from database.models.bot_model import BotPaymentTypeValues
@@ -64,7 +64,9 @@ async def manage_order_options(query: CallbackQuery, state: FSMContext):
     match callback_data.a:
         case callback_data.ActionEnum.BACK_TO_BOT_MENU:
             await query.message.edit_text(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(callback_data.bot_id),
             )
         case callback_data.ActionEnum.ADD_ORDER_OPTION:
@@ -98,7 +100,7 @@ async def customization_manage_callback_handler(query: CallbackQuery):
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
 
     match callback_data.a:
         case callback_data.ActionEnum.CHOOSE_PRESET:
@@ -128,7 +130,7 @@ async def presets_select_callback_handler(query: CallbackQuery):
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
     bot_options = await option_db.get_option(user_bot.options_id)
 
     match callback_data.a:
@@ -159,7 +161,7 @@ async def colors_edit_callback_handler(query: CallbackQuery, state: FSMContext):
 
     bot_id = callback_data.bot_id
     user_bot = await bot_db.get_bot(bot_id)
-    custom_bot_data = await Bot(token=user_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(user_bot.token).get_me()
     state_data = await state.get_data()
 
     match callback_data.a:
@@ -441,7 +443,7 @@ async def manage_payment_settings(query: CallbackQuery, state: FSMContext):
     callback_data = InlinePaymentSettingsKeyboard.Callback.model_validate_json(query.data)
 
     custom_bot = await bot_db.get_bot(callback_data.bot_id)
-    custom_bot_data = await Bot(custom_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(custom_bot.token).get_me()
     custom_bot_options = await option_db.get_option(custom_bot.options_id)
 
     # check if currency code is still xtr, but stars is not selected
@@ -566,7 +568,7 @@ async def manage_payment_setup(query: CallbackQuery, state: FSMContext):
     callback_data = InlinePaymentSetupKeyboard.Callback.model_validate_json(query.data)
 
     custom_bot = await bot_db.get_bot(callback_data.bot_id)
-    custom_bot_tg = Bot(custom_bot.token)
+    custom_bot_tg = bot_pool.get_bot(custom_bot.token)
     custom_bot_data = await custom_bot_tg.get_me()
     custom_bot_options = await option_db.get_option(custom_bot.options_id)
 
@@ -751,7 +753,7 @@ async def select_currency_settings(query: CallbackQuery):
     callback_data = InlineCurrencySelectKeyboard.Callback.model_validate_json(query.data)
 
     custom_bot = await bot_db.get_bot(callback_data.bot_id)
-    custom_bot_data = await Bot(custom_bot.token).get_me()
+    custom_bot_data = await bot_pool.get_bot(custom_bot.token).get_me()
     custom_bot_options = await option_db.get_option(custom_bot.options_id)
 
     if custom_bot.payment_type == BotPaymentTypeValues.STARS:
@@ -1001,7 +1003,7 @@ async def handle_provider_token_input(message: Message, state: FSMContext):
 
         bot_id = state_data["bot_id"]
         custom_bot = await bot_db.get_bot(bot_id)
-        custom_bot_data = await Bot(custom_bot.token).get_me()
+        custom_bot_data = await bot_pool.get_bot(custom_bot.token).get_me()
 
         if custom_bot.payment_type == BotPaymentTypeValues.STARS:
             stars = True
@@ -1157,7 +1159,9 @@ async def editing_start_message_handler(message: Message, state: FSMContext):
                     "Возвращаемся в меню настроек...", reply_markup=ReplyBotMenuKeyboard.get_keyboard()
                 )
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1177,7 +1181,9 @@ async def editing_start_message_handler(message: Message, state: FSMContext):
 
                 await message.answer("Стартовое сообщение изменено!", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
 
@@ -1202,7 +1208,9 @@ async def editing_default_message_handler(message: Message, state: FSMContext):
                     "Возвращаемся в меню настроек...", reply_markup=ReplyBotMenuKeyboard.get_keyboard()
                 )
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1222,7 +1230,9 @@ async def editing_default_message_handler(message: Message, state: FSMContext):
 
                 await message.answer("Сообщение-затычка изменена!", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1246,7 +1256,9 @@ async def editing_custom_color_handler(message: Message, state: FSMContext):
                     "Возвращаемся в меню настроек...", reply_markup=ReplyBotMenuKeyboard.get_keyboard()
                 )
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1292,7 +1304,9 @@ async def editing_custom_color_handler(message: Message, state: FSMContext):
 
                 await message.answer(f"Цвет {param_name} изменен!", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotSettingsMenuKeyboard.get_keyboard(custom_bot.bot_id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1309,7 +1323,7 @@ async def editing_post_order_message_handler(message: Message, state: FSMContext
     if message_text:
         state_data = await state.get_data()
         custom_bot = await bot_db.get_bot(state_data["bot_id"])
-        custom_bot_data = await Bot(custom_bot.token).get_me()
+        custom_bot_data = await bot_pool.get_bot(custom_bot.token).get_me()
 
         match message_text:
             case ReplyBackBotMenuKeyboard.Callback.ActionEnum.BACK_TO_BOT_MENU.value:
@@ -1337,7 +1351,9 @@ async def editing_post_order_message_handler(message: Message, state: FSMContext
                     "Сообщение после заказа изменено!", reply_markup=ReplyBotMenuKeyboard.get_keyboard()
                 )
                 await message.answer(
-                    MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                    MessageTexts.BOT_MENU_MESSAGE.value.format(
+                        (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                    ),
                     reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
                 )
                 await state.set_state(States.BOT_MENU)
@@ -1358,7 +1374,9 @@ async def delete_bot_handler(message: Message, state: FSMContext):
         case ReplyBackBotMenuKeyboard.Callback.ActionEnum.BACK_TO_BOT_MENU.value:
             await message.answer("Возвращаемся в главное меню...", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
             await message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
             )
             await state.set_state(States.BOT_MENU)
@@ -1,82 +1,123 @@
 import asyncio
 
-from aiogram.exceptions import TelegramForbiddenError
-from aiogram.client.bot import Bot
+from typing import AsyncIterator
 
 from bot.main import bot
 from bot.utils.excel_utils import send_ban_users_xlsx
 from bot.utils.message_texts import MessageTexts
 from bot.post_message.post_message_editors import PostActionType, send_post_message
+from bot.post_message.media_cache import prewarm_media_files
+from bot.post_message.mailing_engine import (
+    Mailing,
+    MailingResult,
+    MailingCheckpoint,
+    get_bot_rate_limiter,
+    run_mailing,
+)
+from common_utils.config import main_telegram_bot_settings
 from common_utils.bot_settings_config import BOT_PROPERTIES
+from common_utils.bot_pool import bot_pool
 
-from database.config import custom_bot_user_db, post_message_db
+from database.config import custom_bot_user_db, post_message_db, bot_db, post_message_media_file_db
 
 from logs.config import logger, extra_params
 
 
+_resumed_mailings: set[asyncio.Task] = set()
+
+
 async def send_post_messages(custom_bot, post_message, media_files, chat_id):
-    """Запускает цикл отправления сообщения подписчикам бота"""
+    """Запускает (или продолжает с последнего чекпоинта) рассылку сообщения подписчикам бота"""
 
     post_message_id = post_message.post_message_id
-    all_custom_bot_users = await custom_bot_user_db.get_custom_bot_users(custom_bot.bot_id)
-    custom_bot_tg = Bot(custom_bot.token, default=BOT_PROPERTIES)
-
-    banned_users_list = []
-
-    for ind, user in enumerate(all_custom_bot_users, start=1):
-        post_message = await post_message_db.get_post_message(post_message_id)
-
-        if not post_message.is_running:
-            post_message.sent_post_message_amount = 0
-            await post_message_db.update_post_message(post_message)
-            return
-
-        try:
-            await send_post_message(
-                bot_from_send=custom_bot_tg,
-                to_chat_id=user.user_id,
-                post_message_schema=post_message,
-                media_files=media_files,
-                post_action_type=PostActionType.RELEASE,
-                message=None,
-                is_delayed=False,
-            )
-            logger.info(
-                f"post_message_id={post_message_id}: "
-                f"sent to {ind}/{len(all_custom_bot_users)} with user_id={user.user_id}",
-                extra=extra_params(user_id=user.user_id, bot_id=post_message.bot_id, post_message_id=post_message_id),
-            )
-            post_message.sent_post_message_amount += 1
-            await post_message_db.update_post_message(post_message)
-
-        except TelegramForbiddenError:
-            await post_message_db.update_post_message(post_message)
-            banned_users_list.append(user.user_id)
-            logger.info(
-                f"post_message_id={post_message_id}: " f"user_id={user.user_id} banned bot_id={post_message.bot_id}",
-                extra=extra_params(post_message_id=post_message_id, user_id=user.user_id, bot_id=post_message.bot_id),
-            )
-
-        # 20 messages per second (limit is 30)
-        await asyncio.sleep(0.05)
+    custom_bot_tg = bot_pool.get_bot(custom_bot.token, BOT_PROPERTIES)
+
+    result = MailingResult(
+        sent=post_message.sent_post_message_amount,
+        failed=post_message.failed_post_message_amount,
+        banned_user_ids=list(post_message.banned_user_ids),
+    )
+
+    async def send(user_id: int) -> None:
+        await send_post_message(
+            bot_from_send=custom_bot_tg,
+            to_chat_id=user_id,
+            post_message_schema=post_message,
+            media_files=media_files,
+            post_action_type=PostActionType.RELEASE,
+            message=None,
+            is_delayed=False,
+        )
+
+    async def save_checkpoint(checkpoint: MailingCheckpoint) -> bool:
+        logger.info(
+            f"post_message_id={post_message_id}: sent to {checkpoint.sent} users, mailing_cursor={checkpoint.cursor}",
+            extra=extra_params(bot_id=post_message.bot_id, post_message_id=post_message_id),
+        )
+        return await post_message_db.save_mailing_checkpoint(
+            post_message_id,
+            mailing_cursor=checkpoint.cursor,
+            sent_post_message_amount=checkpoint.sent,
+            failed_post_message_amount=checkpoint.failed,
+            new_banned_user_ids=checkpoint.new_banned_user_ids,
+        )
+
+    mailing = Mailing(
+        post_message_id=post_message_id,
+        bot_id=post_message.bot_id,
+        send=send,
+        save_checkpoint=save_checkpoint,
+        rate_limiter=get_bot_rate_limiter(
+            post_message.bot_id, main_telegram_bot_settings.MAILING_RATE, main_telegram_bot_settings.MAILING_BURST
+        ),
+        concurrency=main_telegram_bot_settings.MAILING_CONCURRENCY,
+        checkpoint_every=main_telegram_bot_settings.MAILING_CHECKPOINT_EVERY,
+        messages_per_send=max(1, len(media_files)),
+        result=result,
+    )
+    await prewarm_media_files(custom_bot_tg, post_message.bot_id, media_files, custom_bot.created_by)
+    result = await run_mailing(mailing, _iter_recipient_batches(post_message.bot_id, post_message.mailing_cursor))
+    if result.is_cancelled:  # the post message is deleted by the cancel handler
+        return
+
+    custom_bot_users_len = result.sent + result.failed + len(result.banned_user_ids)
 
     # Generate xlsx file
-    if banned_users_list:
-        await send_ban_users_xlsx(banned_users_list, post_message.bot_id)
+    if result.banned_user_ids:
+        await send_ban_users_xlsx(result.banned_user_ids, post_message.bot_id)
 
     # Delete users from custom bot users db
-    for user in banned_users_list:
-        await custom_bot_user_db.delete_custom_bot_user(post_message.bot_id, user)
+    await custom_bot_user_db.delete_custom_bot_users(post_message.bot_id, result.banned_user_ids)
 
     await bot.send_message(
         chat_id,
         MessageTexts.show_mailing_info(
-            sent_post_message_amount=post_message.sent_post_message_amount,
-            custom_bot_users_len=len(all_custom_bot_users),
+            sent_post_message_amount=result.sent,
+            custom_bot_users_len=custom_bot_users_len,
         ),
     )
 
-    post_message.is_running = False
-    post_message.sent_post_message_amount = 0
-
     await post_message_db.delete_post_message(post_message.post_message_id)
+
+
+async def _iter_recipient_batches(bot_id: int, after_user_id: int | None) -> AsyncIterator[list[int]]:
+    async for users in custom_bot_user_db.iter_custom_bot_users(
+        bot_id, batch_size=main_telegram_bot_settings.MAILING_FETCH_BATCH_SIZE, after_user_id=after_user_id
+    ):
+        yield [user.user_id for user in users]
+
+
+async def resume_mailings() -> None:
+    """Continues the mailings interrupted by the restart from their checkpoints in the background"""
+    for post_message in await post_message_db.get_running_mailings():
+        custom_bot = await bot_db.get_bot(post_message.bot_id)
+        media_files = await post_message_media_file_db.get_all_post_message_media_files(post_message.post_message_id)
+
+        logger.info(
+            f"post_message_id={post_message.post_message_id}: resuming mailing "
+            f"from mailing_cursor={post_message.mailing_cursor}",
+            extra=extra_params(bot_id=post_message.bot_id, post_message_id=post_message.post_message_id),
+        )
+        task = asyncio.create_task(send_post_messages(custom_bot, post_message, media_files, custom_bot.created_by))
+        _resumed_mailings.add(task)
+        task.add_done_callback(_resumed_mailings.discard)
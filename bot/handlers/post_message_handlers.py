@@ -1,6 +1,5 @@
 from datetime import datetime, timedelta
 
-from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import StateFilter
@@ -37,6 +36,7 @@ from bot.post_message.post_message_callback_handler import post_message_handler
 
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
+from common_utils.bot_pool import bot_pool
 
 from database.config import post_message_media_file_db, post_message_db, contest_db, bot_db
 from database.models.post_message_model import (
@@ -87,7 +87,7 @@ async def editing_post_message_handler(message: Message, state: FSMContext):
     except PostMessageNotFoundError:
         custom_bot = await bot_db.get_bot_by_created_by(user_id)
         await message.answer(
-            MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+            MessageTexts.BOT_MENU_MESSAGE.value.format((await bot_pool.get_bot(custom_bot.token).get_me()).username),
             reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, user_id),
         )
         await state.set_state(States.BOT_MENU)
@@ -221,7 +221,7 @@ async def _start_confirm(
 
         post_message.is_running = True
         custom_bot = await bot_db.get_bot(post_message.bot_id)
-        custom_bot_username = (await Bot(custom_bot.token).get_me()).username
+        custom_bot_username = (await bot_pool.get_bot(custom_bot.token).get_me()).username
 
         match post_message_type:
             case PostMessageType.MAILING:
@@ -279,7 +279,7 @@ async def _start_confirm(
                     contest.finish_job_id = job_id
                     await contest_db.update_contest(contest)
 
-                channel_username = (await Bot(custom_bot.token).get_chat(channel_id)).username
+                channel_username = (await bot_pool.get_bot(custom_bot.token).get_chat(channel_id)).username
 
                 await query.message.answer(
                     f"Запись отправится в {post_message.send_date}" if post_message.is_delayed else "Запись отправлена!"
@@ -287,7 +287,7 @@ async def _start_confirm(
 
                 if not post_message.is_delayed:
                     await send_post_message(
-                        Bot(custom_bot.token, default=BOT_PROPERTIES),
+                        bot_pool.get_bot(custom_bot.token, BOT_PROPERTIES),
                         channel_id,
                         post_message,
                         media_files,
@@ -342,7 +342,7 @@ async def _delete_post_message(
 
     await post_message_db.delete_post_message(post_message.post_message_id)
     custom_bot = await bot_db.get_bot(post_message.bot_id)
-    custom_bot_username = (await Bot(custom_bot.token).get_me()).username
+    custom_bot_username = (await bot_pool.get_bot(custom_bot.token).get_me()).username
 
     match post_message_type:
         case PostMessageType.MAILING:
@@ -364,7 +364,7 @@ async def _delete_post_message(
             )
 
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            channel_username = (await Bot(custom_bot.token).get_chat(channel_id)).username
+            channel_username = (await bot_pool.get_bot(custom_bot.token).get_chat(channel_id)).username
             keyboard = await InlineChannelMenuKeyboard.get_keyboard(post_message.bot_id, channel_id)
 
             await query.message.edit_text(
@@ -432,9 +432,9 @@ async def _inline_back_to_post_message_menu(
 
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -1,6 +1,5 @@
 from datetime import datetime
 
-from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
@@ -23,6 +22,7 @@ from common_utils.bot_utils import create_bot_options
 
 from common_utils.config import common_settings
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
+from common_utils.bot_pool import bot_pool
 
 from database.config import product_db, bot_db, option_db
 from database.models.option_model import OptionNotFoundError
@@ -101,7 +101,9 @@ async def stock_menu_handler(query: CallbackQuery, state: FSMContext):
         case callback_data.ActionEnum.BACK_TO_BOT_MENU:
             custom_bot = await bot_db.get_bot(bot_id)
             await query.message.edit_text(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, query.from_user.id),
             )
 
@@ -1,7 +1,6 @@
 from datetime import timedelta, datetime
 from typing import List
 
-from aiogram import Bot
 from aiogram.enums import ContentType
 from aiogram.types import CallbackQuery, FSInputFile, User, Message
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
@@ -22,6 +21,7 @@ from common_utils.config import common_settings, main_telegram_bot_settings
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
 from common_utils.broadcasting.broadcasting import send_event, EventTypes
 from common_utils.keyboards.remove_keyboard import OurReplyKeyboardRemove
+from common_utils.bot_pool import bot_pool
 
 from database.config import user_db, bot_db, referral_invite_db
 from database.models.user_model import UserSchema, UserStatusValues
@@ -109,7 +109,9 @@ async def waiting_payment_pay_handler(message: Message, state: FSMContext):
 
             await message.answer("Возвращаемся в главное меню...", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
             await message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
             )
         else:
@@ -192,7 +194,9 @@ async def waiting_payment_approve_handler(message: Message, state: FSMContext):
                 reply_markup=ReplyBotMenuKeyboard.get_keyboard(),
             )
             await message.answer(
-                MessageTexts.BOT_MENU_MESSAGE.value.format((await Bot(custom_bot.token).get_me()).username),
+                MessageTexts.BOT_MENU_MESSAGE.value.format(
+                    (await bot_pool.get_bot(custom_bot.token).get_me()).username
+                ),
                 reply_markup=await InlineBotMenuKeyboard.get_keyboard(custom_bot.bot_id, message.from_user.id),
             )
         else:
@@ -309,7 +313,7 @@ async def approve_pay_callback(query: CallbackQuery):
 
     if user_bots:
         bot_id = user_bots[0].bot_id
-        custom_bot = Bot(user_bots[0].token)
+        custom_bot = bot_pool.get_bot(user_bots[0].token)
         user_bot_data = await custom_bot.get_me()
 
         await bot.send_message(
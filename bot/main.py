@@ -7,22 +7,28 @@ from aiogram.types import BotCommand, BotCommandScopeChatAdministrators, BotComm
 from aiogram.exceptions import TelegramBadRequest
 
 from bot.stoke.stoke import Stoke
+from bot.post_message.mailing_engine import cancel_mailing
 
 from common_utils.config import main_telegram_bot_settings, database_settings, common_settings
 from common_utils.start_message import send_start_message_to_admins
-from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.factory import create_fsm_storage, with_fsm_cache, create_fsm_sweeper
 from common_utils.scheduler.scheduler import Scheduler
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.cache_json.cache_json import JsonStore
 from common_utils.subscription.subscription import Subscription
+from common_utils.bot_pool import bot_pool
+from common_utils.middlewaries.log_context_middleware import LogContextMiddleware
 
-from database.config import db_engine
+from database.config import db_engine, bot_registry
+from database.models.post_message_model import POST_MESSAGE_CANCELS_CHANNEL
 
 from logs.config import logger
 
 bot = Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES)
-storage = AlchemyStorageAsync(database_settings.SQLALCHEMY_URL, database_settings.STORAGE_TABLE_NAME)
+storage = with_fsm_cache(create_fsm_storage(database_settings.SQLALCHEMY_URL, database_settings.STORAGE_TABLE_NAME))
+storage_sweeper = create_fsm_sweeper(storage)
 dp = Dispatcher(storage=storage)
+dp.update.outer_middleware(LogContextMiddleware())
 
 stock_manager = Stoke(db_engine)
 
@@ -112,13 +118,29 @@ async def on_start():
         logger.warning(f"Error while setting command to chat_id = {common_settings.ADMIN_GROUP_ID}", exc_info=e)
 
     await db_engine.connect()
+    # the mailings are stopped at once even if they are cancelled by another process
+    bot_registry.add_notification_listener(POST_MESSAGE_CANCELS_CHANNEL, lambda payload: cancel_mailing(int(payload)))
+    await bot_registry.start_listening()
     await setup_storage_and_schedulers()
+    if storage_sweeper is not None:
+        storage_sweeper.start()
+
+    from bot.handlers.mailing_settings_handlers import resume_mailings  # the handlers import this module
+
+    await resume_mailings()
 
     logger.info("onStart finished. Bot online")
 
     await send_start_message_to_admins(bot=bot, admins=common_settings.TECH_ADMINS, msg_text="Main Bot started!")
 
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if storage_sweeper is not None:
+            await storage_sweeper.stop()
+        await storage.close()
+        await bot_pool.close()
+        await db_engine.close()
 
 
 if __name__ == "__main__":
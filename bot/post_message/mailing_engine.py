@@ -0,0 +1,224 @@
+import time
+import asyncio
+
+from dataclasses import dataclass, field
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from common_utils.rate_limiter import RateLimiter
+
+from logs.config import logger, extra_params
+
+
+@dataclass
+class MailingResult:
+    sent: int = 0
+    failed: int = 0
+    banned_user_ids: list[int] = field(default_factory=list)  # the users that blocked the bot
+    is_cancelled: bool = False
+
+
+@dataclass
+class MailingCheckpoint:
+    cursor: int  # the last user_id taken by the mailing, the users up to it are never sent to again
+    sent: int
+    failed: int
+    new_banned_user_ids: list[int]  # banned since the previous checkpoint
+
+
+class Mailing:
+    """
+    Sends one post message to many users: a few senders share the token bucket of the bot.
+
+    The users are taken in chunks of checkpoint_every in the user_id order, the checkpoint is saved before every chunk
+    is sent, so after a restart the mailing is resumed from the cursor and nobody gets the message twice (the users
+    of the chunk interrupted by the restart are skipped). The mailing is stopped by cancel() (cancel_mailing is also
+    called by the NOTIFY of the post message deleted by another process) or when save_checkpoint reports that
+    the post message is no longer running (the notification was missed)
+    """
+
+    RETRY_AFTER_ATTEMPTS = 3  # sends of one user retried after the flood control
+
+    def __init__(
+        self,
+        post_message_id: int,
+        bot_id: int,
+        send: Callable[[int], Awaitable[None]],
+        save_checkpoint: Callable[[MailingCheckpoint], Awaitable[bool]],
+        rate_limiter: RateLimiter,
+        concurrency: int,
+        checkpoint_every: int,
+        messages_per_send: int = 1,
+        result: MailingResult | None = None,
+    ) -> None:
+        """
+        :param send: sends the post message to the user_id
+        :param save_checkpoint: saves the checkpoint, returns False if the mailing should be stopped
+        :param rate_limiter: token bucket of the bot, is shared by all its mailings
+        :param concurrency: sends in flight at the same time
+        :param checkpoint_every: users in one chunk between the checkpoints
+        :param messages_per_send: telegram counts every item of the media group as a message
+        :param result: the counts saved before the restart of the resumed mailing
+        """
+        self.post_message_id = post_message_id
+        self.bot_id = bot_id
+        self.send = send
+        self.save_checkpoint = save_checkpoint
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.checkpoint_every = checkpoint_every
+        self.messages_per_send = messages_per_send
+
+        self.result = result or MailingResult()
+
+        self._is_cancelled = False
+        self._checkpoint_banned = len(self.result.banned_user_ids)  # banned users already saved by the checkpoints
+
+    def cancel(self) -> None:
+        self._is_cancelled = True
+        self.result.is_cancelled = True
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    async def run(self, user_ids: Iterable[int] | AsyncIterable[list[int]]) -> MailingResult:
+        """
+        :param user_ids: ascending user_id of the recipients after the cursor of the last checkpoint or the batches of
+            them streamed from the database
+        """
+        started_at = time.perf_counter()
+        is_first_chunk = True
+        cursor = None
+
+        async for chunk in self._iter_chunks(user_ids):
+            if self._is_cancelled:
+                break
+
+            cursor = chunk[-1]
+            if not await self._save_checkpoint(cursor):
+                self.cancel()
+                break
+
+            chunk_user_ids = iter(chunk)
+            if is_first_chunk:  # the first send uploads the media files and remembers their file_id for the rest
+                await self._send_to_user(next(chunk_user_ids))
+                is_first_chunk = False
+            await asyncio.gather(*[self._sender(chunk_user_ids) for _ in range(self.concurrency)])
+
+        if cursor is not None and not self._is_cancelled:  # the counts of the last chunk
+            await self._save_checkpoint(cursor)
+
+        logger.info(
+            f"post_message_id={self.post_message_id}: mailing is {'cancelled' if self._is_cancelled else 'finished'} "
+            f"in {time.perf_counter() - started_at:.1f}s, sent={self.result.sent}, failed={self.result.failed}, "
+            f"banned={len(self.result.banned_user_ids)}",
+            extra=extra_params(post_message_id=self.post_message_id, bot_id=self.bot_id),
+        )
+        return self.result
+
+    async def _iter_chunks(self, user_ids: Iterable[int] | AsyncIterable[list[int]]) -> AsyncIterator[list[int]]:
+        """Regroups the recipients into the chunks of checkpoint_every users, the batches are fetched one at a time"""
+        if not isinstance(user_ids, AsyncIterable):
+            user_ids = _as_batches(user_ids)
+
+        chunk = []
+        async for batch in user_ids:
+            for user_id in batch:
+                chunk.append(user_id)
+                if len(chunk) == self.checkpoint_every:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    async def _sender(self, user_ids: Iterable[int]) -> None:
+        for user_id in user_ids:  # the iterator is shared, so every user is taken by one sender
+            if self._is_cancelled:
+                return
+            await self._send_to_user(user_id)
+
+    async def _save_checkpoint(self, cursor: int) -> bool:
+        new_banned_user_ids = self.result.banned_user_ids[self._checkpoint_banned :]
+        is_running = await self.save_checkpoint(
+            MailingCheckpoint(
+                cursor=cursor,
+                sent=self.result.sent,
+                failed=self.result.failed,
+                new_banned_user_ids=new_banned_user_ids,
+            )
+        )
+        self._checkpoint_banned += len(new_banned_user_ids)
+        return is_running
+
+    async def _send_to_user(self, user_id: int) -> None:
+        for attempt in range(1, self.RETRY_AFTER_ATTEMPTS + 1):
+            await self.rate_limiter.acquire(self.messages_per_send)
+            try:
+                await self.send(user_id)
+                self.result.sent += 1
+                return
+            except TelegramForbiddenError:
+                self.result.banned_user_ids.append(user_id)
+                logger.info(
+                    f"post_message_id={self.post_message_id}: user_id={user_id} banned bot_id={self.bot_id}",
+                    extra=extra_params(post_message_id=self.post_message_id, user_id=user_id, bot_id=self.bot_id),
+                )
+                return
+            except TelegramRetryAfter as e:
+                if attempt == self.RETRY_AFTER_ATTEMPTS:
+                    break
+                logger.warning(
+                    f"post_message_id={self.post_message_id}: flood control, retrying in {e.retry_after}s",
+                    extra=extra_params(post_message_id=self.post_message_id, bot_id=self.bot_id),
+                )
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.warning(
+                    f"post_message_id={self.post_message_id}: failed to send to user_id={user_id}",
+                    extra=extra_params(post_message_id=self.post_message_id, user_id=user_id, bot_id=self.bot_id),
+                    exc_info=e,
+                )
+                break
+
+        self.result.failed += 1
+
+
+async def _as_batches(user_ids: Iterable[int]) -> AsyncIterator[list[int]]:
+    yield list(user_ids)
+
+
+_running_mailings: dict[int, Mailing] = {}  # post_message_id -> mailing running in this process
+_rate_limiters: dict[int, RateLimiter] = {}  # bot_id -> token bucket of the bot
+
+
+def get_bot_rate_limiter(bot_id: int, rate: float, burst: int) -> RateLimiter:
+    """:return: the token bucket shared by all the mailings of the bot in this process"""
+    if bot_id not in _rate_limiters:
+        _rate_limiters[bot_id] = RateLimiter(rate=rate, burst=burst)
+    return _rate_limiters[bot_id]
+
+
+async def run_mailing(mailing: Mailing, user_ids: Iterable[int] | AsyncIterable[list[int]]) -> MailingResult:
+    """Runs the mailing so that cancel_mailing can stop it"""
+    _running_mailings[mailing.post_message_id] = mailing
+    try:
+        return await mailing.run(user_ids)
+    finally:
+        del _running_mailings[mailing.post_message_id]
+
+
+def cancel_mailing(post_message_id: int) -> MailingResult | None:
+    """
+    Stops the mailing immediately if it is running in this process.
+    Is called by the cancel handler and by the POST_MESSAGE_CANCELS_CHANNEL notifications from the other processes
+
+    :return: the result so far or None if the mailing is not running here
+    """
+    mailing = _running_mailings.get(post_message_id)
+    if mailing is None:
+        return None
+
+    mailing.cancel()
+    return mailing.result
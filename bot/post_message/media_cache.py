@@ -0,0 +1,205 @@
+import os
+import asyncio
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiogram import Bot
+from aiogram.types import Message, BufferedInputFile
+from aiogram.exceptions import TelegramAPIError
+
+from bot.main import bot
+
+from common_utils.config import common_settings, main_telegram_bot_settings
+
+from database.config import post_message_media_file_db, bot_media_file_db
+from database.models.post_message_media_files import PostMessageMediaFileSchema
+
+from logs.config import logger, extra_params
+
+
+MEDIA_CACHE_PATH = common_settings.FILES_PATH + "media_cache/"  # files downloaded from the main bot by file_unique_id
+
+# (bot_id, file_unique_id) -> lock of the upload and the number of its holders and waiters, is dropped when unused
+_upload_locks: dict[tuple[int, str], tuple[asyncio.Lock, int]] = {}
+
+
+async def fill_cached_file_ids(bot_id: int, media_files: list[PostMessageMediaFileSchema]) -> None:
+    """Sets file_id_custom_bot of the media files already uploaded through the custom bot by any feature"""
+    not_uploaded = [media_file for media_file in media_files if media_file.file_id_custom_bot is None]
+    if not not_uploaded:
+        return
+
+    file_unique_ids = [await _get_file_unique_id(media_file) for media_file in not_uploaded]
+    file_ids = await bot_media_file_db.get_file_ids(bot_id, file_unique_ids)
+    for media_file in not_uploaded:
+        if media_file.file_unique_id in file_ids:
+            media_file.file_id_custom_bot = file_ids[media_file.file_unique_id]
+            await post_message_media_file_db.update_media_file(media_file)
+
+
+async def read_media_file(media_file: PostMessageMediaFileSchema) -> BufferedInputFile:
+    """
+    :return: the file downloaded from the main bot, is kept on the disk so every asset is downloaded once.
+        The least recently used files are deleted above MEDIA_CACHE_MAX_SIZE
+    """
+    cache_path = MEDIA_CACHE_PATH + await _get_file_unique_id(media_file)
+    try:
+        file_bytes = await asyncio.to_thread(_read_bytes, cache_path)
+    except FileNotFoundError:  # not downloaded yet or already evicted
+        file_bytes = (await bot.download_file(file_path=media_file.file_path)).read()
+        await asyncio.to_thread(_write_bytes, cache_path, file_bytes)
+        await asyncio.to_thread(_evict_files, MEDIA_CACHE_PATH, main_telegram_bot_settings.MEDIA_CACHE_MAX_SIZE)
+
+    return BufferedInputFile(file=file_bytes, filename=media_file.file_path)
+
+
+async def remember_file_ids(
+    bot_id: int, media_files: list[PostMessageMediaFileSchema], uploaded_messages: list[Message]
+) -> None:
+    """
+    Saves file_id of the media files uploaded through the custom bot to the post message and to the cache of the bot
+
+    :param uploaded_messages: the messages sent with media_files in the same order
+    """
+    file_ids = {}
+    for media_file, uploaded_message in zip(media_files, uploaded_messages):
+        media_file.file_id_custom_bot = get_message_file_id(uploaded_message)
+        file_ids[await _get_file_unique_id(media_file)] = media_file.file_id_custom_bot
+        await post_message_media_file_db.update_media_file(media_file)
+
+    await bot_media_file_db.save_file_ids(bot_id, file_ids)
+
+
+async def prewarm_media_files(
+    custom_bot: Bot, bot_id: int, media_files: list[PostMessageMediaFileSchema], chat_id: int
+) -> None:
+    """
+    Uploads the media files the custom bot does not have yet before the post message is sent, so the sends only
+    reference file_id. Every file is uploaded by the message to chat_id that is deleted right away.
+    The files failed to upload are uploaded by the first send of the post message
+
+    :param chat_id: the chat the custom bot can write to, usually its owner
+    """
+    await fill_cached_file_ids(bot_id, media_files)
+
+    for media_file in media_files:
+        if media_file.file_id_custom_bot is not None:
+            continue
+
+        async with _upload_lock(bot_id, media_file.file_unique_id):
+            await fill_cached_file_ids(bot_id, [media_file])  # could be uploaded while the lock was awaited
+            if media_file.file_id_custom_bot is not None:
+                continue
+
+            try:
+                uploaded_message = await _upload(custom_bot, chat_id, media_file)
+            except TelegramAPIError as e:
+                logger.warning(
+                    f"bot_id={bot_id}: failed to prewarm media file {media_file.file_unique_id}",
+                    extra=extra_params(bot_id=bot_id, post_message_id=media_file.post_message_id),
+                    exc_info=e,
+                )
+                continue
+
+            await remember_file_ids(bot_id, [media_file], [uploaded_message])
+            try:
+                await uploaded_message.delete()
+            except TelegramAPIError:
+                pass
+
+        logger.info(
+            f"bot_id={bot_id}: media file {media_file.file_unique_id} is uploaded before the send",
+            extra=extra_params(bot_id=bot_id, post_message_id=media_file.post_message_id),
+        )
+
+
+def get_message_file_id(message: Message) -> str:
+    """
+    :return: file_id of the media file of the message
+
+    :raises Exception: the message has no supported media file
+    """
+    if message.photo:
+        return message.photo[-1].file_id
+    elif message.video:
+        return message.video.file_id
+    elif message.audio:
+        return message.audio.file_id
+    elif message.document:
+        return message.document.file_id
+    raise Exception("unsupported type")
+
+
+async def _get_file_unique_id(media_file: PostMessageMediaFileSchema) -> str:
+    """The media files saved before file_unique_id was stored get it from telegram once"""
+    if media_file.file_unique_id is None:
+        media_file.file_unique_id = (await bot.get_file(media_file.file_id_main_bot)).file_unique_id
+        await post_message_media_file_db.update_media_file(media_file)
+    return media_file.file_unique_id
+
+
+@asynccontextmanager
+async def _upload_lock(bot_id: int, file_unique_id: str) -> AsyncIterator[None]:
+    """Lets only one mailing of the bot upload the file at a time"""
+    key = (bot_id, file_unique_id)
+    lock, users = _upload_locks.get(key, (asyncio.Lock(), 0))
+    _upload_locks[key] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _upload_locks[key]
+        if users == 1:
+            del _upload_locks[key]
+        else:
+            _upload_locks[key] = (lock, users - 1)
+
+
+async def _upload(custom_bot: Bot, chat_id: int, media_file: PostMessageMediaFileSchema) -> Message:
+    file = await read_media_file(media_file)
+    match media_file.media_type:
+        case "photo":
+            return await custom_bot.send_photo(chat_id, file, disable_notification=True)
+        case "video":
+            return await custom_bot.send_video(chat_id, file, disable_notification=True)
+        case "audio":
+            return await custom_bot.send_audio(chat_id, file, disable_notification=True)
+        case "document":
+            return await custom_bot.send_document(chat_id, file, disable_notification=True)
+        case _:
+            raise Exception("Unexpected type")
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as file:
+        file_bytes = file.read()
+    os.utime(path)  # the modification time is the last use for the eviction
+    return file_bytes
+
+
+def _write_bytes(path: str, file_bytes: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(file_bytes)
+    os.replace(tmp_path, path)  # the readers never see the partially written file
+
+
+def _evict_files(dir_path: str, max_size: int) -> None:
+    """Deletes the least recently used files of the directory until their total size is not above max_size"""
+    files = []
+    for entry in os.scandir(dir_path):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # is evicted by another process
+            pass
+        total_size -= size
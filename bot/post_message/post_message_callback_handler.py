@@ -1,4 +1,3 @@
-from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.types import CallbackQuery, FSInputFile
 from aiogram.fsm.context import FSMContext
@@ -19,9 +18,11 @@ from bot.keyboards.post_message_keyboards import (
     InlinePostMessageStartConfirmKeyboard,
 )
 from bot.post_message.post_message_editors import send_post_message, pre_finish_contest, PostActionType
+from bot.post_message.mailing_engine import cancel_mailing
 
 from common_utils.config import custom_telegram_bot_settings
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
+from common_utils.bot_pool import bot_pool
 
 from database.config import custom_bot_user_db, bot_db, post_message_db, contest_db, post_message_media_file_db
 from database.models.post_message_model import PostMessageSchema, PostMessageType, UnknownPostMessageTypeError
@@ -47,7 +48,7 @@ async def _cancel_send(
     :raises UnknownPostMessageTypeError:
     """
 
-    custom_users_length = len(await custom_bot_user_db.get_custom_bot_users(bot_id=post_message.bot_id))
+    custom_users_length = await custom_bot_user_db.count_custom_bot_users(bot_id=post_message.bot_id)
 
     post_message.is_running = False
 
@@ -66,10 +67,13 @@ async def _cancel_send(
 
     custom_bot = await bot_db.get_bot(post_message.bot_id)
     custom_bot_token = custom_bot.token
-    custom_bot_username = (await Bot(custom_bot_token).get_me()).username
+    custom_bot_username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
 
     match post_message_type:
         case PostMessageType.MAILING:
+            mailing_result = cancel_mailing(post_message.post_message_id)
+            if mailing_result is not None:  # the progress in the database is saved only every few messages
+                post_message.sent_post_message_amount = mailing_result.sent
             await post_message_db.delete_post_message(post_message.post_message_id)
             await query.message.answer(
                 f"Рассылка остановлена\nСообщений разослано - "
@@ -84,7 +88,7 @@ async def _cancel_send(
         case PostMessageType.CHANNEL_POST:
             await post_message_db.delete_post_message(post_message.post_message_id)
 
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
             await query.message.answer("Отправка записи отменена", reply_markup=ReplyBotMenuKeyboard.get_keyboard())
             await query.message.edit_text(
                 MessageTexts.BOT_CHANNEL_MENU_MESSAGE.value.format(username, custom_bot_username),
@@ -93,7 +97,7 @@ async def _cancel_send(
             )
         case PostMessageType.CONTEST:
             contest = await contest_db.get_contest_by_bot_id(bot_id=post_message.bot_id)
-            contest_users = await contest_db.get_contest_users(contest.contest_id)
+            contest_users_count = await contest_db.count_contest_users(contest.contest_id)
             contest.is_finished = True
             path_to_graph = await generate_contest_users_graph(contest.contest_id)
             if contest.finish_job_id:
@@ -102,7 +106,7 @@ async def _cancel_send(
                 except:  # noqa
                     pass
 
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
 
             if contest_pre_finish:
                 await bot.send_message(custom_bot.created_by, "Досрочно завершаю конкурс...")
@@ -116,7 +120,7 @@ async def _cancel_send(
                 parse_mode=ParseMode.HTML,
             )
 
-            if contest_users:
+            if contest_users_count:
                 await query.message.answer_photo(
                     FSInputFile(path_to_graph), caption="📈 График количества участников конкурса от времени"
                 )
@@ -134,13 +138,13 @@ async def _button_add(
     :raises _ContestMessageDoesNotNeedButtonError:
     """
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
-    custom_bot = Bot(custom_bot_token)
+    custom_bot = bot_pool.get_bot(custom_bot_token)
 
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -273,9 +277,9 @@ async def _button_delete(
 
         match post_message_type:
             case PostMessageType.MAILING:
-                username = (await Bot(custom_bot_token).get_me()).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
             case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-                username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
             case _:
                 raise UnknownPostMessageTypeError
 
@@ -436,16 +440,16 @@ async def _start(
 
         match post_message_type:
             case PostMessageType.MAILING:
-                username = (await Bot(custom_bot_token).get_me()).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
                 text = MessageTexts.BOT_MAILINGS_MENU_ACCEPT_START.value.format(username)
             case PostMessageType.CHANNEL_POST:
-                username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
                 text = MessageTexts.BOT_CHANNEL_POST_MENU_ACCEPT_START.value.format(username)
             case PostMessageType.CONTEST:
-                username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
                 text = MessageTexts.BOT_CHANNEL_POST_MENU_ACCEPT_START.value.format(username)
             case PostMessageType.PARTNERSHIP_POST:
-                username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
                 text = MessageTexts.BOT_CHANNEL_POST_MENU_ACCEPT_START.value.format(username)
             case _:
                 raise UnknownPostMessageTypeError
@@ -473,9 +477,9 @@ async def _demo(
 
         match post_message_type:
             case PostMessageType.MAILING:
-                username = (await Bot(custom_bot_token).get_me()).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
             case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-                username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
             case _:
                 raise UnknownPostMessageTypeError
 
@@ -504,10 +508,10 @@ async def _delete_post_message(
 
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
             text = MessageTexts.BOT_MAILINGS_MENU_ACCEPT_DELETING_MESSAGE.value.format(username)
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
             text = MessageTexts.BOT_CHANNEL_POST_MENU_ACCEPT_DELETING_MESSAGE.value.format(username)
         case _:
             raise UnknownPostMessageTypeError
@@ -590,7 +594,7 @@ async def _back(
     :raises UnknownPostMessageTypeError:
     """
     bot_id = post_message.bot_id
-    custom_bot_username = (await Bot(query.bot.token).get_me()).username
+    custom_bot_username = (await bot_pool.get_bot(query.bot.token).get_me()).username
 
     match post_message_type:
         case PostMessageType.MAILING:
@@ -602,7 +606,7 @@ async def _back(
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
             custom_bot = await bot_db.get_bot(bot_id)
 
-            username = (await Bot(custom_bot.token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot.token).get_chat(channel_id)).username
             await query.message.edit_text(
                 MessageTexts.BOT_CHANNEL_MENU_MESSAGE.value.format(username, custom_bot_username),
                 reply_markup=await InlineChannelMenuKeyboard.get_keyboard(bot_id, channel_id),
@@ -622,7 +626,7 @@ async def _post_message_mailing(
     match callback_data.a:
         # RUNNING ACTIONS
         case callback_data.ActionEnum.STATISTICS:
-            custom_users_length = len(await custom_bot_user_db.get_custom_bot_users(bot_id=bot_id))
+            custom_users_length = await custom_bot_user_db.count_custom_bot_users(bot_id=bot_id)
 
             await query.answer(
                 text=MessageTexts.show_mailing_info(
@@ -657,8 +661,7 @@ async def _post_message_union(
             match post_message_type:
                 case PostMessageType.CONTEST:
                     contest = await contest_db.get_contest_by_post_message_id(post_message.post_message_id)
-                    contest_users = await contest_db.get_contest_users(contest.contest_id)
-                    if contest_users:
+                    if await contest_db.count_contest_users(contest.contest_id):
                         path = await generate_contest_users_graph(contest.contest_id)
                         await query.message.answer_photo(
                             FSInputFile(path), caption="📈 График количества участников конкурса от времени."
@@ -844,10 +847,10 @@ async def _inline_no_button(
 
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
             text = "В этом рассылочном сообщении кнопки нет"
         case PostMessageType.CHANNEL_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
             text = "В этой записи для канала кнопки нет"
         case PostMessageType.CONTEST:
             raise _ContestMessageDoesNotNeedButtonError
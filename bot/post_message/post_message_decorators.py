@@ -1,4 +1,3 @@
-from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
@@ -12,6 +11,8 @@ from bot.keyboards.post_message_keyboards import (
 )
 from bot.post_message.post_message_utils import get_post_message
 
+from common_utils.bot_pool import bot_pool
+
 from database.config import bot_db
 from database.models.post_message_model import PostMessageNotFoundError, PostMessageType, UnknownPostMessageTypeError
 
@@ -59,11 +60,11 @@ def check_callback_conflicts(func):
         custom_bot_token = (await bot_db.get_bot(bot_id)).token
         match post_message_type:
             case PostMessageType.MAILING:
-                username = (await Bot(custom_bot_token).get_me()).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
             case PostMessageType.CHANNEL_POST:
-                username = (await Bot(custom_bot_token).get_chat(callback_data.channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(callback_data.channel_id)).username
             case PostMessageType.CONTEST:
-                username = (await Bot(custom_bot_token).get_chat(callback_data.channel_id)).username
+                username = (await bot_pool.get_bot(custom_bot_token).get_chat(callback_data.channel_id)).username
             case _:
                 raise UnknownPostMessageTypeError
 
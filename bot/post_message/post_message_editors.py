@@ -11,7 +11,6 @@ from aiogram.types import (
     InputMediaAudio,
     InputMediaVideo,
     InputMediaPhoto,
-    BufferedInputFile,
     InlineKeyboardMarkup,
     InlineKeyboardButton,
 )
@@ -22,6 +21,7 @@ from bot.utils import MessageTexts, excel_utils
 from bot.states import States
 from bot.keyboards.main_menu_keyboards import ReplyBotMenuKeyboard
 from bot.post_message.post_message_utils import get_channel_id_from_state_data
+from bot.post_message.media_cache import fill_cached_file_ids, read_media_file, remember_file_ids
 from bot.keyboards.post_message_keyboards import (
     InlinePostMessageMenuKeyboard,
     ReplyBackPostMessageMenuKeyboard,
@@ -31,6 +31,7 @@ from bot.keyboards.post_message_keyboards import (
 from common_utils.config import custom_telegram_bot_settings
 from common_utils.keyboards.keyboard_utils import make_webapp_info
 from common_utils.keyboards.channel_keyboards import InlineJoinContestKeyboard
+from common_utils.bot_pool import bot_pool
 
 from database.config import post_message_db, post_message_media_file_db, bot_db, contest_db
 from database.models.bot_model import BotSchema
@@ -127,24 +128,28 @@ async def _media_save(message: Message, post_message_id: int, post_message_type:
     if message.photo:
         photo = message.photo[-1]
         file_id = photo.file_id
+        file_unique_id = photo.file_unique_id
         file_path = (await bot.get_file(photo.file_id)).file_path
         media_type = "photo"
         answer_text = f"Фото {photo.file_unique_id} добавлено"
     elif message.video:
         video = message.video
         file_id = video.file_id
+        file_unique_id = video.file_unique_id
         file_path = (await bot.get_file(video.file_id)).file_path
         media_type = "video"
         answer_text = f"Видео {video.file_name} добавлено"
     elif message.audio:
         audio = message.audio
         file_id = audio.file_id
+        file_unique_id = audio.file_unique_id
         file_path = (await bot.get_file(audio.file_id)).file_path
         media_type = "audio"
         answer_text = f"Аудио {audio.file_name} добавлено"
     elif message.document:
         document = message.document
         file_id = document.file_id
+        file_unique_id = document.file_unique_id
         file_path = (await bot.get_file(document.file_id)).file_path
         media_type = "document"
         answer_text = f"Документ {document.file_name} добавлен"
@@ -185,6 +190,7 @@ async def _media_save(message: Message, post_message_id: int, post_message_type:
             {
                 "post_message_id": post_message_id,
                 "file_id_main_bot": file_id,
+                "file_unique_id": file_unique_id,
                 "file_path": file_path,
                 "media_type": media_type,
             }
@@ -254,9 +260,9 @@ async def _button_text_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -361,11 +367,11 @@ async def _winners_count_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case PostMessageType.CONTEST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -396,11 +402,11 @@ async def _message_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case PostMessageType.CONTEST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -555,9 +561,9 @@ async def _contest_finish_date_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -598,9 +604,9 @@ async def _delay_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -683,9 +689,9 @@ async def _button_url_save(
     custom_bot_token = (await bot_db.get_bot(post_message.bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -718,7 +724,7 @@ async def send_post_message(
     :param is_delayed: True if should not send it at one else False
     """
     if isinstance(bot_from_send, BotSchema):
-        bot_from_send = Bot(bot_from_send.token)
+        bot_from_send = bot_pool.get_bot(bot_from_send.token)
 
     if post_message_schema.has_button:
         if (
@@ -744,21 +750,20 @@ async def send_post_message(
     if len(media_files) >= 1:
         is_first_message = False
         media_group = []
+        if post_action_type == PostActionType.RELEASE:
+            # файлы, уже загруженные в кастомного бота любой рассылкой, записью или конкурсом, берем из кэша
+            await fill_cached_file_ids(post_message_schema.bot_id, media_files)
         for media_file in media_files:
             if post_action_type == PostActionType.RELEASE:
                 # мда, ну короче на серверах фотки хранятся только у главного бота, т.к через него админ создавал
                 # рассылки. В кастомных ботах нет того file_id, который есть в главном боте, поэтому, если у нас
-                # file_id_custom_bot == None, значит это первое сообщение из всей рассылки. Поэтому мы скачиваем файл
-                # с серверов главного бота и отправляем это в кастомном, чтобы получить file_id для кастомного и
-                # сохраняем в бд.
+                # file_id_custom_bot == None, значит файл еще ни разу не отправлялся этим ботом. Поэтому мы берем файл
+                # главного бота (с диска или скачиваем) и отправляем это в кастомном, чтобы получить file_id для
+                # кастомного и сохраняем в бд.
                 # При следующей отправки тут уже не будет None
                 if media_file.file_id_custom_bot is None:
                     is_first_message = True
-                    file_path = media_file.file_path
-                    file_bytes = await bot.download_file(
-                        file_path=file_path,
-                    )
-                    file_name = BufferedInputFile(file=file_bytes.read(), filename=file_path)
+                    file_name = await read_media_file(media_file)
                 else:
                     file_name = media_file.file_id_custom_bot
             else:
@@ -815,22 +820,7 @@ async def send_post_message(
                 await message.delete()
 
         if is_first_message:  # первое сообщение, отправленное в рассылке с кастомного бота. Сохраняем file_id в бд
-            for ind in range(len(uploaded_media_files)):
-                new_message = uploaded_media_files[ind]
-                old_message = media_files[ind]
-                if new_message.photo:
-                    file_id = new_message.photo[-1].file_id
-                elif new_message.video:
-                    file_id = new_message.video.file_id
-                elif new_message.audio:
-                    file_id = new_message.audio.file_id
-                elif new_message.document:
-                    file_id = new_message.document.file_id
-                else:
-                    raise Exception("unsupported type")
-
-                old_message.file_id_custom_bot = file_id
-                await post_message_media_file_db.update_media_file(old_message)
+            await remember_file_ids(post_message_schema.bot_id, media_files, uploaded_media_files)
     else:
         if post_message_schema.description is None:
             return
@@ -875,9 +865,9 @@ async def _reply_no_button(
     custom_bot_token = (await bot_db.get_bot(bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
@@ -903,9 +893,9 @@ async def _back_to_post_message_menu(
     custom_bot_token = (await bot_db.get_bot(bot_id)).token
     match post_message_type:
         case PostMessageType.MAILING:
-            username = (await Bot(custom_bot_token).get_me()).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_me()).username
         case PostMessageType.CHANNEL_POST | PostMessageType.CONTEST | PostMessageType.PARTNERSHIP_POST:
-            username = (await Bot(custom_bot_token).get_chat(channel_id)).username
+            username = (await bot_pool.get_bot(custom_bot_token).get_chat(channel_id)).username
         case _:
             raise UnknownPostMessageTypeError
 
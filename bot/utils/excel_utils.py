@@ -1,5 +1,7 @@
 import os
-from typing import List
+import asyncio
+from datetime import timedelta
+from typing import List, Iterator
 from zipfile import ZipFile
 
 from openpyxl import Workbook
@@ -10,16 +12,19 @@ from io import BytesIO
 
 from aiogram import Bot
 from aiogram.types import BufferedInputFile
+from aiogram.exceptions import TelegramAPIError
 
-from common_utils.config import common_settings
+from common_utils.config import common_settings, main_telegram_bot_settings
+from common_utils.bot_pool import bot_pool
 
-from database.config import bot_db, contest_db, category_db, product_db
+from database.config import bot_db, contest_db, category_db, product_db, telegram_username_db
 from database.models.bot_model import BotNotFoundError
 from database.models.category_model import CategoryNotFoundError
 from database.models.contest_model import ContestUserSchema, ContestNotFoundError
 from database.models.product_model import ProductSchema
 
 from bot.main import bot as main_bot
+from bot.post_message.mailing_engine import get_bot_rate_limiter
 
 from logs.config import logger, extra_params
 
@@ -136,6 +141,48 @@ async def send_demo_import_xlsx(bot_id):
     await main_bot.send_document(created_by, document=buffered_file, caption="шаблон.xlsx")
 
 
+async def _resolve_usernames(custom_bot: Bot, bot_id: int, user_ids: List[int]) -> dict[int, str | None]:
+    """
+    Takes the usernames from the persistent cache and resolves the rest by get_chat concurrently, the requests share
+    the token bucket of the bot with its mailings
+
+    :return: user_id -> username, the users failed to resolve are missing
+    """
+    usernames = await telegram_username_db.get_usernames(
+        user_ids, max_age=timedelta(seconds=main_telegram_bot_settings.USERNAME_CACHE_TTL)
+    )
+    rate_limiter = get_bot_rate_limiter(
+        bot_id, main_telegram_bot_settings.MAILING_RATE, main_telegram_bot_settings.MAILING_BURST
+    )
+    resolved = {}
+
+    async def resolver(not_cached_user_ids: Iterator[int]) -> None:
+        for user_id in not_cached_user_ids:  # the iterator is shared, so every user is resolved once
+            await rate_limiter.acquire()
+            try:
+                resolved[user_id] = (await custom_bot.get_chat(user_id)).username
+            except TelegramAPIError as e:
+                logger.warning(
+                    f"bot_id={bot_id}: failed to resolve username of user_id={user_id}",
+                    extra=extra_params(bot_id=bot_id, user_id=user_id),
+                    exc_info=e,
+                )
+
+    not_cached_user_ids = iter([user_id for user_id in user_ids if user_id not in usernames])
+    await asyncio.gather(
+        *[resolver(not_cached_user_ids) for _ in range(main_telegram_bot_settings.MAILING_CONCURRENCY)]
+    )
+
+    if resolved:
+        await telegram_username_db.save_usernames(resolved)
+    logger.info(
+        f"bot_id={bot_id}: resolved {len(resolved)} usernames, {len(usernames)} were cached",
+        extra=extra_params(bot_id=bot_id),
+    )
+
+    return {**usernames, **resolved}
+
+
 async def send_ban_users_xlsx(users_list: List[int], bot_id: int):
     try:
         bot = await bot_db.get_bot(bot_id=bot_id)
@@ -145,15 +192,14 @@ async def send_ban_users_xlsx(users_list: List[int], bot_id: int):
             f"Provided to excel function bot not found bot_id={bot_id}", extra_params(bot_id=bot_id), exc_info=e
         )
         return
-    custom_bot = Bot(token=bot.token)
+    custom_bot = bot_pool.get_bot(bot.token)
+    usernames = await _resolve_usernames(custom_bot, bot_id, users_list)
     wb_data = []
     for user in users_list:
-        chat = await custom_bot.get_chat(user)
-        username = chat.username
         wb_data.append(
             {
                 "user_id": user,
-                "username": username,
+                "username": usernames.get(user),
             }
         )
     buffered_file = _make_xlsx_buffer("banned", wb_data)
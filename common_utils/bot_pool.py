@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+
+from common_utils.config import common_settings
+
+from database.config import bot_registry
+
+from logs.config import logger, extra_params
+
+
+class BotPool:
+    """
+    Process-wide pool of aiogram.Bot objects.
+
+    All the bots share one AiohttpSession with the bounded connector, so keep-alive connections
+    to api.telegram.org are reused instead of opening a new session for every Bot(token).
+    The least recently used bots are evicted when there are more than max_size of them.
+
+    Never close the session of the returned bot, call BotPool.close() at the shutdown instead
+    """
+
+    def __init__(self, max_size: int, connections_limit: int) -> None:
+        self.max_size = max_size
+        self.connections_limit = connections_limit
+
+        self._session: AiohttpSession | None = None
+        self._bots: OrderedDict[tuple[str, int], Bot] = OrderedDict()
+
+        self.evictions = 0
+
+    @property
+    def session(self) -> AiohttpSession:
+        """The shared session, it is created lazily (the connector itself is opened on the first request)"""
+        if self._session is None:
+            self._session = AiohttpSession(limit=self.connections_limit)
+        return self._session
+
+    def get_bot(self, token: str, default: DefaultBotProperties | None = None) -> Bot:
+        """
+        :param token: telegram token of the bot
+        :param default: default properties of the bot, should be a module level constant (like BOT_PROPERTIES)
+            because bots are also keyed by its identity
+        """
+        key = (token, id(default))
+
+        bot = self._bots.get(key)
+        if bot is not None:
+            self._bots.move_to_end(key)
+            return bot
+
+        bot = Bot(token=token, session=self.session, default=default)
+        self._bots[key] = bot
+        if len(self._bots) > self.max_size:
+            self._bots.popitem(last=False)  # the session is shared, so there is nothing to close
+            self.evictions += 1
+
+        return bot
+
+    async def get_bot_by_id(self, bot_id: int, default: DefaultBotProperties | None = None) -> Bot:
+        """
+        :raises BotNotFoundError:
+        """
+        custom_bot = await bot_registry.get_bot(bot_id)
+        return self.get_bot(custom_bot.token, default)
+
+    async def close(self) -> None:
+        """Closes the shared session. Should be called only once at the shutdown of the process"""
+        self._bots.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        logger.debug(f"BotPool is closed, evictions={self.evictions}", extra=extra_params(evictions=self.evictions))
+
+
+bot_pool = BotPool(
+    max_size=common_settings.BOT_POOL_MAX_SIZE, connections_limit=common_settings.BOT_POOL_CONNECTIONS_LIMIT
+)
@@ -6,11 +6,12 @@ from aiogram.utils.formatting import Text, Bold, Pre, Italic
 
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.config import common_settings, main_telegram_bot_settings
+from common_utils.bot_pool import bot_pool
 
 from logs.config import logger
 
 
-main_bot = Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES)
+main_bot = bot_pool.get_bot(main_telegram_bot_settings.TELEGRAM_TOKEN, BOT_PROPERTIES)
 
 
 class UnknownEventTypeError(Exception):
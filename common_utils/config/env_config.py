@@ -10,6 +10,11 @@ class Mode(Enum):
     TEST = "TEST"
 
 
+class FsmStorageBackend(Enum):
+    POSTGRES = "POSTGRES"
+    REDIS = "REDIS"
+
+
 class Settings(BaseSettings):
     """Base Settings class for other Settings"""
 
@@ -48,6 +53,9 @@ class CommonSettings(Settings):
     ADMIN_GROUP_ID: str
     ADMIN_BUGS_GROUP_ID: str
 
+    BOT_POOL_MAX_SIZE: int = 1000  # aiogram.Bot objects kept by BotPool, the least recently used are evicted
+    BOT_POOL_CONNECTIONS_LIMIT: int = 100  # simultaneous connections of the shared session to api.telegram.org
+
     @computed_field
     def RESOURCES_PATH(self) -> str:  # noqa
         return self.PROJECT_ROOT + "resources/{}"
@@ -73,6 +81,29 @@ class DatabaseSettings(Settings):
     SUPPORT_BOT_STORAGE_DB_URL: str
     SUPPORT_BOT_STORAGE_TABLE_NAME: str
 
+    DB_POOL_SIZE: int = 10  # connections kept open in the pool
+    DB_POOL_MAX_OVERFLOW: int = 20  # extra connections allowed above DB_POOL_SIZE under load
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection before raising
+    DB_POOL_RECYCLE: int = 1800  # seconds after which a connection is reopened
+    DB_POOL_PRE_PING: bool = True  # checks the connection is alive on every checkout
+
+    FSM_STORAGE_BACKEND: FsmStorageBackend = FsmStorageBackend.POSTGRES  # POSTGRES or REDIS
+    FSM_REDIS_URL: str = "redis://localhost:6379/0"
+    FSM_REDIS_TTL: int | None = 30 * 24 * 3600  # seconds the FSM user is kept in Redis after the last write
+
+    FSM_DEFAULT_TTL: int = 30 * 24 * 3600  # seconds the not touched FSM user is kept in the SQL storage
+    FSM_STATE_TTLS: dict[str, int] = {  # seconds by the full state name or by the state group, override the default
+        "CustomUserStates:WAITING_FOR_QUESTION": 24 * 3600,
+        "CustomUserStates:WAITING_FOR_REVIEW_MARK": 24 * 3600,
+        "CustomUserStates:WAITING_FOR_REVIEW_TEXT": 24 * 3600,
+    }
+    FSM_SWEEP_INTERVAL: float = 600  # seconds between the deletions of the expired FSM users
+    FSM_SWEEP_BATCH_SIZE: int = 500  # expired FSM users deleted by one statement
+
+    FSM_CACHE_SIZE: int = 10000  # users whose FSM state and data are kept in memory (POSTGRES backend)
+    FSM_CACHE_FLUSH_INTERVAL: float = 1  # seconds between the batched writes of the changed FSM users
+    FSM_CACHE_TTL: float = 60  # seconds after which the not changed FSM user is reloaded from the database
+
 
 class MainTelegramBotSettings(Settings):
     """MainTelegramBot settings"""
@@ -84,6 +115,14 @@ class MainTelegramBotSettings(Settings):
     DESTINATION_PHONE_NUMBER: str
     SBP_PAYMENT_URL: str
 
+    MAILING_RATE: float = 25  # messages per second from one custom bot, telegram allows about 30
+    MAILING_BURST: int = 5  # messages (media group items) one custom bot may send at once after a pause
+    MAILING_CONCURRENCY: int = 8  # requests to telegram in flight for one mailing
+    MAILING_CHECKPOINT_EVERY: int = 50  # users between the saves of the mailing checkpoint
+    MAILING_FETCH_BATCH_SIZE: int = 1000  # recipients fetched from the database in one query
+    MEDIA_CACHE_MAX_SIZE: int = 1024**3  # bytes of the downloaded media files kept on the disk, the LRU are deleted
+    USERNAME_CACHE_TTL: int = 7 * 24 * 60 * 60  # seconds the usernames resolved for the reports are reused
+
 
 class CustomTelegramBotSettings(Settings):
     """CustomTelegramBot settings"""
@@ -103,6 +142,20 @@ class CustomTelegramBotSettings(Settings):
     WEBHOOK_SERVER_HOST_TO_REDIRECT: str
     WEBHOOK_SERVER_PORT_TO_REDIRECT: int
 
+    WEBHOOK_BOTS_CACHE_SIZE: int = 1000  # Bot instances kept by the webhook request handler, the LRU are evicted
+    WEBHOOK_BOTS_CACHE_TTL: int = 3600  # seconds a Bot instance may stay unused in the webhook request handler
+
+    UPDATES_MAX_CONCURRENCY: int = 64  # updates of all the bots handled at the same time
+    UPDATES_QUEUE_SIZE_PER_BOT: int = 500  # queued updates of one bot, the webhook answers 429 above it
+    UPDATES_LOW_PRIORITY_QUEUE_SIZE_PER_BOT: int = 100  # queued channel membership updates, dropped above it
+    UPDATES_LOW_PRIORITY_MAX_CONCURRENCY: int = 8  # channel membership updates handled at the same time
+
+    WEBHOOKS_RESTORE_CONCURRENCY: int = 20  # bots whose webhooks are restored at the same time on startup
+    WEBHOOKS_RESTORE_RATE: float = 25  # requests per second to telegram while restoring the webhooks
+
+    MULTIBOT_WORKERS: int = 1  # webhook worker processes, with more than 1 the front router shards the bots
+    MULTIBOT_WORKERS_BASE_PORT: int = 4500  # worker N listens on 127.0.0.1:(MULTIBOT_WORKERS_BASE_PORT + N)
+
 
 class LogsSettings(Settings):
     """Logs settings"""
@@ -111,6 +164,21 @@ class LogsSettings(Settings):
     GRAFANA_URL: str
     FROM: str
 
+    LOG_QUEUE_SIZE: int = 10000  # records waiting for the logging thread, the new ones are dropped above it
+    LOKI_BATCH_SIZE: int = 500  # records in one push to Loki
+    LOKI_FLUSH_INTERVAL: float = 2  # seconds the record waits for the Loki batch at most
+    LOKI_BUFFER_SIZE: int = 10000  # records waiting for the push to Loki, the new ones are dropped above it
+    LOKI_TIMEOUT: float = 5  # seconds of one push to Loki
+    LOKI_LABEL_TAGS: list[str] = ["bot_id"]  # the tags sent as Loki labels, the rest are in the JSON line
+
+    LOG_LEVELS: dict[str, str] = {}  # logger name -> level, DEBUG by default. The disabled records are never formatted
+    LOG_SAMPLE_RATES: dict[str, float] = {}  # logger name -> share of its DEBUG and INFO records that are kept
+    LOG_PAYLOAD_MAX_LENGTH: int = 1000  # characters of one LazyPayload in the log line
+
+    LOG_DEDUP_REDIS_URL: str = "redis://localhost:6379/0"  # the events logged by LogMiddleware are marked here
+    LOG_DEDUP_TTL: int = 2  # seconds the logged event is remembered
+    LOG_FSM_DATA: bool = False  # LogMiddleware fetches the FSM data of the user for every logged event
+
 
 class CryptographySettings(Settings):
     """Cryptography settings"""
@@ -1,7 +1,7 @@
-from aiogram import Bot
 from aiogram.types import WebAppInfo
 
 from common_utils.config import custom_telegram_bot_settings
+from common_utils.bot_pool import bot_pool
 
 from database.config import (
     bot_db,
@@ -51,7 +51,7 @@ def make_product_webapp_info(product_id: int, bot_id: int) -> WebAppInfo:
 
 
 async def get_bot_username(bot_id: int) -> str:
-    custom_bot_username = (await Bot((await bot_db.get_bot(bot_id=bot_id)).token).get_me()).username
+    custom_bot_username = (await (await bot_pool.get_bot_by_id(bot_id)).get_me()).username
     return custom_bot_username
 
 
@@ -60,7 +60,7 @@ async def get_bot_status(bot_id: int) -> str:
 
 
 async def get_bot_channels(bot_id: int) -> list[tuple[ChannelSchema, str]]:
-    custom_bot = Bot((await bot_db.get_bot(bot_id=bot_id)).token)
+    custom_bot = await bot_pool.get_bot_by_id(bot_id)
     return [
         (i, (await custom_bot.get_chat(i.channel_id)).username)
         for i in (await channel_db.get_all_channels(bot_id=bot_id))
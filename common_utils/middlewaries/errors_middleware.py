@@ -9,6 +9,7 @@ from common_utils.config import main_telegram_bot_settings
 from common_utils.message_texts import MessageTexts
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.broadcasting.broadcasting import EventTypes, send_event
+from common_utils.bot_pool import bot_pool
 
 from logs.config import logger
 
@@ -16,15 +17,19 @@ from logs.config import logger
 async def notify_about_error(
     event: CallbackQuery | Message | ChatMemberUpdated | InlineQuery,
     error_message: str,
-    bot: Bot = Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES),
+    bot: Bot | None = None,
 ):
+    """
+    :param bot: the bot that sends the error message to the user (the main bot by default)
+    """
+    bot = bot or bot_pool.get_bot(main_telegram_bot_settings.TELEGRAM_TOKEN, BOT_PROPERTIES)
     await bot.send_message(event.from_user.id, MessageTexts.UNKNOWN_ERROR_MESSAGE.value)
     await send_event(event.from_user, EventTypes.UNKNOWN_ERROR, event.bot, err_msg=error_message)
 
 
 class ErrorMiddleware(BaseMiddleware):
-    def __init__(self, bot: Bot = Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES)) -> None:
-        self.bot = bot
+    def __init__(self, bot: Bot | None = None) -> None:
+        self.bot = bot or bot_pool.get_bot(main_telegram_bot_settings.TELEGRAM_TOKEN, BOT_PROPERTIES)
 
     async def __call__(
         self,
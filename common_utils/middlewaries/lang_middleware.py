@@ -7,6 +7,7 @@ from aiogram.types import CallbackQuery, Message, InlineQuery
 from common_utils.keyboards.keyboards import FirstTimeInlineSelectLanguageKb
 
 from database.enums.language import AVAILABLE_LANGUAGES, UserLanguageValues
+from database.models.bot_model import BotNotFoundError
 from database.models.custom_bot_user_model import CustomBotUserNotFoundError
 from database.config import bot_db, option_db, custom_bot_user_db, pickle_store_db, user_db
 
@@ -29,15 +30,22 @@ class LangCheckMiddleware(BaseMiddleware):
     ) -> Any:
         try:
             if not self.from_main_bot:
-                bot = await bot_db.get_bot_by_token(event.bot.token)
-                bot_options = await option_db.get_option(bot.options_id)
-                langs = bot_options.languages
+                if "custom_bot" in data:  # resolved by TenantContextMiddleware
+                    bot = data["custom_bot"]
+                    if bot is None:
+                        raise BotNotFoundError(bot_token=event.bot.token)
+                    bot_options = data["custom_bot_options"] or await option_db.get_option(bot.options_id)
+                    custom_bot_user = data["custom_bot_user"]
+                else:
+                    bot = await bot_db.get_bot_by_token(event.bot.token)
+                    bot_options = await option_db.get_option(bot.options_id)
+                    try:
+                        custom_bot_user = await custom_bot_user_db.get_custom_bot_user(bot.bot_id, event.from_user.id)
+                    except CustomBotUserNotFoundError:
+                        custom_bot_user = None
 
-                try:
-                    custom_bot_user = await custom_bot_user_db.get_custom_bot_user(bot.bot_id, event.from_user.id)
-                    user_lang = custom_bot_user.user_language
-                except CustomBotUserNotFoundError:
-                    user_lang = None
+                langs = bot_options.languages
+                user_lang = custom_bot_user.user_language if custom_bot_user else None
             else:
                 langs = AVAILABLE_LANGUAGES
                 try:
@@ -83,6 +91,9 @@ class LangCheckMiddleware(BaseMiddleware):
                 del data_to_pickle["fsm_storage"]
                 del data_to_pickle["state"]
                 del data_to_pickle["event_router"]
+                # TenantContextMiddleware resolves them again, BotSchema would store the decrypted token
+                for tenant_key in ("custom_bot", "custom_bot_options", "custom_bot_user"):
+                    data_to_pickle.pop(tenant_key, None)
 
                 to_validate = {}
 
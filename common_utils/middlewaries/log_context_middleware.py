@@ -0,0 +1,23 @@
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update, User
+
+from logs.config import log_context
+
+
+class LogContextMiddleware(BaseMiddleware):
+    """
+    Outer middleware of the dispatcher. Tags all the records logged while the update is handled with update_id and
+    user_id, so the handlers do not pass them to every log call
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        with log_context(update_id=event.update_id, user_id=user.id if user else None):
+            return await handler(event, data)
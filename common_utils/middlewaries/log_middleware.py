@@ -1,34 +1,58 @@
-import redis
+import time
 
 from typing import Callable, Dict, Any, Awaitable
 from logging import Logger
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject, User, InlineQuery, PreCheckoutQuery
 from aiogram.fsm.context import FSMContext
 
+from common_utils.config import logs_settings
+
 from logs.config import extra_params
 
 
-class _MockRedis:
-    """If connect to real Redis is broken"""
+class _LocalTtlSet:
+    """In-process set of the keys expiring after ttl seconds. Is used while Redis is unavailable"""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._expires_at: dict[str, float] = {}  # the ttl is the same for all, so the insertion order is the expiry one
 
-    def get(self, *args, **kwargs) -> None:  # noqa
-        return None
+    def add(self, key: str) -> bool:
+        """:return: True if the key is new, False if it was added less than ttl seconds ago"""
+        now = time.monotonic()
+        while self._expires_at:
+            oldest_key = next(iter(self._expires_at))
+            if self._expires_at[oldest_key] > now:
+                break
+            del self._expires_at[oldest_key]
 
-    def set(self, *args, **kwargs) -> None:
-        pass
+        if key in self._expires_at:
+            return False
+        self._expires_at[key] = now + self.ttl
+        return True
 
 
 class LogMiddleware(BaseMiddleware):
-    def __init__(self, logger: Logger) -> None:
+    """
+    Logs every new event once: the middleware is set on the nested routers, so one event passes it several times.
+    The logged events are marked by one SET NX EX in Redis (shared by all the processes of the bot) or in the
+    in-process set while Redis is unavailable
+    """
+
+    REDIS_RETRY_INTERVAL = 30  # seconds the in-process set is used after the Redis error
+
+    def __init__(self, logger: Logger, redis: Redis | None = None) -> None:
         self.logger = logger
-        try:
-            self.redis = redis.Redis()
-            self.redis.info()
-        except redis.ConnectionError as e:
-            self.redis = _MockRedis()
-            self.logger.warning("Unable to connect to Redis", exc_info=e)
+        self.redis = redis or Redis.from_url(
+            logs_settings.LOG_DEDUP_REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+        )
+        self.local_keys = _LocalTtlSet(logs_settings.LOG_DEDUP_TTL)
+        self._redis_retry_at = 0.0
 
     async def __call__(
         self,
@@ -37,45 +61,52 @@ class LogMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         try:
-            user: User = data["event_from_user"]
-            state: FSMContext = data["state"]
-            raw_state: FSMContext = data["raw_state"]
-
-            state_data = await state.get_data()
-            callback_info = f"New event: user_id={user.id}, @{user.username}, {raw_state}, {state_data}"
-
-            if isinstance(event, Message):
-                if self.redis.get(str(event.message_id)) is None:
-                    self.logger.info(f"{callback_info} has written {event.text}", extra=extra_params(user_id=user.id))
-                    # noinspection PyAsyncCall
-                    self.redis.set(name=str(event.message_id), value="", ex=2)
-            elif isinstance(event, CallbackQuery):
-                if self.redis.get(str(event.id)) is None:
-                    self.logger.info(
-                        f"{callback_info} has sent callback_data {event.data}", extra=extra_params(user_id=user.id)
-                    )
-                    # noinspection PyAsyncCall
-                    self.redis.set(name=str(event.id), value="", ex=2)
-            elif isinstance(event, InlineQuery):
-                if self.redis.get(str(event.id)) is None:
-                    self.logger.info(
-                        f"{callback_info} has sent inline_query {event.query}", extra=extra_params(user_id=user.id)
-                    )
-                    # noinspection PyAsyncCall
-                    self.redis.set(name=str(event.id), value="", ex=2)
-            elif isinstance(event, PreCheckoutQuery):
-                if self.redis.get(str(event.id)) is None:
-                    self.logger.info(
-                        f"{callback_info} has sent pre_checkout_query with payload {event.invoice_payload}",
-                        extra=extra_params(user_id=user.id),
-                    )
-                    # noinspection PyAsyncCall
-                    self.redis.set(name=str(event.id), value="", ex=2)
-            else:
-                self.logger.warning(
-                    f"{callback_info} has sent unexpected event {event}", extra=extra_params(user_id=user.id)
-                )
+            await self._log_event(event, data)
         except Exception as e:
             self.logger.error("New event: logger error", exc_info=e)
 
         return await handler(event, data)
+
+    async def _log_event(self, event: TelegramObject, data: Dict[str, Any]) -> None:
+        user: User = data["event_from_user"]
+
+        if isinstance(event, Message):
+            event_key, action = f"message:{event.chat.id}:{event.message_id}", f"has written {event.text}"
+        elif isinstance(event, CallbackQuery):
+            event_key, action = f"callback_query:{event.id}", f"has sent callback_data {event.data}"
+        elif isinstance(event, InlineQuery):
+            event_key, action = f"inline_query:{event.id}", f"has sent inline_query {event.query}"
+        elif isinstance(event, PreCheckoutQuery):
+            event_key = f"pre_checkout_query:{event.id}"
+            action = f"has sent pre_checkout_query with payload {event.invoice_payload}"
+        else:
+            self.logger.warning(
+                f"{await self._get_event_info(user, data)} has sent unexpected event {event}",
+                extra=extra_params(user_id=user.id),
+            )
+            return
+
+        if await self._is_new_event(f"log_middleware:{data['bot'].id}:{event_key}"):
+            self.logger.info(f"{await self._get_event_info(user, data)} {action}", extra=extra_params(user_id=user.id))
+
+    async def _get_event_info(self, user: User, data: Dict[str, Any]) -> str:
+        """The FSM data is fetched from the storage only with LOG_FSM_DATA"""
+        callback_info = f"New event: user_id={user.id}, @{user.username}, {data['raw_state']}"
+        if not logs_settings.LOG_FSM_DATA:
+            return callback_info
+
+        state: FSMContext = data["state"]
+        return f"{callback_info}, {await state.get_data()}"
+
+    async def _is_new_event(self, key: str) -> bool:
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                return bool(await self.redis.set(key, "", ex=logs_settings.LOG_DEDUP_TTL, nx=True))
+            except (RedisError, OSError) as e:
+                self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_INTERVAL
+                self.logger.warning(
+                    f"Unable to connect to Redis, events are deduplicated in-process for {self.REDIS_RETRY_INTERVAL}s",
+                    exc_info=e,
+                )
+
+        return self.local_keys.add(key)
@@ -4,12 +4,12 @@ import string
 from datetime import datetime
 from typing import Any
 
-from aiogram import Bot
 from aiogram.types import Message
 
 from common_utils.config import main_telegram_bot_settings
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.order_utils.order_type import OrderType, UnknownOrderType
+from common_utils.bot_pool import bot_pool
 
 from database.config import product_db, order_option_db
 from database.models.order_model import OrderSchema, OrderItem, OrderItemExtraOption
@@ -82,7 +82,7 @@ async def _handle_zero_products(event: Message, bot_owner: int, zero_products: l
             case OrderType.MAIN_BOT_TEST_ORDER:
                 msg = await event.answer(text)
             case OrderType.CUSTOM_BOT_ORDER:
-                msg = await Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES).send_message(
+                msg = await bot_pool.get_bot(main_telegram_bot_settings.TELEGRAM_TOKEN, BOT_PROPERTIES).send_message(
                     bot_owner, text
                 )
             case _:
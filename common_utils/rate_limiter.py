@@ -0,0 +1,40 @@
+import time
+import asyncio
+
+
+class RateLimiter:
+    """
+    Asynchronous token bucket: allows rate acquisitions per second on average
+    and up to burst acquisitions at once after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        :param rate: acquisitions per second
+        :param burst: capacity of the bucket
+        """
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()  # the waiters are served in the FIFO order
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """
+        Waits until the next acquisition is allowed
+
+        :param tokens: weight of the acquisition, for example the count of messages in a media group.
+            The weight above burst is charged in full: the acquisition waits until the missing tokens are accrued
+        """
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._tokens = tokens
+                self._updated_at = time.monotonic()
+
+            self._tokens -= tokens
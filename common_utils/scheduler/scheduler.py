@@ -9,7 +9,7 @@ from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from common_utils.config import database_settings
 from common_utils.singleton import singleton
 
-from logs.config import logger, extra_params
+from logs.config import logger, extra_params, LazyPayload
 
 
 @singleton
@@ -26,7 +26,7 @@ class Scheduler:
 
     async def start(self):
         self.scheduler.start()
-        logger.info(f"Scheduler started with previous jobs: {await self.get_jobs()}")
+        logger.info("Scheduler started with previous jobs: %s", LazyPayload(await self.get_jobs()))
 
     async def change_job(self, job, changes):
         logger.debug(f"job_id={job.id}: job changed by {changes}", extra=extra_params(job_id=job.id))
@@ -34,7 +34,7 @@ class Scheduler:
 
     async def get_jobs(self):
         jobs = self.scheduler.get_jobs(jobstore=self.jobstore_alias)
-        logger.debug(f"Scheduler returned {len(jobs)} jobs: {jobs}")
+        logger.debug("Scheduler returned %s jobs: %s", len(jobs), LazyPayload(jobs))
         return jobs
 
     async def get_job(self, job_id: str):
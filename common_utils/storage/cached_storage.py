@@ -0,0 +1,234 @@
+import time
+import copy
+import asyncio
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+from pydantic import BaseModel
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
+
+from common_utils.storage.storage import AlchemyStorageAsync, FsmRecord
+
+from logs.config import logger
+
+
+class FsmCacheMetricsSchema(BaseModel):
+    """Snapshot of the FSM cache usage"""
+
+    cached_keys: int
+    dirty_keys: int  # written to the cache but not flushed to the database yet
+
+    hits: int
+    misses: int
+    evictions: int
+
+    flushes: int
+    flushed_keys: int
+    flush_errors: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0
+
+
+@dataclass
+class _CacheEntry:
+    record: FsmRecord | None  # None is the user without row in the database
+    loaded_at: float
+
+
+class CachedStorage(BaseStorage):
+    """
+    Write-behind FSM storage: the hot users are kept in the bounded LRU in memory, the writes are coalesced by user
+    and flushed to the SQL storage in batches every flush_interval seconds and on close().
+
+    The storage expects to be the only writer of its users, the changes made by other processes directly in the
+    database are seen after the cached entry expires in entry_ttl seconds
+    """
+
+    def __init__(
+        self,
+        storage: AlchemyStorageAsync,
+        max_size: int,
+        flush_interval: float,
+        entry_ttl: float,
+    ) -> None:
+        """
+        :param storage: durable backing store
+        :param max_size: users kept in memory, the least recently used are evicted (after they are flushed)
+        :param flush_interval: seconds between the flushes of the changed users
+        :param entry_ttl: seconds after which the not changed user is reloaded from the database
+        """
+        self.storage = storage
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.entry_ttl = entry_ttl
+
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._dirty: dict[str, FsmRecord | None] = {}  # row id -> the latest record to write
+        self._flushing: dict[str, FsmRecord | None] = {}  # records of the flush in progress
+
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.flushed_keys = 0
+        self.flush_errors = 0
+
+    async def connect(self) -> None:
+        await self.storage.connect()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        if state is None:
+            self._write(key, None)
+            return None
+
+        self._write(key, FsmRecord(state=state.state if isinstance(state, State) else state, data={}))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._read(key)
+        if record is None or record.state in ("None", None):
+            return None
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._read(key)
+        self._write(key, FsmRecord(state=record.state if record else None, data=copy.deepcopy(dict(data))))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._read(key)
+        if record is None or record.state == "None":
+            return {}
+        return copy.deepcopy(record.data)
+
+    async def update_data(self, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
+        record = await self._read(key)
+        merged_data = {**(record.data if record else {}), **copy.deepcopy(dict(data))}
+        self._write(key, FsmRecord(state=record.state if record else None, data=merged_data))
+        return copy.deepcopy(merged_data)
+
+    async def clear_state(self, key: StorageKey) -> None:
+        self._write(key, None)
+
+    async def flush(self) -> None:
+        """Writes all the changed users to the database in one transaction"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            self._flushing, self._dirty = self._dirty, {}
+            try:
+                await self.storage.write_records(self._flushing)
+            except Exception as e:
+                self.flush_errors += 1
+                logger.warning(f"FSM cache failed to flush {len(self._flushing)} keys, retrying later", exc_info=e)
+                self._dirty = {**self._flushing, **self._dirty}  # the newer writes win
+                return
+            finally:
+                flushed, self._flushing = self._flushing, {}
+
+            self.flushes += 1
+            self.flushed_keys += len(flushed)
+            self._evict()
+
+    async def clear_table(self) -> None:
+        """
+        Often used in tests
+        """
+        async with self._flush_lock:
+            self._entries.clear()
+            self._dirty.clear()
+            await self.storage.clear_table()
+
+    def get_metrics(self) -> FsmCacheMetricsSchema:
+        return FsmCacheMetricsSchema(
+            cached_keys=len(self._entries),
+            dirty_keys=len(self._dirty),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            flushes=self.flushes,
+            flushed_keys=self.flushed_keys,
+            flush_errors=self.flush_errors,
+        )
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        await self.flush()
+        await self.storage.close()
+
+        metrics = self.get_metrics()
+        logger.info(
+            f"FSM cache is closed: hit_rate={metrics.hit_rate:.2%}, flushes={metrics.flushes}, "
+            f"flushed_keys={metrics.flushed_keys}, flush_errors={metrics.flush_errors}"
+        )
+
+    async def _read(self, key: StorageKey) -> FsmRecord | None:
+        row_id = self.storage.make_id(key)
+
+        entry = self._entries.get(row_id)
+        is_pending = row_id in self._dirty or row_id in self._flushing
+        if entry is not None and (is_pending or time.monotonic() - entry.loaded_at < self.entry_ttl):
+            self.hits += 1
+            self._entries.move_to_end(row_id)
+            return entry.record
+
+        for pending in (self._dirty, self._flushing):  # the entry could be evicted before it is flushed
+            if row_id in pending:
+                self.hits += 1
+                self._store(row_id, pending[row_id])
+                return pending[row_id]
+
+        self.misses += 1
+        started_at = time.monotonic()
+        record = await self.storage.get_record(key)
+
+        entry = self._entries.get(row_id)
+        if entry is not None and entry.loaded_at >= started_at:
+            return entry.record  # the user was written while it was loading
+        for pending in (self._dirty, self._flushing):
+            if row_id in pending:
+                return pending[row_id]
+
+        self._store(row_id, record)
+        return record
+
+    def _write(self, key: StorageKey, record: FsmRecord | None) -> None:
+        row_id = self.storage.make_id(key)
+        self._dirty[row_id] = record
+        self._store(row_id, record)
+
+    def _store(self, row_id: str, record: FsmRecord | None) -> None:
+        self._entries[row_id] = _CacheEntry(record=record, loaded_at=time.monotonic())
+        self._entries.move_to_end(row_id)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drops the least recently used entries above max_size. The dirty ones are kept until they are flushed"""
+        for row_id in list(self._entries):
+            if len(self._entries) <= self.max_size:
+                break
+            if row_id in self._dirty or row_id in self._flushing:
+                continue
+            del self._entries[row_id]
+            self.evictions += 1
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("FSM cache flush failed", exc_info=e)
@@ -1,6 +1,6 @@
 from common_utils.config import database_settings
-from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.factory import create_fsm_storage
 
-custom_bot_storage = AlchemyStorageAsync(
+custom_bot_storage = create_fsm_storage(
     db_url=database_settings.CUSTOM_BOT_STORAGE_DB_URL, table_name=database_settings.CUSTOM_BOT_STORAGE_TABLE_NAME
 )
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from aiogram.fsm.storage.base import BaseStorage
+
+from common_utils.config import database_settings
+from common_utils.config.env_config import FsmStorageBackend
+from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.redis_storage import RedisStorageAsync
+from common_utils.storage.cached_storage import CachedStorage
+from common_utils.storage.sweeper import FsmStorageSweeper
+
+
+def create_fsm_storage(db_url: str, table_name: str) -> AlchemyStorageAsync | RedisStorageAsync:
+    """
+    :param db_url: is used by the postgres backend
+    :param table_name: is the table of the postgres backend or the key prefix of the redis one
+    :return: the storage of the FSM_STORAGE_BACKEND chosen in database_settings
+    """
+    if database_settings.FSM_STORAGE_BACKEND == FsmStorageBackend.REDIS:
+        return RedisStorageAsync.from_url(
+            database_settings.FSM_REDIS_URL, key_prefix=table_name, state_ttl=database_settings.FSM_REDIS_TTL
+        )
+    return AlchemyStorageAsync(db_url=db_url, table_name=table_name)
+
+
+def with_fsm_cache(storage: AlchemyStorageAsync | RedisStorageAsync) -> BaseStorage:
+    """Puts the in-memory write-behind cache in front of the postgres storage, redis is used as it is"""
+    if isinstance(storage, AlchemyStorageAsync):
+        return CachedStorage(
+            storage,
+            max_size=database_settings.FSM_CACHE_SIZE,
+            flush_interval=database_settings.FSM_CACHE_FLUSH_INTERVAL,
+            entry_ttl=database_settings.FSM_CACHE_TTL,
+        )
+    return storage
+
+
+def create_fsm_sweeper(storage: BaseStorage) -> FsmStorageSweeper | None:
+    """:return: the sweeper of the expired users of the postgres storage, redis expires the keys by itself"""
+    if isinstance(storage, CachedStorage):
+        storage = storage.storage
+    if not isinstance(storage, AlchemyStorageAsync):
+        return None
+
+    return FsmStorageSweeper(
+        storage,
+        default_ttl=timedelta(seconds=database_settings.FSM_DEFAULT_TTL),
+        state_ttls={state: timedelta(seconds=ttl) for state, ttl in database_settings.FSM_STATE_TTLS.items()},
+        interval=database_settings.FSM_SWEEP_INTERVAL,
+        batch_size=database_settings.FSM_SWEEP_BATCH_SIZE,
+    )
@@ -0,0 +1,113 @@
+import json
+
+from typing import Optional, Dict, Any
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
+
+from logs.config import logger
+
+
+class RedisStorageAsync(BaseStorage):
+    """
+    FSM storage in Redis with the same behaviour as AlchemyStorageAsync.
+    Every user is a hash {"state": ..., "data": <json>} that expires state_ttl seconds after the last write
+    """
+
+    STATE_FIELD = "state"
+    DATA_FIELD = "data"
+
+    def __init__(self, redis: Redis, key_prefix: str, state_ttl: int | None = None) -> None:
+        """
+        :param redis: client created with decode_responses=True
+        :param key_prefix: separates the storages in the same Redis database, usually the table name of SQL storage
+        :param state_ttl: seconds the user is kept after the last write, None is forever
+        """
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.state_ttl = state_ttl
+
+    @classmethod
+    def from_url(cls, redis_url: str, key_prefix: str, state_ttl: int | None = None) -> "RedisStorageAsync":
+        return cls(Redis.from_url(redis_url, decode_responses=True), key_prefix, state_ttl)
+
+    def make_id(self, key: StorageKey) -> str:
+        """:return: the key of the hash of the user, the same for all the bots"""
+        return f"{self.key_prefix}:{key.user_id}#{abs(key.chat_id)}"
+
+    async def connect(self) -> None:
+        await self.redis.ping()
+        logger.info("storage redis connected.")
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Sets the state and resets the data of the user, the None state deletes both"""
+        if state is None:
+            await self.clear_state(key)
+            return None
+
+        state = state.state if isinstance(state, State) else state
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.make_id(key), mapping={self.STATE_FIELD: state, self.DATA_FIELD: "{}"})
+            self._expire(pipe, key)
+            await pipe.execute()
+        logger.debug(f"set state for user {key.user_id} in chat {key.chat_id} to state {state}.")
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state = await self.redis.hget(self.make_id(key), self.STATE_FIELD)
+        if state in ("None", None):
+            return None
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.make_id(key), self.DATA_FIELD, json.dumps(dict(data)))
+            self._expire(pipe, key)
+            await pipe.execute()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        state, raw_data = await self.redis.hmget(self.make_id(key), [self.STATE_FIELD, self.DATA_FIELD])
+        if raw_data is None or state == "None":
+            return {}
+        return json.loads(raw_data)
+
+    async def update_data(self, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merges the data into the stored one, is retried if the user is changed concurrently"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.make_id(key))
+                    raw_data = await pipe.hget(self.make_id(key), self.DATA_FIELD)
+                    merged_data = {**(json.loads(raw_data) if raw_data is not None else {}), **data}
+
+                    pipe.multi()
+                    pipe.hset(self.make_id(key), self.DATA_FIELD, json.dumps(merged_data))
+                    self._expire(pipe, key)
+                    await pipe.execute()
+                    return merged_data
+                except WatchError:
+                    continue
+
+    async def clear_state(self, key: StorageKey) -> None:
+        await self.redis.delete(self.make_id(key))
+        logger.debug(f"cleared state for user {key.user_id} in chat {key.chat_id}.")
+        return None
+
+    async def clear_table(self) -> None:
+        """
+        Often used in tests
+        """
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.key_prefix}:*")]
+        if keys:
+            await self.redis.delete(*keys)
+
+        logger.debug(f"Keys {self.key_prefix}:* have been cleared")
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    def _expire(self, pipe, key: StorageKey) -> None:
+        if self.state_ttl is not None:
+            pipe.expire(self.make_id(key), self.state_ttl)
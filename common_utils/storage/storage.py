@@ -1,17 +1,39 @@
 from abc import ABC
-from typing import Optional, Dict, Any
+from datetime import timedelta
+from typing import Optional, Dict, Any, NamedTuple
 
-from sqlalchemy import MetaData
-from sqlalchemy import Table, Column, String, JSON
-from sqlalchemy import select, insert, delete, update
+from sqlalchemy import MetaData, NullPool
+from sqlalchemy import Table, Column, String, JSON, DateTime, Interval
+from sqlalchemy import select, delete, cast, func, literal, case
+from sqlalchemy.dialects.postgresql import insert, JSONB
 from sqlalchemy.ext.asyncio import create_async_engine
 
+from aiogram.fsm.state import State
 from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
 
+from common_utils.config import database_settings
+from common_utils.config.env_config import Mode
+
+from database.models.pool import MeasuredAsyncQueuePool
+
 from logs.config import logger
 
 
+class FsmRecord(NamedTuple):
+    """Row of the storage table"""
+
+    state: str | None
+    data: Dict[str, Any]
+
+
 class AlchemyStorageAsync(BaseStorage, ABC):
+    """
+    FSM storage in the Postgres table. Every operation is a single statement, so a state transition costs
+    one round trip and concurrent updates of the same user can not overwrite each other
+    """
+
+    WRITE_BATCH_SIZE = 1000  # rows in one INSERT of write_records, asyncpg allows 32767 parameters per statement
+
     def __init__(self, db_url: str, table_name: str):
         self.table_name = table_name
         self.db_url = db_url
@@ -22,98 +44,188 @@ class AlchemyStorageAsync(BaseStorage, ABC):
             Column("id", String(70), primary_key=True),  # user_id#chat_id  example: 11111111#22222222
             Column("state", String(55)),
             Column("data", JSON),
+            # is updated on every write, the rows not touched longer than the TTL of their state are deleted
+            Column("last_touched", DateTime(timezone=True), nullable=False, server_default=func.now(), index=True),
         )
-        self.engine = create_async_engine(f"{db_url}")
+        if database_settings.MODE == Mode.TEST:
+            self.engine = create_async_engine(f"{db_url}", poolclass=NullPool)
+        else:
+            self.engine = create_async_engine(
+                f"{db_url}",
+                poolclass=MeasuredAsyncQueuePool,
+                pool_size=database_settings.DB_POOL_SIZE,
+                max_overflow=database_settings.DB_POOL_MAX_OVERFLOW,
+                pool_timeout=database_settings.DB_POOL_TIMEOUT,
+                pool_recycle=database_settings.DB_POOL_RECYCLE,
+                pool_pre_ping=database_settings.DB_POOL_PRE_PING,
+            )
+
+    @staticmethod
+    def make_id(key: StorageKey) -> str:
+        """:return: the id of the row of the user, the same for all the bots"""
+        return f"{key.user_id}#{abs(key.chat_id)}"
 
     async def connect(self) -> None:
         async with self.engine.begin() as conn:
             await conn.run_sync(self.metadata.create_all)
-        await self.engine.dispose()
         logger.info("storage db connected.")
 
     async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Sets the state and resets the data of the user, the None state deletes both"""
         if state is None:
             await self.clear_state(key)
             return None
-        if await self.get_state(key):
-            async with self.engine.begin() as conn:
-                await conn.execute(
-                    update(self.storage_table)
-                    .where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
-                    .values(state=state.state, data={})
-                )
-            await self.engine.dispose()
-            logger.debug(f"updated state for user {key.user_id} in chat {key.chat_id} to state {state.state}.")
-            return None
+
+        state = state.state if isinstance(state, State) else state
+        statement = insert(self.storage_table).values(id=self.make_id(key), state=state, data={})
         async with self.engine.begin() as conn:
             await conn.execute(
-                insert(self.storage_table).values(id=f"{key.user_id}#{abs(key.chat_id)}", state=state.state, data={})
+                statement.on_conflict_do_update(
+                    index_elements=[self.storage_table.c.id],
+                    set_={
+                        "state": statement.excluded.state,
+                        "data": statement.excluded.data,
+                        "last_touched": func.now(),
+                    },
+                )
             )
-        await self.engine.dispose()
-        logger.debug(f"set state for user {key.user_id} in chat {key.chat_id} to state {state.state}.")
+        logger.debug(f"set state for user {key.user_id} in chat {key.chat_id} to state {state}.")
 
     async def get_state(self, key: StorageKey) -> Optional[str]:
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(
-                select(self.storage_table).where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
+                select(self.storage_table.c.state).where(self.storage_table.c.id == self.make_id(key))
             )
-        await self.engine.dispose()
-        res = raw_res.fetchone()
-        if res is None or res.state in ("None", None):
-            await self.clear_state(key)
+        state = raw_res.scalar_one_or_none()
+        if state in ("None", None):
             return None
-        return res.state
+        return state
 
     async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        statement = insert(self.storage_table).values(id=self.make_id(key), state=None, data=dict(data))
         async with self.engine.begin() as conn:
             await conn.execute(
-                update(self.storage_table)
-                .where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
-                .values(data=data)
+                statement.on_conflict_do_update(
+                    index_elements=[self.storage_table.c.id],
+                    set_={"data": statement.excluded.data, "last_touched": func.now()},
+                )
             )
-        await self.engine.dispose()
 
     async def get_data(self, key: StorageKey) -> Dict[str, Any]:
         async with self.engine.begin() as conn:
-            raw_res = await conn.execute(
-                select(self.storage_table).where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
-            )
-        await self.engine.dispose()
+            raw_res = await conn.execute(select(self.storage_table).where(self.storage_table.c.id == self.make_id(key)))
         res = raw_res.fetchone()
         if res is None or res.state == "None":
             return {}
-        return res.data
+        return res.data or {}
 
     async def update_data(self, key: StorageKey, data: Dict[str, Any]) -> Dict[str, Any]:
-        _data = await self.get_data(key)
-        _data.update(data)
+        """Merges the data into the stored one on the database side and returns the result"""
+        statement = insert(self.storage_table).values(id=self.make_id(key), state=None, data=dict(data))
+        merged_data = cast(
+            func.coalesce(cast(self.storage_table.c.data, JSONB), literal({}, JSONB)).op("||")(
+                cast(statement.excluded.data, JSONB)
+            ),
+            JSON,
+        )
         async with self.engine.begin() as conn:
-            await conn.execute(
-                update(self.storage_table)
-                .where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
-                .values(data=_data)
+            raw_res = await conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[self.storage_table.c.id],
+                    set_={"data": merged_data, "last_touched": func.now()},
+                ).returning(self.storage_table.c.data)
             )
-        await self.engine.dispose()
-        return _data
+        return raw_res.scalar_one()
 
     async def clear_state(self, key: StorageKey) -> None:
         async with self.engine.begin() as conn:
-            await conn.execute(
-                delete(self.storage_table).where(self.storage_table.c.id == f"{key.user_id}#{abs(key.chat_id)}")
-            )
-        await self.engine.dispose()
+            await conn.execute(delete(self.storage_table).where(self.storage_table.c.id == self.make_id(key)))
         logger.debug(f"cleared state for user {key.user_id} in chat {key.chat_id}.")
         return None
 
+    async def get_record(self, key: StorageKey) -> FsmRecord | None:
+        """:return: the state and the data as they are stored or None if the user has no row"""
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(select(self.storage_table).where(self.storage_table.c.id == self.make_id(key)))
+        res = raw_res.fetchone()
+        if res is None:
+            return None
+        return FsmRecord(state=res.state, data=res.data or {})
+
+    async def write_records(self, records: Dict[str, FsmRecord | None]) -> None:
+        """
+        Writes many rows in one transaction: upserts the records and deletes the rows of the None ones
+
+        :param records: row id (see make_id) -> the whole record that replaces the stored state and data
+        """
+        upserted = [
+            {"id": row_id, "state": record.state, "data": record.data}
+            for row_id, record in records.items()
+            if record is not None
+        ]
+        deleted = [row_id for row_id, record in records.items() if record is None]
+
+        async with self.engine.begin() as conn:
+            for offset in range(0, len(upserted), self.WRITE_BATCH_SIZE):
+                statement = insert(self.storage_table).values(upserted[offset : offset + self.WRITE_BATCH_SIZE])
+                await conn.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[self.storage_table.c.id],
+                        set_={
+                            "state": statement.excluded.state,
+                            "data": statement.excluded.data,
+                            "last_touched": func.now(),
+                        },
+                    )
+                )
+            if deleted:
+                await conn.execute(delete(self.storage_table).where(self.storage_table.c.id.in_(deleted)))
+
+        logger.debug(f"wrote {len(upserted)} and deleted {len(deleted)} rows of table {self.storage_table.name}.")
+
+    async def delete_expired(self, default_ttl: timedelta, state_ttls: Dict[str, timedelta], batch_size: int) -> int:
+        """
+        Deletes one batch of the rows that have not been touched longer than the TTL of their state.
+        The locked rows are skipped, so the handlers writing to the same users are never blocked
+
+        :param default_ttl: TTL of the states that are not in state_ttls and of the rows without state
+        :param state_ttls: TTL by the full state name ("CustomUserStates:MAIN_MENU") or by the state group
+            ("CustomUserStates"), the full state name wins
+        :return: the count of deleted rows, the sweeping is over when it is less than batch_size
+        """
+        state_column = self.storage_table.c.state
+        full_state_ttls = {state: ttl for state, ttl in state_ttls.items() if ":" in state}
+        group_ttls = {group: ttl for group, ttl in state_ttls.items() if ":" not in group}
+
+        ttl = case(
+            *[(state_column == state, literal(ttl, Interval)) for state, ttl in full_state_ttls.items()],
+            *[(state_column.startswith(f"{group}:"), literal(ttl, Interval)) for group, ttl in group_ttls.items()],
+            else_=literal(default_ttl, Interval),
+        )
+        min_ttl = min([default_ttl, *state_ttls.values()])
+
+        expired_ids = (
+            select(self.storage_table.c.id)
+            .where(
+                self.storage_table.c.last_touched < func.now() - literal(min_ttl, Interval),  # uses the index
+                self.storage_table.c.last_touched + ttl < func.now(),
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(delete(self.storage_table).where(self.storage_table.c.id.in_(expired_ids)))
+
+        return raw_res.rowcount
+
     async def clear_table(self) -> None:
         """
         Often used in tests
         """
         async with self.engine.begin() as conn:
             await conn.execute(delete(self.storage_table))
-        await self.engine.dispose()
 
         logger.debug(f"Table {self.storage_table.name} has been cleared")
 
     async def close(self) -> None:
-        pass
+        await self.engine.dispose()
@@ -0,0 +1,66 @@
+import asyncio
+
+from datetime import timedelta
+
+from common_utils.storage.storage import AlchemyStorageAsync
+
+from logs.config import logger
+
+
+class FsmStorageSweeper:
+    """Deletes the expired rows of the SQL FSM storage in the background, in small batches"""
+
+    BATCH_PAUSE = 0.1  # seconds between the batches to leave the database to the handlers
+
+    def __init__(
+        self,
+        storage: AlchemyStorageAsync,
+        default_ttl: timedelta,
+        state_ttls: dict[str, timedelta],
+        interval: float,
+        batch_size: int,
+    ) -> None:
+        """
+        :param default_ttl: TTL of the rows whose state is not in state_ttls
+        :param state_ttls: TTL by the full state name or by the state group, see AlchemyStorageAsync.delete_expired
+        :param interval: seconds between the sweeps
+        :param batch_size: rows deleted by one statement
+        """
+        self.storage = storage
+        self.default_ttl = default_ttl
+        self.state_ttls = state_ttls
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def sweep(self) -> int:
+        """:return: the count of deleted rows"""
+        deleted_total = 0
+        while True:
+            deleted = await self.storage.delete_expired(self.default_ttl, self.state_ttls, self.batch_size)
+            deleted_total += deleted
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.BATCH_PAUSE)
+
+        if deleted_total:
+            logger.info(f"{deleted_total} expired rows are deleted from the table {self.storage.table_name}")
+        return deleted_total
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Sweeping of the table {self.storage.table_name} failed", exc_info=e)
+            await asyncio.sleep(self.interval)
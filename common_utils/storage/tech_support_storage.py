@@ -1,7 +1,7 @@
 from common_utils.config import database_settings
-from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.factory import create_fsm_storage
 
 
-support_bot_storage = AlchemyStorageAsync(
+support_bot_storage = create_fsm_storage(
     db_url=database_settings.SUPPORT_BOT_STORAGE_DB_URL, table_name=database_settings.SUPPORT_BOT_STORAGE_TABLE_NAME
 )
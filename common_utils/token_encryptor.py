@@ -1,6 +1,12 @@
+import hmac
+import hashlib
+
 from cryptography.fernet import Fernet
 from common_utils.singleton import singleton
 
+# the fingerprint key is derived from the secret key, so the secret key itself is used only by Fernet
+_FINGERPRINT_KEY_CONTEXT = b"bot-token-fingerprint"
+
 
 @singleton
 class TokenEncryptor:
@@ -8,6 +14,8 @@ class TokenEncryptor:
 
     def __init__(self, secret_key: bytes) -> None:
         self.fernet = Fernet(key=secret_key)
+        secret_key = secret_key.encode() if isinstance(secret_key, str) else secret_key
+        self._hmac_key = hmac.new(key=secret_key, msg=_FINGERPRINT_KEY_CONTEXT, digestmod=hashlib.sha256).digest()
 
     def encrypt_token(self, bot_token: str) -> str:
         """Encrypts the bot token"""
@@ -17,6 +25,13 @@ class TokenEncryptor:
         """Decrypts the bot token"""
         return self.fernet.decrypt(bot_token).decode()
 
+    def fingerprint_token(self, bot_token: str) -> str:
+        """
+        Deterministic keyed hash (HMAC-SHA256) of the bot token.
+        Unlike the encrypted token it can be used to search the token in database
+        """
+        return hmac.new(key=self._hmac_key, msg=bot_token.encode(), digestmod=hashlib.sha256).hexdigest()
+
 
 if __name__ == "__main__":
     key = Fernet.generate_key().decode()  # to generate 32 url-safe base64-encoded bytes key
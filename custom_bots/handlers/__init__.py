@@ -12,4 +12,5 @@ from .routers import (
     inline_mode_router,
     payment_router,
     multi_bot_raw_router,
+    tenant_context_middleware,
 )
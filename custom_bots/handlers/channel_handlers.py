@@ -15,6 +15,7 @@ from custom_bots.utils.custom_message_texts import CustomMessageTexts
 
 from database.config import channel_user_db, channel_db, contest_db, bot_db, user_db
 from database.enums import UserLanguageValues
+from database.models.bot_model import BotSchema
 from database.models.channel_model import ChannelSchema
 from database.models.contest_model import ContestUserNotFoundError, ContestNotFoundError
 from database.models.channel_user_model import ChannelUserSchemaWithoutId, ChannelUserNotFoundError
@@ -90,7 +91,7 @@ async def on_user_leave(event: ChatMemberUpdated):
 
 
 @multi_bot_channel_router.my_chat_member()
-async def my_chat_member_handler(my_chat_member: ChatMemberUpdated) -> Any:
+async def my_chat_member_handler(my_chat_member: ChatMemberUpdated, custom_bot: BotSchema) -> Any:
     custom_bot_logger.info(
         f"Bot @{(await my_chat_member.bot.get_me()).username} has rights update in @{my_chat_member.chat.username}"
     )
@@ -100,7 +101,6 @@ async def my_chat_member_handler(my_chat_member: ChatMemberUpdated) -> Any:
 
     channel_username = my_chat_member.chat.username
 
-    custom_bot = await bot_db.get_bot_by_token(my_chat_member.bot.token)
     custom_bot_username = (await my_chat_member.bot.get_me()).username
 
     bot_id = custom_bot.bot_id
@@ -187,10 +187,10 @@ async def channel_menu_callback_handler(query: CallbackQuery, lang: UserLanguage
                 await contest_db.add_contest_user(
                     contest.contest_id, query.from_user.id, query.from_user.full_name, query.from_user.username
                 )
-                contest_members = await contest_db.get_contest_users(contest.contest_id)
+                contest_members_count = await contest_db.count_contest_users(contest.contest_id)
                 await query.message.edit_reply_markup(
                     reply_markup=await InlineJoinContestKeyboard.get_keyboard(
-                        custom_bot.bot_id, len(contest_members), callback_data.post_message_id
+                        custom_bot.bot_id, contest_members_count, callback_data.post_message_id
                     )
                 )
                 return await query.answer(CustomMessageTexts.get_contest_join_text(lang), show_alert=True)
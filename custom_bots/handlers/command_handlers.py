@@ -1,4 +1,3 @@
-from aiogram import Bot
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import CommandStart, CommandObject, Command
@@ -20,9 +19,9 @@ from common_utils.broadcasting.broadcasting import send_event, EventTypes
 
 from database.config import custom_bot_user_db, bot_db, option_db, pickle_store_db
 from database.enums.language import get_lang_emoji
-from database.models.bot_model import BotNotFoundError
-from database.models.option_model import OptionNotFoundError
-from database.models.custom_bot_user_model import CustomBotUserNotFoundError
+from database.models.bot_model import BotSchema
+from database.models.option_model import OptionSchema
+from database.models.custom_bot_user_model import CustomBotUserSchema
 
 from database.enums import UserLanguageValues
 from database.models.pickle_storage_model import PickledDataNotFound
@@ -30,31 +29,69 @@ from database.models.pickle_storage_model import PickledDataNotFound
 from logs.config import custom_bot_logger, extra_params
 
 
-async def _check_new_user(event: Message | CallbackQuery, user_id: int):
-    try:
-        db_bot = await bot_db.get_bot_by_token(event.bot.token)
+async def _get_or_add_custom_bot_user(
+    event: Message | CallbackQuery,
+    user_id: int,
+    custom_bot: BotSchema | None,
+    custom_bot_user: CustomBotUserSchema | None,
+) -> CustomBotUserSchema | None:
+    """
+    Adds the user to the custom bot users if he is not in database
+
+    :param custom_bot: BotSchema from TenantContextMiddleware
+    :param custom_bot_user: CustomBotUserSchema from TenantContextMiddleware
+    :return: existing or new CustomBotUserSchema, None if the bot is not in database
+    """
+    if custom_bot is None:
+        custom_bot_logger.warning("Bot not initialized", extra=extra_params(bot_token=event.bot.token))
+        await event.bot.delete_webhook()
+        await event.answer(**CustomMessageTexts.get_bot_not_init_message(UserLanguageValues.ENGLISH).as_kwargs())
+        return None
+
+    if custom_bot_user is None:
         custom_bot_logger.info(
-            f"user_id={user_id}: user called /start at bot_id={db_bot.bot_id}",
-            extra=extra_params(user_id=user_id, bot_id=db_bot.bot_id),
+            f"user_id={user_id}: user not found in database, trying to add to it",
+            extra=extra_params(user_id=user_id, bot_id=custom_bot.bot_id),
         )
 
-        try:
-            await custom_bot_user_db.get_custom_bot_user(db_bot.bot_id, user_id)
-        except CustomBotUserNotFoundError:
-            custom_bot_logger.info(
-                f"user_id={user_id}: user not found in database, trying to add to it",
-                extra=extra_params(user_id=user_id, bot_id=db_bot.bot_id),
-            )
+        await custom_bot_user_db.add_custom_bot_user(custom_bot.bot_id, user_id)
+        custom_bot_user = CustomBotUserSchema(
+            bot_id=custom_bot.bot_id, user_id=user_id, user_language=UserLanguageValues.ENGLISH
+        )
+
+    return custom_bot_user
+
+
+async def _check_new_user(
+    event: Message | CallbackQuery,
+    user_id: int,
+    custom_bot: BotSchema | None,
+    custom_bot_user: CustomBotUserSchema | None,
+) -> CustomBotUserSchema | None:
+    """
+    Handles /start of the user: adds him to the custom bot users and sends the event of the first message if he is new
+
+    :param custom_bot: BotSchema from TenantContextMiddleware
+    :param custom_bot_user: CustomBotUserSchema from TenantContextMiddleware
+    :return: existing or new CustomBotUserSchema, None if the bot is not in database
+    """
+    is_new_user = custom_bot_user is None
+    custom_bot_user = await _get_or_add_custom_bot_user(event, user_id, custom_bot, custom_bot_user)
+    if custom_bot_user is None:
+        return None
+
+    custom_bot_logger.info(
+        f"user_id={user_id}: user called /start at bot_id={custom_bot.bot_id}",
+        extra=extra_params(user_id=user_id, bot_id=custom_bot.bot_id),
+    )
 
-            await custom_bot_user_db.add_custom_bot_user(db_bot.bot_id, user_id)
-            if user_id == db_bot.created_by:
-                await send_event(event.from_user, EventTypes.FIRST_ADMIN_MESSAGE, event_bot=event.bot)
-            else:
-                await send_event(event.from_user, EventTypes.FIRST_USER_MESSAGE, event_bot=event.bot)
-    except BotNotFoundError as e:
-        custom_bot_logger.warning("Bot not initialized", exc_info=e)
-        await Bot(event.bot.token).delete_webhook()
-        return await event.answer(**CustomMessageTexts.get_bot_not_init_message(UserLanguageValues.ENGLISH).as_kwargs())
+    if is_new_user:
+        if user_id == custom_bot.created_by:
+            await send_event(event.from_user, EventTypes.FIRST_ADMIN_MESSAGE, event_bot=event.bot)
+        else:
+            await send_event(event.from_user, EventTypes.FIRST_USER_MESSAGE, event_bot=event.bot)
+
+    return custom_bot_user
 
 
 @multi_bot_raw_router.callback_query(lambda query: FirstTimeInlineSelectLanguageKb.callback_validator(query.data))
@@ -74,10 +111,9 @@ async def first_language_select_handler(query: CallbackQuery, **kwargs):
         await query.message.edit_reply_markup(reply_markup=None)
         return
 
-    await _check_new_user(query, query.from_user.id)
-
-    db_bot = await bot_db.get_bot_by_token(query.bot.token)
-    custom_bot_user = await custom_bot_user_db.get_custom_bot_user(db_bot.bot_id, query.from_user.id)
+    custom_bot_user = await _check_new_user(query, query.from_user.id, kwargs["custom_bot"], kwargs["custom_bot_user"])
+    if custom_bot_user is None:
+        return
 
     match callback_data.a:
         case callback_data.ActionEnum.SELECT:
@@ -95,6 +131,9 @@ async def first_language_select_handler(query: CallbackQuery, **kwargs):
             pickled_data["data"]["bot"] = kwargs["bot"]
             pickled_data["data"]["fsm_storage"] = kwargs["fsm_storage"]
             pickled_data["data"]["state"] = kwargs["state"]
+            pickled_data["data"]["custom_bot"] = kwargs["custom_bot"]
+            pickled_data["data"]["custom_bot_options"] = kwargs["custom_bot_options"]
+            pickled_data["data"]["custom_bot_user"] = custom_bot_user
 
             # валидация типов, которые были задамплены
             for k, typ in pickled_data["data"]["to_validate"].items():
@@ -116,48 +155,58 @@ async def first_language_select_handler(query: CallbackQuery, **kwargs):
 
 @multi_bot_router.message(CommandStart(deep_link=True))
 async def deep_link_start_handler(
-    message: Message, state: FSMContext, command: CommandObject, lang: UserLanguageValues
+    message: Message,
+    state: FSMContext,
+    command: CommandObject,
+    lang: UserLanguageValues,
+    custom_bot: BotSchema | None,
+    custom_bot_user: CustomBotUserSchema | None,
 ):
     """
     :raises UnknownDeepLinkArgument:
     """
     deep_link_params = command.args.split()
 
-    db_bot = await bot_db.get_bot_by_token(message.bot.token)
     # Проверяем, новый ли пользователь
-    await _check_new_user(message, message.from_user.id)
+    if await _check_new_user(message, message.from_user.id, custom_bot, custom_bot_user) is None:
+        return
 
     if deep_link_params[0].startswith("product_"):
         product_id = int(deep_link_params[0].strip().split("_")[-1])
         await state.set_state(CustomUserStates.MAIN_MENU)
         return await message.answer(
             **CustomMessageTexts.get_product_page_message(lang).as_kwargs(),
-            reply_markup=InlineCustomBotModeProductKeyboardButton.get_keyboard(product_id, db_bot.bot_id),
+            reply_markup=InlineCustomBotModeProductKeyboardButton.get_keyboard(product_id, custom_bot.bot_id),
         )
     elif deep_link_params[0] == "web_app":
         await state.set_state(CustomUserStates.MAIN_MENU)
         return await message.answer(
             **CustomMessageTexts.get_shop_page_message(lang).as_kwargs(),
-            reply_markup=InlineBotMainWebAppButton.get_keyboard(db_bot.bot_id, lang),
+            reply_markup=InlineBotMainWebAppButton.get_keyboard(custom_bot.bot_id, lang),
         )
     else:
         raise UnknownDeepLinkArgument(arg=deep_link_params)
 
 
 @multi_bot_router.message(CommandStart())
-async def start_cmd(message: Message, state: FSMContext, lang: UserLanguageValues):
+async def start_cmd(
+    message: Message,
+    state: FSMContext,
+    lang: UserLanguageValues,
+    custom_bot: BotSchema | None,
+    custom_bot_options: OptionSchema | None,
+    custom_bot_user: CustomBotUserSchema | None,
+):
     user_id = message.from_user.id
 
-    db_bot = await bot_db.get_bot_by_token(message.bot.token)
-
-    await _check_new_user(message, user_id)
+    if await _check_new_user(message, user_id, custom_bot, custom_bot_user) is None:
+        return
 
-    try:
-        options = await option_db.get_option(db_bot.options_id)
-    except OptionNotFoundError:
+    options = custom_bot_options
+    if options is None:
         new_options_id = await create_bot_options()
-        db_bot.options_id = new_options_id
-        await bot_db.update_bot(db_bot)
+        custom_bot.options_id = new_options_id
+        await bot_db.update_bot(custom_bot)
         options = await option_db.get_option(new_options_id)
     start_msg = options.start_msg
     bot_data = await message.bot.get_me()
@@ -169,29 +218,33 @@ async def start_cmd(message: Message, state: FSMContext, lang: UserLanguageValue
 
 
 @multi_bot_router.message(Command("lang"))
-async def lang_command_handler(message: Message, lang: UserLanguageValues):
-    db_bot = await bot_db.get_bot_by_token(message.bot.token)
-    bot_options = await option_db.get_option(db_bot.options_id)
+async def lang_command_handler(
+    message: Message, lang: UserLanguageValues, custom_bot: BotSchema, custom_bot_options: OptionSchema
+):
     await message.answer(
         **CustomMessageTexts.get_select_language_message(lang).as_kwargs(),
         reply_markup=InlineSelectLanguageKb.get_keyboard(
-            bot_id=db_bot.bot_id, languages=bot_options.languages, current_lang=lang
+            bot_id=custom_bot.bot_id, languages=custom_bot_options.languages, current_lang=lang
         ),
     )
 
 
 @multi_bot_router.callback_query(lambda query: InlineSelectLanguageKb.callback_validator(query.data))
-async def language_select_handler(query: CallbackQuery):
+async def language_select_handler(
+    query: CallbackQuery,
+    custom_bot: BotSchema | None,
+    custom_bot_options: OptionSchema | None,
+    custom_bot_user: CustomBotUserSchema | None,
+):
+    custom_bot_user = await _get_or_add_custom_bot_user(query, query.from_user.id, custom_bot, custom_bot_user)
+    if custom_bot_user is None:
+        return
+
     callback_data = InlineSelectLanguageKb.Callback.model_validate_json(query.data)
 
     bot_id = callback_data.bot_id
     selected_lang = callback_data.selected
 
-    bot = await bot_db.get_bot(bot_id)
-    bot_options = await option_db.get_option(bot.options_id)
-
-    custom_bot_user = await custom_bot_user_db.get_custom_bot_user(bot_id, query.from_user.id)
-
     match callback_data.a:
         case callback_data.ActionEnum.SELECT:
             if selected_lang == custom_bot_user.user_language:
@@ -204,6 +257,6 @@ async def language_select_handler(query: CallbackQuery):
             await query.message.edit_text(
                 **CustomMessageTexts.get_select_language_message(custom_bot_user.user_language).as_kwargs(),
                 reply_markup=InlineSelectLanguageKb.get_keyboard(
-                    bot_id, bot_options.languages, custom_bot_user.user_language
+                    bot_id, custom_bot_options.languages, custom_bot_user.user_language
                 ),
             )
@@ -1,6 +1,6 @@
 import json
 
-from aiogram import F, Bot
+from aiogram import F
 from aiogram.types import Message
 
 from custom_bots.multibot import CustomUserStates, main_bot
@@ -17,8 +17,8 @@ from common_utils.order_utils.order_utils import create_order
 
 from database.enums import UserLanguageValues
 from database.config import bot_db, option_db
-from database.models.bot_model import BotNotFoundError
-from database.models.option_model import OptionNotFoundError
+from database.models.bot_model import BotSchema
+from database.models.option_model import OptionSchema
 from database.models.product_model import NotEnoughProductsInStockToReduce
 
 from logs.config import custom_bot_logger, extra_params
@@ -57,14 +57,12 @@ async def process_web_app_request(event: Message, lang: UserLanguageValues):
 
 
 @multi_bot_router.message(CustomUserStates.MAIN_MENU)
-async def main_menu_handler(message: Message, lang: UserLanguageValues):
-    try:
-        bot = await bot_db.get_bot_by_token(message.bot.token)
-    except BotNotFoundError:
-        custom_bot_logger.warning(
-            f"bot_token={message.bot.token}: this bot is not in db", extra=extra_params(bot_token=message.bot.token)
-        )
-        await Bot(message.bot.token).delete_webhook()
+async def main_menu_handler(
+    message: Message, lang: UserLanguageValues, custom_bot: BotSchema | None, custom_bot_options: OptionSchema | None
+):
+    bot = custom_bot
+    if bot is None:
+        await message.bot.delete_webhook()
         return await message.answer(**CustomMessageTexts.get_bot_not_init_message(lang).as_kwargs())
     main_bot_data = await main_bot.get_me()
 
@@ -76,9 +74,8 @@ async def main_menu_handler(message: Message, lang: UserLanguageValues):
                 reply_markup=InlineBotMainWebAppButton.get_keyboard(bot.bot_id, lang),
             )
         case _:
-            try:
-                options = await option_db.get_option(bot.options_id)
-            except OptionNotFoundError:
+            options = custom_bot_options
+            if options is None:
                 new_options_id = await create_bot_options()
                 bot.options_id = new_options_id
                 await bot_db.update_bot(bot)
@@ -5,21 +5,22 @@ from aiogram.types import InlineQuery, InlineQueryResultArticle, InputTextMessag
 from custom_bots.multibot import API_URL, custom_bot_logger
 from custom_bots.utils.custom_message_texts import CustomMessageTexts
 
-from database.config import product_db, bot_db
+from database.config import product_db
 from database.enums import UserLanguageValues
+from database.models.bot_model import BotSchema
 from database.models.product_model import ProductFilter
 
 from common_utils.keyboards.keyboards import InlineModeProductKeyboardButton
 
 
 @inline_mode_router.inline_query()
-async def handle_inline_query(query: InlineQuery, lang: UserLanguageValues):
+async def handle_inline_query(query: InlineQuery, lang: UserLanguageValues, custom_bot: BotSchema):
     if not query.offset:
         prev_offset = 0
     else:
         prev_offset = int(query.offset)
 
-    custom_bot_object = await bot_db.get_bot_by_token(query.bot.token)
+    custom_bot_object = custom_bot
     custom_bot_data = await query.bot.get_me()
 
     if query.query.strip():
@@ -22,9 +22,9 @@ from common_utils.keyboards.order_manage_keyboards import (
 )
 from common_utils.message_texts import MessageTexts as CommonMessageTexts
 
-from database.config import product_review_db, order_db, product_db, bot_db
+from database.config import product_review_db, order_db, product_db
 from database.enums import UserLanguageValues
-from database.models.bot_model import BotNotFoundError
+from database.models.bot_model import BotSchema
 from database.models.order_model import OrderStatusValues, OrderNotFoundError
 from database.models.product_model import ProductNotFoundError
 from database.models.product_review_model import ProductReviewSchemaWithoutID, ProductReviewNotFoundError
@@ -170,18 +170,14 @@ async def create_order_review(query: CallbackQuery, lang: UserLanguageValues):
 
 
 @multi_bot_router.callback_query(lambda query: InlinePickReviewProductKeyboard.callback_validator(query.data))
-async def get_product_id(query: CallbackQuery, state: FSMContext, lang: UserLanguageValues):
+async def get_product_id(
+    query: CallbackQuery, state: FSMContext, lang: UserLanguageValues, custom_bot: BotSchema | None
+):
     callback_data = InlinePickReviewProductKeyboard.Callback.model_validate_json(query.data)
 
     match callback_data.a:
         case callback_data.ActionEnum.PICK_PRODUCT:
-            try:
-                await bot_db.get_bot_by_token(query.message.bot.token)
-            except BotNotFoundError:
-                custom_bot_logger.warning(
-                    f"bot_token={query.message.bot.token}: this bot is not in db",
-                    extra=extra_params(bot_token=query.message.bot.token),
-                )
+            if custom_bot is None:
                 return await query.message.answer(**CustomMessageTexts.get_bot_not_init_message(lang).as_kwargs())
             try:
                 await product_review_db.get_product_review_by_user_id_and_product_id(
@@ -203,13 +199,8 @@ async def get_product_id(query: CallbackQuery, state: FSMContext, lang: UserLang
 
 
 @multi_bot_router.message(StateFilter(CustomUserStates.WAITING_FOR_REVIEW_MARK))
-async def get_review_mark(message: Message, state: FSMContext, lang: UserLanguageValues):
-    try:
-        await bot_db.get_bot_by_token(message.bot.token)
-    except BotNotFoundError:
-        custom_bot_logger.warning(
-            f"bot_token={message.bot.token}: this bot is not in db", extra=extra_params(bot_token=message.bot.token)
-        )
+async def get_review_mark(message: Message, state: FSMContext, lang: UserLanguageValues, custom_bot: BotSchema | None):
+    if custom_bot is None:
         return await message.answer(**CustomMessageTexts.get_bot_not_init_message(lang).as_kwargs())
 
     actions = ReplyReviewBackKeyboard.Callback.ActionEnum
@@ -249,14 +240,9 @@ async def get_review_mark(message: Message, state: FSMContext, lang: UserLanguag
 
 
 @multi_bot_router.message(StateFilter(CustomUserStates.WAITING_FOR_REVIEW_TEXT))
-async def get_review_text(message: Message, state: FSMContext, lang: UserLanguageValues):
+async def get_review_text(message: Message, state: FSMContext, lang: UserLanguageValues, custom_bot: BotSchema | None):
     state_data = await state.get_data()
-    try:
-        bot = await bot_db.get_bot_by_token(message.bot.token)
-    except BotNotFoundError:
-        custom_bot_logger.warning(
-            f"bot_token={message.bot.token}: this bot is not in db", extra=extra_params(bot_token=message.bot.token)
-        )
+    if custom_bot is None:
         return await message.answer(**CustomMessageTexts.get_shop_button_message(lang).as_kwargs())
     actions = ReplyReviewBackKeyboard.Callback.ActionEnum
     if message.text in (actions.BACK.value, actions.BACK_ENG.value, actions.BACK_HEB.value):
@@ -271,7 +257,7 @@ async def get_review_text(message: Message, state: FSMContext, lang: UserLanguag
     mark = state_data["mark"]
     review_id = await product_review_db.add_product_review(
         ProductReviewSchemaWithoutID(
-            bot_id=bot.bot_id,
+            bot_id=custom_bot.bot_id,
             product_id=state_data["product_id"],
             mark=mark,
             review_text=message.text,
@@ -285,7 +271,7 @@ async def get_review_text(message: Message, state: FSMContext, lang: UserLanguag
     try:
         product = await product_db.get_product(state_data["product_id"])
         await main_bot.send_message(
-            chat_id=bot.created_by,
+            chat_id=custom_bot.created_by,
             text=CustomMessageTexts.show_product_review_info(mark, message.text, product.name),
             reply_markup=InlineAcceptReviewKeyboard.get_keyboard(review_id),
         )
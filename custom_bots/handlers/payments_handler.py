@@ -11,9 +11,11 @@ from custom_bots.multibot import PREV_ORDER_MSGS, main_bot
 from custom_bots.utils.custom_message_texts import CustomMessageTexts
 from database.enums import UserLanguageValues
 
+from database.models.bot_model import BotSchema
 from database.models.order_model import OrderStatusValues
 from database.models.payment_model import PaymentSchemaWithoutId
-from database.config import pay_db, bot_db, order_db, product_db, custom_bot_user_db
+from database.models.custom_bot_user_model import CustomBotUserSchema, CustomBotUserNotFoundError
+from database.config import pay_db, order_db, product_db
 
 from common_utils.message_texts import MessageTexts as CommonMessageTexts
 
@@ -31,9 +33,11 @@ class PreCheckHandler(PreCheckoutQueryHandler):
         from_user = self.event.from_user
         lang = UserLanguageValues.ENGLISH
         try:
-            custom_bot = await bot_db.get_bot_by_token(self.bot.token)
+            custom_bot: BotSchema = self.data["custom_bot"]
             bot_id = custom_bot.bot_id
-            custom_bot_user = await custom_bot_user_db.get_custom_bot_user(bot_id, from_user.id)
+            custom_bot_user: CustomBotUserSchema | None = self.data["custom_bot_user"]
+            if custom_bot_user is None:
+                raise CustomBotUserNotFoundError(user_id=from_user.id, bot_id=bot_id)
             lang = custom_bot_user.user_language
             payload = json.loads(self.event.invoice_payload)
             extra_data = self.event.order_info
@@ -116,10 +120,9 @@ class PreCheckHandler(PreCheckoutQueryHandler):
 
 
 @payment_router.message(F.successful_payment)
-async def process_successfully_payment(message: Message, lang: UserLanguageValues):
+async def process_successfully_payment(message: Message, lang: UserLanguageValues, custom_bot: BotSchema):
     payment = message.successful_payment
     payload = json.loads(payment.invoice_payload)
-    custom_bot = await bot_db.get_bot_by_token(message.bot.token)
     if "TEST" == payload["order_id"]:
         custom_bot_logger.debug("new test success payment, skipping payment database object creation")
         pay_id = "TEST"
@@ -11,8 +11,9 @@ from custom_bots.keyboards.custom_bot_menu_keyboards import ReplyCustomBotMenuKe
 from custom_bots.utils.custom_message_texts import CustomMessageTexts
 from custom_bots.utils.question_utils import is_able_to_ask
 
-from database.config import bot_db, order_db
+from database.config import order_db
 from database.enums import UserLanguageValues
+from database.models.bot_model import BotSchema
 from database.models.order_model import OrderNotFoundError
 
 from logs.config import custom_bot_logger, extra_params
@@ -62,13 +63,15 @@ async def handle_waiting_for_question_state(message: Message, state: FSMContext,
 
 
 @multi_bot_router.callback_query(lambda query: InlineOrderQuestionKeyboard.callback_validator(query.data))
-async def ask_question_callback(query: CallbackQuery, state: FSMContext, lang: UserLanguageValues):
+async def ask_question_callback(
+    query: CallbackQuery, state: FSMContext, lang: UserLanguageValues, custom_bot: BotSchema
+):
     callback_data = InlineOrderQuestionKeyboard.Callback.model_validate_json(query.data)
     state_data = await state.get_data()
 
     order_id = callback_data.order_id
     user_id = query.from_user.id
-    bot_data = await bot_db.get_bot_by_token(query.bot.token)
+    bot_data = custom_bot
 
     match callback_data.a:
         case callback_data.ActionEnum.APPROVE:
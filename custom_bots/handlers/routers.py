@@ -4,10 +4,13 @@ from common_utils.middlewaries.lang_middleware import LangCheckMiddleware
 from common_utils.middlewaries.log_middleware import LogMiddleware
 from common_utils.middlewaries.errors_middleware import ErrorMiddleware
 
+from custom_bots.middlewaries import TenantContextMiddleware
+
 from logs.config import custom_bot_logger
 
 log_middleware = LogMiddleware(logger=custom_bot_logger)
 lang_middleware = LangCheckMiddleware(from_main_bot=False)
+tenant_context_middleware = TenantContextMiddleware()  # is registered on the multibot dispatcher
 
 multi_bot_raw_router = Router(name="raw")
 multi_bot_raw_router.message.outer_middleware(log_middleware)
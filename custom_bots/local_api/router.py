@@ -7,17 +7,21 @@ from aiogram.types import InlineQueryResultArticle, InputTextMessageContent
 from bot.handlers.admin_bot_menu_handlers import send_new_order_notify
 from custom_bots.multibot import web, session, main_bot
 from custom_bots.utils.utils import is_bot_token
+from custom_bots.utils.multi_dispathcer_server import WEBHOOK_REQUEST_HANDLER_KEY
 from custom_bots.utils.order_creation import order_creation_process
-from custom_bots.utils import restart_custom_bot
+from custom_bots.utils import restart_custom_bot, WebhookRestoreResult
+from custom_bots.handlers.routers import tenant_context_middleware
 
 from common_utils.order_utils.order_type import OrderType
 from common_utils.order_utils.order_utils import create_order
+from common_utils.bot_pool import bot_pool
+from common_utils.storage.cached_storage import CachedStorage
 
-from database.config import bot_db
+from database.config import bot_db, bot_registry, db_engine
 from database.models.bot_model import BotNotFoundError
 from database.models.product_model import NotEnoughProductsInStockToReduce
 
-from logs.config import custom_bot_logger, extra_params, api_logger
+from logs.config import custom_bot_logger, extra_params, api_logger, get_logging_metrics
 
 routes = web.RouteTableDef()
 
@@ -37,7 +41,8 @@ async def add_bot_handler(request):
     except TelegramUnauthorizedError:
         return web.Response(status=400, text="Unauthorized telegram token.")
 
-    await restart_custom_bot(bot, session)
+    if await restart_custom_bot(bot, session) == WebhookRestoreResult.FAILED:
+        return web.Response(status=500, text=f"Webhook of the bot is not set (id: {bot_id}).")
 
     return web.Response(text=f"Started bot with token ({bot.token}) and username (@{new_bot_data.username})")
 
@@ -72,14 +77,14 @@ async def send_web_app_data_to_bot(request):
     bot_id = request.match_info["bot_id"]
     api_logger.debug(f"new request to with bot_id : {bot_id}")
     try:
-        bot = await bot_db.get_bot(int(bot_id))
+        bot = await bot_registry.get_bot(int(bot_id))
         api_logger.debug(f"new request to with bot : {bot}")
     except BotNotFoundError:
         return web.Response(status=404, text=f"Bot with provided id not found (id: {bot_id}).")
     if not is_bot_token(bot.token):
         return web.Response(status=400, text="Incorrect bot token format.")
 
-    custom_bot_tg = Bot(bot.token)
+    custom_bot_tg = bot_pool.get_bot(bot.token)
     api_logger.debug(f"new request to with tg_bot : {custom_bot_tg}")
     sent_data = await request.json()
     api_logger.debug(f"new request to with sent_data : {sent_data}")
@@ -167,3 +172,90 @@ async def send_hex_data_to_bot(request):
         raise ex
 
     return web.Response(status=200, text="Data was sent to bot successfully")
+
+
+@routes.get("/metrics/db_pool")
+async def db_pool_metrics_handler(request):  # noqa
+    pool_metrics = db_engine.get_pool_metrics()
+    if pool_metrics is None:
+        return web.Response(status=404, text="Database pool is not measured in this mode.")
+
+    return web.Response(
+        status=200,
+        body=json.dumps({**pool_metrics.model_dump(), "wait_time_avg": pool_metrics.wait_time_avg}),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/bot_registry")
+async def bot_registry_metrics_handler(request):  # noqa
+    return web.Response(
+        status=200,
+        body=bot_registry.get_metrics().model_dump_json(),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/webhook_bots")
+async def webhook_bots_metrics_handler(request):
+    return web.Response(
+        status=200,
+        body=request.app[WEBHOOK_REQUEST_HANDLER_KEY].get_metrics().model_dump_json(),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/updates")
+async def updates_metrics_handler(request):
+    update_metrics = request.app[WEBHOOK_REQUEST_HANDLER_KEY].update_executor.get_metrics()
+    return web.Response(
+        status=200,
+        body=json.dumps(
+            {
+                **update_metrics.model_dump(),
+                "wait_time_avg": {
+                    telegram_bot_id: bot_metrics.wait_time_avg
+                    for telegram_bot_id, bot_metrics in update_metrics.bots.items()
+                },
+            }
+        ),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/fsm_cache")
+async def fsm_cache_metrics_handler(request):
+    storage = request.app[WEBHOOK_REQUEST_HANDLER_KEY].dispatcher.storage
+    if not isinstance(storage, CachedStorage):
+        return web.Response(status=404, text="FSM storage is not cached with this backend.")
+
+    fsm_cache_metrics = storage.get_metrics()
+    return web.Response(
+        status=200,
+        body=json.dumps({**fsm_cache_metrics.model_dump(), "hit_rate": fsm_cache_metrics.hit_rate}),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/logging")
+async def logging_metrics_handler(request):  # noqa
+    return web.Response(
+        status=200,
+        body=get_logging_metrics().model_dump_json(),
+        content_type="application/json",
+    )
+
+
+@routes.get("/metrics/db_round_trips")
+async def db_round_trips_metrics_handler(request):  # noqa
+    return web.Response(
+        status=200,
+        body=json.dumps(
+            {
+                "updates_count": tenant_context_middleware.updates_count,
+                "db_round_trips_total": tenant_context_middleware.db_round_trips_total,
+                "db_round_trips_per_update": tenant_context_middleware.db_round_trips_per_update,
+            }
+        ),
+        content_type="application/json",
+    )
@@ -0,0 +1 @@
+from .tenant_context_middleware import TenantContextMiddleware
@@ -0,0 +1,91 @@
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update, User
+
+from database.config import bot_registry, option_db, custom_bot_user_db
+from database.models.bot_model import BotNotFoundError, BotSchema
+from database.models.round_trips import count_db_round_trips
+from database.models.option_model import OptionNotFoundError, OptionSchema
+from database.models.custom_bot_user_model import CustomBotUserNotFoundError, CustomBotUserSchema
+
+from logs.config import custom_bot_logger, extra_params, log_context
+
+# updates that are handled with the user's language, so they need options and the custom bot user
+_INTERACTIVE_UPDATE_TYPES = ("message", "callback_query", "inline_query", "pre_checkout_query")
+
+
+class TenantContextMiddleware(BaseMiddleware):
+    """
+    Outer middleware of the multibot dispatcher.
+    Resolves the custom bot, its options and the custom bot user once per update and puts them into handler data:
+        - custom_bot: BotSchema | None
+        - custom_bot_options: OptionSchema | None
+        - custom_bot_user: CustomBotUserSchema | None (None if the user is not in database yet)
+
+    Also tags the records logged while the update is handled with bot_id and counts database round trips of every
+    update
+    """
+
+    def __init__(self) -> None:
+        self.updates_count = 0
+        self.db_round_trips_total = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ) -> Any:
+        with count_db_round_trips() as db_round_trips:
+            try:
+                await self._resolve_context(event, data)
+                custom_bot: BotSchema | None = data["custom_bot"]
+                with log_context(bot_id=custom_bot.bot_id if custom_bot else None):
+                    return await handler(event, data)
+            finally:
+                self.updates_count += 1
+                self.db_round_trips_total += db_round_trips.count
+
+                custom_bot: BotSchema | None = data.get("custom_bot")
+                bot_id = custom_bot.bot_id if custom_bot else None
+                custom_bot_logger.debug(
+                    f"bot_id={bot_id}: update {event.update_id} ({event.event_type}) "
+                    f"took {db_round_trips.count} db round trips",
+                    extra=extra_params(bot_id=bot_id),
+                )
+
+    @property
+    def db_round_trips_per_update(self) -> float:
+        return self.db_round_trips_total / self.updates_count if self.updates_count else 0.0
+
+    @staticmethod
+    async def _resolve_context(event: Update, data: Dict[str, Any]) -> None:
+        custom_bot: BotSchema | None = None
+        custom_bot_options: OptionSchema | None = None
+        custom_bot_user: CustomBotUserSchema | None = None
+
+        try:
+            custom_bot = await bot_registry.get_bot_by_token(data["bot"].token)
+        except BotNotFoundError:
+            custom_bot_logger.warning(
+                f"bot_token={data['bot'].token}: this bot is not in db",
+                extra=extra_params(bot_token=data["bot"].token),
+            )
+
+        if custom_bot is not None and event.event_type in _INTERACTIVE_UPDATE_TYPES:
+            try:
+                custom_bot_options = await option_db.get_option(custom_bot.options_id)
+            except OptionNotFoundError:
+                pass  # handlers create new options if they need
+
+            user: User | None = data.get("event_from_user")
+            if user is not None:
+                try:
+                    custom_bot_user = await custom_bot_user_db.get_custom_bot_user(custom_bot.bot_id, user.id)
+                except CustomBotUserNotFoundError:
+                    pass
+
+        data["custom_bot"] = custom_bot
+        data["custom_bot_options"] = custom_bot_options
+        data["custom_bot_user"] = custom_bot_user
@@ -1,5 +1,6 @@
 import asyncio
 import ssl
+import multiprocessing
 
 from aiohttp import web
 
@@ -22,14 +23,18 @@ from common_utils.start_message import send_start_message_to_admins
 from common_utils.scheduler.scheduler import Scheduler
 from common_utils.cache_json.cache_json import JsonStore
 from common_utils.storage.custom_bot_storage import custom_bot_storage
+from common_utils.storage.factory import create_fsm_sweeper
+from common_utils.bot_pool import bot_pool
+from common_utils.middlewaries.log_context_middleware import LogContextMiddleware
 from custom_bots.utils.bot_restart import OTHER_BOTS_PATH
 
-from custom_bots.utils.multi_dispathcer_server import EncryptedTokenBasedRequestHandler
-from database.config import bot_db
+from custom_bots.utils.multi_dispathcer_server import EncryptedTokenBasedRequestHandler, WEBHOOK_REQUEST_HANDLER_KEY
+from custom_bots.utils.shard_router import ShardRouter, WorkersSupervisor
+from database.config import bot_db, bot_registry, db_engine
 
 from logs.config import custom_bot_logger
 
-from custom_bots.utils import restart_custom_bot
+from custom_bots.utils import restore_custom_bots
 
 app = web.Application()
 
@@ -69,16 +74,39 @@ class CustomUserStates(StatesGroup):
     WAITING_FOR_REVIEW_TEXT = State()
 
 
-async def main():
+def _create_ssl_context() -> ssl.SSLContext:
+    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)  # noqa
+    ssl_context.load_cert_chain(api_settings.SSL_CERT_PATH, api_settings.SSL_KEY_PATH)
+    return ssl_context
+
+
+def _get_worker_port(worker_index: int) -> int:
+    return custom_telegram_bot_settings.MULTIBOT_WORKERS_BASE_PORT + worker_index
+
+
+async def main(worker_index: int | None = None):
+    """
+    :param worker_index: index of the worker process in the sharded mode (see run_sharded) or None.
+        Only the single process or the worker 0 runs the local api, the scheduler and restarts the webhooks
+    """
+    is_primary = worker_index in (None, 0)
+
     from custom_bots.handlers import (
         multi_bot_router,
         multi_bot_channel_router,
         inline_mode_router,
         payment_router,
         multi_bot_raw_router,
+        tenant_context_middleware,
     )
 
-    multibot_dispatcher = Dispatcher(storage=custom_bot_storage)
+    # no write-behind cache: the main bot writes to custom_bot_storage directly (clears last_question_time),
+    # the cached copy of the user would be flushed over that change
+    storage = custom_bot_storage
+    storage_sweeper = create_fsm_sweeper(custom_bot_storage) if is_primary else None
+    multibot_dispatcher = Dispatcher(storage=storage)
+    multibot_dispatcher.update.outer_middleware(LogContextMiddleware())
+    multibot_dispatcher.update.outer_middleware(tenant_context_middleware)
 
     multibot_dispatcher.include_router(multi_bot_raw_router)
     multibot_dispatcher.include_router(payment_router)
@@ -86,29 +114,39 @@ async def main():
     multibot_dispatcher.include_router(multi_bot_router)
     multibot_dispatcher.include_router(inline_mode_router)
 
-    EncryptedTokenBasedRequestHandler(
+    request_handler = EncryptedTokenBasedRequestHandler(
         dispatcher=multibot_dispatcher,
-        bot_settings={"default": BOT_PROPERTIES},
+        bot_settings={"default": BOT_PROPERTIES, "session": bot_pool.session},
         session=session,
-    ).register(app, path=OTHER_BOTS_PATH)
+    )
+    request_handler.register(app, path=OTHER_BOTS_PATH)
+    local_app[WEBHOOK_REQUEST_HANDLER_KEY] = request_handler
 
     setup_application(app, multibot_dispatcher)
 
-    from local_api.router import routes
+    if is_primary:
+        from local_api.router import routes
 
-    local_app.add_routes(routes)
+        local_app.add_routes(routes)
 
     custom_bot_logger.debug("[1/5] Routes added, application is being setup")
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
-    ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)  # noqa
-    ssl_context.load_cert_chain(api_settings.SSL_CERT_PATH, api_settings.SSL_KEY_PATH)
+    if worker_index is None:
+        ssl_context = _create_ssl_context()
+        webhook_host = custom_telegram_bot_settings.WEBHOOK_SERVER_HOST_TO_REDIRECT
+        webhook_port = custom_telegram_bot_settings.WEBHOOK_SERVER_PORT_TO_REDIRECT
+    else:  # the front router terminates TLS
+        ssl_context = None
+        webhook_host = "127.0.0.1"
+        webhook_port = _get_worker_port(worker_index)
 
     custom_bot_logger.debug("[2/5] SSL certificates are downloaded")
 
-    await custom_bot_storage.connect()
+    await storage.connect()
+    await bot_registry.start_listening()
 
     custom_bot_logger.debug(
         f"[3/5] Setting up local api server on "
@@ -116,46 +154,98 @@ async def main():
         f"{custom_telegram_bot_settings.WEBHOOK_LOCAL_API_PORT}"
     )
     custom_bot_logger.info(
-        f"[4/5] Setting up webhook server on "
-        f"{custom_telegram_bot_settings.WEBHOOK_HOST}:"
-        f"{custom_telegram_bot_settings.WEBHOOK_SERVER_PORT_TO_REDIRECT} "
-        f"<- {custom_telegram_bot_settings.WEBHOOK_PORT}"
+        f"[4/5] Setting up webhook server on {webhook_host}:{webhook_port} "
+        f"<- {custom_telegram_bot_settings.WEBHOOK_PORT} (worker_index={worker_index})"
     )
 
-    custom_bot_logger.info("[5/5] Restarting all bots webhook")
-
-    all_bots = await bot_db.get_bots()
-
-    for bot in all_bots:
-        try:
-            await restart_custom_bot(bot, session)
-        except Exception as e:
-            custom_bot_logger.warning(f"cant restart custom bot ({bot})", exc_info=e)
-
-    await scheduler.start()
-
-    await asyncio.gather(
-        web._run_app(  # noqa
-            local_app,
-            host=custom_telegram_bot_settings.WEBHOOK_LOCAL_API_URL_OUTSIDE,
-            port=custom_telegram_bot_settings.WEBHOOK_LOCAL_API_PORT,
-            access_log=custom_bot_logger,
-            print=custom_bot_logger.debug,
-        ),
+    servers = [
         web._run_app(  # noqa
             app,
-            host=custom_telegram_bot_settings.WEBHOOK_SERVER_HOST_TO_REDIRECT,
-            port=custom_telegram_bot_settings.WEBHOOK_SERVER_PORT_TO_REDIRECT,
+            host=webhook_host,
+            port=webhook_port,
             ssl_context=ssl_context,
             access_log=custom_bot_logger,
             print=custom_bot_logger.debug,
+        )
+    ]
+    if is_primary:
+        custom_bot_logger.info("[5/5] Restarting all bots webhook")
+
+        await restore_custom_bots(
+            await bot_db.get_bots(),
+            session,
+            concurrency=custom_telegram_bot_settings.WEBHOOKS_RESTORE_CONCURRENCY,
+            rate=custom_telegram_bot_settings.WEBHOOKS_RESTORE_RATE,
+        )
+
+        await scheduler.start()
+        if storage_sweeper is not None:
+            storage_sweeper.start()
+
+        servers += [
+            web._run_app(  # noqa
+                local_app,
+                host=custom_telegram_bot_settings.WEBHOOK_LOCAL_API_URL_OUTSIDE,
+                port=custom_telegram_bot_settings.WEBHOOK_LOCAL_API_PORT,
+                access_log=custom_bot_logger,
+                print=custom_bot_logger.debug,
+            ),
+            send_start_message_to_admins(
+                bot_pool.get_bot(main_telegram_bot_settings.TELEGRAM_TOKEN),
+                common_settings.TECH_ADMINS,
+                "Custom bots started!",
+            ),
+        ]
+
+    try:
+        await asyncio.gather(*servers)
+    finally:
+        if storage_sweeper is not None:
+            await storage_sweeper.stop()
+        await storage.close()
+        await bot_pool.close()
+        await db_engine.close()
+
+
+def _run_worker(worker_index: int) -> None:
+    asyncio.run(main(worker_index))
+
+
+def run_sharded(workers_count: int) -> None:
+    """
+    Runs workers_count webhook worker processes behind the front router.
+    The router listens on the webhook port and forwards every bot to one worker by the consistent hash
+    of the encrypted token from the path, so changing workers_count moves only about 1/N of the bots
+    """
+    spawn_context = multiprocessing.get_context("spawn")  # the children must not inherit the loop and connections
+
+    router_app = web.Application()
+    ShardRouter(
+        worker_urls={
+            worker_index: f"http://127.0.0.1:{_get_worker_port(worker_index)}" for worker_index in range(workers_count)
+        }
+    ).register(router_app, path=OTHER_BOTS_PATH)
+    WorkersSupervisor(
+        workers_count,
+        lambda worker_index: spawn_context.Process(
+            target=_run_worker, args=(worker_index,), name=f"multibot-worker-{worker_index}"
         ),
-        send_start_message_to_admins(
-            Bot(main_telegram_bot_settings.TELEGRAM_TOKEN), common_settings.TECH_ADMINS, "Custom bots started!"
-        ),
+    ).register(router_app)
+
+    custom_bot_logger.info(f"Multibot is starting in the sharded mode with {workers_count} workers")
+    web.run_app(
+        router_app,
+        host=custom_telegram_bot_settings.WEBHOOK_SERVER_HOST_TO_REDIRECT,
+        port=custom_telegram_bot_settings.WEBHOOK_SERVER_PORT_TO_REDIRECT,
+        ssl_context=_create_ssl_context(),
+        access_log=None,
+        print=custom_bot_logger.debug,
     )
 
 
 if __name__ == "__main__":
     custom_bot_logger.debug("===== New multibot app session =====\n\n\n\n")
-    asyncio.run(main())
+    if custom_telegram_bot_settings.MULTIBOT_WORKERS > 1:
+        run_sharded(custom_telegram_bot_settings.MULTIBOT_WORKERS)
+    else:
+        asyncio.run(main())
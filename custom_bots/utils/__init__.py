@@ -1 +1,9 @@
-from .bot_restart import restart_custom_bot, BASE_URL, OTHER_BOTS_PATH, OTHER_BOTS_URL, ALLOWED_UPDATES
+from .bot_restart import (
+    restart_custom_bot,
+    restore_custom_bots,
+    WebhookRestoreResult,
+    BASE_URL,
+    OTHER_BOTS_PATH,
+    OTHER_BOTS_URL,
+    ALLOWED_UPDATES,
+)
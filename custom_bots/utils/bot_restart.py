@@ -1,10 +1,19 @@
+import time
+import asyncio
+
+from collections import Counter
+from enum import Enum
+
+from cryptography.fernet import InvalidToken
+
 from aiogram import Bot
 from aiogram.client.session.aiohttp import AiohttpSession
-from aiogram.types import BotCommand, BotCommandScopeAllPrivateChats, MenuButtonWebApp
+from aiogram.types import BotCommand, BotCommandScopeAllPrivateChats, MenuButtonWebApp, WebhookInfo
 
 from common_utils.config import cryptography_settings, custom_telegram_bot_settings
 from common_utils.keyboards.keyboard_utils import make_webapp_info
 from common_utils.token_encryptor import TokenEncryptor
+from common_utils.rate_limiter import RateLimiter
 
 from database.config import option_db
 from database.models.bot_model import BotSchema
@@ -29,37 +38,136 @@ OTHER_BOTS_PATH = f"/{custom_telegram_bot_settings.WEBHOOK_LABEL}/" + "webhook/b
 OTHER_BOTS_URL = f"{BASE_URL}{OTHER_BOTS_PATH}"
 
 
-async def restart_custom_bot(bot: BotSchema, session: AiohttpSession):
+class WebhookRestoreResult(Enum):
+    UNCHANGED = "unchanged"  # webhook, commands and menu button are already up to date
+    UPDATED = "updated"
+    OFFLINE = "offline"  # the bot is not online, nothing is done
+    FAILED = "failed"  # telegram has not set the webhook or the restoration has raised
+
+
+class _NoRateLimit:
+    async def acquire(self) -> None:
+        pass
+
+
+def _is_our_webhook(webhook_info: WebhookInfo, bot_token: str, token_encryptor: TokenEncryptor) -> bool:
+    """Fernet tokens are salted, so the url is compared by the decrypted token from its path"""
+    url_prefix = OTHER_BOTS_URL.format(encrypted_bot_token="")
+    if not webhook_info.url.startswith(url_prefix):
+        return False
+    try:
+        return token_encryptor.decrypt_token(bot_token=webhook_info.url[len(url_prefix) :]) == bot_token
+    except InvalidToken:
+        return False
+
+
+async def restart_custom_bot(
+    bot: BotSchema, session: AiohttpSession, rate_limiter: RateLimiter | None = None
+) -> WebhookRestoreResult:
+    """
+    Sets the webhook, the commands and the menu button of the online bot.
+    Every setting is read first and is changed only if it differs, pending updates are kept
+
+    :param rate_limiter: is acquired before every request to telegram
+    """
+    rate_limiter = rate_limiter or _NoRateLimit()
     tg_bot = Bot(token=bot.token, session=session)
     bot_id = bot.bot_id
 
-    if bot.status == "online":
-        await tg_bot.delete_webhook(drop_pending_updates=True)
-        custom_bot_logger.debug(f"bot_id={bot_id}: webhook is deleted", extra=extra_params(bot_id=bot_id))
+    if bot.status != "online":
+        return WebhookRestoreResult.OFFLINE
+
+    result = WebhookRestoreResult.UNCHANGED
+    token_encryptor: TokenEncryptor = TokenEncryptor(cryptography_settings.TOKEN_SECRET_KEY)
 
-        token_encryptor: TokenEncryptor = TokenEncryptor(cryptography_settings.TOKEN_SECRET_KEY)
-        result = await tg_bot.set_webhook(
+    await rate_limiter.acquire()
+    webhook_info = await tg_bot.get_webhook_info()
+    if _is_our_webhook(webhook_info, bot.token, token_encryptor) and set(webhook_info.allowed_updates or []) == set(
+        ALLOWED_UPDATES
+    ):
+        custom_bot_logger.debug(f"bot_id={bot_id}: webhook is up to date", extra=extra_params(bot_id=bot_id))
+    else:
+        await rate_limiter.acquire()
+        is_set = await tg_bot.set_webhook(
             OTHER_BOTS_URL.format(encrypted_bot_token=token_encryptor.encrypt_token(bot_token=bot.token)),
             allowed_updates=ALLOWED_UPDATES,
         )
-        if result:
-            custom_bot_logger.debug(f"bot_id={bot_id}: webhook is set", extra=extra_params(bot_id=bot_id))
-
-            bot_options = await option_db.get_option(bot.options_id)
+        if not is_set:
+            custom_bot_logger.warning(
+                f"bot_id={bot_id}: webhook's setting is failed", extra=extra_params(bot_id=bot_id)
+            )
+            return WebhookRestoreResult.FAILED
+        custom_bot_logger.debug(f"bot_id={bot_id}: webhook is set", extra=extra_params(bot_id=bot_id))
+        result = WebhookRestoreResult.UPDATED
 
-            commands = []
-            if len(bot_options.languages):
-                commands.append(BotCommand(command="lang", description="select language"))
+    bot_options = await option_db.get_option(bot.options_id)
 
-            if commands:
-                await tg_bot.set_my_commands(commands=commands, scope=BotCommandScopeAllPrivateChats())
-            else:
-                await tg_bot.delete_my_commands()
+    commands = []
+    if len(bot_options.languages):
+        commands.append(BotCommand(command="lang", description="select language"))
 
-            await tg_bot.set_chat_menu_button(
-                menu_button=MenuButtonWebApp(text="Catalog", web_app=make_webapp_info(bot_id))
-            )
+    await rate_limiter.acquire()
+    current_commands = await tg_bot.get_my_commands(scope=BotCommandScopeAllPrivateChats())
+    if [(c.command, c.description) for c in current_commands] != [(c.command, c.description) for c in commands]:
+        await rate_limiter.acquire()
+        if commands:
+            await tg_bot.set_my_commands(commands=commands, scope=BotCommandScopeAllPrivateChats())
         else:
-            custom_bot_logger.warning(
-                f"bot_id={bot_id}: webhook's setting is failed", extra=extra_params(bot_id=bot_id)
+            await tg_bot.delete_my_commands(scope=BotCommandScopeAllPrivateChats())
+        result = WebhookRestoreResult.UPDATED
+
+    menu_button = MenuButtonWebApp(text="Catalog", web_app=make_webapp_info(bot_id))
+    await rate_limiter.acquire()
+    current_menu_button = await tg_bot.get_chat_menu_button()
+    if not (
+        isinstance(current_menu_button, MenuButtonWebApp)
+        and current_menu_button.text == menu_button.text
+        and current_menu_button.web_app.url == menu_button.web_app.url
+    ):
+        await rate_limiter.acquire()
+        await tg_bot.set_chat_menu_button(menu_button=menu_button)
+        result = WebhookRestoreResult.UPDATED
+
+    return result
+
+
+async def restore_custom_bots(
+    bots: list[BotSchema], session: AiohttpSession, concurrency: int, rate: float
+) -> Counter[WebhookRestoreResult]:
+    """
+    Restores the webhooks of all the bots concurrently, logs the progress and the total time
+
+    :param concurrency: bots that are restored at the same time
+    :param rate: requests per second to telegram from all the restorations
+    :return: the count of each result
+    """
+    started_at = time.perf_counter()
+    rate_limiter = RateLimiter(rate=rate, burst=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    results: Counter[WebhookRestoreResult] = Counter()
+    progress_step = max(1, len(bots) // 20)
+
+    async def restore(bot: BotSchema) -> None:
+        async with semaphore:
+            try:
+                results[await restart_custom_bot(bot, session, rate_limiter)] += 1
+            except Exception as e:
+                results[WebhookRestoreResult.FAILED] += 1
+                custom_bot_logger.warning(f"cant restart custom bot ({bot})", exc_info=e)
+
+        done = sum(results.values())
+        if done % progress_step == 0 or done == len(bots):
+            custom_bot_logger.info(
+                f"Webhooks restoring: {done}/{len(bots)} in {time.perf_counter() - started_at:.1f}s "
+                f"(updated={results[WebhookRestoreResult.UPDATED]}, "
+                f"unchanged={results[WebhookRestoreResult.UNCHANGED]}, failed={results[WebhookRestoreResult.FAILED]})"
             )
+
+    await asyncio.gather(*(restore(bot) for bot in bots))
+
+    custom_bot_logger.info(
+        f"Webhooks of {len(bots)} bots are restored in {time.perf_counter() - started_at:.1f}s: "
+        f"updated={results[WebhookRestoreResult.UPDATED]}, unchanged={results[WebhookRestoreResult.UNCHANGED]}, "
+        f"offline={results[WebhookRestoreResult.OFFLINE]}, failed={results[WebhookRestoreResult.FAILED]}"
+    )
+    return results
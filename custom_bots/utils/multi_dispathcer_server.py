@@ -1,14 +1,39 @@
+import asyncio
+import time
+
+from collections import OrderedDict
 from typing import Any, Optional, Dict
 
+from pydantic import BaseModel
+
 from aiohttp import web
 from aiohttp.abc import Application
 
 from aiogram import Bot, Dispatcher
 from aiogram.webhook.aiohttp_server import TokenBasedRequestHandler
 
-from common_utils.config import cryptography_settings
+from common_utils.config import cryptography_settings, custom_telegram_bot_settings
 from common_utils.token_encryptor import TokenEncryptor
 
+from custom_bots.utils.update_executor import (
+    SubmitResult,
+    UpdateExecutor,
+    get_update_order_key,
+    get_update_priority,
+    get_update_coalesce_key,
+)
+
+
+class BotsCacheMetricsSchema(BaseModel):
+    """Snapshot of the Bot instances cache of EncryptedTokenBasedRequestHandler"""
+
+    size: int
+    max_size: int
+
+    hits: int
+    misses: int
+    evictions: int
+
 
 class EncryptedTokenBasedRequestHandler(TokenBasedRequestHandler):
     def __init__(
@@ -16,6 +41,9 @@ class EncryptedTokenBasedRequestHandler(TokenBasedRequestHandler):
         dispatcher: Dispatcher,
         handle_in_background: bool = True,
         bot_settings: Optional[Dict[str, Any]] = None,
+        max_bots: int = custom_telegram_bot_settings.WEBHOOK_BOTS_CACHE_SIZE,
+        bot_ttl: float = custom_telegram_bot_settings.WEBHOOK_BOTS_CACHE_TTL,
+        update_executor: UpdateExecutor | None = None,
         **data: Any,
     ) -> None:
         """
@@ -26,10 +54,39 @@ class EncryptedTokenBasedRequestHandler(TokenBasedRequestHandler):
         :param handle_in_background: immediately responds to the Telegram instead of
             a waiting end of handler process
         :param bot_settings: kwargs that will be passed to new Bot instance
+            (pass the shared "session" there, otherwise every Bot opens its own one)
+        :param max_bots: the least recently used Bot instances are evicted above this size
+        :param bot_ttl: seconds after which an unused Bot instance is evicted
+        :param update_executor: runs the updates if handle_in_background is True (the default one if None)
         """
         super().__init__(dispatcher, handle_in_background, bot_settings, **data)
         self.token_encryptor: TokenEncryptor = TokenEncryptor(cryptography_settings.TOKEN_SECRET_KEY)
 
+        self.max_bots = max_bots
+        self.bot_ttl = bot_ttl
+        self.bots: OrderedDict[str, Bot] = OrderedDict()  # encrypted token -> Bot, the least recently used first
+        self._last_used: dict[str, float] = {}
+        self._closing_sessions: set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.update_executor = update_executor or UpdateExecutor(
+            max_concurrency=custom_telegram_bot_settings.UPDATES_MAX_CONCURRENCY,
+            max_queue_size=custom_telegram_bot_settings.UPDATES_QUEUE_SIZE_PER_BOT,
+            max_low_priority_queue_size=custom_telegram_bot_settings.UPDATES_LOW_PRIORITY_QUEUE_SIZE_PER_BOT,
+            max_low_priority_concurrency=custom_telegram_bot_settings.UPDATES_LOW_PRIORITY_MAX_CONCURRENCY,
+        )
+
+    async def close(self) -> None:
+        """Finishes the queued updates and closes the sessions of the cached bots (the shared one only once)"""
+        await self.update_executor.close()
+
+        sessions = {id(bot.session): bot.session for bot in self.bots.values()}
+        for session in sessions.values():
+            await session.close()
+
     def register(self, app: Application, /, path: str, **kwargs: Any) -> None:
         """
         Validate path, register route and shutdown callback
@@ -44,14 +101,69 @@ class EncryptedTokenBasedRequestHandler(TokenBasedRequestHandler):
 
     async def resolve_bot(self, request: web.Request) -> Bot:
         """
-        Get bot encrypted token from a path and create or get from cache Bot instance
+        Get bot encrypted token from a path and create or get from cache Bot instance.
+        The token is decrypted only if the Bot is not cached
 
         :param request:
         :return:
         """
         encrypted_token = request.match_info["encrypted_bot_token"]
-        token = self.token_encryptor.decrypt_token(bot_token=encrypted_token)
+        now = time.monotonic()
+
+        bot = self.bots.get(encrypted_token)
+        if bot is not None:
+            self.hits += 1
+            self.bots.move_to_end(encrypted_token)
+        else:
+            self.misses += 1
+            token = self.token_encryptor.decrypt_token(bot_token=encrypted_token)  # only on a miss, Fernet is slow
+            bot = Bot(token=token, **self.bot_settings)
+            self.bots[encrypted_token] = bot
+        self._last_used[encrypted_token] = now
+
+        self._evict(now)
+        return bot
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        """Puts the update into the queue of the bot instead of creating an unbounded task"""
+        update = await request.json(loads=bot.session.json_loads)
+
+        submit_result = self.update_executor.submit(
+            bot.id,
+            get_update_order_key(update),
+            lambda: self._background_feed_update(bot=bot, update=update),
+            priority=get_update_priority(update),
+            coalesce_key=get_update_coalesce_key(update),
+        )
+        if submit_result == SubmitResult.SHED:  # telegram will redeliver the update later
+            return web.Response(status=429, headers={"Retry-After": "1"}, text="Too many updates for this bot")
+
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    def get_metrics(self) -> BotsCacheMetricsSchema:
+        return BotsCacheMetricsSchema(
+            size=len(self.bots),
+            max_size=self.max_bots,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+    def _evict(self, now: float) -> None:
+        """Drops the least recently used bots while there are too many of them or they are unused for too long"""
+        while self.bots:
+            encrypted_token = next(iter(self.bots))
+            if len(self.bots) <= self.max_bots and now - self._last_used[encrypted_token] < self.bot_ttl:
+                break
+
+            bot = self.bots.pop(encrypted_token)
+            del self._last_used[encrypted_token]
+            self.evictions += 1
+
+            if "session" not in self.bot_settings:  # the session is not shared, so it belongs only to this bot
+                task = asyncio.create_task(bot.session.close())
+                self._closing_sessions.add(task)
+                task.add_done_callback(self._closing_sessions.discard)
+
 
-        if encrypted_token not in self.bots:
-            self.bots[encrypted_token] = Bot(token=token, **self.bot_settings)
-        return self.bots[encrypted_token]
+WEBHOOK_REQUEST_HANDLER_KEY = web.AppKey("webhook_request_handler", EncryptedTokenBasedRequestHandler)
@@ -1,4 +1,3 @@
-from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.types import Chat
 from aiogram.enums import ParseMode
@@ -15,17 +14,25 @@ from common_utils.bot_utils import create_bot_options
 from common_utils.invoice import create_invoice_params
 from common_utils.message_texts import MessageTexts as CommonMessageTexts
 from common_utils.keyboards.order_manage_keyboards import InlineOrderStatusesKeyboard, InlineOrderCustomBotKeyboard
+from common_utils.bot_pool import bot_pool
 
-from logs.config import extra_params, custom_bot_logger
+from logs.config import extra_params, custom_bot_logger, bind_log_context
 
 
 async def order_creation_process(order: OrderSchema, order_user_data: Chat) -> str | None:
     bot_id = order.bot_id
     user_id = order_user_data.id
+    bind_log_context(bot_id=bot_id, user_id=user_id, order_id=order.id)
 
     custom_bot = await bot_db.get_bot(bot_id)
-    custom_bot_tg = Bot(custom_bot.token)
-    custom_bot_options = await option_db.get_option(custom_bot.options_id)
+    custom_bot_tg = bot_pool.get_bot(custom_bot.token)
+    try:
+        options = await option_db.get_option(custom_bot.options_id)
+    except OptionNotFoundError:
+        new_options_id = await create_bot_options()
+        custom_bot.options_id = new_options_id
+        await bot_db.update_bot(custom_bot)
+        options = await option_db.get_option(new_options_id)
     custom_bot_user = await custom_bot_user_db.get_custom_bot_user(custom_bot.bot_id, order.from_user)
 
     if custom_bot.payment_type in (BotPaymentTypeValues.TG_PROVIDER, BotPaymentTypeValues.STARS):
@@ -39,22 +46,12 @@ async def order_creation_process(order: OrderSchema, order_user_data: Chat) -> s
         products.append((product, order_item.amount, order_item.used_extra_options))
     username = "@" + order_user_data.username if order_user_data.username else order_user_data.full_name
 
-    # TODO Handle exceptions
-    custom_bot = await bot_db.get_bot_by_token(custom_bot.token)
-
     admin_id = custom_bot.created_by
 
     text = await CommonMessageTexts.generate_order_notification_text(order, products, username, True)
     main_msg = await main_bot.send_message(admin_id, **text)
     products_to_refill = []
     products_not_enough = []
-    try:
-        options = await option_db.get_option(custom_bot.options_id)
-    except OptionNotFoundError:
-        new_options_id = await create_bot_options()
-        custom_bot.options_id = new_options_id
-        await bot_db.update_bot(custom_bot)
-        options = await option_db.get_option(new_options_id)
     if options.auto_reduce is True:
         for ind, product_item in enumerate(products, start=1):
             product_schema, amount, extra_options = product_item
@@ -120,7 +117,7 @@ async def order_creation_process(order: OrderSchema, order_user_data: Chat) -> s
                 photo_url=photo_url,
                 order_id=order.id,
             )
-            if custom_bot_options.show_payment_in_webview:
+            if options.show_payment_in_webview:
                 invoice_link = await custom_bot_tg.create_invoice_link(**params)
             else:
                 await custom_bot_tg.send_invoice(chat_id=user_id, **params)
@@ -145,7 +142,7 @@ async def order_creation_process(order: OrderSchema, order_user_data: Chat) -> s
             if "CURRENCY_INVALID" in str(ex):
                 await main_msg.answer(
                     f"❗️ Произошла ошибка при создании платежа, заказ отменен.\n\n"
-                    f"⚠️ Указанная Вами валюта ({custom_bot_options.currency_symbol.value}) "
+                    f"⚠️ Указанная Вами валюта ({options.currency_symbol.value}) "
                     f"не поддерживается платежным провайдером, чей токен Вы указали.",
                 )
             elif "PAYMENT_PROVIDER_INVALID" in str(ex):
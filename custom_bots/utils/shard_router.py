@@ -0,0 +1,150 @@
+import asyncio
+import bisect
+import hashlib
+
+from typing import Callable, Iterable
+from multiprocessing.context import SpawnProcess
+
+import aiohttp
+from aiohttp import web
+
+from logs.config import custom_bot_logger
+
+
+class ConsistentHashRing:
+    """
+    Maps keys to nodes so that adding or removing one of N nodes moves only about 1/N of the keys.
+    Every node is placed on the ring virtual_nodes times to spread the keys evenly
+    """
+
+    def __init__(self, nodes: Iterable[int], virtual_nodes: int = 160) -> None:
+        self.virtual_nodes = virtual_nodes
+        self._ring: list[tuple[int, int]] = []  # (hash, node) sorted by hash
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def add_node(self, node: int) -> None:
+        for replica in range(self.virtual_nodes):
+            bisect.insort(self._ring, (self._hash(f"{node}:{replica}"), node))
+
+    def remove_node(self, node: int) -> None:
+        self._ring = [point for point in self._ring if point[1] != node]
+
+    def get_node(self, key: str) -> int:
+        """
+        :param key: usually the encrypted token from the webhook path
+        :return: the first node clockwise from the hash of the key
+        """
+        if not self._ring:
+            raise LookupError("There are no nodes in the ring")
+        index = bisect.bisect(self._ring, (self._hash(key), -1)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class ShardRouter:
+    """
+    Front webhook server of the sharded multibot. Forwards every webhook request to the worker process
+    chosen by the consistent hash of the encrypted token, so all the updates of a bot are handled
+    by the same worker with its warm caches
+    """
+
+    FORWARDED_REQUEST_HEADERS = ("Content-Type", "X-Telegram-Bot-Api-Secret-Token")
+    FORWARDED_RESPONSE_HEADERS = ("Content-Type", "Retry-After")
+
+    def __init__(self, worker_urls: dict[int, str], connections_limit: int = 100) -> None:
+        """
+        :param worker_urls: index of the worker -> base url of its webhook server
+        :param connections_limit: keep-alive connections from the router to all the workers
+        """
+        self.worker_urls = worker_urls
+        self.connections_limit = connections_limit
+        self.ring = ConsistentHashRing(worker_urls.keys())
+
+        self._session: aiohttp.ClientSession | None = None
+
+    def register(self, app: web.Application, /, path: str) -> None:
+        if "{encrypted_bot_token}" not in path:
+            raise ValueError("Path should contains '{encrypted_bot_token}' substring")
+
+        app.on_startup.append(self._open_session)
+        app.on_cleanup.append(self._close_session)
+        app.router.add_route("POST", path, self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        worker_index = self.ring.get_node(request.match_info["encrypted_bot_token"])
+        headers = {name: request.headers[name] for name in self.FORWARDED_REQUEST_HEADERS if name in request.headers}
+
+        try:
+            async with self._session.post(
+                self.worker_urls[worker_index] + request.path, data=await request.read(), headers=headers
+            ) as response:
+                return web.Response(
+                    status=response.status,
+                    body=await response.read(),
+                    headers={
+                        name: response.headers[name]
+                        for name in self.FORWARDED_RESPONSE_HEADERS
+                        if name in response.headers
+                    },
+                )
+        except aiohttp.ClientError as e:  # telegram will redeliver the update later
+            custom_bot_logger.warning(f"Multibot worker {worker_index} is unavailable", exc_info=e)
+            return web.Response(status=503, text="Worker is unavailable")
+
+    async def _open_session(self, _: web.Application) -> None:
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.connections_limit))
+
+    async def _close_session(self, _: web.Application) -> None:
+        await self._session.close()
+
+
+class WorkersSupervisor:
+    """Starts the worker processes and restarts the ones that died"""
+
+    CHECK_INTERVAL = 5  # seconds
+
+    def __init__(self, workers_count: int, create_process: Callable[[int], SpawnProcess]) -> None:
+        """
+        :param create_process: creates the not started process of the worker with the given index
+        """
+        self.workers_count = workers_count
+        self.create_process = create_process
+
+        self._processes: dict[int, SpawnProcess] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, app: web.Application) -> None:
+        app.on_startup.append(self._start)
+        app.on_cleanup.append(self._stop)
+
+    async def _start(self, _: web.Application) -> None:
+        for worker_index in range(self.workers_count):
+            self._start_worker(worker_index)
+        self._task = asyncio.create_task(self._watch())
+
+    async def _stop(self, _: web.Application) -> None:
+        self._task.cancel()
+        for process in self._processes.values():
+            process.terminate()
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join)
+
+    def _start_worker(self, worker_index: int) -> None:
+        process = self.create_process(worker_index)
+        process.start()
+        self._processes[worker_index] = process
+        custom_bot_logger.info(f"Multibot worker {worker_index} is started with pid={process.pid}")
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.CHECK_INTERVAL)
+            for worker_index, process in self._processes.items():
+                if not process.is_alive():
+                    custom_bot_logger.error(
+                        f"Multibot worker {worker_index} exited with code {process.exitcode}, restarting it"
+                    )
+                    self._start_worker(worker_index)
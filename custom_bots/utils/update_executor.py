@@ -0,0 +1,351 @@
+import time
+import asyncio
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Any, Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+
+from logs.config import custom_bot_logger
+
+
+class UpdatePriority(IntEnum):
+    """Lanes of the updates, the lower value is handled first"""
+
+    HIGH = 0  # payments and orders, telegram waits only 10 seconds for the pre_checkout_query answer
+    NORMAL = 1  # interactive messages and callbacks
+    LOW = 2  # channel membership tracking, can be coalesced or dropped under pressure
+
+
+class SubmitResult(Enum):
+    QUEUED = "queued"
+    COALESCED = "coalesced"  # replaced the queued update with the same coalesce key
+    DROPPED = "dropped"  # the low priority lane is full, the update is ignored
+    SHED = "shed"  # the queue is full, telegram should redeliver the update later
+
+
+class BotQueueMetricsSchema(BaseModel):
+    """Snapshot of the updates queue of one bot"""
+
+    depth: dict[str, int]  # priority name -> queued updates
+    running: int
+
+    processed: int
+    shed: int
+    coalesced: int
+    dropped: int
+    wait_time_total: float  # seconds
+    wait_time_max: float  # seconds
+
+    @property
+    def wait_time_avg(self) -> float:
+        return self.wait_time_total / self.processed if self.processed else 0.0
+
+
+class UpdateExecutorMetricsSchema(BaseModel):
+    """Snapshot of the UpdateExecutor"""
+
+    max_concurrency: int
+    running: dict[str, int]  # priority name -> running updates
+    queued: dict[str, int]
+    wait_time_max: dict[str, float]  # seconds
+    bots: dict[int, BotQueueMetricsSchema]  # telegram bot id -> metrics
+
+
+_HIGH_PRIORITY_UPDATE_TYPES = frozenset({"pre_checkout_query", "shipping_query"})
+# my_chat_member is NORMAL: the dropped update is never redelivered and only it adds or removes the channels of the bot
+_LOW_PRIORITY_UPDATE_TYPES = frozenset({"chat_member", "channel_post", "edited_channel_post"})
+
+
+def _get_update_type(update: dict[str, Any]) -> tuple[str | None, dict[str, Any]]:
+    for key, payload in update.items():
+        if key != "update_id" and isinstance(payload, dict):
+            return key, payload
+    return None, {}
+
+
+def get_update_order_key(update: dict[str, Any]) -> Hashable | None:
+    """
+    :param update: raw telegram update
+    :return: id of the chat (or of the user if there is no chat) the update belongs to.
+        Channel membership updates are ordered only per user, so the joins to a popular channel run concurrently
+    """
+    update_type, payload = _get_update_type(update)
+    if update_type == "chat_member":
+        return payload["chat"]["id"], payload["new_chat_member"]["user"]["id"]
+
+    for chat_holder in (payload, payload.get("message") or {}):
+        chat = chat_holder.get("chat")
+        if chat is not None:
+            return chat["id"]
+    user = payload.get("from")
+    if user is not None:
+        return user["id"]
+    return None
+
+
+def get_update_priority(update: dict[str, Any]) -> UpdatePriority:
+    """
+    :param update: raw telegram update
+    """
+    update_type, payload = _get_update_type(update)
+    if update_type in _HIGH_PRIORITY_UPDATE_TYPES or (update_type == "message" and "web_app_data" in payload):
+        return UpdatePriority.HIGH
+    if update_type in _LOW_PRIORITY_UPDATE_TYPES:
+        return UpdatePriority.LOW
+    return UpdatePriority.NORMAL
+
+
+def get_update_coalesce_key(update: dict[str, Any]) -> Hashable | None:
+    """
+    :param update: raw telegram update
+    :return: key of the updates where only the last one matters or None if the update can't be coalesced.
+        Only the membership of the user in the channel is coalesced, its handlers store the latest state
+    """
+    update_type, payload = _get_update_type(update)
+    if update_type == "chat_member":
+        return update_type, payload["chat"]["id"], payload["new_chat_member"]["user"]["id"]
+    return None
+
+
+@dataclass
+class _Job:
+    order_key: Hashable | None
+    priority: UpdatePriority
+    run: Callable[[], Awaitable[Any]]
+    coalesce_key: Hashable | None = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Lane:
+    jobs: deque[_Job] = field(default_factory=deque)
+    coalescible_jobs: dict[Hashable, _Job] = field(default_factory=dict)
+    credit: int = 0  # how many jobs the bot may still start during its current round-robin turn
+    in_turns: bool = False
+
+
+@dataclass
+class _BotQueue:
+    weight: int
+    lanes: dict[UpdatePriority, _Lane] = field(
+        default_factory=lambda: {priority: _Lane() for priority in UpdatePriority}
+    )
+    active_order_keys: set[Hashable] = field(default_factory=set)
+
+    running: int = 0
+    processed: int = 0
+    shed: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+
+class UpdateExecutor:
+    """
+    Runs updates of the custom bots in the background with the global concurrency limit.
+
+    Every bot has its own bounded queue split into the priority lanes. Workers take the jobs of the highest
+    priority lane first and pick the bots of a lane in the weighted round-robin order
+    (a bot with weight N starts up to N updates per turn), so one busy bot can't starve the others.
+    Updates of the same chat are started only after the previous update of that chat is finished.
+    The order between the lanes is not kept, a payment can overtake an earlier message of the same chat
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue_size: int,
+        max_low_priority_queue_size: int,
+        max_low_priority_concurrency: int,
+        default_weight: int = 1,
+        logger=custom_bot_logger,
+    ) -> None:
+        """
+        :param max_concurrency: updates that are handled at the same time by all the bots
+        :param max_queue_size: high and normal priority updates waiting in their lane of the queue of one bot,
+            the new ones are shed above it
+        :param max_low_priority_queue_size: low priority updates waiting in the queue of one bot,
+            the new ones are dropped above it
+        :param max_low_priority_concurrency: low priority updates that are handled at the same time by all the bots,
+            so the workers are always left for the higher lanes
+        :param default_weight: weight of the bot in the round-robin if it is not set by set_weight
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_low_priority_queue_size = max_low_priority_queue_size
+        self.max_low_priority_concurrency = max_low_priority_concurrency
+        self.default_weight = default_weight
+        self.logger = logger
+
+        self._queues: dict[int, _BotQueue] = {}
+        # telegram ids of the bots that have queued updates in the lane
+        self._turns: dict[UpdatePriority, deque[int]] = {priority: deque() for priority in UpdatePriority}
+        self._running: dict[UpdatePriority, int] = {priority: 0 for priority in UpdatePriority}
+        self._wait_time_max: dict[UpdatePriority, float] = {priority: 0.0 for priority in UpdatePriority}
+        self._has_jobs = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    def set_weight(self, telegram_bot_id: int, weight: int) -> None:
+        self._get_queue(telegram_bot_id).weight = weight
+
+    def submit(
+        self,
+        telegram_bot_id: int,
+        order_key: Hashable | None,
+        run: Callable[[], Awaitable[Any]],
+        priority: UpdatePriority = UpdatePriority.NORMAL,
+        coalesce_key: Hashable | None = None,
+    ) -> SubmitResult:
+        """
+        :param telegram_bot_id: id of the bot from its token
+        :param order_key: updates with the same key (usually chat id) are run one by one in the order of submitting
+        :param run: coroutine function that handles the update
+        :param priority: lane of the update
+        :param coalesce_key: the queued update with the same key is replaced by this one
+        """
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.max_concurrency)]
+
+        queue = self._get_queue(telegram_bot_id)
+        lane = queue.lanes[priority]
+
+        if coalesce_key is not None and coalesce_key in lane.coalescible_jobs:
+            lane.coalescible_jobs[coalesce_key].run = run  # keeps the place in the queue
+            queue.coalesced += 1
+            return SubmitResult.COALESCED
+
+        match priority:
+            case UpdatePriority.HIGH | UpdatePriority.NORMAL if len(lane.jobs) >= self.max_queue_size:
+                queue.shed += 1
+                self.logger.warning(f"telegram_bot_id={telegram_bot_id}: updates queue is full, the update is shed")
+                return SubmitResult.SHED
+            case UpdatePriority.LOW if len(lane.jobs) >= self.max_low_priority_queue_size:
+                queue.dropped += 1
+                return SubmitResult.DROPPED
+
+        job = _Job(order_key=order_key, priority=priority, run=run, coalesce_key=coalesce_key)
+        lane.jobs.append(job)
+        if coalesce_key is not None:
+            lane.coalescible_jobs[coalesce_key] = job
+        if not lane.in_turns:
+            lane.in_turns = True
+            self._turns[priority].append(telegram_bot_id)
+        self._has_jobs.set()
+
+        return SubmitResult.QUEUED
+
+    def get_metrics(self) -> UpdateExecutorMetricsSchema:
+        return UpdateExecutorMetricsSchema(
+            max_concurrency=self.max_concurrency,
+            running={priority.name.lower(): running for priority, running in self._running.items()},
+            queued={
+                priority.name.lower(): sum(len(queue.lanes[priority].jobs) for queue in self._queues.values())
+                for priority in UpdatePriority
+            },
+            wait_time_max={priority.name.lower(): wait_time for priority, wait_time in self._wait_time_max.items()},
+            bots={
+                telegram_bot_id: BotQueueMetricsSchema(
+                    depth={priority.name.lower(): len(lane.jobs) for priority, lane in queue.lanes.items()},
+                    running=queue.running,
+                    processed=queue.processed,
+                    shed=queue.shed,
+                    coalesced=queue.coalesced,
+                    dropped=queue.dropped,
+                    wait_time_total=queue.wait_time_total,
+                    wait_time_max=queue.wait_time_max,
+                )
+                for telegram_bot_id, queue in self._queues.items()
+            },
+        )
+
+    async def close(self, timeout: float = 10) -> None:
+        """Waits up to timeout seconds for the queued updates and cancels the rest"""
+        deadline = time.monotonic() + timeout
+        while self._has_queued_or_running() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        dropped = sum(len(lane.jobs) for queue in self._queues.values() for lane in queue.lanes.values())
+        self.logger.info(f"UpdateExecutor is closed, {dropped} queued updates are dropped")
+
+    def _has_queued_or_running(self) -> bool:
+        return any(self._turns.values()) or any(self._running.values())
+
+    def _get_queue(self, telegram_bot_id: int) -> _BotQueue:
+        queue = self._queues.get(telegram_bot_id)
+        if queue is None:
+            queue = self._queues[telegram_bot_id] = _BotQueue(weight=self.default_weight)
+        return queue
+
+    def _next_job(self) -> tuple[_BotQueue, _Job] | None:
+        """Takes the first job whose chat is not busy from the highest lane in the weighted round-robin order"""
+        for priority, turns in self._turns.items():
+            if priority == UpdatePriority.LOW and self._running[priority] >= self.max_low_priority_concurrency:
+                continue
+
+            for _ in range(len(turns)):
+                queue = self._queues[turns[0]]
+                lane = queue.lanes[priority]
+
+                job_index = next(
+                    (ind for ind, job in enumerate(lane.jobs) if job.order_key not in queue.active_order_keys), None
+                )
+                if job_index is None:  # all the queued chats of the bot are busy
+                    lane.credit = 0
+                    turns.rotate(-1)
+                    continue
+
+                job = lane.jobs[job_index]
+                del lane.jobs[job_index]
+                if job.coalesce_key is not None:
+                    del lane.coalescible_jobs[job.coalesce_key]
+
+                if lane.credit <= 0:
+                    lane.credit = queue.weight
+                lane.credit -= 1
+                if not lane.jobs:
+                    lane.credit = 0
+                    lane.in_turns = False
+                    turns.popleft()
+                elif lane.credit == 0:
+                    turns.rotate(-1)
+
+                return queue, job
+        return None
+
+    async def _work(self) -> None:
+        while True:
+            next_job = self._next_job()
+            if next_job is None:
+                self._has_jobs.clear()
+                await self._has_jobs.wait()
+                continue
+
+            queue, job = next_job
+            waited = time.monotonic() - job.enqueued_at
+            queue.wait_time_total += waited
+            queue.wait_time_max = max(queue.wait_time_max, waited)
+            self._wait_time_max[job.priority] = max(self._wait_time_max[job.priority], waited)
+
+            if job.order_key is not None:
+                queue.active_order_keys.add(job.order_key)
+            queue.running += 1
+            self._running[job.priority] += 1
+            try:
+                await job.run()
+            except Exception as e:  # noqa
+                self.logger.error("Error while handling the update in background", exc_info=e)
+            finally:
+                queue.running -= 1
+                queue.processed += 1
+                self._running[job.priority] -= 1
+                queue.active_order_keys.discard(job.order_key)
+                self._has_jobs.set()  # the jobs of this chat could be waiting
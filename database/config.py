@@ -2,6 +2,7 @@ from common_utils.config import database_settings
 
 from database.models.models import Database
 from database.models.bot_model import BotDao
+from database.models.bot_registry import BotRegistry
 from database.models.user_model import UserDao
 from database.models.order_model import OrderDao
 from database.models.option_model import OptionDao
@@ -23,12 +24,16 @@ from database.models.custom_bot_user_model import CustomBotUserDao
 from database.models.post_message_media_files import PostMessageMediaFileDao
 from database.models.order_choose_option_model import OrderChooseOptionDao
 from database.models.referral_invite_model import ReferralInviteDao
+from database.models.telegram_username_model import TelegramUsernameDao
+from database.models.bot_media_file_model import BotMediaFileDao
+from database.models.catalog_version_model import CatalogVersionDao
 
 from logs.config import db_logger
 
 db_engine: Database = Database(database_settings.SQLALCHEMY_URL, db_logger)
 
 bot_db: BotDao = db_engine.get_bot_dao()
+bot_registry: BotRegistry = db_engine.get_bot_registry()
 user_db: UserDao = db_engine.get_user_dao()
 order_db: OrderDao = db_engine.get_order_dao()
 pay_db: PaymentDao = db_engine.get_payment_dao()
@@ -50,3 +55,6 @@ custom_bot_user_db: CustomBotUserDao = db_engine.get_custom_bot_user_db()
 referral_invite_db: ReferralInviteDao = db_engine.get_referral_invite_dao()
 order_choose_option_db: OrderChooseOptionDao = db_engine.get_order_choose_option_dao()
 post_message_media_file_db: PostMessageMediaFileDao = db_engine.get_post_message_media_file_dao()
+telegram_username_db: TelegramUsernameDao = db_engine.get_telegram_username_dao()
+bot_media_file_db: BotMediaFileDao = db_engine.get_bot_media_file_dao()
+catalog_version_db: CatalogVersionDao = db_engine.get_catalog_version_dao()
@@ -0,0 +1,82 @@
+from pydantic import validate_call
+
+from sqlalchemy import Column, ForeignKey, String, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.models import Base
+from database.models.dao import Dao
+from database.models.bot_model import Bot
+
+from logs.config import extra_params
+
+
+class BotMediaFile(Base):
+    """
+    file_id of the media file uploaded through the custom bot. The file is addressed by its file_unique_id that
+    telegram keeps the same for all the bots, so the asset is uploaded to every bot only once
+    """
+
+    __tablename__ = "bot_media_files"
+
+    bot_id = Column(ForeignKey(Bot.bot_id, ondelete="CASCADE"), primary_key=True)
+    file_unique_id = Column(String, primary_key=True)
+    file_id = Column(String, nullable=False)
+
+
+class BotMediaFileDao(Dao):
+    def __init__(self, engine: AsyncEngine, logger) -> None:
+        super().__init__(engine, logger)
+
+    @validate_call(validate_return=True)
+    async def get_file_ids(self, bot_id: int, file_unique_ids: list[str]) -> dict[str, str]:
+        """
+        :return: file_unique_id -> file_id of the custom bot for the files already uploaded through it
+        """
+        if not file_unique_ids:
+            return {}
+
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                select(BotMediaFile.file_unique_id, BotMediaFile.file_id).where(
+                    BotMediaFile.bot_id == bot_id, BotMediaFile.file_unique_id.in_(file_unique_ids)
+                )
+            )
+
+        res = {file_unique_id: file_id for file_unique_id, file_id in raw_res.fetchall()}
+
+        self.logger.debug(
+            "bot_id=%s: found %s of %s uploaded media files",
+            bot_id,
+            len(res),
+            len(file_unique_ids),
+            extra=extra_params(bot_id=bot_id),
+        )
+
+        return res
+
+    @validate_call(validate_return=True)
+    async def save_file_ids(self, bot_id: int, file_ids: dict[str, str]) -> None:
+        """
+        :param file_ids: file_unique_id -> file_id of the custom bot
+        """
+        if not file_ids:
+            return
+
+        statement = insert(BotMediaFile).values(
+            [
+                {"bot_id": bot_id, "file_unique_id": file_unique_id, "file_id": file_id}
+                for file_unique_id, file_id in file_ids.items()
+            ]
+        )
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[BotMediaFile.bot_id, BotMediaFile.file_unique_id],
+                    set_={"file_id": statement.excluded.file_id},
+                )
+            )
+
+        self.logger.debug(
+            "bot_id=%s: saved %s uploaded media files", bot_id, len(file_ids), extra=extra_params(bot_id=bot_id)
+        )
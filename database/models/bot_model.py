@@ -4,12 +4,12 @@ from enum import Enum
 
 from aiogram.utils.token import validate_token
 
-from typing import Optional
+from typing import Callable, Optional
 
 from sqlalchemy import BigInteger, Column, String, DateTime, JSON, ForeignKey, Unicode, Dialect, TypeDecorator
-from sqlalchemy import select, update, delete, insert
+from sqlalchemy import select, update, delete, insert, func
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
 from pydantic import BaseModel, Field, ConfigDict, validate_call
 
@@ -24,6 +24,8 @@ from database.exceptions.exceptions import KwargsException
 
 from logs.config import extra_params
 
+BOT_CHANGES_CHANNEL = "bot_changes"  # Postgres NOTIFY channel, the payload is bot_id of the changed bot
+
 
 class BotNotFoundError(KwargsException):
     """Raised when provided bot not found in database"""
@@ -88,12 +90,21 @@ class DatabaseBotTokenEncryptor(TypeDecorator):  # noqa
         """
         return self._encryptor.decrypt_token(bot_token=value)
 
+    @classmethod
+    def fingerprint_token(cls, bot_token: str) -> str:
+        """
+        :param bot_token: decrypted token
+        :return: keyed hash of the token that is stored in Bot.token_fingerprint
+        """
+        return cls._encryptor.fingerprint_token(bot_token=bot_token)
+
 
 class Bot(Base):
     __tablename__ = "bots"
 
     bot_id = Column(BigInteger, primary_key=True, autoincrement=True)
     bot_token = Column(DatabaseBotTokenEncryptor, unique=True)
+    token_fingerprint = Column(String(64), unique=True)  # is used for the indexed search by token
     status = Column(String(55), nullable=False)
     created_at = Column(DateTime, nullable=False)
     created_by = Column(ForeignKey(User.user_id, ondelete="CASCADE"), nullable=False)
@@ -130,6 +141,24 @@ class BotDao(Dao):
     def __init__(self, engine: AsyncEngine, logger) -> None:
         super().__init__(engine, logger)
 
+        self._change_listeners: list[Callable[[int], None]] = []
+
+    def add_change_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        :param listener: is called with bot_id after every add/update/delete of the bot made by this process
+        """
+        self._change_listeners.append(listener)
+
+    async def _notify_bot_changed(self, conn: AsyncConnection, bot_id: int) -> None:
+        """
+        Sends NOTIFY to the other processes (it is delivered only after the commit of conn's transaction)
+        and calls the local change listeners
+        """
+        await conn.execute(select(func.pg_notify(BOT_CHANGES_CHANNEL, str(bot_id))))
+
+        for listener in self._change_listeners:
+            listener(bot_id)
+
     @validate_call(validate_return=True)
     async def get_bots(self, user_id: int | None = None) -> list[BotSchema]:
         """
@@ -141,14 +170,13 @@ class BotDao(Dao):
                 raw_res = await conn.execute(select(Bot).where(Bot.created_by == user_id))
             else:
                 raw_res = await conn.execute(select(Bot))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for bot in raw_res:
             res.append(BotSchema.model_validate(bot))
 
-        self.logger.debug(f"user_id={user_id}: has {len(res)} bots", extra=extra_params(user_id=user_id))
+        self.logger.debug("user_id=%s: has %s bots", user_id, len(res), extra=extra_params(user_id=user_id))
 
         return res
 
@@ -162,13 +190,12 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Bot).where(Bot.bot_id == bot_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
             raise BotNotFoundError(bot_id=bot_id)
 
-        self.logger.debug(f"bot_id={bot_id}: bot {bot_id} is found", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: bot %s is found", bot_id, bot_id, extra=extra_params(bot_id=bot_id))
 
         return BotSchema.model_validate(res)
 
@@ -179,7 +206,6 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Bot).where(Bot.admin_invite_link_hash == link_hash))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -197,7 +223,6 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Bot).where(Bot.created_by == created_by))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -206,14 +231,16 @@ class BotDao(Dao):
         res = BotSchema.model_validate(res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: bot with created_by={created_by} is found",
+            "bot_id=%s: bot with created_by=%s is found",
+            res.bot_id,
+            created_by,
             extra=extra_params(bot_id=res.bot_id, user_id=created_by),
         )
 
         return res
 
     @validate_call(validate_return=True)
-    async def get_bot_by_token(self, bot_token: str) -> BotSchema:  # TODO hot fix. Change crypto
+    async def get_bot_by_token(self, bot_token: str) -> BotSchema:
         """
         :param bot_token: telegram token of the Bot
         :return: BotSchema
@@ -224,26 +251,19 @@ class BotDao(Dao):
         validate_token(bot_token)
 
         async with self.engine.begin() as conn:
-            # raw_res = await conn.execute(select(Bot).where(Bot.bot_token == bot_token))
-            raw_res = await conn.execute(select(Bot))
-        await self.engine.dispose()
-
-        # res = raw_res.fetchone()
-        results = raw_res.fetchall()
-        for bot_res in results:
-            res: BotSchema = BotSchema.model_validate(bot_res)
-            if res.token == bot_token:
-                break
-        else:
-            raise BotNotFoundError(bot_token=bot_token)
+            raw_res = await conn.execute(
+                select(Bot).where(Bot.token_fingerprint == DatabaseBotTokenEncryptor.fingerprint_token(bot_token))
+            )
 
-        # if res is None:
-        #     raise BotNotFoundError(bot_token=bot_token)
+        res = raw_res.fetchone()
+        if res is None:
+            raise BotNotFoundError(bot_token=bot_token)
 
-        # res = BotSchema.model_validate(res)
+        res = BotSchema.model_validate(res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: bot with bot_token={bot_token} is found",
+            "bot_id=%s: bot is found by bot_token",
+            res.bot_id,
             extra=extra_params(bot_id=res.bot_id, bot_token=bot_token),
         )
 
@@ -260,16 +280,21 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             try:
-                bot_id = (await conn.execute(insert(Bot).values(**bot.model_dump(by_alias=True)))).inserted_primary_key[
-                    0
-                ]
+                bot_id = (
+                    await conn.execute(
+                        insert(Bot).values(
+                            **bot.model_dump(by_alias=True),
+                            token_fingerprint=DatabaseBotTokenEncryptor.fingerprint_token(bot.token),
+                        )
+                    )
+                ).inserted_primary_key[0]
             except IntegrityError as e:
                 raise BotIntegrityError(bot_token=bot.token, e=e)
 
-        await self.engine.dispose()
+            await self._notify_bot_changed(conn, bot_id)
 
         self.logger.debug(
-            f"bot_id={bot_id}: bot {bot_id} is added to", extra=extra_params(user_id=bot.created_by, bot_id=bot_id)
+            "bot_id=%s: bot %s is added to", bot_id, bot_id, extra=extra_params(user_id=bot.created_by, bot_id=bot_id)
         )
 
         return bot_id
@@ -283,12 +308,19 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(
-                update(Bot).where(Bot.bot_id == updated_bot.bot_id).values(**updated_bot.model_dump(by_alias=True))
+                update(Bot)
+                .where(Bot.bot_id == updated_bot.bot_id)
+                .values(
+                    **updated_bot.model_dump(by_alias=True),
+                    token_fingerprint=DatabaseBotTokenEncryptor.fingerprint_token(updated_bot.token),
+                )
             )
-        await self.engine.dispose()
+            await self._notify_bot_changed(conn, updated_bot.bot_id)
 
         self.logger.debug(
-            f"bot_id={updated_bot.bot_id}: bot {updated_bot.bot_id} is updated",
+            "bot_id=%s: bot %s is updated",
+            updated_bot.bot_id,
+            updated_bot.bot_id,
             extra=extra_params(user_id=updated_bot.created_by, bot_id=updated_bot.bot_id),
         )
 
@@ -301,9 +333,9 @@ class BotDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(delete(Bot).where(Bot.bot_id == bot_id))
-        await self.engine.dispose()
+            await self._notify_bot_changed(conn, bot_id)
 
-        self.logger.debug(f"bot_id={bot_id}: bot {bot_id} is deleted", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: bot %s is deleted", bot_id, bot_id, extra=extra_params(bot_id=bot_id))
 
     @validate_call(validate_return=True)
     async def clear_table(self) -> None:
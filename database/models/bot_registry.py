@@ -0,0 +1,269 @@
+import asyncio
+
+from typing import Callable
+
+import asyncpg
+
+from aiogram.utils.token import validate_token
+
+from pydantic import BaseModel
+
+from sqlalchemy.engine import make_url
+
+from database.models.bot_model import BotDao, BotSchema, DatabaseBotTokenEncryptor, BOT_CHANGES_CHANNEL
+from database.models.catalog_version_model import CatalogVersionDao, CATALOG_CHANGES_CHANNEL
+
+from logs.config import extra_params
+
+
+class BotRegistryMetricsSchema(BaseModel):
+    """Snapshot of the bot registry usage"""
+
+    is_listening: bool
+    cached_bots: int
+    cached_catalog_versions: int
+
+    hits: int
+    misses: int
+    invalidations: int
+    reconnects: int
+
+
+class BotRegistry:
+    """
+    In-process cache of the bots keyed by bot_id and by token fingerprint and of the catalog versions of the bots.
+
+    Entries are invalidated by BotDao (CatalogVersionDao) of the current process immediately and by the Postgres
+    NOTIFY events sent by the daos of the other processes (api, main bot, custom bots).
+    Until start_listening() is called (or while the listening connection is lost) the cache is bypassed,
+    so the registry never serves a bot that could have been changed without notification.
+
+    The listening connection also delivers the notifications of the other channels to the listeners added by
+    add_notification_listener
+    """
+
+    RECONNECT_DELAY = 1  # seconds, is doubled after every failed attempt
+    RECONNECT_MAX_DELAY = 30
+
+    def __init__(self, bot_dao: BotDao, catalog_version_dao: CatalogVersionDao, sqlalchemy_url: str, logger) -> None:
+        self.bot_dao = bot_dao
+        self.catalog_version_dao = catalog_version_dao
+        self.sqlalchemy_url = sqlalchemy_url
+        self.logger = logger
+
+        self._bots_by_id: dict[int, BotSchema] = {}
+        self._bot_ids_by_fingerprint: dict[str, int] = {}
+        self._generation = 0  # is increased on every invalidation to drop the results of the concurrent loads
+        self._catalog_versions: dict[int, int] = {}
+        self._catalog_generation = 0
+
+        self._notification_listeners: dict[str, list[Callable[[str], None]]] = {}  # channel -> listeners
+        self._connection: asyncpg.Connection | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._is_stopped = True
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.reconnects = 0
+
+        self.bot_dao.add_change_listener(self.invalidate)
+        self.catalog_version_dao.add_change_listener(self.invalidate_catalog_version)
+
+    @property
+    def is_listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def get_bot(self, bot_id: int) -> BotSchema:
+        """
+        The same as BotDao.get_bot but is served from memory if the bot has not been changed since the last call
+
+        :raises BotNotFoundError:
+        """
+        bot = self._bots_by_id.get(bot_id) if self.is_listening else None
+        if bot is not None:
+            self.hits += 1
+            return bot.model_copy()
+
+        self.misses += 1
+        generation = self._generation
+        bot = await self.bot_dao.get_bot(bot_id)
+        self._store(bot, generation)
+
+        return bot.model_copy()
+
+    async def get_bot_by_token(self, bot_token: str) -> BotSchema:
+        """
+        The same as BotDao.get_bot_by_token but is served from memory if the bot has not been changed since the last
+        call
+
+        :raises BotNotFoundError:
+        :raises TokenValidationError:
+        """
+        validate_token(bot_token)
+
+        bot = None
+        if self.is_listening:
+            bot_id = self._bot_ids_by_fingerprint.get(DatabaseBotTokenEncryptor.fingerprint_token(bot_token))
+            bot = self._bots_by_id.get(bot_id) if bot_id is not None else None
+        if bot is not None:
+            self.hits += 1
+            return bot.model_copy()
+
+        self.misses += 1
+        generation = self._generation
+        bot = await self.bot_dao.get_bot_by_token(bot_token)
+        self._store(bot, generation)
+
+        return bot.model_copy()
+
+    async def get_catalog_version(self, bot_id: int) -> int:
+        """The same as CatalogVersionDao.get_catalog_version but is served from memory while listening"""
+        version = self._catalog_versions.get(bot_id) if self.is_listening else None
+        if version is not None:
+            self.hits += 1
+            return version
+
+        self.misses += 1
+        generation = self._catalog_generation
+        version = await self.catalog_version_dao.get_catalog_version(bot_id)
+        if self.is_listening and generation == self._catalog_generation:
+            self._catalog_versions[bot_id] = version
+
+        return version
+
+    def invalidate_catalog_version(self, bot_id: int) -> None:
+        """Drops the catalog version from the cache. Is called by CatalogVersionDao before the commit of the change"""
+        self._catalog_generation += 1
+        self.invalidations += 1
+        self._catalog_versions.pop(bot_id, None)
+
+    def invalidate(self, bot_id: int) -> None:
+        """Drops the bot from the cache. Is called by BotDao and by NOTIFY events"""
+        self._generation += 1
+        self.invalidations += 1
+
+        bot = self._bots_by_id.pop(bot_id, None)
+        if bot is not None:
+            self._bot_ids_by_fingerprint.pop(DatabaseBotTokenEncryptor.fingerprint_token(bot.token), None)
+
+        self.logger.debug("bot_id=%s: bot is invalidated in the registry", bot_id, extra=extra_params(bot_id=bot_id))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._bots_by_id.clear()
+        self._bot_ids_by_fingerprint.clear()
+
+        self._catalog_generation += 1
+        self._catalog_versions.clear()
+
+    def get_metrics(self) -> BotRegistryMetricsSchema:
+        return BotRegistryMetricsSchema(
+            is_listening=self.is_listening,
+            cached_bots=len(self._bots_by_id),
+            cached_catalog_versions=len(self._catalog_versions),
+            hits=self.hits,
+            misses=self.misses,
+            invalidations=self.invalidations,
+            reconnects=self.reconnects,
+        )
+
+    def add_notification_listener(self, channel: str, listener: Callable[[str], None]) -> None:
+        """
+        Must be called before start_listening. The notifications sent while the connection is lost are missed
+
+        :param channel: Postgres NOTIFY channel
+        :param listener: is called with the payload of every notification of the channel
+        """
+        self._notification_listeners.setdefault(channel, []).append(listener)
+
+    async def start_listening(self) -> None:
+        """Opens the dedicated connection that LISTENs to the bot changes. The cache is used only after that"""
+        self._is_stopped = False
+        await self._listen()
+
+    async def stop_listening(self) -> None:
+        """Closes the listening connection and turns the cache off"""
+        self._is_stopped = True
+
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+        self.clear()
+
+    async def _listen(self) -> None:
+        # asyncpg does not understand the "postgresql+asyncpg" scheme of SQLAlchemy
+        dsn = make_url(self.sqlalchemy_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+        connection = await asyncpg.connect(dsn)
+        connection.add_termination_listener(self._on_connection_lost)
+        await connection.add_listener(BOT_CHANGES_CHANNEL, self._on_notification)
+        await connection.add_listener(CATALOG_CHANGES_CHANNEL, self._on_catalog_notification)
+        for channel in self._notification_listeners:
+            await connection.add_listener(channel, self._on_other_notification)
+
+        self.clear()  # the bots could have been changed while the registry was not listening
+        self._connection = connection
+
+        self.logger.info("Bot registry is listening to the '%s' channel", BOT_CHANGES_CHANNEL)
+
+    def _on_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:  # noqa
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            self.logger.warning(f"Bot registry got unexpected payload={payload}, clearing the cache")
+            self.clear()
+
+    def _on_catalog_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:  # noqa
+        """The payload has the committed version, so it is stored without the query"""
+        try:
+            bot_id, version = map(int, payload.split(":"))
+        except ValueError:
+            self.logger.warning(f"Bot registry got unexpected catalog payload={payload}, clearing the cache")
+            self.clear()
+            return
+
+        self._catalog_generation += 1
+        self._catalog_versions[bot_id] = max(version, self._catalog_versions.get(bot_id, 0))
+
+    def _on_other_notification(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:  # noqa
+        for listener in self._notification_listeners.get(channel, []):
+            try:
+                listener(payload)
+            except Exception as e:  # noqa
+                self.logger.error(f"Error in the listener of the '{channel}' channel, payload={payload}", exc_info=e)
+
+    def _on_connection_lost(self, connection: asyncpg.Connection) -> None:  # noqa
+        self._connection = None
+        self.clear()
+
+        if self._is_stopped:
+            return
+
+        self.logger.warning("Bot registry has lost the listening connection, the cache is turned off until reconnect")
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_DELAY
+        while not self._is_stopped:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                self.reconnects += 1
+                return
+            except (OSError, asyncpg.PostgresError) as e:
+                self.logger.warning(f"Bot registry failed to reconnect, retrying in {delay}s", exc_info=e)
+                delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    def _store(self, bot: BotSchema, generation: int) -> None:
+        if not self.is_listening or generation != self._generation:
+            return  # the bot could have been changed while it was loading
+
+        self._bots_by_id[bot.bot_id] = bot
+        self._bot_ids_by_fingerprint[DatabaseBotTokenEncryptor.fingerprint_token(bot.token)] = bot.bot_id
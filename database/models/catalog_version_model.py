@@ -0,0 +1,85 @@
+from typing import Callable
+
+from pydantic import validate_call
+
+from sqlalchemy import BigInteger, Column, Select, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
+
+from database.models import Base
+from database.models.dao import Dao
+
+from logs.config import extra_params
+
+CATALOG_CHANGES_CHANNEL = "catalog_changes"  # Postgres NOTIFY channel, the payload is "bot_id:version"
+
+
+class CatalogVersion(Base):
+    """
+    Version of the web app catalog of the bot (products, categories, options, order options), is increased by
+    every change of them. The API derives the ETags from it, so the unchanged catalog is not queried again.
+    The row is kept after the bot is deleted, so the re-added bot never gets the version of the old catalog
+    """
+
+    __tablename__ = "catalog_versions"
+
+    bot_id = Column(BigInteger, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+
+
+class CatalogVersionDao(Dao):
+    def __init__(self, engine: AsyncEngine, logger) -> None:
+        super().__init__(engine, logger)
+
+        self._change_listeners: list[Callable[[int], None]] = []
+
+    def add_change_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        :param listener: is called with bot_id after every change of the catalog made by this process
+        """
+        self._change_listeners.append(listener)
+
+    @validate_call(validate_return=True)
+    async def get_catalog_version(self, bot_id: int) -> int:
+        """
+        :return: version of the catalog, 0 if the catalog has never been changed
+        """
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(select(CatalogVersion.version).where(CatalogVersion.bot_id == bot_id))
+
+        res = raw_res.scalar() or 0
+
+        self.logger.debug("bot_id=%s: catalog version is %s", bot_id, res, extra=extra_params(bot_id=bot_id))
+
+        return res
+
+    async def bump_catalog_versions(self, conn: AsyncConnection, bot_ids: int | Select) -> None:
+        """
+        Is called by the catalog daos inside the transaction of the change.
+        Sends NOTIFY to the other processes (it is delivered only after the commit of conn's transaction)
+        and calls the local change listeners
+
+        :param bot_ids: bot_id or the query selecting bot_ids of the changed catalogs
+        """
+        if isinstance(bot_ids, int):
+            bot_ids = select(literal(bot_ids, BigInteger))
+
+        changed_bots = bot_ids.subquery()
+        statement = insert(CatalogVersion).from_select(
+            [CatalogVersion.bot_id, CatalogVersion.version],
+            select(changed_bots.c[0], literal(1, BigInteger)).distinct(),
+        )
+        raw_res = await conn.execute(
+            statement.on_conflict_do_update(
+                index_elements=[CatalogVersion.bot_id], set_={"version": CatalogVersion.version + 1}
+            ).returning(CatalogVersion.bot_id, CatalogVersion.version)
+        )
+
+        for bot_id, version in raw_res.fetchall():
+            await conn.execute(select(func.pg_notify(CATALOG_CHANGES_CHANNEL, f"{bot_id}:{version}")))
+            for listener in self._change_listeners:
+                listener(bot_id)
+
+            self.logger.debug(
+                "bot_id=%s: catalog version is bumped to %s", bot_id, version, extra=extra_params(bot_id=bot_id)
+            )
@@ -8,8 +8,9 @@ from database.exceptions.exceptions import KwargsException
 from database.models import Base
 from database.models.dao import Dao
 from database.models.bot_model import Bot
+from database.models.catalog_version_model import CatalogVersionDao
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class CategoryNotFoundError(KwargsException):
@@ -40,8 +41,9 @@ class CategorySchema(CategorySchemaWithoutId):
 
 
 class CategoryDao(Dao):  # TODO write tests
-    def __init__(self, engine: AsyncEngine, logger) -> None:
+    def __init__(self, engine: AsyncEngine, logger, catalog_version_dao: CatalogVersionDao) -> None:
         super().__init__(engine, logger)
+        self.catalog_version_dao = catalog_version_dao
 
     @validate_call(validate_return=True)
     async def get_all_categories(self, bot_id: int) -> list[CategorySchema]:
@@ -52,14 +54,13 @@ class CategoryDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Category).where(Category.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for category in raw_res:
             res.append(CategorySchema.model_validate(category))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} categories", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s categories", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -73,7 +74,6 @@ class CategoryDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Category).where(Category.id == category_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -81,7 +81,10 @@ class CategoryDao(Dao):  # TODO write tests
 
         res = CategorySchema.model_validate(res)
         self.logger.debug(
-            f"category_id={category_id}: found category {res}", extra=extra_params(category_id=category_id)
+            "category_id=%s: found category %s",
+            category_id,
+            LazyPayload(res),
+            extra=extra_params(category_id=category_id),
         )
 
         return res
@@ -99,9 +102,12 @@ class CategoryDao(Dao):  # TODO write tests
                         category_name=new_category.name, bot_id=new_category.bot_id, category_id=cat.id
                     )
             cat_id = (await conn.execute(insert(Category).values(new_category.model_dump()))).inserted_primary_key[0]
+            await self.catalog_version_dao.bump_catalog_versions(conn, new_category.bot_id)
 
         self.logger.debug(
-            f"category_id={cat_id}: new added category {new_category}",
+            "category_id=%s: new added category %s",
+            cat_id,
+            LazyPayload(new_category),
             extra=extra_params(bot_id=new_category.bot_id, category_id=cat_id),
         )
 
@@ -122,9 +128,12 @@ class CategoryDao(Dao):  # TODO write tests
                     category_name=updated_category.name, bot_id=bot_id, category_id=category_id
                 )
             await conn.execute(update(Category).where(Category.id == category_id).values(updated_category.model_dump()))
+            await self.catalog_version_dao.bump_catalog_versions(conn, bot_id)
 
         self.logger.debug(
-            f"category_id={category_id}: updated category {updated_category}",
+            "category_id=%s: updated category %s",
+            category_id,
+            LazyPayload(updated_category),
             extra=extra_params(bot_id=bot_id, category_id=category_id),
         )
 
@@ -134,8 +143,11 @@ class CategoryDao(Dao):  # TODO write tests
         Deletes the category from database
         """
         async with self.engine.begin() as conn:
+            await self.catalog_version_dao.bump_catalog_versions(
+                conn, select(Category.bot_id).where(Category.id == category_id)
+            )
             await conn.execute(delete(Category).where(Category.id == category_id))
 
         self.logger.debug(
-            f"category_id={category_id}: deleted category {category_id}", extra=extra_params(category_id=category_id)
+            "category_id=%s: deleted category %s", category_id, category_id, extra=extra_params(category_id=category_id)
         )
@@ -8,7 +8,7 @@ from database.models.dao import Dao
 from database.models.bot_model import Bot
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ChannelNotFoundError(KwargsException):
@@ -46,14 +46,13 @@ class ChannelDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Channel).where(Channel.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for channel in raw_res:
             res.append(ChannelSchema.model_validate(channel))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} channels", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s channels", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -64,7 +63,6 @@ class ChannelDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Channel).where(Channel.channel_id == channel_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -73,7 +71,10 @@ class ChannelDao(Dao):  # TODO write tests
         res = ChannelSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found channel {res}", extra=extra_params(bot_id=res.bot_id, channel_id=channel_id)
+            "bot_id=%s: found channel %s",
+            res.bot_id,
+            LazyPayload(res),
+            extra=extra_params(bot_id=res.bot_id, channel_id=channel_id),
         )
 
         return res
@@ -87,7 +88,9 @@ class ChannelDao(Dao):  # TODO write tests
             await conn.execute(insert(Channel).values(new_channel.model_dump()))
 
         self.logger.debug(
-            f"bot_id={new_channel.bot_id}: added channel {new_channel}",
+            "bot_id=%s: added channel %s",
+            new_channel.bot_id,
+            LazyPayload(new_channel),
             extra=extra_params(bot_id=new_channel.bot_id, channel_id=new_channel.channel_id),
         )
 
@@ -102,10 +105,11 @@ class ChannelDao(Dao):  # TODO write tests
                 .where(Channel.channel_id == updated_channel.channel_id)
                 .values(**updated_channel.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"channel_id={updated_channel.channel_id}: updated channel {updated_channel}",
+            "channel_id=%s: updated channel %s",
+            updated_channel.channel_id,
+            LazyPayload(updated_channel),
             extra=extra_params(channel_id=updated_channel.channel_id, bot_id=updated_channel.bot_id),
         )
 
@@ -120,6 +124,8 @@ class ChannelDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"bot_id={channel.bot_id}: deleted channel {channel}",
+            "bot_id=%s: deleted channel %s",
+            channel.bot_id,
+            LazyPayload(channel),
             extra=extra_params(bot_id=channel.bot_id, channel_id=channel.channel_id),
         )
@@ -9,7 +9,7 @@ from database.models.bot_model import Bot
 from database.exceptions.exceptions import KwargsException
 from database.models.post_message_model import PostMessage
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ChannelPostNotFoundError(KwargsException):
@@ -47,14 +47,13 @@ class ChannelPostDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ChannelPost).where(ChannelPost.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for channel_post in raw_res:
             res.append(ChannelPostSchema.model_validate(channel_post))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} channel_posts", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s channel_posts", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -68,7 +67,6 @@ class ChannelPostDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ChannelPost).where(ChannelPost.post_message_id == post_message_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -77,7 +75,9 @@ class ChannelPostDao(Dao):  # TODO write tests
         res = ChannelPostSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found channel_post: {res}",
+            "bot_id=%s: found channel_post: %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, channel_post_id=res.channel_post_id),
         )
 
@@ -93,7 +93,6 @@ class ChannelPostDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ChannelPost).where(ChannelPost.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -102,7 +101,9 @@ class ChannelPostDao(Dao):  # TODO write tests
         res = ChannelPostSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found channel_post: {res}",
+            "bot_id=%s: found channel_post: %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, channel_post_id=res.channel_post_id),
         )
 
@@ -121,7 +122,9 @@ class ChannelPostDao(Dao):  # TODO write tests
             ).inserted_primary_key[0]
 
         self.logger.debug(
-            f"bot_id={new_channel_post.bot_id}: added channel_post {channel_post_id}",
+            "bot_id=%s: added channel_post %s",
+            new_channel_post.bot_id,
+            channel_post_id,
             extra=extra_params(bot_id=new_channel_post.bot_id, channel_post_id=channel_post_id),
         )
 
@@ -138,10 +141,11 @@ class ChannelPostDao(Dao):  # TODO write tests
                 .where(ChannelPost.channel_post_id == updated_channel_post.channel_post_id)
                 .values(**updated_channel_post.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"channel_post_id={updated_channel_post.channel_post_id}: " f"updated channel_post {updated_channel_post}",
+            "channel_post_id=%s: updated channel_post %s",
+            updated_channel_post.channel_post_id,
+            LazyPayload(updated_channel_post),
             extra=extra_params(
                 channel_post_id=updated_channel_post.channel_post_id, bot_id=updated_channel_post.bot_id
             ),
@@ -156,6 +160,8 @@ class ChannelPostDao(Dao):  # TODO write tests
             await conn.execute(delete(ChannelPost).where(ChannelPost.channel_post_id == channel_post.channel_post_id))
 
         self.logger.debug(
-            f"bot_id={channel_post.bot_id}: deleted channel_post {channel_post}",
+            "bot_id=%s: deleted channel_post %s",
+            channel_post.bot_id,
+            LazyPayload(channel_post),
             extra=extra_params(bot_id=channel_post.bot_id, channel_post_id=channel_post.channel_post_id),
         )
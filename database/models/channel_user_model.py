@@ -3,7 +3,7 @@ from datetime import timedelta
 
 from pydantic import BaseModel, Field, ConfigDict, validate_call
 
-from sqlalchemy import ForeignKey, BOOLEAN, BigInteger, Column, DateTime, select, update, delete, insert
+from sqlalchemy import ForeignKey, BOOLEAN, BigInteger, Column, DateTime, select, update, delete, insert, func
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from database.models import Base
@@ -11,7 +11,7 @@ from database.models.dao import Dao
 from database.models.channel_model import Channel
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ChannelUserNotFoundError(KwargsException):
@@ -40,57 +40,46 @@ class ChannelUserSchema(ChannelUserSchemaWithoutId):
     channel_user_pk: int = Field(frozen=True)
 
 
-class ChannelUserDao(Dao):
-    def __init__(self, engine: AsyncEngine, logger) -> None:
-        super().__init__(engine, logger)
+class ChannelUsersCountSchema(BaseModel):
+    """Channel Users joined and left the channel during the period"""
 
-    @validate_call(validate_return=True)
-    async def get_joined_channel_users_by_channel_id(self, channel_id: int) -> list[ChannelUserSchema]:
-        """
-        Return a list of Channel Users joined the channel in less that 24 hours
-        """
-        async with self.engine.begin() as conn:
-            raw_res = await conn.execute(
-                select(ChannelUser).where(
-                    (ChannelUser.channel_id == channel_id),
-                    ((datetime.now() - ChannelUser.join_date) < timedelta(hours=24)),
-                    (ChannelUser.is_channel_member is True),
-                )
-            )
-        await self.engine.dispose()
+    joined: int = 0
+    left: int = 0
 
-        raw_res = raw_res.fetchall()
-        res = []
-        for channel_user in raw_res:
-            res.append(ChannelUserSchema.model_validate(channel_user))
 
-        self.logger.debug(
-            f"There are {len(res)} ChannelUsers in our service", extra=extra_params(channel_id=channel_id)
-        )
-        return res
+class ChannelUserDao(Dao):
+    def __init__(self, engine: AsyncEngine, logger) -> None:
+        super().__init__(engine, logger)
 
     @validate_call(validate_return=True)
-    async def get_left_channel_users_by_channel_id(self, channel_id: int) -> list[ChannelUserSchema]:
+    async def count_channel_users_by_membership(
+        self, channel_id: int, period: timedelta = timedelta(hours=24)
+    ) -> ChannelUsersCountSchema:
         """
-        Return a list of Channel Users left the channel in less that 24 hours
+        Counts Channel Users joined and left the channel during the period grouped by is_channel_member
+        on the database side
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(
-                select(ChannelUser).where(
-                    (ChannelUser.channel_id == channel_id),
-                    ((datetime.now() - ChannelUser.join_date) < timedelta(hours=24)),
-                    (ChannelUser.is_channel_member is False),
+                select(ChannelUser.is_channel_member, func.count())
+                .where(
+                    ChannelUser.channel_id == channel_id,
+                    ChannelUser.join_date > datetime.now() - period,
+                    ChannelUser.is_channel_member.is_not(None),
                 )
+                .group_by(ChannelUser.is_channel_member)
             )
-        await self.engine.dispose()
 
-        raw_res = raw_res.fetchall()
-        res = []
-        for channel_user in raw_res:
-            res.append(ChannelUserSchema.model_validate(channel_user))
+        counts = {is_channel_member: count for is_channel_member, count in raw_res.fetchall()}
+        res = ChannelUsersCountSchema(joined=counts.get(True, 0), left=counts.get(False, 0))
 
         self.logger.debug(
-            f"There are {len(res)} ChannelUsers in our service", extra=extra_params(channel_id=channel_id)
+            "channel_id=%s: %s ChannelUsers joined and %s left during %s",
+            channel_id,
+            res.joined,
+            res.left,
+            period,
+            extra=extra_params(channel_id=channel_id),
         )
         return res
 
@@ -107,7 +96,6 @@ class ChannelUserDao(Dao):
                     (ChannelUser.channel_user_id == channel_user_id), (ChannelUser.channel_id == channel_id)
                 )
             )
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -116,7 +104,9 @@ class ChannelUserDao(Dao):
         res = ChannelUserSchema.model_validate(res)
 
         self.logger.debug(
-            f"channel_user_id={channel_user_id}: found ChannelUser {res}",
+            "channel_user_id=%s: found ChannelUser %s",
+            channel_user_id,
+            LazyPayload(res),
             extra=extra_params(channel_user_id=channel_user_id),
         )
 
@@ -129,10 +119,11 @@ class ChannelUserDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(insert(ChannelUser).values(**channel_user.model_dump(by_alias=True)))
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"channel_user_id={channel_user.channel_user_id}: added ChannelUser {channel_user}",
+            "channel_user_id=%s: added ChannelUser %s",
+            channel_user.channel_user_id,
+            LazyPayload(channel_user),
             extra=extra_params(channel_user_id=channel_user.channel_user_id),
         )
 
@@ -147,10 +138,11 @@ class ChannelUserDao(Dao):
                 .where(ChannelUser.channel_user_id == updated_channel_user.channel_user_id)
                 .values(**updated_channel_user.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"channel_user_id={updated_channel_user.channel_user_id}: " f"updated ChannelUser {updated_channel_user}",
+            "channel_user_id=%s: updated ChannelUser %s",
+            updated_channel_user.channel_user_id,
+            LazyPayload(updated_channel_user),
             extra=extra_params(channel_user_id=updated_channel_user.channel_user_id),
         )
 
@@ -159,9 +151,10 @@ class ChannelUserDao(Dao):
         """Deletes Channel User from database"""
         async with self.engine.begin() as conn:
             await conn.execute(delete(ChannelUser).where(ChannelUser.channel_user_id == channel_user_id))
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"channel_user_id={channel_user_id}: deleted ChannelUser {channel_user_id}",
+            "channel_user_id=%s: deleted ChannelUser %s",
+            channel_user_id,
+            channel_user_id,
             extra=extra_params(channel_user_id=channel_user_id),
         )
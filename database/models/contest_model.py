@@ -2,7 +2,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field, validate_call, ConfigDict
 
-from sqlalchemy import BigInteger, Column, ForeignKey, select, insert, delete, update, Boolean, DateTime, String
+from sqlalchemy import BigInteger, Column, ForeignKey, select, insert, delete, update, Boolean, DateTime, String, func
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from database.models import Base
@@ -11,7 +11,7 @@ from database.models.bot_model import Bot
 from database.exceptions.exceptions import KwargsException
 from database.models.post_message_model import PostMessage
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ContestNotFoundError(KwargsException):
@@ -84,14 +84,13 @@ class ContestDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Contest).where(Contest.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for contest in raw_res:
             res.append(ContestSchema.model_validate(contest))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} contests", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s contests", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -107,7 +106,6 @@ class ContestDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(Contest).where(Contest.post_message_id == post_message_id, Contest.is_finished == False)  # noqa
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -116,7 +114,9 @@ class ContestDao(Dao):  # TODO write tests
         res = ContestSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found contest: {res}",
+            "bot_id=%s: found contest: %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, contest_id=res.contest_id),
         )
 
@@ -134,7 +134,6 @@ class ContestDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(Contest).where(Contest.bot_id == bot_id, Contest.is_finished == False)  # noqa
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -143,7 +142,9 @@ class ContestDao(Dao):  # TODO write tests
         res = ContestSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found contest: {res}",
+            "bot_id=%s: found contest: %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, contest_id=res.contest_id),
         )
 
@@ -159,7 +160,6 @@ class ContestDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Contest).where(Contest.contest_id == contest_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -168,7 +168,9 @@ class ContestDao(Dao):  # TODO write tests
         res = ContestSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found contest: {res}",
+            "bot_id=%s: found contest: %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, contest_id=res.contest_id),
         )
 
@@ -183,7 +185,9 @@ class ContestDao(Dao):  # TODO write tests
             contest_id = (await conn.execute(insert(Contest).values(new_contest.model_dump()))).inserted_primary_key[0]
 
         self.logger.debug(
-            f"bot_id={new_contest.bot_id}: added contest {new_contest}",
+            "bot_id=%s: added contest %s",
+            new_contest.bot_id,
+            LazyPayload(new_contest),
             extra=extra_params(bot_id=new_contest.bot_id, contest_id=contest_id),
         )
 
@@ -200,10 +204,11 @@ class ContestDao(Dao):  # TODO write tests
                 .where(Contest.contest_id == updated_contest.contest_id)
                 .values(**updated_contest.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"contest_id={updated_contest.contest_id}: updated contest {updated_contest}",
+            "contest_id=%s: updated contest %s",
+            updated_contest.contest_id,
+            LazyPayload(updated_contest),
             extra=extra_params(contest_id=updated_contest.contest_id, bot_id=updated_contest.bot_id),
         )
 
@@ -216,7 +221,9 @@ class ContestDao(Dao):  # TODO write tests
             await conn.execute(delete(Contest).where(Contest.contest_id == contest.contest_id))
 
         self.logger.debug(
-            f"bot_id={contest.bot_id}: deleted contest {contest}",
+            "bot_id=%s: deleted contest %s",
+            contest.bot_id,
+            LazyPayload(contest),
             extra=extra_params(bot_id=contest.bot_id, contest_id=contest.contest_id),
         )
 
@@ -228,14 +235,28 @@ class ContestDao(Dao):  # TODO write tests
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ContestUser).where(ContestUser.contest_id == contest_id))
 
-        await self.engine.dispose()
-
         raw_res = raw_res.fetchall()
         res = []
         for user in raw_res:
             res.append(ContestUserSchema.model_validate(user))
 
-        self.logger.debug(f"contest={contest_id}: has {len(res)} users", extra=extra_params(contest_id=contest_id))
+        self.logger.debug("contest=%s: has %s users", contest_id, len(res), extra=extra_params(contest_id=contest_id))
+
+        return res
+
+    @validate_call(validate_return=True)
+    async def count_contest_users(self, contest_id: int) -> int:
+        """
+        Counts contest users belonging to contest on the database side
+        """
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                select(func.count()).select_from(ContestUser).where(ContestUser.contest_id == contest_id)
+            )
+
+        res = raw_res.scalar_one()
+
+        self.logger.debug("contest=%s: has %s users", contest_id, res, extra=extra_params(contest_id=contest_id))
 
         return res
 
@@ -250,7 +271,6 @@ class ContestDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(ContestUser).where(ContestUser.contest_id == contest_id, ContestUser.user_id == user_id)
             )
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -259,7 +279,10 @@ class ContestDao(Dao):  # TODO write tests
         res = ContestUserSchema.model_validate(res)
 
         self.logger.debug(
-            f"contest_id={contest_id}: found user {user_id}", extra=extra_params(user_id=user_id, contest_id=contest_id)
+            "contest_id=%s: found user %s",
+            contest_id,
+            user_id,
+            extra=extra_params(user_id=user_id, contest_id=contest_id),
         )
 
         return res
@@ -279,10 +302,11 @@ class ContestDao(Dao):  # TODO write tests
         )
         async with self.engine.begin() as conn:
             await conn.execute(insert(ContestUser).values(**new_user.model_dump(by_alias=True)))
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"contest_id={contest_id}: joined user {new_user}",
+            "contest_id=%s: joined user %s",
+            contest_id,
+            LazyPayload(new_user),
             extra=extra_params(user_id=user_id, contest_id=contest_id),
         )
 
@@ -297,9 +321,10 @@ class ContestDao(Dao):  # TODO write tests
                 .where(ContestUser.contest_id == updated_user.contest_id, ContestUser.user_id == updated_user.user_id)
                 .values(**updated_user.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"contest_id={updated_user.contest_id}: updated contest {updated_user}",
+            "contest_id=%s: updated contest %s",
+            updated_user.contest_id,
+            LazyPayload(updated_user),
             extra=extra_params(contest_id=updated_user.contest_id, user_id=updated_user.user_id),
         )
@@ -1,6 +1,9 @@
+from typing import AsyncIterator
+
 from pydantic import BaseModel, ConfigDict, validate_call
 
-from sqlalchemy import BigInteger, Column, ForeignKey, insert, select, update, delete
+from sqlalchemy import BigInteger, Column, ForeignKey, insert, select, update, delete, func, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from database.models import Base
@@ -10,7 +13,7 @@ from database.exceptions.exceptions import KwargsException
 
 from database.enums import UserLanguage, UserLanguageValues
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class CustomBotUserNotFoundError(KwargsException):
@@ -48,7 +51,6 @@ class CustomBotUserDao(Dao):
             raw_res = await conn.execute(
                 select(CustomBotUser).where(CustomBotUser.bot_id == bot_id, CustomBotUser.user_id == user_id)
             )
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -56,26 +58,77 @@ class CustomBotUserDao(Dao):
 
         res = CustomBotUserSchema.model_validate(res)
 
-        self.logger.debug(f"bot_id={bot_id}: found user {res}", extra=extra_params(user_id=user_id, bot_id=bot_id))
+        self.logger.debug(
+            "bot_id=%s: found user %s", bot_id, LazyPayload(res), extra=extra_params(user_id=user_id, bot_id=bot_id)
+        )
 
         return res
 
     @validate_call(validate_return=True)
-    async def get_custom_bot_users(self, bot_id: int) -> list[CustomBotUserSchema]:  # TODO write tests
+    async def count_custom_bot_users(self, bot_id: int, language: UserLanguageValues | None = None) -> int:
         """
-        Returns users belonging to Bot
+        Counts users belonging to Bot on the database side
+
+        :param language: counts only the users with this language
         """
+        statement = select(func.count()).select_from(CustomBotUser).where(CustomBotUser.bot_id == bot_id)
+        if language is not None:
+            statement = statement.where(CustomBotUser.user_language == language)
+
         async with self.engine.begin() as conn:
-            raw_res = await conn.execute(select(CustomBotUser).where(CustomBotUser.bot_id == bot_id))
-        await self.engine.dispose()
+            raw_res = await conn.execute(statement)
+
+        res = raw_res.scalar_one()
+
+        self.logger.debug("bot_id=%s: has %s users", bot_id, res, extra=extra_params(bot_id=bot_id))
+
+        return res
+
+    @validate_call
+    async def iter_custom_bot_users(
+        self,
+        bot_id: int,
+        batch_size: int = 1000,
+        language: UserLanguageValues | None = None,
+        after_user_id: int | None = None,
+    ) -> AsyncIterator[list[CustomBotUserSchema]]:
+        """
+        Yields users belonging to Bot in batches ordered by user_id. Every batch is one short query by the primary key
+        (keyset pagination), so the connection is not held while the caller processes the batch
+
+        :param batch_size: users in one batch
+        :param language: yields only the users with this language
+        :param after_user_id: yields only the users with greater user_id, is used to resume the iteration
+        """
+        statement = (
+            select(CustomBotUser)
+            .where(CustomBotUser.bot_id == bot_id)
+            .order_by(CustomBotUser.user_id)
+            .limit(batch_size)
+        )
+        if language is not None:
+            statement = statement.where(CustomBotUser.user_language == language)
+
+        users_count = 0
+        while True:
+            batch_statement = statement
+            if after_user_id is not None:
+                batch_statement = statement.where(CustomBotUser.user_id > after_user_id)
 
-        users = []
-        for raw in raw_res.fetchall():
-            users.append(CustomBotUserSchema.model_validate(raw))
+            async with self.engine.begin() as conn:
+                raw_res = await conn.execute(batch_statement)
+            users = [CustomBotUserSchema.model_validate(raw) for raw in raw_res.fetchall()]
+            if not users:
+                break
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(users)} users", extra=extra_params(bot_id=bot_id))
+            users_count += len(users)
+            after_user_id = users[-1].user_id
+            yield users
 
-        return users
+            if len(users) < batch_size:
+                break
+
+        self.logger.debug("bot_id=%s: iterated over %s users", bot_id, users_count, extra=extra_params(bot_id=bot_id))
 
     @validate_call(validate_return=True)
     async def update_custom_bot_user(self, updated_user: CustomBotUserSchema):
@@ -88,10 +141,12 @@ class CustomBotUserDao(Dao):
                 .where(CustomBotUser.user_id == updated_user.user_id)
                 .values(**updated_user.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={updated_user.user_id}, bot_id={updated_user.bot_id}: " f"updated custom bot user {updated_user}",
+            "user_id=%s, bot_id=%s: updated custom bot user %s",
+            updated_user.user_id,
+            updated_user.bot_id,
+            LazyPayload(updated_user),
             extra=extra_params(user_id=updated_user.user_id, bot_id=updated_user.bot_id),
         )
 
@@ -104,9 +159,10 @@ class CustomBotUserDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(insert(CustomBotUser).values(bot_id=bot_id, user_id=user_id, user_language=lang))
-        await self.engine.dispose()
 
-        self.logger.debug(f"bot_id={bot_id}: added user {user_id}", extra=extra_params(user_id=user_id, bot_id=bot_id))
+        self.logger.debug(
+            "bot_id=%s: added user %s", bot_id, user_id, extra=extra_params(user_id=user_id, bot_id=bot_id)
+        )
 
     @validate_call(validate_return=True)
     async def delete_custom_bot_user(self, bot_id: int, user_id: int) -> None:
@@ -117,8 +173,29 @@ class CustomBotUserDao(Dao):
             await conn.execute(
                 delete(CustomBotUser).where(CustomBotUser.bot_id == bot_id, CustomBotUser.user_id == user_id)
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"bot_id={bot_id}: deleted user {user_id}", extra=extra_params(user_id=user_id, bot_id=bot_id)
+            "bot_id=%s: deleted user %s", bot_id, user_id, extra=extra_params(user_id=user_id, bot_id=bot_id)
         )
+
+    @validate_call(validate_return=True)
+    async def delete_custom_bot_users(self, bot_id: int, user_ids: list[int]) -> int:
+        """
+        Deletes many Custom bot users from db in one statement, the ids are sent as a single array parameter
+
+        :return: the count of deleted users
+        """
+        if not user_ids:
+            return 0
+
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                delete(CustomBotUser).where(
+                    CustomBotUser.bot_id == bot_id,
+                    CustomBotUser.user_id == any_(bindparam("user_ids", user_ids, type_=ARRAY(BigInteger))),
+                )
+            )
+
+        self.logger.debug("bot_id=%s: deleted %s users", bot_id, raw_res.rowcount, extra=extra_params(bot_id=bot_id))
+
+        return raw_res.rowcount
@@ -21,6 +21,5 @@ class Dao:
         """
         async with self.engine.begin() as conn:
             await conn.execute(delete(table))
-        await self.engine.dispose()
 
-        self.logger.debug(f"Table {table.__tablename__} has been cleared")
+        self.logger.debug("Table %s has been cleared", table.__tablename__)
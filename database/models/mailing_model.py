@@ -9,7 +9,7 @@ from database.models.dao import Dao
 from database.models.bot_model import Bot
 from database.models.post_message_model import PostMessage
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class MailingNotFoundError(KwargsException):
@@ -47,14 +47,13 @@ class MailingDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Mailing).where(Mailing.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for mailing in raw_res:
             res.append(MailingSchema.model_validate(mailing))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} mailings", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s mailings", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -65,7 +64,6 @@ class MailingDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Mailing).where(Mailing.post_message_id == post_message_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -74,7 +72,9 @@ class MailingDao(Dao):  # TODO write tests
         res = MailingSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found mailing {res}",
+            "bot_id=%s: found mailing %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, mailing_id=res.mailing_id),
         )
 
@@ -87,7 +87,6 @@ class MailingDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Mailing).where(Mailing.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -96,7 +95,9 @@ class MailingDao(Dao):  # TODO write tests
         res = MailingSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found mailing {res}",
+            "bot_id=%s: found mailing %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, mailing_id=res.mailing_id),
         )
 
@@ -111,7 +112,10 @@ class MailingDao(Dao):  # TODO write tests
             mailing_id = (await conn.execute(insert(Mailing).values(new_mailing.model_dump()))).inserted_primary_key[0]
 
         self.logger.debug(
-            f"bot_id={new_mailing.bot_id}: added mailing {mailing_id} -> {new_mailing}",
+            "bot_id=%s: added mailing %s -> %s",
+            new_mailing.bot_id,
+            mailing_id,
+            LazyPayload(new_mailing),
             extra=extra_params(bot_id=new_mailing.bot_id, mailing_id=mailing_id),
         )
 
@@ -128,10 +132,11 @@ class MailingDao(Dao):  # TODO write tests
                 .where(Mailing.mailing_id == updated_mailing.mailing_id)
                 .values(**updated_mailing.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"mailing_id={updated_mailing.mailing_id}: updated mailing {updated_mailing}",
+            "mailing_id=%s: updated mailing %s",
+            updated_mailing.mailing_id,
+            LazyPayload(updated_mailing),
             extra=extra_params(mailing_id=updated_mailing.mailing_id, bot_id=updated_mailing.bot_id),
         )
 
@@ -144,6 +149,8 @@ class MailingDao(Dao):  # TODO write tests
             await conn.execute(delete(Mailing).where(Mailing.mailing_id == mailing.mailing_id))
 
         self.logger.debug(
-            f"bot_id={mailing.bot_id}: deleted mailing {mailing}",
+            "bot_id=%s: deleted mailing %s",
+            mailing.bot_id,
+            LazyPayload(mailing),
             extra=extra_params(bot_id=mailing.bot_id, mailing_id=mailing.mailing_id),
         )
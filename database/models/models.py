@@ -1,4 +1,4 @@
-from sqlalchemy import NullPool
+from sqlalchemy import NullPool, event
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from database.models.bot_model import BotDao
@@ -21,8 +21,14 @@ from database.models.order_option_model import OrderOptionDao
 from database.models.product_review_model import ProductReviewDao
 from database.models.custom_bot_user_model import CustomBotUserDao
 from database.models.referral_invite_model import ReferralInviteDao
+from database.models.telegram_username_model import TelegramUsernameDao
+from database.models.bot_media_file_model import BotMediaFileDao
+from database.models.catalog_version_model import CatalogVersionDao
 from database.models.post_message_media_files import PostMessageMediaFileDao
 from database.models.order_choose_option_model import OrderChooseOptionDao
+from database.models.bot_registry import BotRegistry
+from database.models.pool import MeasuredAsyncQueuePool, PoolMetricsSchema
+from database.models.round_trips import on_cursor_execute
 from database.models import Base  # should be the last import from database.models
 
 from common_utils.singleton import singleton
@@ -40,30 +46,44 @@ class Database:
             self.engine = create_async_engine(sqlalchemy_url, poolclass=NullPool)
         else:
             self.logger.debug("Database runs in Mode.PROD")
-            self.engine = create_async_engine(sqlalchemy_url)
-
+            self.engine = create_async_engine(
+                sqlalchemy_url,
+                poolclass=MeasuredAsyncQueuePool,
+                pool_size=database_settings.DB_POOL_SIZE,
+                max_overflow=database_settings.DB_POOL_MAX_OVERFLOW,
+                pool_timeout=database_settings.DB_POOL_TIMEOUT,
+                pool_recycle=database_settings.DB_POOL_RECYCLE,
+                pool_pre_ping=database_settings.DB_POOL_PRE_PING,
+            )
+        event.listen(self.engine.sync_engine, "before_cursor_execute", on_cursor_execute)
+
+        self.catalog_version_dao = CatalogVersionDao(self.engine, self.logger)
         self.bot_dao = BotDao(self.engine, self.logger)
         self.user_dao = UserDao(self.engine, self.logger)
         self.order_dao = OrderDao(self.engine, self.logger)
-        self.option_dao = OptionDao(self.engine, self.logger)
-        self.product_dao = ProductDao(self.engine, self.logger)
+        self.option_dao = OptionDao(self.engine, self.logger, self.catalog_version_dao)
+        self.product_dao = ProductDao(self.engine, self.logger, self.catalog_version_dao)
         self.mailing_dao = MailingDao(self.engine, self.logger)
         self.contest_dao = ContestDao(self.engine, self.logger)
         self.payment_dao = PaymentDao(self.engine, self.logger)
         self.channel_dao = ChannelDao(self.engine, self.logger)
-        self.category_dao = CategoryDao(self.engine, self.logger)
+        self.category_dao = CategoryDao(self.engine, self.logger, self.catalog_version_dao)
         self.user_role_dao = UserRoleDao(self.engine, self.logger)
         self.partnership_dao = PartnershipDao(self.engine, self.logger)
         self.post_message_dao = PostMessageDao(self.engine, self.logger)
         self.channel_user_dao = ChannelUserDao(self.engine, self.logger)
         self.channel_post_dao = ChannelPostDao(self.engine, self.logger)
-        self.order_option_dao = OrderOptionDao(self.engine, self.logger)
+        self.order_option_dao = OrderOptionDao(self.engine, self.logger, self.catalog_version_dao)
         self.pickle_store_dao = PickleStorageDao(self.engine, self.logger)
         self.product_review_dao = ProductReviewDao(self.engine, self.logger)
         self.custom_bot_user_dao = CustomBotUserDao(self.engine, self.logger)
-        self.order_choose_option_dao = OrderChooseOptionDao(self.engine, self.logger)
+        self.order_choose_option_dao = OrderChooseOptionDao(self.engine, self.logger, self.catalog_version_dao)
         self.post_message_media_file_dao = PostMessageMediaFileDao(self.engine, self.logger)
         self.referral_invite_dao = ReferralInviteDao(self.engine, self.logger)
+        self.telegram_username_dao = TelegramUsernameDao(self.engine, self.logger)
+        self.bot_media_file_dao = BotMediaFileDao(self.engine, self.logger)
+
+        self.bot_registry = BotRegistry(self.bot_dao, self.catalog_version_dao, sqlalchemy_url, self.logger)
 
         self.logger.debug("Database class is initialized")
 
@@ -74,9 +94,30 @@ class Database:
 
         self.logger.debug("Metadata is used to create Tables")
 
+    async def close(self) -> None:
+        """Closes all the pooled connections. Should be called only once at the shutdown of the process"""
+        await self.bot_registry.stop_listening()
+
+        pool_metrics = self.get_pool_metrics()
+        await self.engine.dispose()
+
+        self.logger.debug("Database engine is disposed, pool metrics -> %s", pool_metrics)
+
+    def get_pool_metrics(self) -> PoolMetricsSchema | None:
+        """
+        :return: checkout and wait time metrics of the connection pool or None if the pool is not measured
+        """
+        pool = self.engine.pool
+        if isinstance(pool, MeasuredAsyncQueuePool):
+            return pool.get_metrics()
+        return None
+
     def get_bot_dao(self) -> BotDao:
         return self.bot_dao
 
+    def get_bot_registry(self) -> BotRegistry:
+        return self.bot_registry
+
     def get_user_dao(self) -> UserDao:
         return self.user_dao
 
@@ -139,3 +180,12 @@ class Database:
 
     def get_post_message_media_file_dao(self) -> PostMessageMediaFileDao:
         return self.post_message_media_file_dao
+
+    def get_telegram_username_dao(self) -> TelegramUsernameDao:
+        return self.telegram_username_dao
+
+    def get_bot_media_file_dao(self) -> BotMediaFileDao:
+        return self.bot_media_file_dao
+
+    def get_catalog_version_dao(self) -> CatalogVersionDao:
+        return self.catalog_version_dao
@@ -20,17 +20,18 @@ from sqlalchemy import (
     ARRAY,
     JSON,
 )
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
 
 from common_utils.themes import ThemeParamsSchema
 
 from database.models import Base
 from database.models.dao import Dao
+from database.models.catalog_version_model import CatalogVersionDao
 from database.exceptions.exceptions import KwargsException
 
 from database.enums import UserLanguage, UserLanguageValues
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 # TODO Create handle_exception_func
@@ -166,8 +167,17 @@ class OptionSchema(OptionSchemaWithoutId):
 
 
 class OptionDao(Dao):  # TODO write tests
-    def __init__(self, engine: AsyncEngine, logger) -> None:
+    def __init__(self, engine: AsyncEngine, logger, catalog_version_dao: CatalogVersionDao) -> None:
         super().__init__(engine, logger)
+        self.catalog_version_dao = catalog_version_dao
+
+    async def _bump_catalog_versions(self, conn: AsyncConnection, option_id: int) -> None:
+        """The options are shown in the web app, so the catalogs of the bots with these options are changed"""
+        from database.models.bot_model import Bot  # bot_model imports this module
+
+        await self.catalog_version_dao.bump_catalog_versions(
+            conn, select(Bot.bot_id).where(Bot.options_id == option_id)
+        )
 
     @validate_call(validate_return=True)
     async def get_all_options(self) -> list[OptionSchema]:
@@ -176,14 +186,13 @@ class OptionDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Option))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for option in raw_res:
             res.append(OptionSchema.model_validate(option))
 
-        self.logger.debug(f"Found {len(res)} options", extra=extra_params())
+        self.logger.debug("Found %s options", len(res), extra=extra_params())
 
         return res
 
@@ -197,7 +206,6 @@ class OptionDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Option).where(Option.id == option_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -206,7 +214,9 @@ class OptionDao(Dao):  # TODO write tests
         res = OptionSchema.model_validate(res)
         if isinstance(res.theme_params, dict):
             res.theme_params = ThemeParamsSchema(**res.theme_params)
-        self.logger.debug(f"option_id={option_id}: found option {res}", extra=extra_params(option_id=option_id))
+        self.logger.debug(
+            "option_id=%s: found option %s", option_id, LazyPayload(res), extra=extra_params(option_id=option_id)
+        )
 
         return res
 
@@ -218,7 +228,9 @@ class OptionDao(Dao):  # TODO write tests
         async with self.engine.begin() as conn:
             opt_id = (await conn.execute(insert(Option).values(new_option.model_dump()))).inserted_primary_key[0]
 
-        self.logger.debug(f"option_id={opt_id}: new added option {new_option}", extra=extra_params(option_id=opt_id))
+        self.logger.debug(
+            "option_id=%s: new added option %s", opt_id, LazyPayload(new_option), extra=extra_params(option_id=opt_id)
+        )
 
         return opt_id
 
@@ -232,9 +244,13 @@ class OptionDao(Dao):  # TODO write tests
 
         async with self.engine.begin() as conn:
             await conn.execute(update(Option).where(Option.id == option_id).values(updated_option.model_dump()))
+            await self._bump_catalog_versions(conn, option_id)
 
         self.logger.debug(
-            f"option_id={option_id}: updated option {updated_option}", extra=extra_params(option_id=option_id)
+            "option_id=%s: updated option %s",
+            option_id,
+            LazyPayload(updated_option),
+            extra=extra_params(option_id=option_id),
         )
 
     @validate_call(validate_return=True)
@@ -243,9 +259,12 @@ class OptionDao(Dao):  # TODO write tests
         Deletes the option from database
         """
         async with self.engine.begin() as conn:
+            await self._bump_catalog_versions(conn, option_id)
             await conn.execute(delete(Option).where(Option.id == option_id))
 
-        self.logger.debug(f"option_id={option_id}: deleted option {option_id}", extra=extra_params(option_id=option_id))
+        self.logger.debug(
+            "option_id=%s: deleted option %s", option_id, option_id, extra=extra_params(option_id=option_id)
+        )
 
     @validate_call(validate_return=True)
     async def clear_table(self) -> None:
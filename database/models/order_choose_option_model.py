@@ -1,13 +1,14 @@
 from pydantic import BaseModel, ConfigDict, Field, validate_call
 
 from sqlalchemy import Column, BigInteger, String, ForeignKey, select, insert, update, delete
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
 
 from database.models import Base
 from database.models.dao import Dao
 from database.exceptions.exceptions import KwargsException
 from database.models.order_option_model import OrderOption
-from logs.config import extra_params
+from database.models.catalog_version_model import CatalogVersionDao
+from logs.config import extra_params, LazyPayload
 
 
 class OrderChooseOptionNotFoundError(KwargsException):
@@ -34,8 +35,14 @@ class OrderChooseOptionSchema(OrderChooseOptionSchemaWithoutId):
 
 
 class OrderChooseOptionDao(Dao):
-    def __init__(self, engine: AsyncEngine, logger) -> None:
+    def __init__(self, engine: AsyncEngine, logger, catalog_version_dao: CatalogVersionDao) -> None:
         super().__init__(engine, logger)
+        self.catalog_version_dao = catalog_version_dao
+
+    async def _bump_catalog_version(self, conn: AsyncConnection, order_option_id: int) -> None:
+        await self.catalog_version_dao.bump_catalog_versions(
+            conn, select(OrderOption.bot_id).where(OrderOption.id == order_option_id)
+        )
 
     @validate_call(validate_return=True)
     async def get_all_choose_options(self, order_option_id: int) -> list[OrderChooseOptionSchema]:
@@ -47,7 +54,6 @@ class OrderChooseOptionDao(Dao):
             raw_res = await conn.execute(
                 select(OrderChooseOption).where(OrderChooseOption.order_option_id == order_option_id)
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
@@ -55,7 +61,9 @@ class OrderChooseOptionDao(Dao):
             res.append(OrderChooseOptionSchema.model_validate(choose_option))
 
         self.logger.debug(
-            f"order_option_id={order_option_id}: has {len(res)} choose options",
+            "order_option_id=%s: has %s choose options",
+            order_option_id,
+            len(res),
             extra=extra_params(order_option_id=order_option_id),
         )
 
@@ -71,7 +79,6 @@ class OrderChooseOptionDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(OrderChooseOption).where(OrderChooseOption.id == choose_option_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -79,7 +86,9 @@ class OrderChooseOptionDao(Dao):
 
         res = OrderChooseOptionSchema.model_validate(res)
         self.logger.debug(
-            f"choose_option_id={choose_option_id}: found choose option {res}",
+            "choose_option_id=%s: found choose option %s",
+            choose_option_id,
+            LazyPayload(res),
             extra=extra_params(choose_option_id=choose_option_id),
         )
 
@@ -96,9 +105,12 @@ class OrderChooseOptionDao(Dao):
             choose_option_id = (
                 await conn.execute(insert(OrderChooseOption).values(new_choose_option.model_dump()))
             ).inserted_primary_key[0]
+            await self._bump_catalog_version(conn, new_choose_option.order_option_id)
 
         self.logger.debug(
-            f"choose_option_id={choose_option_id}: new added choose option {new_choose_option}",
+            "choose_option_id=%s: new added choose option %s",
+            choose_option_id,
+            LazyPayload(new_choose_option),
             extra=extra_params(order_option_id=new_choose_option.order_option_id, choose_option_id=choose_option_id),
         )
 
@@ -118,9 +130,12 @@ class OrderChooseOptionDao(Dao):
                 .where(OrderChooseOption.id == choose_option_id)
                 .values(updated_choose_option.model_dump())
             )
+            await self._bump_catalog_version(conn, order_option_id)
 
         self.logger.debug(
-            f"choose_option_id={choose_option_id}: updated choose option {updated_choose_option}",
+            "choose_option_id=%s: updated choose option %s",
+            choose_option_id,
+            LazyPayload(updated_choose_option),
             extra=extra_params(order_option_id=order_option_id, choose_option_id=choose_option_id),
         )
 
@@ -130,9 +145,17 @@ class OrderChooseOptionDao(Dao):
         Deletes the choose option from database
         """
         async with self.engine.begin() as conn:
+            await self.catalog_version_dao.bump_catalog_versions(
+                conn,
+                select(OrderOption.bot_id)
+                .join(OrderChooseOption, OrderChooseOption.order_option_id == OrderOption.id)
+                .where(OrderChooseOption.id == choose_option_id),
+            )
             await conn.execute(delete(OrderChooseOption).where(OrderChooseOption.id == choose_option_id))
 
         self.logger.debug(
-            f"choose_option_id={choose_option_id}: deleted choose option {choose_option_id}",
+            "choose_option_id=%s: deleted choose option %s",
+            choose_option_id,
+            choose_option_id,
             extra=extra_params(choose_option_id=choose_option_id),
         )
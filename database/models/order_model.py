@@ -15,7 +15,7 @@ from database.models.dao import Dao
 from database.models.bot_model import Bot
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class OrderStatusValues(Enum):
@@ -161,14 +161,13 @@ class OrderDao(Dao):
     async def get_all_orders(self, bot_id: int) -> list[OrderSchema]:
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Order).where(Order.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for order in raw_res:
             res.append(OrderSchema.model_validate(order))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} orders", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s orders", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -179,7 +178,6 @@ class OrderDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Order).where(Order.id == order_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -191,7 +189,10 @@ class OrderDao(Dao):
             res = OrderSchema.model_validate(non_actual_data_fix(raw_res, e))
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found order {res}", extra=extra_params(order_id=order_id, bot_id=res.bot_id)
+            "bot_id=%s: found order %s",
+            res.bot_id,
+            LazyPayload(res),
+            extra=extra_params(order_id=order_id, bot_id=res.bot_id),
         )
 
         return res
@@ -205,7 +206,9 @@ class OrderDao(Dao):
             await conn.execute(insert(Order).values(new_order.model_dump()))
 
         self.logger.debug(
-            f"bot_id={new_order.bot_id}: added order {new_order}",
+            "bot_id=%s: added order %s",
+            new_order.bot_id,
+            LazyPayload(new_order),
             extra=extra_params(order_id=new_order.id, bot_id=new_order.bot_id),
         )
 
@@ -216,7 +219,9 @@ class OrderDao(Dao):
             await conn.execute(update(Order).where(Order.id == updated_order.id).values(updated_order.model_dump()))
 
         self.logger.debug(
-            f"bot_id={updated_order.bot_id}: updated order {updated_order}",
+            "bot_id=%s: updated order %s",
+            updated_order.bot_id,
+            LazyPayload(updated_order),
             extra=extra_params(order_id=updated_order.id, bot_id=updated_order.bot_id),
         )
 
@@ -226,4 +231,4 @@ class OrderDao(Dao):
         async with self.engine.begin() as conn:
             await conn.execute(delete(Order).where(Order.id == order_id))
 
-        self.logger.debug(f"order_id={order_id}: deleted order {order_id}", extra=extra_params(order_id=order_id))
+        self.logger.debug("order_id=%s: deleted order %s", order_id, order_id, extra=extra_params(order_id=order_id))
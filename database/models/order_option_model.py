@@ -23,8 +23,9 @@ from database.exceptions.exceptions import KwargsException
 from database.models import Base
 from database.models.dao import Dao
 from database.models.bot_model import Bot
+from database.models.catalog_version_model import CatalogVersionDao
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 from enum import Enum
 
@@ -92,8 +93,9 @@ class OrderOptionSchema(OrderOptionSchemaWithoutId):
 
 
 class OrderOptionDao(Dao):  # TODO write tests
-    def __init__(self, engine: AsyncEngine, logger) -> None:
+    def __init__(self, engine: AsyncEngine, logger, catalog_version_dao: CatalogVersionDao) -> None:
         super().__init__(engine, logger)
+        self.catalog_version_dao = catalog_version_dao
 
     @validate_call(validate_return=True)
     async def get_all_order_options(self, bot_id: int) -> list[OrderOptionSchema]:
@@ -103,14 +105,13 @@ class OrderOptionDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(OrderOption).where(OrderOption.bot_id == bot_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for order_option in raw_res:
             res.append(OrderOptionSchema.model_validate(order_option))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} order options", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s order options", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -124,7 +125,6 @@ class OrderOptionDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(OrderOption).where(OrderOption.id == order_option_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -132,7 +132,9 @@ class OrderOptionDao(Dao):  # TODO write tests
 
         res = OrderOptionSchema.model_validate(res)
         self.logger.debug(
-            f"order_option_id={order_option_id}: found order option {res}",
+            "order_option_id=%s: found order option %s",
+            order_option_id,
+            LazyPayload(res),
             extra=extra_params(order_option_id=order_option_id),
         )
 
@@ -147,9 +149,12 @@ class OrderOptionDao(Dao):  # TODO write tests
             order_option_id = (
                 await conn.execute(insert(OrderOption).values(new_order_option.model_dump()))
             ).inserted_primary_key[0]
+            await self.catalog_version_dao.bump_catalog_versions(conn, new_order_option.bot_id)
 
         self.logger.debug(
-            f"order_option_id={order_option_id}: new added order option {new_order_option}",
+            "order_option_id=%s: new added order option %s",
+            order_option_id,
+            LazyPayload(new_order_option),
             extra=extra_params(bot_id=new_order_option.bot_id, order_option_id=order_option_id),
         )
 
@@ -167,9 +172,12 @@ class OrderOptionDao(Dao):  # TODO write tests
             await conn.execute(
                 update(OrderOption).where(OrderOption.id == order_option_id).values(updated_order_option.model_dump())
             )
+            await self.catalog_version_dao.bump_catalog_versions(conn, bot_id)
 
         self.logger.debug(
-            f"order_option_id={order_option_id}: updated order option {updated_order_option}",
+            "order_option_id=%s: updated order option %s",
+            order_option_id,
+            LazyPayload(updated_order_option),
             extra=extra_params(bot_id=bot_id, order_option_id=order_option_id),
         )
 
@@ -179,9 +187,14 @@ class OrderOptionDao(Dao):  # TODO write tests
         Deletes the order option from database
         """
         async with self.engine.begin() as conn:
+            await self.catalog_version_dao.bump_catalog_versions(
+                conn, select(OrderOption.bot_id).where(OrderOption.id == order_option_id)
+            )
             await conn.execute(delete(OrderOption).where(OrderOption.id == order_option_id))
 
         self.logger.debug(
-            f"order_option_id={order_option_id}: deleted order option {order_option_id}",
+            "order_option_id=%s: deleted order option %s",
+            order_option_id,
+            order_option_id,
             extra=extra_params(order_option_id=order_option_id),
         )
@@ -23,7 +23,7 @@ from database.models.dao import Dao
 from database.models.bot_model import Bot
 from database.models.post_message_model import PostMessage
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class PartnershipNotFoundError(KwargsException):
@@ -99,14 +99,13 @@ class PartnershipDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(Partnership).where(Partnership.bot_id == bot_id)  # noqa
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for contest in raw_res:
             res.append(PartnershipSchema.model_validate(contest))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} partnerships", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s partnerships", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -122,7 +121,6 @@ class PartnershipDao(Dao):  # TODO write tests
                     Partnership.is_finished == False,  # noqa
                 )
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -131,7 +129,9 @@ class PartnershipDao(Dao):  # TODO write tests
         res = PartnershipSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found partnership {res}",
+            "bot_id=%s: found partnership %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, partnership_id=res.partnership_id),
         )
 
@@ -146,7 +146,6 @@ class PartnershipDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(Partnership).where(Partnership.bot_id == bot_id, Partnership.is_finished == False)  # noqa
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -155,7 +154,9 @@ class PartnershipDao(Dao):  # TODO write tests
         res = PartnershipSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found partnership {res}",
+            "bot_id=%s: found partnership %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, partnership_id=res.partnership_id),
         )
 
@@ -168,7 +169,6 @@ class PartnershipDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Partnership).where(Partnership.partnership_id == partnership_id))  # noqa
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -177,7 +177,9 @@ class PartnershipDao(Dao):  # TODO write tests
         res = PartnershipSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found partnership {res}",
+            "bot_id=%s: found partnership %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(bot_id=res.bot_id, partnership_id=res.partnership_id),
         )
 
@@ -194,7 +196,10 @@ class PartnershipDao(Dao):  # TODO write tests
             ).inserted_primary_key[0]
 
         self.logger.debug(
-            f"bot_id={new_partnership.bot_id}: added partnership {partnership_id} {new_partnership}",
+            "bot_id=%s: added partnership %s %s",
+            new_partnership.bot_id,
+            partnership_id,
+            LazyPayload(new_partnership),
             extra=extra_params(bot_id=new_partnership.bot_id, partnership_id=partnership_id),
         )
 
@@ -209,10 +214,11 @@ class PartnershipDao(Dao):  # TODO write tests
                 .  # noqa
                 values(**updated_partnership.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"partnership_id={updated_partnership.partnership_id}: " f"updated partnership {updated_partnership}",
+            "partnership_id=%s: updated partnership %s",
+            updated_partnership.partnership_id,
+            LazyPayload(updated_partnership),
             extra=extra_params(partnership_id=updated_partnership.partnership_id, bot_id=updated_partnership.bot_id),
         )
 
@@ -226,7 +232,9 @@ class PartnershipDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"bot_id={partnership.bot_id}: deleted partnership {partnership}",
+            "bot_id=%s: deleted partnership %s",
+            partnership.bot_id,
+            LazyPayload(partnership),
             extra=extra_params(bot_id=partnership.bot_id, partnership_id=partnership.partnership_id),
         )
 
@@ -235,15 +243,15 @@ class PartnershipDao(Dao):  # TODO write tests
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Criteria).where(Criteria.criteria_id == criteria_id))  # noqa
 
-        await self.engine.dispose()
-
         raw_res = raw_res.fetchone()
         if not raw_res:
             raise CriteriaNotFoundError(criteria_id=criteria_id)
 
         res = CriteriaSchema.model_validate(raw_res)
 
-        self.logger.debug(f"criteria_id={criteria_id}: {res}", extra=extra_params(criteria_id=criteria_id))
+        self.logger.debug(
+            "criteria_id=%s: %s", criteria_id, LazyPayload(res), extra=extra_params(criteria_id=criteria_id)
+        )
 
         return res
 
@@ -256,10 +264,12 @@ class PartnershipDao(Dao):  # TODO write tests
             criteria_id = await conn.execute(
                 insert(Criteria).values(**new_criteria.model_dump(by_alias=True))
             ).inserted_primary_key[0]
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"criteria_id={criteria_id}: added criteria {new_criteria}", extra=extra_params(criteria_id=criteria_id)
+            "criteria_id=%s: added criteria %s",
+            criteria_id,
+            LazyPayload(new_criteria),
+            extra=extra_params(criteria_id=criteria_id),
         )
 
         return criteria_id
@@ -273,9 +283,10 @@ class PartnershipDao(Dao):  # TODO write tests
                 .  # noqa
                 values(**updated_criteria.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"criteria_id={updated_criteria.criteria_id}: updated criteria {updated_criteria}",
+            "criteria_id=%s: updated criteria %s",
+            updated_criteria.criteria_id,
+            LazyPayload(updated_criteria),
             extra=extra_params(criteria_id=updated_criteria.criteria_id),
         )
@@ -12,7 +12,7 @@ from database.models.user_model import User
 from database.exceptions.exceptions import KwargsException
 
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class PaymentNotFoundError(KwargsException):
@@ -75,7 +75,6 @@ class PaymentDao(Dao):
     async def get_all_payments(self) -> list[PaymentSchema]:
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Payment))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
@@ -83,7 +82,8 @@ class PaymentDao(Dao):
             res.append(PaymentSchema.model_validate(payment))
 
         self.logger.debug(
-            f"payments: there are {len(res)} payments",
+            "payments: there are %s payments",
+            len(res),
         )
 
         return res
@@ -95,7 +95,6 @@ class PaymentDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Payment).where(Payment.payment_id == payment_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -104,7 +103,9 @@ class PaymentDao(Dao):
         res = PaymentSchema.model_validate(res)
 
         self.logger.debug(
-            f"payment_id={payment_id}: found payment {res}",
+            "payment_id=%s: found payment %s",
+            payment_id,
+            LazyPayload(res),
             extra=extra_params(payment_id=payment_id, user_id=res.from_user),
         )
 
@@ -119,10 +120,12 @@ class PaymentDao(Dao):
             payment_id = (
                 await conn.execute(insert(Payment).values(**payment.model_dump(by_alias=True)))
             ).inserted_primary_key[0]
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={payment.from_user}: added payment {payment_id} {payment}",
+            "user_id=%s: added payment %s %s",
+            payment.from_user,
+            payment_id,
+            LazyPayload(payment),
             extra=extra_params(payment_id=payment_id, user_id=payment.from_user),
         )
 
@@ -138,9 +141,10 @@ class PaymentDao(Dao):
                 .where(Payment.payment_id == updated_payment.id)
                 .values(**updated_payment.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={updated_payment.from_user}: updated payment {updated_payment}",
+            "user_id=%s: updated payment %s",
+            updated_payment.from_user,
+            LazyPayload(updated_payment),
             extra=extra_params(payment_id=updated_payment.id, user_id=updated_payment.from_user),
         )
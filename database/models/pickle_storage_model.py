@@ -74,14 +74,13 @@ class PickleStorageDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(PickledData).where(PickledData.id == object_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if raw_res is None:
             raise PickledDataNotFound(uuid=object_id)
         res = PickledObjectSchema.model_validate(raw_res)
 
-        self.logger.debug(f"returning pickled data with uuid: {res.id}")
+        self.logger.debug("returning pickled data with uuid: %s", res.id)
 
         return res
 
@@ -92,7 +91,7 @@ class PickleStorageDao(Dao):  # TODO write tests
         """
         if new_object.unique_for_user:
             self.logger.info(
-                f"unique data is adding, deleting all old data " f"with provided user id {new_object.unique_for_user}"
+                "unique data is adding, deleting all old data with provided user id %s", new_object.unique_for_user
             )
             async with self.engine.begin() as conn:
                 await conn.execute(
@@ -104,7 +103,7 @@ class PickleStorageDao(Dao):  # TODO write tests
         async with self.engine.begin() as conn:
             await conn.execute(insert(PickledData).values(new_object.model_dump()))
 
-        self.logger.debug(f"add pickled data with uuid: {new_object.id}")
+        self.logger.debug("add pickled data with uuid: %s", new_object.id)
 
     @validate_call
     async def delete_pickled_object(self, object_id: str) -> None:
@@ -114,4 +113,4 @@ class PickleStorageDao(Dao):  # TODO write tests
         async with self.engine.begin() as conn:
             await conn.execute(delete(PickledData).where(PickledData.id == object_id))
 
-        self.logger.debug(f"delete pickled data with uuid: {object_id}")
+        self.logger.debug("delete pickled data with uuid: %s", object_id)
@@ -0,0 +1,65 @@
+import time
+
+from pydantic import BaseModel
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetricsSchema(BaseModel):
+    """Snapshot of the connection pool usage"""
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+    checkouts: int
+    timeouts: int
+    wait_time_total: float  # seconds
+    wait_time_max: float  # seconds
+
+    @property
+    def wait_time_avg(self) -> float:
+        return self.wait_time_total / self.checkouts if self.checkouts else 0.0
+
+
+class MeasuredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that counts checkouts and measures how long
+    the callers wait for a free connection
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):  # noqa
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+
+        waited = time.perf_counter() - started_at
+        self.checkouts += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+        return connection
+
+    def get_metrics(self) -> PoolMetricsSchema:
+        return PoolMetricsSchema(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_time_total=self.wait_time_total,
+            wait_time_max=self.wait_time_max,
+        )
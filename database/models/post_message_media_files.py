@@ -8,7 +8,7 @@ from database.models.dao import Dao
 from database.exceptions.exceptions import KwargsException
 from database.models.post_message_model import PostMessage
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class PostMessageMediaFileNotFound(KwargsException):
@@ -21,6 +21,7 @@ class PostMessageMediaFile(Base):
     post_message_id = Column(BigInteger, ForeignKey(PostMessage.post_message_id, ondelete="CASCADE"), primary_key=True)
     file_id_main_bot = Column(String, primary_key=True)
     file_id_custom_bot = Column(String, default=None)
+    file_unique_id = Column(String, nullable=True)  # the same for all the bots, addresses the file in bot_media_files
     file_path = Column(String)
     media_type = Column(String, nullable=False)
 
@@ -31,6 +32,7 @@ class PostMessageMediaFileSchema(BaseModel):
     post_message_id: int = Field(frozen=True)
     file_id_main_bot: str = Field(frozen=True)
     file_id_custom_bot: str | None = None
+    file_unique_id: str | None = None
     file_path: str
     media_type: str
 
@@ -45,7 +47,6 @@ class PostMessageMediaFileDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(PostMessageMediaFile).where(PostMessageMediaFile.post_message_id == post_message_id)
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
@@ -53,7 +54,9 @@ class PostMessageMediaFileDao(Dao):  # TODO write tests
             res.append(PostMessageMediaFileSchema.model_validate(post_message_media_file))
 
         self.logger.debug(
-            f"post_message_id={post_message_id}: has {len(res)} media_files",
+            "post_message_id=%s: has %s media_files",
+            post_message_id,
+            len(res),
             extra=extra_params(post_message_id=post_message_id),
         )
 
@@ -68,8 +71,9 @@ class PostMessageMediaFileDao(Dao):  # TODO write tests
             await conn.execute(insert(PostMessageMediaFile).values(new_post_message_media_file.model_dump()))
 
         self.logger.debug(
-            f"post_message_id={new_post_message_media_file.post_message_id}: "
-            f"added media file {new_post_message_media_file}",
+            "post_message_id=%s: added media file %s",
+            new_post_message_media_file.post_message_id,
+            LazyPayload(new_post_message_media_file),
             extra=extra_params(post_message_id=new_post_message_media_file.post_message_id),
         )
 
@@ -83,8 +87,9 @@ class PostMessageMediaFileDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"post_message_id={new_post_message_media_file.post_message_id}: "
-            f"updated media file {new_post_message_media_file}",
+            "post_message_id=%s: updated media file %s",
+            new_post_message_media_file.post_message_id,
+            LazyPayload(new_post_message_media_file),
             extra=extra_params(post_message_id=new_post_message_media_file.post_message_id),
         )
 
@@ -103,6 +108,7 @@ class PostMessageMediaFileDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"post_message_id={post_message_id}: all media files have been deleted",
+            "post_message_id=%s: all media files have been deleted",
+            post_message_id,
             extra=extra_params(post_message_id=post_message_id),
         )
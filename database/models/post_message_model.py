@@ -20,7 +20,9 @@ from sqlalchemy import (
     Dialect,
     and_,
     or_,
+    func,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from database.models import Base
@@ -28,7 +30,10 @@ from database.models.dao import Dao
 from database.models.bot_model import Bot
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
+
+# Postgres NOTIFY channel, the payload is post_message_id of the deleted running post message
+POST_MESSAGE_CANCELS_CHANNEL = "post_message_cancels"
 
 
 class PostMessageType(Enum):
@@ -92,6 +97,11 @@ class PostMessage(Base):
     is_running = Column(BOOLEAN, default=False)
     sent_post_message_amount = Column(BigInteger, default=0)
 
+    # Mailing checkpoint, the mailing is resumed from it after restart
+    mailing_cursor = Column(BigInteger, nullable=True)  # the last custom_bot_users.user_id taken by the mailing
+    failed_post_message_amount = Column(BigInteger, default=0)
+    banned_user_ids = Column(ARRAY(BigInteger), nullable=False, default=[], server_default="{}")
+
     # Delay
     is_delayed = Column(BOOLEAN, default=False)
     send_date = Column(DateTime, nullable=True)
@@ -119,6 +129,10 @@ class PostMessageSchemaWithoutId(BaseModel):
     is_running: bool = False
     sent_post_message_amount: int = 0
 
+    mailing_cursor: Optional[int | None] = None
+    failed_post_message_amount: int = 0
+    banned_user_ids: list[int] = []
+
     is_delayed: bool = False
     send_date: Optional[datetime.datetime | None] = None
     job_id: Optional[str | None] = None
@@ -149,7 +163,6 @@ class PostMessageDao(Dao):  # TODO write tests
                     )
                 )
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -158,7 +171,9 @@ class PostMessageDao(Dao):  # TODO write tests
         res = PostMessageSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found post_message {post_message_id}",
+            "bot_id=%s: found post_message %s",
+            res.bot_id,
+            post_message_id,
             extra=extra_params(post_message_id=post_message_id, bot_id=res.bot_id),
         )
 
@@ -182,7 +197,6 @@ class PostMessageDao(Dao):  # TODO write tests
                     ),
                 )
             )
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
@@ -191,7 +205,9 @@ class PostMessageDao(Dao):  # TODO write tests
         res = PostMessageSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found post_message {res}",
+            "bot_id=%s: found post_message %s",
+            res.bot_id,
+            LazyPayload(res),
             extra=extra_params(post_message_id=res.post_message_id, bot_id=bot_id),
         )
 
@@ -208,7 +224,10 @@ class PostMessageDao(Dao):  # TODO write tests
             ).inserted_primary_key[0]
 
         self.logger.debug(
-            f"bot_id={new_post_message.bot_id}: added post_message_id {post_message_id} -> {new_post_message}",
+            "bot_id=%s: added post_message_id %s -> %s",
+            new_post_message.bot_id,
+            post_message_id,
+            LazyPayload(new_post_message),
             extra=extra_params(post_message_id=post_message_id, bot_id=new_post_message.bot_id),
         )
 
@@ -224,18 +243,91 @@ class PostMessageDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"bot_id={updated_post_message.bot_id}: updated post_message {updated_post_message}",
+            "bot_id=%s: updated post_message %s",
+            updated_post_message.bot_id,
+            LazyPayload(updated_post_message),
             extra=extra_params(
                 post_message_id=updated_post_message.post_message_id, bot_id=updated_post_message.bot_id
             ),
         )
 
+    @validate_call(validate_return=True)
+    async def get_running_mailings(self) -> list[PostMessageSchema]:
+        """Returns the mailings that were started (have a checkpoint) and are not finished or cancelled"""
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                select(PostMessage).where(
+                    PostMessage.post_message_type == PostMessageType.MAILING,
+                    PostMessage.is_running == True,  # noqa: E712
+                    PostMessage.mailing_cursor.is_not(None),
+                )
+            )
+
+        res = [PostMessageSchema.model_validate(raw) for raw in raw_res.fetchall()]
+
+        self.logger.debug("found %s running mailings", len(res))
+
+        return res
+
+    @validate_call(validate_return=True)
+    async def save_mailing_checkpoint(
+        self,
+        post_message_id: int,
+        mailing_cursor: int,
+        sent_post_message_amount: int,
+        failed_post_message_amount: int,
+        new_banned_user_ids: list[int],
+    ) -> bool:
+        """
+        Saves the progress of the running mailing in one statement
+
+        :param mailing_cursor: the last user_id taken by the mailing, it is never sent to again
+        :param new_banned_user_ids: are appended to the saved ones
+        :return: False if the mailing has been stopped or deleted meanwhile
+        """
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                update(PostMessage)
+                .where(PostMessage.post_message_id == post_message_id, PostMessage.is_running == True)  # noqa: E712
+                .values(
+                    mailing_cursor=mailing_cursor,
+                    sent_post_message_amount=sent_post_message_amount,
+                    failed_post_message_amount=failed_post_message_amount,
+                    banned_user_ids=PostMessage.banned_user_ids + new_banned_user_ids,
+                )
+                .returning(PostMessage.post_message_id)
+            )
+            is_running = raw_res.fetchone() is not None
+
+        self.logger.debug(
+            "post_message_id=%s: mailing_cursor=%s, sent_post_message_amount=%s, is_running=%s",
+            post_message_id,
+            mailing_cursor,
+            sent_post_message_amount,
+            is_running,
+            extra=extra_params(post_message_id=post_message_id),
+        )
+
+        return is_running
+
     @validate_call(validate_return=True)
     async def delete_post_message(self, post_message_id: int) -> None:
+        """
+        Sends NOTIFY if the post message was running, so the process running its mailing stops it
+        without waiting for the next checkpoint
+        """
         async with self.engine.begin() as conn:
-            await conn.execute(delete(PostMessage).where(PostMessage.post_message_id == post_message_id))
+            raw_res = await conn.execute(
+                delete(PostMessage)
+                .where(PostMessage.post_message_id == post_message_id)
+                .returning(PostMessage.is_running)
+            )
+            if raw_res.scalar():
+                await conn.execute(select(func.pg_notify(POST_MESSAGE_CANCELS_CHANNEL, str(post_message_id))))
 
         self.logger.debug(
-            f"post_message_id={post_message_id}: deleted post_message {post_message_id}",
+            "post_message_id=%s: deleted post_message %s",
+            post_message_id,
+            post_message_id,
             extra=extra_params(post_message_id=post_message_id),
         )
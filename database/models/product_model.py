@@ -13,9 +13,10 @@ from database.enums import UserLanguageValues
 from database.models import Base
 from database.models.dao import Dao
 from database.models.bot_model import Bot
+from database.models.catalog_version_model import CatalogVersionDao
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class SameArticleProductError(KwargsException):
@@ -192,8 +193,9 @@ class NotEnoughProductsInStockToReduce(Exception):  # TODO Arsen should delete
 
 
 class ProductDao(Dao):
-    def __init__(self, engine: AsyncEngine, logger) -> None:
+    def __init__(self, engine: AsyncEngine, logger, catalog_version_dao: CatalogVersionDao) -> None:
         super().__init__(engine, logger)
+        self.catalog_version_dao = catalog_version_dao
 
     @validate_call(validate_return=True)
     async def get_all_products(
@@ -231,14 +233,13 @@ class ProductDao(Dao):
 
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(sql_select)
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for product in raw_res:
             res.append(ProductSchema.model_validate(product))
 
-        self.logger.debug(f"bot_id={bot_id}: has {len(res)} products", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: has %s products", bot_id, len(res), extra=extra_params(bot_id=bot_id))
 
         return res
 
@@ -249,17 +250,19 @@ class ProductDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Product).where(Product.id == product_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
-            self.logger.debug(f"product with id {product_id} not found ")
+            self.logger.debug("product with id %s not found ", product_id)
             raise ProductNotFoundError(product_id=product_id)
 
         res = ProductSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}: found product {res}", extra=extra_params(product_id=res.id, bot_id=res.bot_id)
+            "bot_id=%s: found product %s",
+            res.bot_id,
+            LazyPayload(res),
+            extra=extra_params(product_id=res.id, bot_id=res.bot_id),
         )
 
         return res
@@ -271,17 +274,19 @@ class ProductDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(Product).where(Product.bot_id == bot_id, Product.article == article))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if not raw_res:
-            self.logger.debug(f"product with bot_id {bot_id} and article {article} not found.")
+            self.logger.debug("product with bot_id %s and article %s not found.", bot_id, article)
             raise ProductNotFoundError(bot_id=bot_id, article=article)
 
         res = ProductSchema.model_validate(raw_res)
 
         self.logger.debug(
-            f"bot_id={res.bot_id}, article={res.article}: found product {res}",
+            "bot_id=%s, article=%s: found product %s",
+            res.bot_id,
+            res.article,
+            LazyPayload(res),
             extra=extra_params(product_id=res.id, bot_id=res.bot_id, article=res.article),
         )
 
@@ -310,9 +315,13 @@ class ProductDao(Dao):
             raise SameArticleProductError(bot_id=new_product.bot_id, article=new_product.article)
         async with self.engine.begin() as conn:
             product_id = (await conn.execute(insert(Product).values(new_product.model_dump()))).inserted_primary_key[0]
+            await self.catalog_version_dao.bump_catalog_versions(conn, new_product.bot_id)
 
         self.logger.debug(
-            f"bot_id={new_product.bot_id}: added product {product_id} {new_product}",
+            "bot_id=%s: added product %s %s",
+            new_product.bot_id,
+            product_id,
+            LazyPayload(new_product),
             extra=extra_params(product_id=product_id, bot_id=new_product.bot_id),
         )
 
@@ -329,6 +338,7 @@ class ProductDao(Dao):
         """
         new_product_dict = new_product.model_dump(exclude={"id"})
         async with self.engine.begin() as conn:
+            await self.catalog_version_dao.bump_catalog_versions(conn, new_product.bot_id)
             if replace_duplicates:
                 upsert_query = (
                     upsert(Product)
@@ -337,7 +347,10 @@ class ProductDao(Dao):
                 )
                 product_id = (await conn.execute(upsert_query)).inserted_primary_key[0]
                 self.logger.debug(
-                    f"bot_id={new_product.bot_id}: upserted product {product_id} {new_product}",
+                    "bot_id=%s: upserted product %s %s",
+                    new_product.bot_id,
+                    product_id,
+                    LazyPayload(new_product),
                     extra=extra_params(product_id=product_id, bot_id=new_product.bot_id),
                 )
             else:
@@ -350,7 +363,10 @@ class ProductDao(Dao):
                 )
                 product_id = (await conn.execute(upsert_query)).inserted_primary_key[0]
                 self.logger.debug(
-                    f"bot_id={new_product.bot_id}: upserted product {product_id} {new_product}",
+                    "bot_id=%s: upserted product %s %s",
+                    new_product.bot_id,
+                    product_id,
+                    LazyPayload(new_product),
                     extra=extra_params(product_id=product_id, bot_id=new_product.bot_id),
                 )
 
@@ -371,24 +387,31 @@ class ProductDao(Dao):
         await self.get_product(updated_product.id)
         async with self.engine.begin() as conn:
             await conn.execute(update(Product).where(Product.id == updated_product.id).values(updated_product_dump))
+            await self.catalog_version_dao.bump_catalog_versions(conn, updated_product.bot_id)
 
         self.logger.debug(
-            f"bot_id={updated_product.bot_id}: updated product {updated_product}",
+            "bot_id=%s: updated product %s",
+            updated_product.bot_id,
+            LazyPayload(updated_product),
             extra=extra_params(product_id=updated_product.id, bot_id=updated_product.bot_id),
         )
 
     @validate_call(validate_return=True)
     async def delete_product(self, product_id: int):
         async with self.engine.begin() as conn:
+            await self.catalog_version_dao.bump_catalog_versions(
+                conn, select(Product.bot_id).where(Product.id == product_id)
+            )
             await conn.execute(delete(Product).where(Product.id == product_id))
 
         self.logger.debug(
-            f"product_id={product_id}: deleted product {product_id}", extra=extra_params(product_id=product_id)
+            "product_id=%s: deleted product %s", product_id, product_id, extra=extra_params(product_id=product_id)
         )
 
     @validate_call(validate_return=True)
     async def delete_all_products(self, bot_id: int):
         async with self.engine.begin() as conn:
             await conn.execute(delete(Product).where(Product.bot_id == bot_id))
+            await self.catalog_version_dao.bump_catalog_versions(conn, bot_id)
 
-        self.logger.debug(f"bot_id={bot_id}: all products are deleted", extra=extra_params(bot_id=bot_id))
+        self.logger.debug("bot_id=%s: all products are deleted", bot_id, extra=extra_params(bot_id=bot_id))
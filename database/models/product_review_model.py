@@ -10,7 +10,7 @@ from database.models.user_model import User
 from database.models.product_model import Product
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ProductReviewNotFoundError(KwargsException):
@@ -52,14 +52,15 @@ class ProductReviewDao(Dao):  # TODO write tests
     async def get_all_reviews_by_product_id(self, product_id: int) -> list[ProductReviewSchema]:
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ProductReview).where(ProductReview.product_id == product_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for product in raw_res:
             res.append(ProductReviewSchema.model_validate(product))
 
-        self.logger.debug(f"product_id={product_id}: has {len(res)} reviews", extra=extra_params(product_id=product_id))
+        self.logger.debug(
+            "product_id=%s: has %s reviews", product_id, len(res), extra=extra_params(product_id=product_id)
+        )
 
         return res
 
@@ -72,7 +73,6 @@ class ProductReviewDao(Dao):  # TODO write tests
             raw_res = await conn.execute(
                 select(ProductReview).where(ProductReview.user_id == user_id, ProductReview.product_id == product_id)
             )
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if not res:
@@ -82,7 +82,10 @@ class ProductReviewDao(Dao):  # TODO write tests
 
         if res is not None:
             self.logger.debug(
-                f"product_id={product_id}, user_id {user_id}: found product_review {res}",
+                "product_id=%s, user_id %s: found product_review %s",
+                product_id,
+                user_id,
+                LazyPayload(res),
                 extra=extra_params(product_id=product_id, user_id=user_id),
             )
 
@@ -95,7 +98,6 @@ class ProductReviewDao(Dao):  # TODO write tests
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ProductReview).where(ProductReview.id == review_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if not res:
@@ -104,7 +106,9 @@ class ProductReviewDao(Dao):  # TODO write tests
         res = ProductReviewSchema.model_validate(res)
 
         self.logger.debug(
-            f"product_review_id={review_id}: found product_review {review_id}",
+            "product_review_id=%s: found product_review %s",
+            review_id,
+            review_id,
             extra=extra_params(product_review_id=review_id),
         )
 
@@ -121,7 +125,10 @@ class ProductReviewDao(Dao):  # TODO write tests
             ).inserted_primary_key[0]
 
         self.logger.debug(
-            f"product_review_id={review_id}: added product_review {review_id} {new_review}",
+            "product_review_id=%s: added product_review %s %s",
+            review_id,
+            review_id,
+            LazyPayload(new_review),
             extra=extra_params(product_review=review_id),
         )
 
@@ -136,7 +143,9 @@ class ProductReviewDao(Dao):  # TODO write tests
             )
 
         self.logger.debug(
-            f"product_review_id={updated_review.id}: updated product_review {updated_review}",
+            "product_review_id=%s: updated product_review %s",
+            updated_review.id,
+            LazyPayload(updated_review),
             extra=extra_params(product_review=updated_review.id),
         )
 
@@ -146,6 +155,8 @@ class ProductReviewDao(Dao):  # TODO write tests
             await conn.execute(delete(ProductReview).where(ProductReview.id == review_id))
 
         self.logger.debug(
-            f"product_review_id={review_id}: deleted product_review {review_id}",
+            "product_review_id=%s: deleted product_review %s",
+            review_id,
+            review_id,
             extra=extra_params(product_review=review_id),
         )
@@ -7,7 +7,7 @@ from database.models import Base
 from database.models.dao import Dao
 from database.models.user_model import User
 from database.exceptions.exceptions import KwargsException
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class ReferralInviteNotFoundError(KwargsException):
@@ -48,14 +48,13 @@ class ReferralInviteDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ReferralInviteModel))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchall()
         res = []
         for referral_invite in raw_res:
             res.append(ReferralInviteSchema.model_validate(referral_invite))
 
-        self.logger.debug(f"There are {len(res)} referral invitations")
+        self.logger.debug("There are %s referral invitations", len(res))
 
         return res
 
@@ -69,7 +68,6 @@ class ReferralInviteDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ReferralInviteModel).where(ReferralInviteModel.user_id == user_id))
-        await self.engine.dispose()
 
         raw_res = raw_res.fetchone()
         if raw_res is None:
@@ -87,7 +85,6 @@ class ReferralInviteDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(ReferralInviteModel).where(ReferralInviteModel.id == invite_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -95,7 +92,9 @@ class ReferralInviteDao(Dao):
 
         res = ReferralInviteSchema.model_validate(res)
         self.logger.debug(
-            f"invite_id={invite_id}: found referral invite {res}",
+            "invite_id=%s: found referral invite %s",
+            invite_id,
+            LazyPayload(res),
             extra=extra_params(invite_id=invite_id),
         )
 
@@ -117,7 +116,9 @@ class ReferralInviteDao(Dao):
             ).inserted_primary_key[0]
 
         self.logger.debug(
-            f"invite_id={invite_id}: new added referral invite {new_invite}",
+            "invite_id=%s: new added referral invite %s",
+            invite_id,
+            LazyPayload(new_invite),
             extra=extra_params(user_id=new_invite.user_id, invite_id=invite_id),
         )
 
@@ -144,7 +145,9 @@ class ReferralInviteDao(Dao):
             )
 
         self.logger.debug(
-            f"invite_id={invite_id}: updated referral invite {updated_invite}",
+            "invite_id=%s: updated referral invite %s",
+            invite_id,
+            LazyPayload(updated_invite),
             extra=extra_params(user_id=user_id, invite_id=invite_id),
         )
 
@@ -157,6 +160,8 @@ class ReferralInviteDao(Dao):
             await conn.execute(delete(ReferralInviteModel).where(ReferralInviteModel.id == invite_id))
 
         self.logger.debug(
-            f"invite_id={invite_id}: deleted referral invite {invite_id}",
+            "invite_id=%s: deleted referral invite %s",
+            invite_id,
+            invite_id,
             extra=extra_params(invite_id=invite_id),
         )
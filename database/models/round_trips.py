@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class DatabaseRoundTrips:
+    """Counter of the statements sent to database inside of count_db_round_trips() block"""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+
+_current_round_trips: ContextVar[DatabaseRoundTrips | None] = ContextVar("current_round_trips", default=None)
+
+
+def on_cursor_execute(*args, **kwargs) -> None:  # noqa
+    """SQLAlchemy 'before_cursor_execute' listener. Is registered on the engine in Database.__init__"""
+    round_trips = _current_round_trips.get()
+    if round_trips is not None:
+        round_trips.count += 1
+
+
+@contextmanager
+def count_db_round_trips() -> Iterator[DatabaseRoundTrips]:
+    """
+    Counts database statements executed by the current asyncio task (and the tasks it creates) inside the block
+
+    Example:
+        with count_db_round_trips() as round_trips:
+            await bot_db.get_bot(bot_id)
+        print(round_trips.count)  # 1
+    """
+    round_trips = DatabaseRoundTrips()
+    token = _current_round_trips.set(round_trips)
+    try:
+        yield round_trips
+    finally:
+        _current_round_trips.reset(token)
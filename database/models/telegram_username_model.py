@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from pydantic import validate_call
+
+from sqlalchemy import BigInteger, Column, String, DateTime, select, func, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.models import Base
+from database.models.dao import Dao
+
+
+class TelegramUsername(Base):
+    """Usernames of the telegram users resolved by get_chat, is used as the persistent cache of the reports"""
+
+    __tablename__ = "telegram_usernames"
+
+    user_id = Column(BigInteger, primary_key=True)
+    username = Column(String, nullable=True)  # the user has no username
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class TelegramUsernameDao(Dao):
+    WRITE_BATCH_SIZE = 5000  # rows in one INSERT, asyncpg allows 32767 parameters per statement
+
+    def __init__(self, engine: AsyncEngine, logger) -> None:
+        super().__init__(engine, logger)
+
+    @validate_call(validate_return=True)
+    async def get_usernames(self, user_ids: list[int], max_age: timedelta) -> dict[int, str | None]:
+        """
+        :param max_age: the usernames resolved earlier are considered outdated
+        :return: user_id -> username of the users resolved not earlier than max_age ago
+        """
+        if not user_ids:
+            return {}
+
+        async with self.engine.begin() as conn:
+            raw_res = await conn.execute(
+                select(TelegramUsername.user_id, TelegramUsername.username).where(
+                    # one array parameter, IN would send a parameter per id
+                    TelegramUsername.user_id == any_(bindparam("user_ids", user_ids, type_=ARRAY(BigInteger))),
+                    TelegramUsername.updated_at > datetime.now() - max_age,
+                )
+            )
+
+        res = {user_id: username for user_id, username in raw_res.fetchall()}
+
+        self.logger.debug("found %s of %s cached usernames", len(res), len(user_ids))
+
+        return res
+
+    @validate_call(validate_return=True)
+    async def save_usernames(self, usernames: dict[int, str | None]) -> None:
+        """
+        Inserts or refreshes the resolved usernames
+
+        :param usernames: user_id -> username
+        """
+        rows = [{"user_id": user_id, "username": username} for user_id, username in usernames.items()]
+
+        async with self.engine.begin() as conn:
+            for offset in range(0, len(rows), self.WRITE_BATCH_SIZE):
+                statement = insert(TelegramUsername).values(rows[offset : offset + self.WRITE_BATCH_SIZE])
+                await conn.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[TelegramUsername.user_id],
+                        set_={"username": statement.excluded.username, "updated_at": func.now()},
+                    )
+                )
+
+        self.logger.debug("saved %s usernames", len(rows))
@@ -13,7 +13,7 @@ from database.models import Base
 from database.models.dao import Dao
 from database.exceptions.exceptions import KwargsException
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class UserNotFoundError(KwargsException):
@@ -98,7 +98,6 @@ class UserDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(User).where(User.user_id == user_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -106,7 +105,7 @@ class UserDao(Dao):
 
         res = UserSchema.model_validate(res)
 
-        self.logger.debug(f"user_id={user_id}: user {user_id} is found", extra=extra_params(user_id=user_id))
+        self.logger.debug("user_id=%s: user %s is found", user_id, user_id, extra=extra_params(user_id=user_id))
 
         return res
 
@@ -117,9 +116,8 @@ class UserDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(insert(User).values(**user.model_dump(by_alias=True)))
-        await self.engine.dispose()
 
-        self.logger.debug(f"user_id={user.id}: added user {user}", extra=extra_params(user_id=user.id))
+        self.logger.debug("user_id=%s: added user %s", user.id, LazyPayload(user), extra=extra_params(user_id=user.id))
 
     @validate_call(validate_return=True)
     async def update_user(self, updated_user: UserSchema) -> None:
@@ -127,19 +125,20 @@ class UserDao(Dao):
             await conn.execute(
                 update(User).where(User.user_id == updated_user.id).values(**updated_user.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={updated_user.id}: updated user {updated_user}", extra=extra_params(user_id=updated_user.id)
+            "user_id=%s: updated user %s",
+            updated_user.id,
+            LazyPayload(updated_user),
+            extra=extra_params(user_id=updated_user.id),
         )
 
     @validate_call(validate_return=True)
     async def del_user(self, user_id: int) -> None:
         async with self.engine.begin() as conn:
             await conn.execute(delete(User).where(User.user_id == user_id))
-        await self.engine.dispose()
 
-        self.logger.debug(f"user_id={user_id}: deleted user {user_id}", extra=extra_params(user_id=user_id))
+        self.logger.debug("user_id=%s: deleted user %s", user_id, user_id, extra=extra_params(user_id=user_id))
 
     @validate_call(validate_return=True)
     async def clear_table(self) -> None:
@@ -14,7 +14,7 @@ from database.exceptions.exceptions import KwargsException
 
 from typing import Optional
 
-from logs.config import extra_params
+from logs.config import extra_params, LazyPayload
 
 
 class UserRoleNotFoundError(KwargsException):
@@ -99,7 +99,7 @@ class UserRoleDao(Dao):
                     bots.append(BotSchema.model_validate(raw_bot))
 
         self.logger.debug(
-            f"user_id={user_id}: has {len(bots)} roles in different bots", extra=extra_params(user_id=user_id)
+            "user_id=%s: has %s roles in different bots", user_id, len(bots), extra=extra_params(user_id=user_id)
         )
 
         return bots
@@ -111,7 +111,6 @@ class UserRoleDao(Dao):
         """
         async with self.engine.begin() as conn:
             raw_res = await conn.execute(select(UserRole).where(UserRole.user_id == user_id, UserRole.bot_id == bot_id))
-        await self.engine.dispose()
 
         res = raw_res.fetchone()
         if res is None:
@@ -120,7 +119,10 @@ class UserRoleDao(Dao):
         res = UserRoleSchema.model_validate(res)
 
         self.logger.debug(
-            f"user_id={user_id} bot_id={bot_id}: found user_role {res}",
+            "user_id=%s bot_id=%s: found user_role %s",
+            user_id,
+            bot_id,
+            LazyPayload(res),
             extra=extra_params(user_id=user_id, bot_id=bot_id),
         )
 
@@ -133,10 +135,12 @@ class UserRoleDao(Dao):
         """
         async with self.engine.begin() as conn:
             await conn.execute(insert(UserRole).values(**new_role.model_dump(by_alias=True)))
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={new_role.user_id} bot_id={new_role.bot_id}: added user_role {new_role}",
+            "user_id=%s bot_id=%s: added user_role %s",
+            new_role.user_id,
+            new_role.bot_id,
+            LazyPayload(new_role),
             extra=extra_params(user_id=new_role.user_id, bot_id=new_role.bot_id),
         )
 
@@ -148,10 +152,12 @@ class UserRoleDao(Dao):
                 .where(UserRole.user_id == updated_role.user_id, UserRole.bot_id == updated_role.bot_id)
                 .values(**updated_role.model_dump(by_alias=True))
             )
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={updated_role.user_id} bot_id={updated_role.bot_id}: updated user_role {updated_role}",
+            "user_id=%s bot_id=%s: updated user_role %s",
+            updated_role.user_id,
+            updated_role.bot_id,
+            LazyPayload(updated_role),
             extra=extra_params(user_id=updated_role.user_id, bot_id=updated_role.bot_id),
         )
 
@@ -159,10 +165,12 @@ class UserRoleDao(Dao):
     async def del_user_role(self, user_id: int, bot_id: int) -> None:
         async with self.engine.begin() as conn:
             await conn.execute(delete(UserRole).where(UserRole.user_id == user_id, UserRole.bot_id == bot_id))
-        await self.engine.dispose()
 
         self.logger.debug(
-            f"user_id={user_id} bot_id={bot_id}: deleted user_role", extra=extra_params(user_id=user_id, bot_id=bot_id)
+            "user_id=%s bot_id=%s: deleted user_role",
+            user_id,
+            bot_id,
+            extra=extra_params(user_id=user_id, bot_id=bot_id),
         )
 
     @validate_call(validate_return=True)
@@ -174,7 +182,6 @@ class UserRoleDao(Dao):
             raw_res = await conn.execute(
                 select(UserRole).where(UserRole.bot_id == bot_id, UserRole.role == UserRoleValues.ADMINISTRATOR)
             )
-        await self.engine.dispose()
 
         res = raw_res.fetchall()
 
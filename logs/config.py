@@ -2,13 +2,24 @@ import logging  # noqa
 import logging.config
 import logging_loki  # noqa
 
-from re import compile, sub, UNICODE
+from re import compile, UNICODE
 import os
+import json
+import queue
+import atexit
+import random
 
 from logging import LogRecord
+from logging.handlers import QueueHandler, QueueListener
+
+from pydantic import BaseModel
 
 from common_utils.config import logs_settings, common_settings
 
+from logs.loki import BatchedLokiHandler
+from logs.context import get_log_context, bind_log_context, reset_log_context, log_context  # noqa
+from logs.lazy import LazyPayload  # noqa
+
 try:
     os.mkdir(common_settings.LOGS_PATH)
 except Exception:  # noqa
@@ -25,86 +36,130 @@ def extra_params(**kwargs):
     return {"tags": kwargs}
 
 
+EMOTIONS_PATTERN = compile(
+    "["
+    "\U0001f600-\U0001f64f"  # emoticons
+    "\U0001f300-\U0001f5ff"  # symbols & pictographs
+    "\U0001f680-\U0001f6ff"  # transport & map symbols
+    "\U0001f1e0-\U0001f1ff"  # flags (iOS)
+    "\U00002500-\U00002bef"  # chinese char
+    "\U00002702-\U000027b0"
+    "\U000024c2-\U0001f251"
+    "\U0001f926-\U0001f937"
+    "\U00010000-\U0010ffff"
+    "\u2640-\u2642"
+    "\u2600-\u2b55"
+    "\u200d"
+    "\u23cf"
+    "\u23e9"
+    "\u231a"
+    "\ufe0f"  # dingbats
+    "\u3030"
+    "]+",
+    UNICODE,
+)
+
+
 class EmotionsFilter(logging.Filter):
     def filter(self, record: LogRecord) -> bool:
-        emotions = compile(
-            "["
-            "\U0001f600-\U0001f64f"  # emoticons
-            "\U0001f300-\U0001f5ff"  # symbols & pictographs
-            "\U0001f680-\U0001f6ff"  # transport & map symbols
-            "\U0001f1e0-\U0001f1ff"  # flags (iOS)
-            "\U00002500-\U00002bef"  # chinese char
-            "\U00002702-\U000027b0"
-            "\U000024c2-\U0001f251"
-            "\U0001f926-\U0001f937"
-            "\U00010000-\U0010ffff"
-            "\u2640-\u2642"
-            "\u2600-\u2b55"
-            "\u200d"
-            "\u23cf"
-            "\u23e9"
-            "\u231a"
-            "\ufe0f"  # dingbats
-            "\u3030"
-            "]+",
-            UNICODE,
-        )
-        record.msg = sub(emotions, "*", record.msg)
+        if isinstance(record.msg, str):
+            record.msg = EMOTIONS_PATTERN.sub("*", record.msg)
 
         return True
 
 
-class LokiFilter(logging.Filter):
+class ContextFilter(logging.Filter):
+    """
+    Tags the record with the ids of the log context (see logs.context), the ids of extra_params win.
+    Is attached to the queue handler, so it runs in the task that logs the record
+    """
+
+    def filter(self, record: LogRecord) -> bool:
+        context = get_log_context()
+        tags = getattr(record, "tags", None)
+        if not context and not tags:
+            return True
+
+        tags = {**context, **tags} if tags else dict(context)
+        bot_token = tags.pop("bot_token", None)
+        if bot_token:  # hide the token from all the logs, it could be in the message or in its arguments
+            secret = str(bot_token)[5:-1]
+            record.msg = record.getMessage().replace(secret, "*" * len(secret))
+            record.args = None
+        record.tags = tags
+
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps the share of DEBUG and INFO records of the loggers from sample_rates, the warnings and errors are always kept.
+    Is attached to the queue handler, so the dropped records are never formatted
+    """
+
+    def __init__(self, sample_rates: dict[str, float]) -> None:
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.sampled_out = 0
+
     def filter(self, record: LogRecord) -> bool:
-        if hasattr(record, "tags"):
-            if hasattr(record, "product_review_id"):
-                record.tags["product_review_id"] = record.product_review_id
-            if hasattr(record, "user_id"):
-                record.tags["user_id"] = record.user_id
-            if hasattr(record, "bot_id"):
-                record.tags["bot_id"] = record.bot_id
-            if hasattr(record, "category_id"):
-                record.tags["category_id"] = record.category_id
-            if hasattr(record, "channel_id"):
-                record.tags["channel_id"] = record.channel_id
-            if hasattr(record, "channel_user_id"):
-                record.tags["channel_user_id"] = record.channel_user_id
-            if hasattr(record, "channel_post_id"):
-                record.tags["channel_post_id"] = record.channel_post_id
-            if hasattr(record, "post_message_id"):
-                record.tags["post_message_id"] = record.post_message_id
-            if hasattr(record, "order_id"):
-                record.tags["order_id"] = record.order_id
-            if hasattr(record, "product_id"):
-                record.tags["product_id"] = record.product_id
-            if hasattr(record, "payment_id"):
-                record.tags["payment_id"] = record.payment_id
-            if hasattr(record, "adv_id"):
-                record.tags["adv_id"] = record.adv_id
-            if hasattr(record, "job_id"):
-                record.tags["job_id"] = record.job_id
-            if hasattr(record, "contest_id"):
-                record.tags["contest_id"] = record.contest_id
-            if hasattr(record, "partnership_id"):
-                record.tags["partnership_id"] = record.partnership_id
-            if hasattr(record, "criteria_id"):
-                record.tags["criteria_id"] = record.criteria_id
-            if hasattr(record, "order_option_id"):
-                record.tags["order_option_id"] = record.order_option_id
-            if hasattr(record, "bot_token"):
-                # hide the token from gr
-                record.msg = record.msg.replace(record.bot_token[5:-1], "*" * len(record.bot_token[5:-1]))
-            if hasattr(record, "invite_id"):
-                record.tags["invite_id"] = record.invite_id
-            if "bot_token" in record.tags:
-                # hide the token from gr
-                record.msg = record.msg.replace(
-                    record.tags["bot_token"][5:-1], "*" * len(record.tags["bot_token"][5:-1])
-                )
+        if record.levelno >= logging.WARNING or record.name not in self.sample_rates:
+            return True
+        if random.random() < self.sample_rates[record.name]:
+            return True
 
+        self.sampled_out += 1
+        return False
+
+
+class LokiFilter(logging.Filter):
+    def filter(self, record: LogRecord) -> bool:  # noqa
         return logs_settings.LOG_TO_GRAFANA
 
 
+class JsonLineFormatter(logging.Formatter):
+    """Formats the record as the compact JSON line with its tags"""
+
+    def format(self, record: LogRecord) -> str:
+        line = {"file": record.filename, "func": record.funcName, "msg": record.getMessage()}
+        tags = getattr(record, "tags", None)
+        if tags:
+            line.update(tags)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line["exc"] = record.exc_text
+
+        return json.dumps(line, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Puts the records to the bounded queue of the logging thread, drops and counts them when it is full"""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingMetricsSchema(BaseModel):
+    """Snapshot of the logging pipeline"""
+
+    queued: int  # records waiting for the logging thread
+    queue_dropped: int
+    sampled_out: int
+
+    loki_buffered: int  # records waiting for the push to Loki
+    loki_sent: int
+    loki_dropped: int
+    loki_failed_pushes: int
+
+
 class ErrorWarningFilter(logging.Filter):
     def filter(self, record: LogRecord) -> bool:
         if record.levelno >= 30:
@@ -117,7 +172,7 @@ logger_configuration = {
     "version": 1,
     "formatters": {
         LOCAL_FORMATTER_NAME: {"format": "{levelname} {asctime} {filename} {funcName}() {msg}", "style": "{"},
-        GRAFANA_FORMATTER_NAME: {"format": "{filename} {funcName}() {msg}", "style": "{"},
+        GRAFANA_FORMATTER_NAME: {"()": JsonLineFormatter},
     },
     "filters": {
         "emotions_filter": {"()": EmotionsFilter},
@@ -146,41 +201,74 @@ logger_configuration = {
             "filters": ["error_warning_filter", "emotions_filter"],
         },
         "loki_handler": {
-            "class": "logging_loki.LokiHandler",
+            "()": BatchedLokiHandler,
             "level": "DEBUG",
             "formatter": GRAFANA_FORMATTER_NAME,
             "url": logs_settings.GRAFANA_URL + "loki/api/v1/push",
             "tags": {"from": logs_settings.FROM},
             "filters": ["loki_filter"],
-            "version": "1",
+            "batch_size": logs_settings.LOKI_BATCH_SIZE,
+            "flush_interval": logs_settings.LOKI_FLUSH_INTERVAL,
+            "buffer_size": logs_settings.LOKI_BUFFER_SIZE,
+            "timeout": logs_settings.LOKI_TIMEOUT,
+            "label_tags": logs_settings.LOKI_LABEL_TAGS,
         },
     },
     "loggers": {
         "general_logger": {
-            "level": "DEBUG",
+            "level": logs_settings.LOG_LEVELS.get("general_logger", "DEBUG"),
             "handlers": ["console_handler", "file_handler", "file_error_warning_handler", "loki_handler"],
         },
         "db_logger": {
-            "level": "DEBUG",
+            "level": logs_settings.LOG_LEVELS.get("db_logger", "DEBUG"),
             "handlers": ["console_handler", "file_handler", "file_error_warning_handler", "loki_handler"],
         },
         "api_logger": {
-            "level": "DEBUG",
+            "level": logs_settings.LOG_LEVELS.get("api_logger", "DEBUG"),
             "handlers": ["console_handler", "file_handler", "file_error_warning_handler", "loki_handler"],
         },
         "custom_bot_logger": {
-            "level": "DEBUG",
+            "level": logs_settings.LOG_LEVELS.get("custom_bot_logger", "DEBUG"),
             "handlers": ["console_handler", "file_handler", "file_error_warning_handler", "loki_handler"],
         },
         "tech_support_logger": {
-            "level": "DEBUG",
+            "level": logs_settings.LOG_LEVELS.get("tech_support_logger", "DEBUG"),
             "handlers": ["console_handler", "file_handler", "file_error_warning_handler", "loki_handler"],
         },
         "test_logger": {"level": "DEBUG", "handlers": ["console_handler"]},
     },
 }
 
+# the loggers of the service only put the records to the queue, the handlers doing I/O run in the logging thread
+QUEUED_LOGGER_NAMES = ["general_logger", "db_logger", "api_logger", "custom_bot_logger", "tech_support_logger"]
+
 logging.config.dictConfig(logger_configuration)
+
+_queued_handlers = logging.getLogger(QUEUED_LOGGER_NAMES[0]).handlers
+_loki_handler = next(handler for handler in _queued_handlers if isinstance(handler, BatchedLokiHandler))
+_queue_handler = DroppingQueueHandler(queue.Queue(logs_settings.LOG_QUEUE_SIZE))
+_sampling_filter = SamplingFilter(logs_settings.LOG_SAMPLE_RATES)
+_queue_handler.addFilter(_sampling_filter)
+_queue_handler.addFilter(ContextFilter())
+_queue_listener = QueueListener(_queue_handler.queue, *_queued_handlers, respect_handler_level=True)
+for logger_name in QUEUED_LOGGER_NAMES:
+    logging.getLogger(logger_name).handlers = [_queue_handler]
+_queue_listener.start()
+atexit.register(_queue_listener.stop)  # runs before logging.shutdown closes the handlers, so the queue is drained
+
+
+def get_logging_metrics() -> LoggingMetricsSchema:
+    return LoggingMetricsSchema(
+        queued=_queue_handler.queue.qsize(),
+        queue_dropped=_queue_handler.dropped,
+        sampled_out=_sampling_filter.sampled_out,
+        loki_buffered=len(_loki_handler._buffer),  # noqa
+        loki_sent=_loki_handler.sent,
+        loki_dropped=_loki_handler.dropped,
+        loki_failed_pushes=_loki_handler.failed_pushes,
+    )
+
+
 logger = logging.getLogger("general_logger")
 db_logger = logging.getLogger("db_logger")
 api_logger = logging.getLogger("api_logger")
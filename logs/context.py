@@ -0,0 +1,36 @@
+from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+# ids of what is being handled (bot_id, user_id, order_id, update_id...), every record of the task is tagged with them
+_log_context: ContextVar[dict[str, Any]] = ContextVar("log_context", default={})
+
+
+def get_log_context() -> dict[str, Any]:
+    return _log_context.get()
+
+
+def bind_log_context(**kwargs) -> Token:
+    """
+    Adds the ids to the context of the current task, the None values are skipped.
+    The ids are kept until the token is reset or the task (the update, the request) is over
+
+    :return: token for reset_log_context
+    """
+    return _log_context.set(
+        {**_log_context.get(), **{key: value for key, value in kwargs.items() if value is not None}}
+    )
+
+
+def reset_log_context(token: Token) -> None:
+    _log_context.reset(token)
+
+
+@contextmanager
+def log_context(**kwargs):
+    """Tags the records logged inside the block with the ids"""
+    token = bind_log_context(**kwargs)
+    try:
+        yield
+    finally:
+        reset_log_context(token)
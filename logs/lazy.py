@@ -0,0 +1,37 @@
+from typing import Any
+
+from common_utils.config import logs_settings
+
+
+class LazyPayload:
+    """
+    Large object passed to the log call as the %-style argument: it is rendered only when the record is emitted
+    (not when the level is disabled or the record is sampled out) and the text is cut to LOG_PAYLOAD_MAX_LENGTH.
+    The lists are rendered item by item up to the limit, so the rest of the items are never converted to the string
+
+        logger.debug("bot_id=%s: has %s products -> %s", bot_id, len(products), LazyPayload(products))
+    """
+
+    __slots__ = ("payload", "max_length")
+
+    def __init__(self, payload: Any, max_length: int | None = None) -> None:
+        self.payload = payload
+        self.max_length = max_length or logs_settings.LOG_PAYLOAD_MAX_LENGTH
+
+    def __str__(self) -> str:
+        if isinstance(self.payload, (list, tuple, set)):
+            return self._render_items()
+
+        text = str(self.payload)
+        if len(text) <= self.max_length:
+            return text
+        return f"{text[: self.max_length]}... ({len(text)} chars)"
+
+    def _render_items(self) -> str:
+        rendered, length = [], 0
+        for item in self.payload:
+            if length >= self.max_length:
+                return f"[{', '.join(rendered)}, ... ({len(self.payload) - len(rendered)} more)]"
+            rendered.append(str(item))
+            length += len(rendered[-1]) + 2
+        return f"[{', '.join(rendered)}]"
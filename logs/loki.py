@@ -0,0 +1,139 @@
+import logging
+import threading
+
+from collections import deque
+from typing import Iterable
+
+import requests
+
+from logging_loki.emitter import LokiEmitterV1
+
+
+class BatchedLokiHandler(logging.Handler):
+    """
+    Ships the records to Loki from its own thread: the records are buffered and pushed by one request every
+    batch_size records or flush_interval seconds. The buffer is bounded, the records above it are dropped and counted,
+    so the slow or unavailable Loki never blocks the logging threads and never exhausts the memory
+    """
+
+    def __init__(
+        self,
+        url: str,
+        tags: dict | None = None,
+        batch_size: int = 500,
+        flush_interval: float = 2,
+        buffer_size: int = 10000,
+        timeout: float = 5,
+        label_tags: Iterable[str] | None = None,
+        level: int = logging.NOTSET,
+    ) -> None:
+        """
+        :param url: loki/api/v1/push endpoint
+        :param tags: labels of all the records, the record adds its own by the "tags" attribute
+        :param batch_size: records in one push
+        :param flush_interval: seconds the record waits for the batch at most
+        :param buffer_size: records waiting for the push at most, the new ones are dropped above it
+        :param timeout: seconds of one push, the batch is dropped if it fails
+        :param label_tags: the tags of the record sent as the labels, None is all of them. Every set of the labels is
+            a separate stream in Loki, so the ids with many values (user_id, update_id) should stay in the line
+        """
+        super().__init__(level)
+        self.emitter = LokiEmitterV1(url, tags)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.timeout = timeout
+        self.label_tags = None if label_tags is None else frozenset(label_tags)
+
+        self._buffer: deque[tuple[dict, str, str]] = deque()  # labels, timestamp in ns, line
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._is_closed = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.failed_pushes = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = (self._build_labels(record), str(int(record.created * 1e9)), self.format(record))
+        except Exception:  # noqa
+            self.handleError(record)
+            return
+
+        with self._condition:
+            if self._is_closed or len(self._buffer) >= self.buffer_size:
+                self.dropped += 1
+                return
+
+            self._buffer.append(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._ship_periodically, name="loki_shipper", daemon=True)
+                self._thread.start()
+            if len(self._buffer) >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """Wakes the shipper up to push the buffered records without waiting for the full batch"""
+        with self._condition:
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Pushes the buffered records and stops the shipper"""
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout * 2)
+
+        self.emitter.close()
+        super().close()
+
+    def _build_labels(self, record: logging.LogRecord) -> dict:
+        if self.label_tags is None:
+            return self.emitter.build_tags(record)
+
+        labels = {
+            **self.emitter.tags,
+            self.emitter.level_tag: record.levelname.lower(),
+            self.emitter.logger_tag: record.name,
+        }
+        tags = getattr(record, "tags", None)
+        if isinstance(tags, dict):
+            labels.update({name: value for name, value in tags.items() if name in self.label_tags})
+        return labels
+
+    def _ship_periodically(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._is_closed or len(self._buffer) >= self.batch_size, timeout=self.flush_interval
+                )
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                is_over = self._is_closed and not self._buffer
+
+            if batch:
+                self._push(batch)
+            if is_over:
+                return
+
+    def _push(self, batch: list[tuple[dict, str, str]]) -> None:
+        streams: dict[tuple, dict] = {}  # the records with the same labels are sent as one stream
+        for raw_labels, timestamp, line in batch:
+            labels = {name: str(value) for name, value in raw_labels.items()}
+            stream = streams.setdefault(tuple(sorted(labels.items())), {"stream": labels, "values": []})
+            stream["values"].append([timestamp, line])
+
+        try:
+            self._post({"streams": list(streams.values())})
+        except Exception:  # noqa
+            self.failed_pushes += 1
+            self.dropped += len(batch)
+            return
+
+        self.sent += len(batch)
+
+    def _post(self, payload: dict) -> None:
+        resp = self.emitter.session.post(self.emitter.url, json=payload, timeout=self.timeout)
+        if resp.status_code != self.emitter.success_response_code:
+            raise requests.HTTPError(f"Unexpected Loki API response status code: {resp.status_code}")
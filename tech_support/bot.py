@@ -9,12 +9,14 @@ from common_utils.start_message import send_start_message_to_admins
 from common_utils.bot_settings_config import BOT_PROPERTIES
 from common_utils.cache_json.cache_json import JsonStore
 from common_utils.storage.tech_support_storage import support_bot_storage
+from common_utils.middlewaries.log_context_middleware import LogContextMiddleware
 
 from logs.config import tech_support_logger
 
 
 bot = Bot(tech_support_settings.TECH_SUPPORT_BOT_TOKEN, default=BOT_PROPERTIES)
 dp = Dispatcher(storage=support_bot_storage)
+dp.update.outer_middleware(LogContextMiddleware())
 
 main_bot = Bot(main_telegram_bot_settings.TELEGRAM_TOKEN, default=BOT_PROPERTIES)
 
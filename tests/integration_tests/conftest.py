@@ -9,7 +9,7 @@ from bot.keyboards.main_menu_keyboards import ReplyBotMenuKeyboard
 from bot.main import bot, storage, dp, include_routers, setup_storage_and_schedulers, scheduler
 from common_utils.keyboards.remove_keyboard import OurReplyKeyboardRemove
 
-from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.cached_storage import CachedStorage
 from database.models.bot_model import BotSchema, BotDao
 from database.models.option_model import OptionSchema, OptionDao
 
@@ -36,7 +36,7 @@ async def clear_keyboards_triggers() -> None:
 
 
 @pytest.fixture
-async def main_storage() -> AlchemyStorageAsync:
+async def main_storage() -> CachedStorage:
     yield storage  # Используем реальный instance storage из main.py, чтобы проверить боевые условия
     await storage.clear_table()
 
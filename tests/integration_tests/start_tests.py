@@ -12,7 +12,7 @@ from bot.keyboards.start_keyboards import ShortDescriptionKeyboard
 from bot.keyboards.main_menu_keyboards import ReplyBotMenuKeyboard
 from bot.keyboards.subscription_keyboards import InlineSubscriptionContinueKeyboard
 
-from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.cached_storage import CachedStorage
 from common_utils.keyboards.keyboards import InlineBotMenuKeyboard
 from common_utils.keyboards.remove_keyboard import OurReplyKeyboardRemove
 
@@ -29,7 +29,7 @@ class TestStartCommand:
         user_db: UserDao,
         tg_main_bot: Bot,
         dispatcher: Dispatcher,
-        main_storage: AlchemyStorageAsync,
+        main_storage: CachedStorage,
         tg_user: User,
         tg_chat: Chat,
     ):
@@ -62,7 +62,7 @@ class TestStartCommand:
         user_db: UserDao,
         tg_main_bot: Bot,
         dispatcher: Dispatcher,
-        main_storage: AlchemyStorageAsync,
+        main_storage: CachedStorage,
         tg_user: User,
         tg_chat: Chat,
     ):
@@ -111,7 +111,7 @@ class TestStartCommand:
         tg_main_bot: Bot,
         tg_custom_bot: Bot,
         dispatcher: Dispatcher,
-        main_storage: AlchemyStorageAsync,
+        main_storage: CachedStorage,
         tg_user: User,
         tg_chat: Chat,
     ):
@@ -157,7 +157,7 @@ class TestStartCommand:
         user_db: UserDao,
         tg_main_bot: Bot,
         dispatcher: Dispatcher,
-        main_storage: AlchemyStorageAsync,
+        main_storage: CachedStorage,
         tg_user: User,
         tg_chat: Chat,
     ):
@@ -210,7 +210,7 @@ def _get_storage_key(tg_user: User) -> StorageKey:
 async def _propagate_message_event(
     tg_main_bot: Bot,
     dispatcher: Dispatcher,
-    main_storage: AlchemyStorageAsync,
+    main_storage: CachedStorage,
     tg_user: User,
     tg_chat: Chat,
     text: str,
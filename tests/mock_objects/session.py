@@ -0,0 +1,42 @@
+from typing import Any, Callable
+
+from aiogram import Bot
+from aiogram.types import TelegramObject
+from aiogram.methods import TelegramMethod
+from aiogram.client.session.base import BaseSession
+
+
+class FakeSession(BaseSession):
+    """
+    Answers the telegram methods without the network and records them.
+    The response is the value for the type of the method, the callable is called with the method,
+    the exception is raised. The methods without the response return True.
+    The returned telegram objects are bound to the bot like the real responses, so their shortcuts work
+    """
+
+    def __init__(self, responses: dict[type[TelegramMethod], Any | Callable[[TelegramMethod], Any]] | None = None):
+        super().__init__()
+        self.responses = responses or {}
+        self.requests: list[TelegramMethod] = []
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: int | None = None) -> Any:
+        self.requests.append(method)
+
+        response = self.responses.get(type(method), True)
+        if isinstance(response, Exception):
+            raise response
+        if callable(response):
+            response = response(method)
+        if isinstance(response, TelegramObject):
+            response = response.as_(bot)
+        return response
+
+    async def stream_content(self, *args, **kwargs):  # noqa
+        raise NotImplementedError
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+    def get_requests(self, method_type: type[TelegramMethod]) -> list[TelegramMethod]:
+        return [method for method in self.requests if isinstance(method, method_type)]
@@ -0,0 +1,25 @@
+from starlette.requests import Request
+
+from api.utils.caching import is_not_modified
+
+
+def _make_request(if_none_match: str | None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestCatalogCaching:
+    """Tests for the ETag comparison of the catalog endpoints"""
+
+    def test_matching_etag_is_not_modified(self):
+        etag = 'W/"1-5-abc"'
+
+        assert is_not_modified(_make_request('W/"1-5-abc"'), etag)
+        assert is_not_modified(_make_request('"1-4-abc", "1-5-abc"'), etag)
+        assert is_not_modified(_make_request("*"), etag)
+
+    def test_changed_catalog_is_modified(self):
+        etag = 'W/"1-6-abc"'
+
+        assert not is_not_modified(_make_request(None), etag)
+        assert not is_not_modified(_make_request('W/"1-5-abc"'), etag)
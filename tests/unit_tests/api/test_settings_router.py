@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from fastapi import Response
+from starlette.requests import Request
+
+from api.settings import router as settings_router
+from api.utils import caching
+
+from database.models.option_model import OptionSchema, OptionNotFoundError
+
+BOT_ID = 1
+
+
+class _FakeBotRegistry:
+    def __init__(self, options_id: int) -> None:
+        self.options_id = options_id
+
+    async def get_bot(self, bot_id: int) -> SimpleNamespace:
+        return SimpleNamespace(bot_id=bot_id, options_id=self.options_id)
+
+    async def get_catalog_version(self, *_) -> int:
+        return 1  # the catalog is not changed
+
+
+class _FakeOptionDao:
+    async def get_option(self, option_id: int) -> OptionSchema:
+        if option_id < 0:
+            raise OptionNotFoundError(option_id=option_id)
+        return OptionSchema(id=option_id, web_app_button=f"button {option_id}")
+
+
+def _make_request(if_none_match: str | None = None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    path = f"/api/settings/get_web_app_options/{BOT_ID}/"
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
+
+
+class TestWebAppOptionsCaching:
+    """Tests for the ETag of the web app options"""
+
+    async def test_new_options_of_bot_are_modified(self, monkeypatch):
+        bot_registry = _FakeBotRegistry(options_id=1)
+        monkeypatch.setattr(settings_router, "bot_registry", bot_registry)
+        monkeypatch.setattr(caching, "bot_registry", bot_registry)
+        monkeypatch.setattr(settings_router, "option_db", _FakeOptionDao())
+
+        response = Response()
+        await settings_router.get_web_app_options_api(BOT_ID, _make_request(), response)
+        etag = response.headers["ETag"]
+
+        not_modified = await settings_router.get_web_app_options_api(BOT_ID, _make_request(etag), Response())
+        assert not_modified.status_code == 304
+
+        bot_registry.options_id = 2  # e.g. the options are created again from the stock menu
+        options = await settings_router.get_web_app_options_api(BOT_ID, _make_request(etag), Response())
+        assert options.id == 2
+
+    async def test_default_options_are_not_cached(self, monkeypatch):
+        bot_registry = _FakeBotRegistry(options_id=-5)
+        monkeypatch.setattr(settings_router, "bot_registry", bot_registry)
+        monkeypatch.setattr(caching, "bot_registry", bot_registry)
+        monkeypatch.setattr(settings_router, "option_db", _FakeOptionDao())
+
+        response = Response()
+        options = await settings_router.get_web_app_options_api(BOT_ID, _make_request(), response)
+
+        assert options.id == -1
+        assert "ETag" not in response.headers
@@ -0,0 +1,21 @@
+import hmac
+import hashlib
+
+from common_utils.config import cryptography_settings
+from common_utils.token_encryptor import TokenEncryptor
+
+BOT_TOKEN = "7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo"
+
+
+class TestTokenEncryptor:
+    """Tests for TokenEncryptor"""
+
+    def test_fingerprint_is_not_keyed_by_secret_key(self):
+        secret_key = cryptography_settings.TOKEN_SECRET_KEY
+        encryptor = TokenEncryptor(secret_key)
+
+        fingerprint = encryptor.fingerprint_token(BOT_TOKEN)
+
+        assert fingerprint == encryptor.fingerprint_token(BOT_TOKEN)  # is used to search the token in database
+        assert fingerprint != hmac.new(secret_key.encode(), BOT_TOKEN.encode(), hashlib.sha256).hexdigest()
+        assert encryptor.decrypt_token(encryptor.encrypt_token(BOT_TOKEN)) == BOT_TOKEN
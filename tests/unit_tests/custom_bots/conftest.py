@@ -0,0 +1,26 @@
+import pytest
+import datetime
+
+from database.models.models import Database
+from database.models.bot_model import BotSchema
+from database.models.option_model import OptionSchemaWithoutId, OptionDao
+
+
+@pytest.fixture
+async def option_db(database: Database) -> OptionDao:
+    option_db = database.get_option_dao()
+    yield option_db
+    await option_db.clear_table()
+
+
+@pytest.fixture
+async def custom_bot(option_db: OptionDao) -> BotSchema:
+    return BotSchema(
+        bot_id=7346456554,
+        bot_token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo",
+        status="online",
+        created_at=datetime.datetime.now(),
+        created_by=1,
+        options_id=await option_db.add_option(OptionSchemaWithoutId(web_app_button="default")),
+        locale="default",
+    )
@@ -0,0 +1,72 @@
+from aiogram.methods import (
+    GetWebhookInfo,
+    SetWebhook,
+    GetMyCommands,
+    SetMyCommands,
+    GetChatMenuButton,
+    SetChatMenuButton,
+)
+from aiogram.types import WebhookInfo, BotCommand, MenuButtonWebApp, MenuButtonDefault
+
+from common_utils.config import cryptography_settings
+from common_utils.keyboards.keyboard_utils import make_webapp_info
+from common_utils.token_encryptor import TokenEncryptor
+
+from custom_bots.utils.bot_restart import (
+    restart_custom_bot,
+    restore_custom_bots,
+    WebhookRestoreResult,
+    OTHER_BOTS_URL,
+    ALLOWED_UPDATES,
+)
+
+from database.models.bot_model import BotSchema
+
+from tests.mock_objects.session import FakeSession
+
+
+def _webhook_info(url: str) -> WebhookInfo:
+    return WebhookInfo(url=url, has_custom_certificate=False, pending_update_count=0, allowed_updates=ALLOWED_UPDATES)
+
+
+class TestBotRestart:
+    """Tests for restart_custom_bot and restore_custom_bots"""
+
+    async def test_up_to_date_bot_is_unchanged(self, custom_bot: BotSchema):
+        encrypted_token = TokenEncryptor(cryptography_settings.TOKEN_SECRET_KEY).encrypt_token(custom_bot.token)
+        session = FakeSession(
+            {
+                GetWebhookInfo: _webhook_info(OTHER_BOTS_URL.format(encrypted_bot_token=encrypted_token)),
+                GetMyCommands: [BotCommand(command="lang", description="select language")],
+                GetChatMenuButton: MenuButtonWebApp(text="Catalog", web_app=make_webapp_info(custom_bot.bot_id)),
+            }
+        )
+
+        assert await restart_custom_bot(custom_bot, session) == WebhookRestoreResult.UNCHANGED
+        assert not session.get_requests(SetWebhook)
+        assert not session.get_requests(SetMyCommands)
+        assert not session.get_requests(SetChatMenuButton)
+
+    async def test_changed_bot_is_updated(self, custom_bot: BotSchema):
+        session = FakeSession(
+            {
+                GetWebhookInfo: _webhook_info("https://other.host/webhook"),
+                GetMyCommands: [],
+                GetChatMenuButton: MenuButtonDefault(),
+            }
+        )
+
+        assert await restart_custom_bot(custom_bot, session) == WebhookRestoreResult.UPDATED
+        assert len(session.get_requests(SetWebhook)) == 1
+        assert len(session.get_requests(SetMyCommands)) == 1
+        assert len(session.get_requests(SetChatMenuButton)) == 1
+
+    async def test_not_set_webhook_is_failed(self, custom_bot: BotSchema):
+        session = FakeSession({GetWebhookInfo: _webhook_info(""), SetWebhook: False})
+
+        assert await restart_custom_bot(custom_bot, session) == WebhookRestoreResult.FAILED
+
+        results = await restore_custom_bots([custom_bot], session, concurrency=1, rate=1000)
+
+        assert results[WebhookRestoreResult.FAILED] == 1
+        assert results[WebhookRestoreResult.UPDATED] == 0
@@ -0,0 +1,92 @@
+import datetime
+
+from aiogram import Bot
+from aiogram.methods import AnswerCallbackQuery, DeleteWebhook, EditMessageText
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+from custom_bots.handlers import command_handlers
+from custom_bots.handlers.command_handlers import language_select_handler
+from custom_bots.keyboards.custom_bot_menu_keyboards import InlineSelectLanguageKb
+
+from database.enums import UserLanguageValues
+from database.models.bot_model import BotSchema
+from database.models.option_model import OptionSchema
+
+from tests.mock_objects.session import FakeSession
+
+BOT_TOKEN = "7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo"
+
+
+class _FakeCustomBotUserDao:
+    def __init__(self) -> None:
+        self.added: list[tuple[int, int]] = []
+        self.updated_languages: list[UserLanguageValues] = []
+
+    async def add_custom_bot_user(self, bot_id: int, user_id: int) -> None:
+        self.added.append((bot_id, user_id))
+
+    async def update_custom_bot_user(self, custom_bot_user) -> None:
+        self.updated_languages.append(custom_bot_user.user_language)
+
+
+def _language_query(bot: Bot, language: UserLanguageValues) -> CallbackQuery:
+    message = Message(message_id=1, date=datetime.datetime.now(), chat=Chat(id=5, type="private"), text="lang")
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=5, is_bot=False, first_name="user"),
+        chat_instance="1",
+        message=message.as_(bot),
+        data=InlineSelectLanguageKb.callback_json(InlineSelectLanguageKb.Callback.ActionEnum.SELECT, language, bot.id),
+    ).as_(bot)
+
+
+class TestCommandHandlers:
+    """Tests for the command handlers of the custom bots"""
+
+    async def test_language_select_without_bot_in_database(self):
+        session = FakeSession()
+        bot = Bot(token=BOT_TOKEN, session=session)
+        query = _language_query(bot, UserLanguageValues.ENGLISH)
+
+        # the tenant middleware injects None for the bot and the user that are not in the database
+        await language_select_handler(query, custom_bot=None, custom_bot_options=None, custom_bot_user=None)
+
+        assert len(session.get_requests(DeleteWebhook)) == 1
+        assert len(session.get_requests(AnswerCallbackQuery)) == 1
+        assert not session.get_requests(EditMessageText)
+
+    async def test_language_select_of_new_user_is_not_start(self, monkeypatch):
+        custom_bot_user_db = _FakeCustomBotUserDao()
+        sent_events = []
+
+        async def send_event(*args, **kwargs) -> None:
+            sent_events.append((args, kwargs))
+
+        monkeypatch.setattr(command_handlers, "custom_bot_user_db", custom_bot_user_db)
+        monkeypatch.setattr(command_handlers, "send_event", send_event)
+        session = FakeSession()
+        bot = Bot(token=BOT_TOKEN, session=session)
+        custom_bot = BotSchema(
+            bot_id=bot.id,
+            bot_token=BOT_TOKEN,
+            status="online",
+            created_at=datetime.datetime.now(),
+            created_by=1,
+            options_id=1,
+            locale="default",
+        )
+        options = OptionSchema(
+            id=1, web_app_button="default", languages=[UserLanguageValues.RUSSIAN, UserLanguageValues.ENGLISH]
+        )
+
+        await language_select_handler(
+            _language_query(bot, UserLanguageValues.RUSSIAN),
+            custom_bot=custom_bot,
+            custom_bot_options=options,
+            custom_bot_user=None,
+        )
+
+        assert custom_bot_user_db.added == [(bot.id, 5)]
+        assert custom_bot_user_db.updated_languages == [UserLanguageValues.RUSSIAN]
+        assert not sent_events  # the first message events are sent only by /start
+        assert len(session.get_requests(EditMessageText)) == 1
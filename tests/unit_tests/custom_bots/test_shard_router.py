@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer, TestClient
+
+import pytest
+
+from custom_bots.utils.shard_router import ConsistentHashRing, ShardRouter, WorkersSupervisor
+
+PATH = "/webhook/bot/{encrypted_bot_token}"
+KEYS = [f"encrypted-token-{ind}" for ind in range(10000)]
+
+
+class FakeProcess:
+    _pids = itertools.count(1000)
+
+    def __init__(self, worker_index: int) -> None:
+        self.worker_index = worker_index
+        self.pid = None
+        self.exitcode = None
+        self.alive = False
+        self.terminated = False
+
+    def start(self) -> None:
+        self.pid = next(self._pids)
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.alive = False
+
+    def join(self) -> None:
+        pass
+
+
+async def _start_worker_server(worker_index: int, requests: list) -> TestServer:
+    async def handle(request: web.Request) -> web.Response:
+        requests.append((worker_index, request.path, await request.read(), dict(request.headers)))
+        return web.json_response({"worker": worker_index}, status=429, headers={"Retry-After": "1", "X-Other": "1"})
+
+    app = web.Application()
+    app.router.add_route("POST", PATH, handle)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestConsistentHashRing:
+    """Tests for ConsistentHashRing"""
+
+    def test_routing_is_stable(self):
+        ring = ConsistentHashRing(range(4))
+        other_ring = ConsistentHashRing([3, 1, 0, 2])
+
+        assert [ring.get_node(key) for key in KEYS] == [other_ring.get_node(key) for key in KEYS]
+        assert {ring.get_node(key) for key in KEYS} == {0, 1, 2, 3}
+
+    def test_adding_node_moves_about_one_nth_of_keys(self):
+        ring = ConsistentHashRing(range(4))
+        before = {key: ring.get_node(key) for key in KEYS}
+
+        ring.add_node(4)
+        moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+
+        assert all(ring.get_node(key) == 4 for key in moved)  # the keys move only to the new node
+        assert 0.12 < len(moved) / len(KEYS) < 0.28  # about 1/5
+
+    def test_removing_node_moves_only_its_keys(self):
+        ring = ConsistentHashRing(range(4))
+        before = {key: ring.get_node(key) for key in KEYS}
+
+        ring.remove_node(2)
+
+        for key in KEYS:
+            if before[key] != 2:
+                assert ring.get_node(key) == before[key]
+            else:
+                assert ring.get_node(key) != 2
+
+    def test_empty_ring(self):
+        with pytest.raises(LookupError):
+            ConsistentHashRing([]).get_node("encrypted-token")
+
+
+class TestShardRouter:
+    """Tests for ShardRouter"""
+
+    async def test_request_is_forwarded_to_worker_of_bot(self):
+        requests = []
+        workers = {worker_index: await _start_worker_server(worker_index, requests) for worker_index in range(3)}
+        router = ShardRouter({worker_index: str(server.make_url("")) for worker_index, server in workers.items()})
+        app = web.Application()
+        router.register(app, path=PATH)
+
+        async with TestClient(TestServer(app)) as client:
+            for key in KEYS[:30]:
+                response = await client.post(
+                    PATH.format(encrypted_bot_token=key),
+                    data=b'{"update_id": 1}',
+                    headers={"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": "secret"},
+                )
+
+                worker_index = router.ring.get_node(key)
+                assert response.status == 429
+                assert response.headers["Retry-After"] == "1"
+                assert "X-Other" not in response.headers
+                assert await response.json() == {"worker": worker_index}
+                assert requests[-1][:3] == (worker_index, PATH.format(encrypted_bot_token=key), b'{"update_id": 1}')
+                assert requests[-1][3]["X-Telegram-Bot-Api-Secret-Token"] == "secret"
+
+        for server in workers.values():
+            await server.close()
+
+        assert len({worker_index for worker_index, *_ in requests}) == 3
+
+    async def test_unavailable_worker(self):
+        worker = await _start_worker_server(0, [])
+        worker_url = str(worker.make_url(""))
+        await worker.close()
+
+        app = web.Application()
+        ShardRouter({0: worker_url}).register(app, path=PATH)
+
+        async with TestClient(TestServer(app)) as client:
+            response = await client.post(PATH.format(encrypted_bot_token="encrypted-token"), data=b"{}")
+
+        assert response.status == 503
+
+
+class TestWorkersSupervisor:
+    """Tests for WorkersSupervisor"""
+
+    async def test_dead_worker_is_restarted(self):
+        processes = []
+
+        def create_process(worker_index: int) -> FakeProcess:
+            processes.append(FakeProcess(worker_index))
+            return processes[-1]
+
+        supervisor = WorkersSupervisor(2, create_process)
+        supervisor.CHECK_INTERVAL = 0.01
+        app = web.Application()
+        supervisor.register(app)
+
+        async with TestServer(app):  # runs the startup and cleanup callbacks
+            assert [(process.worker_index, process.is_alive()) for process in processes] == [(0, True), (1, True)]
+
+            processes[1].alive, processes[1].exitcode = False, 1
+            await asyncio.sleep(0.05)
+
+            assert [process.worker_index for process in processes] == [0, 1, 1]
+            assert processes[2].is_alive()
+
+        assert processes[0].terminated and processes[2].terminated
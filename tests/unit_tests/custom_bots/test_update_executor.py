@@ -0,0 +1,304 @@
+import asyncio
+
+from aiogram import Bot, Dispatcher
+
+from custom_bots.utils.multi_dispathcer_server import EncryptedTokenBasedRequestHandler
+from custom_bots.utils.update_executor import (
+    SubmitResult,
+    UpdateExecutor,
+    UpdatePriority,
+    get_update_order_key,
+    get_update_priority,
+    get_update_coalesce_key,
+)
+
+from tests.mock_objects.session import FakeSession
+
+
+class FakeHandler:
+    """Records the order of the handled updates, the update is finished only after its event is set"""
+
+    def __init__(self) -> None:
+        self.handled: list = []
+        self.running: set = set()
+        self.max_running_per_key: dict = {}
+        self.finish_events: dict = {}
+
+    def make_run(self, name, order_key=None, block: bool = False):
+        if block:
+            self.finish_events[name] = asyncio.Event()
+
+        async def run() -> None:
+            self.running.add(name)
+            running_of_key = sum(1 for running_name in self.running if running_name[0] == order_key)
+            self.max_running_per_key[order_key] = max(self.max_running_per_key.get(order_key, 0), running_of_key)
+            self.handled.append(name)
+            if name in self.finish_events:
+                await self.finish_events[name].wait()
+            await asyncio.sleep(0)
+            self.running.discard(name)
+
+        return run
+
+
+class FakeRequest:
+    def __init__(self, update: dict) -> None:
+        self.update = update
+
+    async def json(self, loads=None) -> dict:
+        return self.update
+
+
+def _make_executor(max_concurrency: int = 1, max_queue_size: int = 100) -> UpdateExecutor:
+    return UpdateExecutor(
+        max_concurrency=max_concurrency,
+        max_queue_size=max_queue_size,
+        max_low_priority_queue_size=100,
+        max_low_priority_concurrency=1,
+    )
+
+
+def _chat_member_update(update_id: int, chat_id: int, user_id: int, status: str) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": "user"}
+    return {
+        "update_id": update_id,
+        "chat_member": {
+            "chat": {"id": chat_id, "type": "channel", "title": "channel"},
+            "from": user,
+            "date": 0,
+            "old_chat_member": {"status": "left", "user": user},
+            "new_chat_member": {"status": status, "user": user},
+        },
+    }
+
+
+def _my_chat_member_update(update_id: int, chat_id: int) -> dict:
+    admin = {"id": 1, "is_bot": False, "first_name": "admin"}
+    bot = {"id": 7346456554, "is_bot": True, "first_name": "bot"}
+    return {
+        "update_id": update_id,
+        "my_chat_member": {
+            "chat": {"id": chat_id, "type": "channel", "title": "channel"},
+            "from": admin,
+            "date": 0,
+            "old_chat_member": {"status": "left", "user": bot},
+            "new_chat_member": {"status": "administrator", "user": bot},
+        },
+    }
+
+
+async def _wait_until_idle(executor: UpdateExecutor) -> None:
+    for _ in range(1000):
+        if not executor._has_queued_or_running():  # noqa
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("the executor has not handled the updates")
+
+
+async def _wait_until_idle_except(executor: UpdateExecutor, handler: FakeHandler, blocking_name) -> None:
+    """Waits until only the blocking update is left running"""
+    for _ in range(1000):
+        if handler.running == {blocking_name} and all(
+            not lane.jobs or all(job.order_key == blocking_name[0] for job in lane.jobs)
+            for queue in executor._queues.values()  # noqa
+            for lane in queue.lanes.values()
+        ):
+            return
+        await asyncio.sleep(0)
+    raise AssertionError("the executor has not handled the updates")
+
+
+class TestUpdateExecutor:
+    """Tests for UpdateExecutor"""
+
+    async def test_bots_are_handled_in_round_robin(self):
+        executor, handler = _make_executor(), FakeHandler()
+        for ind in range(4):
+            executor.submit(1, ("a", ind), handler.make_run(("a", ind), "a"))
+        for ind in range(2):
+            executor.submit(2, ("b", ind), handler.make_run(("b", ind), "b"))
+
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert handler.handled == [("a", 0), ("b", 0), ("a", 1), ("b", 1), ("a", 2), ("a", 3)]
+
+    async def test_weighted_bot_starts_more_updates_per_turn(self):
+        executor, handler = _make_executor(), FakeHandler()
+        executor.set_weight(1, 2)
+        for ind in range(4):
+            executor.submit(1, ("a", ind), handler.make_run(("a", ind), "a"))
+            executor.submit(2, ("b", ind), handler.make_run(("b", ind), "b"))
+
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert handler.handled[:6] == [("a", 0), ("a", 1), ("b", 0), ("a", 2), ("a", 3), ("b", 1)]
+
+    async def test_updates_of_one_chat_are_handled_in_order(self):
+        executor, handler = _make_executor(max_concurrency=4), FakeHandler()
+        executor.submit(1, "chat", handler.make_run(("chat", 0), "chat", block=True))
+        for ind in range(1, 4):
+            executor.submit(1, "chat", handler.make_run(("chat", ind), "chat"))
+        executor.submit(1, "other_chat", handler.make_run(("other_chat", 0), "other_chat"))
+
+        await _wait_until_idle_except(executor, handler, ("chat", 0))
+        assert handler.handled == [("chat", 0), ("other_chat", 0)]  # the other chat is not blocked by the busy one
+
+        handler.finish_events[("chat", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert [name for name in handler.handled if name[0] == "chat"] == [("chat", ind) for ind in range(4)]
+        assert handler.max_running_per_key["chat"] == 1
+
+    async def test_full_queue_sheds_the_update(self):
+        executor, handler = _make_executor(max_queue_size=2), FakeHandler()
+        executor.submit(1, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        assert executor.submit(1, "chat", handler.make_run(("chat", 0))) == SubmitResult.QUEUED
+        assert executor.submit(1, "chat", handler.make_run(("chat", 1))) == SubmitResult.QUEUED
+        assert executor.submit(1, "chat", handler.make_run(("chat", 2))) == SubmitResult.SHED
+        assert executor.submit(2, "chat", handler.make_run(("chat", 3))) == SubmitResult.QUEUED  # other bot
+
+        handler.finish_events[("blocking", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert ("chat", 2) not in handler.handled
+        assert executor.get_metrics().bots[1].shed == 1
+
+    async def test_webhook_answers_429_on_full_queue(self):
+        executor, handler = _make_executor(max_queue_size=1), FakeHandler()
+        request_handler = EncryptedTokenBasedRequestHandler(Dispatcher(), update_executor=executor)
+        bot = Bot(token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo", session=FakeSession())
+        executor.submit(bot.id, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        message = {"message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}, "text": "hi"}
+        first = await request_handler._handle_request_background(bot, FakeRequest({"update_id": 1, "message": message}))
+        second = await request_handler._handle_request_background(
+            bot, FakeRequest({"update_id": 2, "message": message})
+        )
+
+        assert first.status == 200
+        assert second.status == 429
+        assert second.headers["Retry-After"] == "1"
+
+        handler.finish_events[("blocking", 0)].set()
+        await executor.close()
+
+    async def test_membership_updates_are_coalesced(self):
+        executor, handler = _make_executor(), FakeHandler()
+        executor.submit(1, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        results = []
+        for update_id, status in enumerate(("member", "left", "member")):
+            update = _chat_member_update(update_id, chat_id=-100, user_id=5, status=status)
+            results.append(
+                executor.submit(
+                    1,
+                    get_update_order_key(update),
+                    handler.make_run(("member", status, update_id)),
+                    priority=UpdatePriority.LOW,
+                    coalesce_key=get_update_coalesce_key(update),
+                )
+            )
+        other_user_update = _chat_member_update(3, chat_id=-100, user_id=6, status="member")
+        results.append(
+            executor.submit(
+                1,
+                get_update_order_key(other_user_update),
+                handler.make_run(("member", "member", 3)),
+                priority=UpdatePriority.LOW,
+                coalesce_key=get_update_coalesce_key(other_user_update),
+            )
+        )
+
+        handler.finish_events[("blocking", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert results == [SubmitResult.QUEUED, SubmitResult.COALESCED, SubmitResult.COALESCED, SubmitResult.QUEUED]
+        assert handler.handled[1:] == [("member", "member", 2), ("member", "member", 3)]
+        assert executor.get_metrics().bots[1].coalesced == 2
+
+    async def test_higher_lanes_are_handled_first(self):
+        executor, handler = _make_executor(), FakeHandler()
+        executor.submit(1, "low", handler.make_run(("low", 0)), priority=UpdatePriority.LOW)
+        executor.submit(1, "normal", handler.make_run(("normal", 0)))
+        executor.submit(2, "high", handler.make_run(("high", 0)), priority=UpdatePriority.HIGH)
+        executor.submit(1, "high", handler.make_run(("high", 1)), priority=UpdatePriority.HIGH)
+
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert handler.handled == [("high", 0), ("high", 1), ("normal", 0), ("low", 0)]
+
+    async def test_full_high_lane_sheds_the_update(self):
+        executor, handler = _make_executor(max_queue_size=1), FakeHandler()
+        executor.submit(1, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        assert executor.submit(1, 1, handler.make_run(("high", 0)), UpdatePriority.HIGH) == SubmitResult.QUEUED
+        assert executor.submit(1, 1, handler.make_run(("high", 1)), UpdatePriority.HIGH) == SubmitResult.SHED
+        assert executor.submit(1, 1, handler.make_run(("normal", 0))) == SubmitResult.QUEUED  # the lanes are separate
+
+        handler.finish_events[("blocking", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert handler.handled == [("blocking", 0), ("high", 0), ("normal", 0)]
+        assert executor.get_metrics().bots[1].shed == 1
+
+    async def test_full_low_lane_drops_the_update(self):
+        executor, handler = _make_executor(), FakeHandler()
+        executor.max_low_priority_queue_size = 1
+        executor.submit(1, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        assert executor.submit(1, 1, handler.make_run(("low", 0)), UpdatePriority.LOW) == SubmitResult.QUEUED
+        assert executor.submit(1, 2, handler.make_run(("low", 1)), UpdatePriority.LOW) == SubmitResult.DROPPED
+        assert executor.submit(1, 3, handler.make_run(("normal", 0))) == SubmitResult.QUEUED
+
+        handler.finish_events[("blocking", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert handler.handled == [("blocking", 0), ("normal", 0), ("low", 0)]
+        metrics = executor.get_metrics().bots[1]
+        assert (metrics.dropped, metrics.shed) == (1, 0)
+
+    async def test_bot_membership_updates_are_never_dropped(self):
+        executor, handler = _make_executor(), FakeHandler()
+        executor.max_low_priority_queue_size = 1
+        executor.submit(1, "blocking", handler.make_run(("blocking", 0), "blocking", block=True))
+        await asyncio.sleep(0)  # the worker takes the blocking update
+
+        results = []
+        for update_id in range(3):
+            for update in (
+                _chat_member_update(update_id, chat_id=-100, user_id=update_id, status="member"),
+                _my_chat_member_update(update_id, chat_id=-100 - update_id),
+            ):
+                results.append(
+                    executor.submit(
+                        1,
+                        get_update_order_key(update),
+                        handler.make_run((next(key for key in update if key != "update_id"), update_id)),
+                        priority=get_update_priority(update),
+                        coalesce_key=get_update_coalesce_key(update),
+                    )
+                )
+
+        handler.finish_events[("blocking", 0)].set()
+        await _wait_until_idle(executor)
+        await executor.close()
+
+        assert results[1::2] == [SubmitResult.QUEUED] * 3  # the bot is added to the channels
+        assert results[0::2] == [SubmitResult.QUEUED, SubmitResult.DROPPED, SubmitResult.DROPPED]
+        assert [name for name in handler.handled if name[0] == "my_chat_member"] == [
+            ("my_chat_member", update_id) for update_id in range(3)
+        ]
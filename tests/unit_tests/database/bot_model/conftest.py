@@ -0,0 +1,37 @@
+import pytest
+
+from database.models.models import Database
+from database.models.bot_model import BotSchemaWithoutId, BotDao
+from database.models.bot_registry import BotRegistry
+from database.models.post_message_model import PostMessage, PostMessageDao
+
+
+@pytest.fixture
+def bots(bot: BotSchemaWithoutId) -> list[BotSchemaWithoutId]:
+    return [bot] + [
+        bot.model_copy(update={"token": token})
+        for token in (
+            "7346456555:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgp",
+            "7346456556:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgq",
+        )
+    ]
+
+
+@pytest.fixture
+async def add_bots(bots: list[BotSchemaWithoutId], bot_db: BotDao, add_user) -> list[int]:
+    return [await bot_db.add_bot(bot) for bot in bots]
+
+
+@pytest.fixture
+async def bot_registry(database: Database) -> BotRegistry:
+    bot_registry = database.get_bot_registry()
+    await bot_registry.start_listening()
+    yield bot_registry
+    await bot_registry.stop_listening()
+
+
+@pytest.fixture
+async def post_message_db(database: Database) -> PostMessageDao:
+    post_message_db = database.get_post_message_dao()
+    yield post_message_db
+    await post_message_db.clear_table(PostMessage)
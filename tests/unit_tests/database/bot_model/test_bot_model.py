@@ -0,0 +1,18 @@
+import pytest
+
+from database.models.bot_model import BotSchemaWithoutId, BotDao, BotNotFoundError
+
+
+class TestBotModel:
+    """Tests for BotDao"""
+
+    async def test_get_bot_by_token(self, bots: list[BotSchemaWithoutId], bot_db: BotDao, add_bots: list[int]):
+        for bot, bot_id in zip(bots, add_bots):
+            found_bot = await bot_db.get_bot_by_token(bot.token)
+
+            assert found_bot.bot_id == bot_id
+            assert found_bot.token == bot.token
+
+    async def test_get_bot_by_unknown_token(self, bot_db: BotDao, add_bots: list[int]):
+        with pytest.raises(BotNotFoundError):
+            await bot_db.get_bot_by_token("7346456557:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgr")
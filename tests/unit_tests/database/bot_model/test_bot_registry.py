@@ -0,0 +1,92 @@
+import asyncio
+
+from sqlalchemy import select, func
+
+from database.models.bot_model import BotDao, BOT_CHANGES_CHANNEL
+from database.models.bot_registry import BotRegistry
+from database.models.post_message_model import (
+    PostMessageDao,
+    PostMessageSchemaWithoutId,
+    PostMessageType,
+    POST_MESSAGE_CANCELS_CHANNEL,
+)
+
+
+class TestBotRegistry:
+    """Tests for BotRegistry"""
+
+    async def test_get_bot_is_cached(self, bot_registry: BotRegistry, add_bots: list[int]):
+        bot_id = add_bots[0]
+        hits, misses = bot_registry.hits, bot_registry.misses
+
+        first = await bot_registry.get_bot(bot_id)
+        second = await bot_registry.get_bot(bot_id)
+        by_token = await bot_registry.get_bot_by_token(first.token)
+
+        assert first == second == by_token
+        assert bot_registry.misses - misses == 1
+        assert bot_registry.hits - hits == 2
+
+    async def test_update_bot_invalidates_registry(
+        self, bot_registry: BotRegistry, bot_db: BotDao, add_bots: list[int]
+    ):
+        bot = await bot_registry.get_bot(add_bots[0])
+        bot.status = "offline"
+        await bot_db.update_bot(bot)
+
+        assert (await bot_registry.get_bot(bot.bot_id)).status == "offline"
+
+    async def test_notify_from_other_process_invalidates_registry(
+        self, bot_registry: BotRegistry, bot_db: BotDao, add_bots: list[int]
+    ):
+        bot_id = add_bots[0]
+        await bot_registry.get_bot(bot_id)
+
+        async with bot_db.engine.begin() as conn:
+            await conn.execute(select(func.pg_notify(BOT_CHANGES_CHANNEL, str(bot_id))))
+        for _ in range(50):
+            if bot_registry.get_metrics().cached_bots == 0:
+                break
+            await asyncio.sleep(0.01)
+
+        assert bot_registry.get_metrics().cached_bots == 0
+
+    async def test_catalog_version_is_cached_until_bumped(self, bot_registry: BotRegistry, add_bots: list[int]):
+        bot_id = add_bots[0]
+        version = await bot_registry.get_catalog_version(bot_id)
+        hits = bot_registry.hits
+
+        assert await bot_registry.get_catalog_version(bot_id) == version
+        assert bot_registry.hits - hits == 1
+
+        async with bot_registry.catalog_version_dao.engine.begin() as conn:
+            await bot_registry.catalog_version_dao.bump_catalog_versions(conn, bot_id)
+
+        assert await bot_registry.get_catalog_version(bot_id) == version + 1
+
+    async def test_deleted_running_post_message_is_notified(
+        self, bot_registry: BotRegistry, post_message_db: PostMessageDao, add_bots: list[int]
+    ):
+        cancelled_post_message_ids = []
+        await bot_registry.stop_listening()  # the listeners are subscribed on connect
+        bot_registry.add_notification_listener(
+            POST_MESSAGE_CANCELS_CHANNEL, lambda payload: cancelled_post_message_ids.append(int(payload))
+        )
+        await bot_registry.start_listening()
+
+        running_id, stopped_id = [
+            await post_message_db.add_post_message(
+                PostMessageSchemaWithoutId(
+                    bot_id=add_bots[0], post_message_type=PostMessageType.MAILING, is_running=is_running
+                )
+            )
+            for is_running in (True, False)
+        ]
+        await post_message_db.delete_post_message(stopped_id)
+        await post_message_db.delete_post_message(running_id)
+        for _ in range(50):
+            if cancelled_post_message_ids:
+                break
+            await asyncio.sleep(0.01)
+
+        assert cancelled_post_message_ids == [running_id]
@@ -0,0 +1,23 @@
+import pytest
+
+from database.models.models import Database
+from database.models.channel_model import ChannelSchema, ChannelDao
+from database.models.channel_user_model import ChannelUserDao
+
+
+@pytest.fixture
+def channel_db(database: Database) -> ChannelDao:
+    return database.get_channel_dao()
+
+
+@pytest.fixture
+def channel_user_db(database: Database) -> ChannelUserDao:
+    return database.get_channel_user_dao()
+
+
+@pytest.fixture
+async def channel_ids(channel_db: ChannelDao, custom_bot_id: int) -> list[int]:
+    channel_ids = [-1001, -1002]
+    for channel_id in channel_ids:
+        await channel_db.add_channel(ChannelSchema(channel_id=channel_id, bot_id=custom_bot_id, added_by_admin=True))
+    return channel_ids
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+from database.models.channel_user_model import ChannelUserDao, ChannelUserSchemaWithoutId, ChannelUsersCountSchema
+
+
+class TestChannelUserModel:
+    """Tests for ChannelUserDao"""
+
+    async def test_count_channel_users_by_membership(self, channel_user_db: ChannelUserDao, channel_ids: list[int]):
+        channel_id, other_channel_id = channel_ids
+        now = datetime.now()
+        for channel_user_id, channel, is_channel_member, join_date in (
+            (1, channel_id, True, now - timedelta(hours=1)),
+            (2, channel_id, True, now - timedelta(hours=23)),
+            (3, channel_id, False, now - timedelta(hours=2)),
+            (4, channel_id, None, now - timedelta(hours=2)),  # the membership is unknown
+            (5, channel_id, True, now - timedelta(days=2)),  # out of the period
+            (6, channel_id, False, now - timedelta(days=2)),
+            (7, other_channel_id, True, now - timedelta(hours=1)),
+        ):
+            channel_user = ChannelUserSchemaWithoutId(
+                channel_user_id=channel_user_id, channel_id=channel, join_date=join_date
+            )
+            if is_channel_member is not None:  # None is only the default of the schema
+                channel_user.is_channel_member = is_channel_member
+            await channel_user_db.add_channel_user(channel_user)
+
+        assert await channel_user_db.count_channel_users_by_membership(channel_id) == ChannelUsersCountSchema(
+            joined=2, left=1
+        )
+        assert await channel_user_db.count_channel_users_by_membership(
+            channel_id, period=timedelta(days=3)
+        ) == ChannelUsersCountSchema(joined=3, left=2)
+        assert await channel_user_db.count_channel_users_by_membership(-1) == ChannelUsersCountSchema(joined=0, left=0)
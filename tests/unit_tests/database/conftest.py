@@ -0,0 +1,46 @@
+import pytest
+import datetime
+
+from database.models.bot_model import BotSchemaWithoutId, BotDao
+from database.models.option_model import OptionSchemaWithoutId, OptionDao
+from database.models.user_model import UserSchema, UserStatusValues, UserDao
+
+
+@pytest.fixture
+def user():
+    return UserSchema(
+        user_id=1,
+        username="admin",
+        status=UserStatusValues.SUBSCRIBED,
+        subscribed_until=datetime.datetime.now(),
+        registered_at=datetime.datetime.now(),
+    )
+
+
+@pytest.fixture
+async def add_user(user: UserSchema, user_db: UserDao) -> UserSchema:
+    await user_db.add_user(user)
+    return user
+
+
+@pytest.fixture
+async def add_option(option_db: OptionDao) -> int:
+    return await option_db.add_option(OptionSchemaWithoutId(web_app_button="default"))
+
+
+@pytest.fixture
+def bot(user: UserSchema, add_option: int) -> BotSchemaWithoutId:
+    return BotSchemaWithoutId(
+        bot_token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo",
+        status="online",
+        created_at=datetime.datetime.now(),
+        created_by=user.id,
+        options_id=add_option,
+        locale="default",
+    )
+
+
+@pytest.fixture
+async def custom_bot_id(bot: BotSchemaWithoutId, bot_db: BotDao, add_user: UserSchema) -> int:
+    """Adds the bot with its owner, the rows belonging to the bot are deleted with it by the cascade"""
+    return await bot_db.add_bot(bot)
@@ -0,0 +1,26 @@
+import pytest
+
+from database.models.models import Database
+from database.models.contest_model import ContestSchemaWithoutId, ContestDao
+from database.models.post_message_model import PostMessageSchemaWithoutId, PostMessageType
+
+
+@pytest.fixture
+def contest_db(database: Database) -> ContestDao:
+    return database.get_contest_dao()
+
+
+@pytest.fixture
+async def contest_ids(database: Database, contest_db: ContestDao, custom_bot_id: int) -> list[int]:
+    post_message_db = database.get_post_message_dao()
+    contest_ids = []
+    for _ in range(2):
+        post_message_id = await post_message_db.add_post_message(
+            PostMessageSchemaWithoutId(bot_id=custom_bot_id, post_message_type=PostMessageType.CONTEST)
+        )
+        contest_ids.append(
+            await contest_db.add_contest(
+                ContestSchemaWithoutId(bot_id=custom_bot_id, post_message_id=post_message_id, winners_count=1)
+            )
+        )
+    return contest_ids
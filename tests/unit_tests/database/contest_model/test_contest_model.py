@@ -0,0 +1,15 @@
+from database.models.contest_model import ContestDao
+
+
+class TestContestModel:
+    """Tests for ContestDao"""
+
+    async def test_count_contest_users(self, contest_db: ContestDao, contest_ids: list[int]):
+        contest_id, other_contest_id = contest_ids
+        for user_id in range(1, 4):
+            await contest_db.add_contest_user(contest_id, user_id, full_name=f"user {user_id}", username=None)
+        await contest_db.add_contest_user(other_contest_id, 1, full_name="user 1", username="user_1")
+
+        assert await contest_db.count_contest_users(contest_id) == 3
+        assert await contest_db.count_contest_users(other_contest_id) == 1
+        assert await contest_db.count_contest_users(max(contest_ids) + 1) == 0
@@ -0,0 +1,9 @@
+import pytest
+
+from database.models.models import Database
+from database.models.custom_bot_user_model import CustomBotUserDao
+
+
+@pytest.fixture
+def custom_bot_user_db(database: Database) -> CustomBotUserDao:
+    return database.get_custom_bot_user_db()
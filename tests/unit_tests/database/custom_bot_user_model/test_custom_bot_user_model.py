@@ -0,0 +1,20 @@
+from database.enums import UserLanguageValues
+from database.models.custom_bot_user_model import CustomBotUserDao
+
+
+class TestCustomBotUserModel:
+    """Tests for CustomBotUserDao"""
+
+    async def test_count_custom_bot_users(self, custom_bot_user_db: CustomBotUserDao, custom_bot_id: int):
+        for user_id, language in (
+            (1, UserLanguageValues.RUSSIAN),
+            (2, UserLanguageValues.RUSSIAN),
+            (3, UserLanguageValues.ENGLISH),
+        ):
+            await custom_bot_user_db.add_custom_bot_user(custom_bot_id, user_id, language)
+
+        assert await custom_bot_user_db.count_custom_bot_users(custom_bot_id) == 3
+        assert await custom_bot_user_db.count_custom_bot_users(custom_bot_id, UserLanguageValues.RUSSIAN) == 2
+        assert await custom_bot_user_db.count_custom_bot_users(custom_bot_id, UserLanguageValues.ENGLISH) == 1
+        assert await custom_bot_user_db.count_custom_bot_users(custom_bot_id, UserLanguageValues.HEBREW) == 0
+        assert await custom_bot_user_db.count_custom_bot_users(custom_bot_id + 1) == 0
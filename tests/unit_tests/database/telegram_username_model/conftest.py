@@ -0,0 +1,11 @@
+import pytest
+
+from database.models.models import Database
+from database.models.telegram_username_model import TelegramUsername, TelegramUsernameDao
+
+
+@pytest.fixture
+async def telegram_username_db(database: Database) -> TelegramUsernameDao:
+    telegram_username_db = database.get_telegram_username_dao()
+    yield telegram_username_db
+    await telegram_username_db.clear_table(TelegramUsername)
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from database.models.telegram_username_model import TelegramUsernameDao
+
+
+class TestTelegramUsernameModel:
+    """Tests for TelegramUsernameDao"""
+
+    async def test_get_usernames_above_parameters_limit(self, telegram_username_db: TelegramUsernameDao):
+        user_ids = list(range(1, 40001))  # asyncpg allows 32767 parameters per statement
+        await telegram_username_db.save_usernames({user_id: f"user{user_id}" for user_id in user_ids[::2]})
+
+        usernames = await telegram_username_db.get_usernames(user_ids, max_age=timedelta(days=1))
+
+        assert len(usernames) == 20000
+        assert usernames[1] == "user1"
+        assert 2 not in usernames
+
+    async def test_outdated_usernames_are_skipped(self, telegram_username_db: TelegramUsernameDao):
+        await telegram_username_db.save_usernames({1: "user1", 2: None})
+
+        assert await telegram_username_db.get_usernames([1, 2], max_age=timedelta(days=1)) == {1: "user1", 2: None}
+        assert await telegram_username_db.get_usernames([1, 2], max_age=timedelta(0)) == {}
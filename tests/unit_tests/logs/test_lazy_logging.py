@@ -0,0 +1,42 @@
+import logging
+
+from logs.config import LazyPayload, SamplingFilter
+
+
+class _Schema:
+    rendered = 0
+
+    def __str__(self) -> str:
+        _Schema.rendered += 1
+        return "x" * 100
+
+
+class TestLazyPayload:
+    """Tests for the LazyPayload and SamplingFilter"""
+
+    def test_payload_is_rendered_only_when_the_level_is_enabled(self):
+        logger = logging.getLogger("test_lazy_logger")
+        logger.setLevel(logging.INFO)
+        _Schema.rendered = 0
+
+        logger.debug("found %s", LazyPayload(_Schema()))
+
+        assert _Schema.rendered == 0
+
+    def test_list_is_truncated_without_rendering_every_item(self):
+        _Schema.rendered = 0
+
+        text = str(LazyPayload([_Schema() for _ in range(1000)], max_length=250))
+
+        assert _Schema.rendered == 3
+        assert text.endswith("... (997 more)]")
+
+    def test_sampling_keeps_warnings(self):
+        sampling_filter = SamplingFilter({"test_lazy_logger": 0})
+        records = [
+            logging.LogRecord("test_lazy_logger", level, __file__, 1, "message", None, None)
+            for level in (logging.DEBUG, logging.INFO, logging.WARNING)
+        ]
+
+        assert [sampling_filter.filter(record) for record in records] == [False, False, True]
+        assert sampling_filter.sampled_out == 2
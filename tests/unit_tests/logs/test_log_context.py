@@ -0,0 +1,49 @@
+import json
+import logging
+
+from logs.config import ContextFilter, JsonLineFormatter, log_context, extra_params
+
+
+def _make_record(message: str, **tags) -> logging.LogRecord:
+    record = logging.LogRecord("test_logger", logging.INFO, __file__, 1, message, None, None)
+    if tags:
+        record.tags = extra_params(**tags)["tags"]
+    return record
+
+
+class TestLogContext:
+    """Tests for the log context and its filter"""
+
+    def test_record_is_tagged_with_context(self):
+        record = _make_record("message", user_id=2)
+        with log_context(bot_id=1, user_id=1, update_id=None):
+            ContextFilter().filter(record)
+
+        assert record.tags == {"bot_id": 1, "user_id": 2}
+        assert json.loads(JsonLineFormatter().format(record)) == {
+            "file": "test_log_context.py",
+            "func": None,
+            "msg": "message",
+            "bot_id": 1,
+            "user_id": 2,
+        }
+
+    def test_context_is_reset_after_block(self):
+        with log_context(bot_id=1):
+            pass
+        record = _make_record("123456:SECRET_TOKEN", bot_token="123456:SECRET_TOKEN")
+        ContextFilter().filter(record)
+
+        assert record.tags == {}
+        assert "SECRET_TOKE" not in record.msg
+
+    def test_bot_token_argument_never_reaches_formatted_line(self):
+        bot_token = "123456:SECRET_TOKEN"
+        record = logging.LogRecord(
+            "test_logger", logging.INFO, __file__, 1, "bot with bot_token=%s", (bot_token,), None
+        )
+        record.tags = extra_params(bot_token=bot_token)["tags"]
+        ContextFilter().filter(record)
+
+        assert "SECRET_TOKE" not in record.getMessage()
+        assert "SECRET_TOKE" not in logging.Formatter().format(record)
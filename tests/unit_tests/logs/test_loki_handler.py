@@ -0,0 +1,51 @@
+import logging
+import threading
+
+from logs.loki import BatchedLokiHandler
+
+
+class _FakeLokiHandler(BatchedLokiHandler):
+    def __init__(self, is_available: bool = True, **kwargs) -> None:
+        super().__init__("http://loki/loki/api/v1/push", tags={"from": "tests"}, **kwargs)
+        self.is_available = is_available
+        self.unblocked = threading.Event()
+        self.payloads: list[dict] = []
+
+    def _post(self, payload: dict) -> None:
+        self.unblocked.wait()
+        if not self.is_available:
+            raise ConnectionError
+        self.payloads.append(payload)
+
+
+def _make_record(message: str, bot_id: int) -> logging.LogRecord:
+    record = logging.LogRecord("test_logger", logging.INFO, __file__, 1, message, None, None)
+    record.tags = {"bot_id": bot_id}
+    return record
+
+
+class TestBatchedLokiHandler:
+    """Tests for the BatchedLokiHandler"""
+
+    def test_records_are_pushed_in_batches_grouped_by_labels(self):
+        handler = _FakeLokiHandler(batch_size=4, flush_interval=3600)
+        handler.unblocked.set()
+        for ind in range(8):
+            handler.emit(_make_record(f"message {ind}", bot_id=ind % 2))
+        handler.close()
+
+        assert handler.sent == 8
+        assert len(handler.payloads) == 2
+        assert all(len(payload["streams"]) == 2 for payload in handler.payloads)
+        assert handler.payloads[0]["streams"][0]["stream"]["bot_id"] == "0"
+
+    def test_records_above_buffer_are_dropped(self):
+        handler = _FakeLokiHandler(is_available=False, batch_size=2, buffer_size=3, flush_interval=3600)
+        for ind in range(10):  # the first batch is blocked in the push, so the buffer fills up
+            handler.emit(_make_record(f"message {ind}", bot_id=1))
+        handler.unblocked.set()
+        handler.close()
+
+        assert handler.sent == 0
+        assert handler.dropped == 10
+        assert handler.failed_pushes >= 1
@@ -0,0 +1,104 @@
+import pytest
+
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+
+from bot.post_message.mailing_engine import Mailing, MailingCheckpoint, MailingResult, run_mailing, cancel_mailing
+
+from common_utils.rate_limiter import RateLimiter
+
+BANNED_USER_ID = 7
+
+
+class _Restarted(Exception):
+    """Emulates the restart of the process after the checkpoint"""
+
+
+class _FakeMailingStorage:
+    def __init__(self, restart_on_checkpoint: int | None = None) -> None:
+        self.restart_on_checkpoint = restart_on_checkpoint
+        self.checkpoints: list[MailingCheckpoint] = []
+        self.sent_to: list[int] = []
+
+    async def send(self, user_id: int) -> None:
+        if user_id == BANNED_USER_ID:
+            raise TelegramForbiddenError(
+                SendMessage(chat_id=user_id, text=""), "Forbidden: bot was blocked by the user"
+            )
+        self.sent_to.append(user_id)
+
+    async def save_checkpoint(self, checkpoint: MailingCheckpoint) -> bool:
+        if len(self.checkpoints) == self.restart_on_checkpoint:
+            raise _Restarted
+        self.checkpoints.append(checkpoint)
+        return True
+
+
+def _create_mailing(storage: _FakeMailingStorage, result: MailingResult | None = None) -> Mailing:
+    return Mailing(
+        post_message_id=1,
+        bot_id=1,
+        send=storage.send,
+        save_checkpoint=storage.save_checkpoint,
+        rate_limiter=RateLimiter(rate=10000, burst=100),
+        concurrency=4,
+        checkpoint_every=5,
+        result=result,
+    )
+
+
+class TestMailingEngine:
+    """Tests for the Mailing"""
+
+    async def test_mailing_sends_to_everyone(self):
+        storage = _FakeMailingStorage()
+
+        result = await _create_mailing(storage).run(range(1, 21))
+
+        assert sorted(storage.sent_to) == [user_id for user_id in range(1, 21) if user_id != BANNED_USER_ID]
+        assert result.sent == 19
+        assert result.banned_user_ids == [BANNED_USER_ID]
+        assert storage.checkpoints[-1].cursor == 20
+
+    async def test_resumed_mailing_sends_no_duplicates(self):
+        storage = _FakeMailingStorage(restart_on_checkpoint=2)
+        with pytest.raises(_Restarted):
+            await _create_mailing(storage).run(range(1, 21))
+
+        checkpoint = storage.checkpoints[-1]
+        storage.restart_on_checkpoint = None
+        await _create_mailing(
+            storage, MailingResult(sent=checkpoint.sent, banned_user_ids=checkpoint.new_banned_user_ids)
+        ).run(range(checkpoint.cursor + 1, 21))
+
+        assert len(storage.sent_to) == len(set(storage.sent_to))
+        assert sorted(storage.sent_to) == [user_id for user_id in range(1, 21) if user_id != BANNED_USER_ID]
+
+    async def test_mailing_consumes_batches(self):
+        storage = _FakeMailingStorage()
+
+        async def batches():
+            for offset in range(1, 21, 3):
+                yield list(range(offset, min(offset + 3, 21)))
+
+        await _create_mailing(storage).run(batches())
+
+        assert sorted(storage.sent_to) == [user_id for user_id in range(1, 21) if user_id != BANNED_USER_ID]
+        assert [checkpoint.cursor for checkpoint in storage.checkpoints] == [5, 10, 15, 20, 20]
+
+    async def test_cancel_stops_mailing_before_next_checkpoint(self):
+        storage = _FakeMailingStorage()
+        send = storage.send
+
+        async def send_and_cancel(user_id: int) -> None:
+            await send(user_id)
+            if user_id == 3:  # the notification of the cancel from another process
+                cancel_mailing(1)
+
+        storage.send = send_and_cancel
+        result = await run_mailing(_create_mailing(storage), range(1, 21))
+
+        assert result.is_cancelled
+        assert len(storage.checkpoints) == 1
+        assert max(storage.sent_to) <= 5  # the rest of the first chunk is not sent either
+        assert cancel_mailing(1) is None  # the mailing is not running anymore
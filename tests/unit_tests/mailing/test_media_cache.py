@@ -0,0 +1,182 @@
+import io
+import os
+import asyncio
+import datetime
+
+import pytest
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendPhoto, DeleteMessage
+from aiogram.types import Chat, File, Message, PhotoSize
+
+from bot.post_message import media_cache
+
+from common_utils.config import main_telegram_bot_settings
+
+from database.models.post_message_media_files import PostMessageMediaFileSchema
+
+from tests.mock_objects.session import FakeSession
+
+BOT_ID = 1
+OWNER_CHAT_ID = 100
+
+
+class _FakeMainBot:
+    def __init__(self) -> None:
+        self.downloaded: list[str] = []
+
+    async def get_file(self, file_id: str) -> File:
+        return File(file_id=file_id, file_unique_id=file_id.replace("main", "unique"))
+
+    async def download_file(self, file_path: str) -> io.BytesIO:
+        self.downloaded.append(file_path)
+        await asyncio.sleep(0)
+        return io.BytesIO(b"0123456789")
+
+
+class _FakeBotMediaFileDao:
+    def __init__(self, file_ids: dict[str, str] | None = None) -> None:
+        self.file_ids = dict(file_ids or {})  # file_unique_id -> file_id of the custom bot
+
+    async def get_file_ids(self, bot_id: int, file_unique_ids: list[str]) -> dict[str, str]:
+        return {key: value for key, value in self.file_ids.items() if key in file_unique_ids}
+
+    async def save_file_ids(self, bot_id: int, file_ids: dict[str, str]) -> None:
+        self.file_ids.update(file_ids)
+
+
+class _FakePostMessageMediaFileDao:
+    def __init__(self) -> None:
+        self.updated: list[PostMessageMediaFileSchema] = []
+
+    async def update_media_file(self, media_file: PostMessageMediaFileSchema) -> None:
+        self.updated.append(media_file.model_copy())
+
+
+@pytest.fixture
+def main_bot(monkeypatch, tmp_path) -> _FakeMainBot:
+    main_bot = _FakeMainBot()
+    monkeypatch.setattr(media_cache, "bot", main_bot)
+    monkeypatch.setattr(media_cache, "MEDIA_CACHE_PATH", f"{tmp_path}/")
+    return main_bot
+
+
+@pytest.fixture
+def bot_media_file_db(monkeypatch) -> _FakeBotMediaFileDao:
+    bot_media_file_db = _FakeBotMediaFileDao({"unique-cached": "custom-cached"})
+    monkeypatch.setattr(media_cache, "bot_media_file_db", bot_media_file_db)
+    return bot_media_file_db
+
+
+@pytest.fixture
+def post_message_media_file_db(monkeypatch) -> _FakePostMessageMediaFileDao:
+    post_message_media_file_db = _FakePostMessageMediaFileDao()
+    monkeypatch.setattr(media_cache, "post_message_media_file_db", post_message_media_file_db)
+    return post_message_media_file_db
+
+
+def _media_file(name: str, file_unique_id: str | None = None) -> PostMessageMediaFileSchema:
+    return PostMessageMediaFileSchema(
+        post_message_id=1,
+        file_id_main_bot=f"main-{name}",
+        file_unique_id=file_unique_id,
+        file_path=f"photos/{name}.jpg",
+        media_type="photo",
+    )
+
+
+def _uploaded_photo(method: SendPhoto) -> Message:
+    file_name = method.photo.filename.removeprefix("photos/").removesuffix(".jpg")
+    return Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=method.chat_id, type="private"),
+        photo=[PhotoSize(file_id=f"custom-{file_name}", file_unique_id=f"unique-{file_name}", width=1, height=1)],
+    )
+
+
+class TestMediaCache:
+    """Tests for the media files cache of the mailings"""
+
+    async def test_cached_file_ids_are_filled(
+        self, main_bot, bot_media_file_db, post_message_media_file_db: _FakePostMessageMediaFileDao
+    ):
+        cached, without_unique_id, uploaded = (
+            _media_file("cached", "unique-cached"),
+            _media_file("new"),
+            _media_file("uploaded", "unique-uploaded"),
+        )
+        uploaded.file_id_custom_bot = "custom-uploaded"
+
+        await media_cache.fill_cached_file_ids(BOT_ID, [cached, without_unique_id, uploaded])
+
+        assert cached.file_id_custom_bot == "custom-cached"
+        assert without_unique_id.file_unique_id == "unique-new"  # is asked from telegram once
+        assert without_unique_id.file_id_custom_bot is None
+        assert {media_file.file_id_main_bot for media_file in post_message_media_file_db.updated} == {
+            "main-cached",
+            "main-new",
+        }
+
+    async def test_prewarm_uploads_only_missing_files(
+        self, main_bot: _FakeMainBot, bot_media_file_db: _FakeBotMediaFileDao, post_message_media_file_db
+    ):
+        session = FakeSession({SendPhoto: _uploaded_photo})
+        custom_bot = Bot(token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo", session=session)
+        cached, new = _media_file("cached", "unique-cached"), _media_file("new", "unique-new")
+
+        await media_cache.prewarm_media_files(custom_bot, BOT_ID, [cached, new], OWNER_CHAT_ID)
+
+        assert (cached.file_id_custom_bot, new.file_id_custom_bot) == ("custom-cached", "custom-new")
+        assert bot_media_file_db.file_ids["unique-new"] == "custom-new"
+        assert [method.chat_id for method in session.get_requests(SendPhoto)] == [OWNER_CHAT_ID]
+        assert len(session.get_requests(DeleteMessage)) == 1  # the upload message is not left in the chat
+        assert main_bot.downloaded == ["photos/new.jpg"]
+        assert not media_cache._upload_locks  # noqa
+
+    async def test_concurrent_prewarms_upload_once(self, main_bot, bot_media_file_db, post_message_media_file_db):
+        session = FakeSession({SendPhoto: _uploaded_photo})
+        custom_bot = Bot(token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo", session=session)
+        media_files = [_media_file("new", "unique-new") for _ in range(3)]
+
+        await asyncio.gather(
+            *[
+                media_cache.prewarm_media_files(custom_bot, BOT_ID, [media_file], OWNER_CHAT_ID)
+                for media_file in media_files
+            ]
+        )
+
+        assert len(session.get_requests(SendPhoto)) == 1
+        assert {media_file.file_id_custom_bot for media_file in media_files} == {"custom-new"}
+        assert not media_cache._upload_locks  # noqa
+
+    async def test_failed_upload_is_left_for_first_send(
+        self, main_bot, bot_media_file_db: _FakeBotMediaFileDao, post_message_media_file_db
+    ):
+        session = FakeSession({SendPhoto: TelegramBadRequest(SendPhoto(chat_id=OWNER_CHAT_ID, photo="x"), "error")})
+        custom_bot = Bot(token="7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo", session=session)
+        new = _media_file("new", "unique-new")
+
+        await media_cache.prewarm_media_files(custom_bot, BOT_ID, [new], OWNER_CHAT_ID)
+
+        assert new.file_id_custom_bot is None  # the first send of the post message uploads it
+        assert "unique-new" not in bot_media_file_db.file_ids
+        assert not session.get_requests(DeleteMessage)
+        assert not media_cache._upload_locks  # noqa
+
+    async def test_least_recently_used_files_are_evicted(self, monkeypatch, main_bot: _FakeMainBot):
+        monkeypatch.setattr(main_telegram_bot_settings, "MEDIA_CACHE_MAX_SIZE", 25)  # two files of 10 bytes
+        first, second, third = _media_file("1", "unique-1"), _media_file("2", "unique-2"), _media_file("3", "unique-3")
+
+        for timestamp, media_file in enumerate((first, second), start=1):
+            await media_cache.read_media_file(media_file)
+            os.utime(media_cache.MEDIA_CACHE_PATH + media_file.file_unique_id, (timestamp, timestamp))
+        await media_cache.read_media_file(first)  # is used again, so the second one is the least recently used
+        await media_cache.read_media_file(third)
+
+        assert sorted(os.listdir(media_cache.MEDIA_CACHE_PATH)) == ["unique-1", "unique-3"]
+        assert main_bot.downloaded == ["photos/1.jpg", "photos/2.jpg", "photos/3.jpg"]
+
+        assert (await media_cache.read_media_file(second)).data == b"0123456789"
+        assert main_bot.downloaded[-1] == "photos/2.jpg"
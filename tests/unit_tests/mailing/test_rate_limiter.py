@@ -0,0 +1,26 @@
+import time
+
+from common_utils.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for the RateLimiter"""
+
+    async def test_burst_is_allowed_at_once(self):
+        rate_limiter = RateLimiter(rate=10, burst=5)
+
+        started_at = time.monotonic()
+        for _ in range(5):
+            await rate_limiter.acquire()
+
+        assert time.monotonic() - started_at < 0.05
+
+    async def test_weight_above_burst_is_charged_in_full(self):
+        rate_limiter = RateLimiter(rate=100, burst=5)
+
+        started_at = time.monotonic()
+        for _ in range(3):
+            await rate_limiter.acquire(10)  # the media groups of 10 messages
+
+        # 30 messages at 100 per second with 5 of them allowed at once
+        assert time.monotonic() - started_at >= (30 - 5) / 100
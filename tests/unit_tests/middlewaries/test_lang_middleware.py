@@ -0,0 +1,76 @@
+import datetime
+
+from aiogram import Bot
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message, User
+
+from common_utils.middlewaries import lang_middleware
+from common_utils.middlewaries.lang_middleware import LangCheckMiddleware
+
+from database.enums import UserLanguageValues
+from database.models.bot_model import BotSchema
+from database.models.option_model import OptionSchema
+from database.models.pickle_storage_model import PickledObjectSchema
+
+from tests.mock_objects.session import FakeSession
+
+BOT_TOKEN = "7346456554:AAHGQOBfwJOtfLwYggVeoR2Qt-E6yEubOgo"
+
+
+class _FakePickleStorage:
+    def __init__(self) -> None:
+        self.pickled_objects: list[PickledObjectSchema] = []
+
+    async def add_pickled_object(self, pickled_object: PickledObjectSchema) -> None:
+        self.pickled_objects.append(pickled_object)
+
+
+async def _handler(*_) -> None:
+    raise AssertionError("the handler must wait for the language to be selected")
+
+
+class TestLangCheckMiddleware:
+    """Tests for LangCheckMiddleware"""
+
+    async def test_pickled_handler_has_no_bot_token(self, monkeypatch):
+        pickle_storage = _FakePickleStorage()
+        monkeypatch.setattr(lang_middleware, "pickle_store_db", pickle_storage)
+        session = FakeSession()
+        bot = Bot(token=BOT_TOKEN, session=session)
+        user = User(id=5, is_bot=False, first_name="user", language_code="de")  # the language is unsupported
+        chat = Chat(id=5, type="private")
+        event = Message(message_id=1, date=datetime.datetime.now(), chat=chat, from_user=user, text="hi").as_(bot)
+        custom_bot = BotSchema(
+            bot_id=bot.id,
+            bot_token=BOT_TOKEN,
+            status="online",
+            created_at=datetime.datetime.now(),
+            created_by=1,
+            options_id=1,
+            locale="default",
+        )
+        data = {
+            "event_from_user": user,
+            "event_chat": chat,
+            "session": session,
+            "bot": bot,
+            "fsm_storage": None,
+            "state": None,
+            "event_router": None,
+            "custom_bot": custom_bot,
+            "custom_bot_options": OptionSchema(
+                id=1,
+                web_app_button="default",
+                languages=[UserLanguageValues.RUSSIAN, UserLanguageValues.ENGLISH],
+            ),
+            "custom_bot_user": None,
+        }
+
+        await LangCheckMiddleware(from_main_bot=False)(_handler, event, data)
+
+        assert len(session.get_requests(SendMessage)) == 1  # the language is asked
+        (pickled_object,) = pickle_storage.pickled_objects
+        pickled_data = pickled_object.unpickle_args()["data"]
+        assert not {"custom_bot", "custom_bot_options", "custom_bot_user"} & pickled_data.keys()
+        assert BOT_TOKEN.encode() not in pickled_object.pickled_args
+        assert BOT_TOKEN.split(":")[1].encode() not in pickled_object.pickled_args
@@ -0,0 +1,74 @@
+import logging
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from fakeredis import FakeAsyncRedis
+from redis.exceptions import ConnectionError
+
+from aiogram.types import Chat, Message, User
+
+from common_utils.middlewaries.log_middleware import LogMiddleware
+
+
+class _BrokenRedis:
+    calls = 0
+
+    async def set(self, *args, **kwargs) -> None:
+        _BrokenRedis.calls += 1
+        raise ConnectionError
+
+
+class _RecordsHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def _make_logger() -> tuple[logging.Logger, _RecordsHandler]:
+    logger = logging.getLogger("test_log_middleware")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler := _RecordsHandler())
+    return logger, handler
+
+
+async def _pass_event(middleware: LogMiddleware, message_id: int) -> None:
+    user = User(id=1, is_bot=False, first_name="test")
+    message = Message(
+        message_id=message_id, date=datetime.now(), chat=Chat(id=1, type="private"), from_user=user, text="hi"
+    )
+    data = {"event_from_user": user, "raw_state": None, "state": None, "bot": SimpleNamespace(id=1)}
+
+    async def handler(*_) -> None:
+        pass
+
+    await middleware(handler, message, data)
+
+
+class TestLogMiddleware:
+    """Tests for the LogMiddleware"""
+
+    async def test_event_is_logged_once_by_nested_routers(self):
+        logger, records = _make_logger()
+        middleware = LogMiddleware(logger, redis=FakeAsyncRedis())
+
+        for message_id in (1, 1, 1, 2):
+            await _pass_event(middleware, message_id)
+
+        assert len([message for message in records.messages if "has written hi" in message]) == 2
+
+    async def test_events_are_deduplicated_in_process_while_redis_is_down(self):
+        logger, records = _make_logger()
+        middleware = LogMiddleware(logger, redis=_BrokenRedis())
+        _BrokenRedis.calls = 0
+
+        for message_id in (1, 1, 2):
+            await _pass_event(middleware, message_id)
+
+        assert _BrokenRedis.calls == 1
+        assert len([message for message in records.messages if "has written hi" in message]) == 2
@@ -0,0 +1,68 @@
+import pytest
+
+from fakeredis import FakeAsyncRedis
+
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+
+from common_utils.config import database_settings
+from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.redis_storage import RedisStorageAsync
+from common_utils.storage.cached_storage import CachedStorage
+
+TEST_TABLE_NAME = "test_fsm_storage"
+
+
+def _create_storage(backend: str) -> BaseStorage:
+    match backend:
+        case "postgres":
+            return AlchemyStorageAsync(db_url=database_settings.SQLALCHEMY_URL, table_name=TEST_TABLE_NAME)
+        case "cached_postgres":
+            return CachedStorage(
+                AlchemyStorageAsync(db_url=database_settings.SQLALCHEMY_URL, table_name=TEST_TABLE_NAME),
+                max_size=2,
+                flush_interval=3600,  # flushes are triggered by the tests
+                entry_ttl=3600,
+            )
+        case "redis":
+            return RedisStorageAsync(FakeAsyncRedis(decode_responses=True), key_prefix=TEST_TABLE_NAME, state_ttl=60)
+
+
+@pytest.fixture(params=["postgres", "cached_postgres", "redis"])
+async def fsm_storage(request) -> BaseStorage:
+    """Every behaviour test runs against all the FSM storage backends"""
+    storage = _create_storage(request.param)
+    await storage.connect()
+    await storage.clear_table()
+    yield storage
+    await storage.clear_table()
+    await storage.close()
+
+
+@pytest.fixture
+async def sql_storage() -> AlchemyStorageAsync:
+    storage = _create_storage("postgres")
+    await storage.connect()
+    await storage.clear_table()
+    yield storage
+    await storage.clear_table()
+    await storage.close()
+
+
+@pytest.fixture
+async def cached_storage() -> CachedStorage:
+    storage = _create_storage("cached_postgres")
+    await storage.connect()
+    await storage.clear_table()
+    yield storage
+    await storage.clear_table()
+    await storage.close()
+
+
+@pytest.fixture
+def storage_key() -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=-100200, user_id=100)
+
+
+@pytest.fixture
+def other_storage_key() -> StorageKey:
+    return StorageKey(bot_id=1, chat_id=101, user_id=101)
@@ -0,0 +1,152 @@
+from datetime import timedelta
+
+from sqlalchemy import update, func
+
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+
+from common_utils.storage.storage import AlchemyStorageAsync
+from common_utils.storage.cached_storage import CachedStorage
+from common_utils.storage.sweeper import FsmStorageSweeper
+
+
+class _TestStates(StatesGroup):
+    first = State()
+    second = State()
+
+
+class TestFsmStorage:
+    """Behaviour tests shared by all the FSM storage backends"""
+
+    async def test_unknown_user(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        assert await fsm_storage.get_state(storage_key) is None
+        assert await fsm_storage.get_data(storage_key) == {}
+
+    async def test_set_state(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        assert await fsm_storage.get_state(storage_key) == _TestStates.first.state
+
+        await fsm_storage.set_state(storage_key, _TestStates.second.state)
+        assert await fsm_storage.get_state(storage_key) == _TestStates.second.state
+
+    async def test_set_state_resets_data(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        await fsm_storage.set_data(storage_key, {"product_id": 1})
+
+        await fsm_storage.set_state(storage_key, _TestStates.second)
+
+        assert await fsm_storage.get_data(storage_key) == {}
+
+    async def test_set_none_state_clears_user(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        await fsm_storage.set_data(storage_key, {"product_id": 1})
+
+        await fsm_storage.set_state(storage_key, None)
+
+        assert await fsm_storage.get_state(storage_key) is None
+        assert await fsm_storage.get_data(storage_key) == {}
+
+    async def test_set_data_keeps_state(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        await fsm_storage.set_data(storage_key, {"product_id": 1, "names": ["a", "b"]})
+
+        assert await fsm_storage.get_state(storage_key) == _TestStates.first.state
+        assert await fsm_storage.get_data(storage_key) == {"product_id": 1, "names": ["a", "b"]}
+
+    async def test_update_data_merges(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        await fsm_storage.set_data(storage_key, {"product_id": 1, "count": 1})
+
+        updated_data = await fsm_storage.update_data(storage_key, {"count": 2, "bot_id": 3})
+
+        assert updated_data == {"product_id": 1, "count": 2, "bot_id": 3}
+        assert await fsm_storage.get_data(storage_key) == updated_data
+
+    async def test_update_data_without_state(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        assert await fsm_storage.update_data(storage_key, {"bot_id": 3}) == {"bot_id": 3}
+        assert await fsm_storage.get_data(storage_key) == {"bot_id": 3}
+        assert await fsm_storage.get_state(storage_key) is None
+
+    async def test_users_are_isolated(
+        self, fsm_storage: BaseStorage, storage_key: StorageKey, other_storage_key: StorageKey
+    ):
+        await fsm_storage.set_state(storage_key, _TestStates.first)
+        await fsm_storage.update_data(storage_key, {"bot_id": 3})
+        await fsm_storage.set_state(other_storage_key, _TestStates.second)
+
+        await fsm_storage.clear_state(other_storage_key)
+
+        assert await fsm_storage.get_state(storage_key) == _TestStates.first.state
+        assert await fsm_storage.get_data(storage_key) == {"bot_id": 3}
+        assert await fsm_storage.get_state(other_storage_key) is None
+
+    async def test_returned_data_is_a_copy(self, fsm_storage: BaseStorage, storage_key: StorageKey):
+        await fsm_storage.set_data(storage_key, {"names": ["a"]})
+
+        data = await fsm_storage.get_data(storage_key)
+        data["names"].append("b")
+
+        assert await fsm_storage.get_data(storage_key) == {"names": ["a"]}
+
+
+class TestCachedStorage:
+    """Tests of the write-behind part of CachedStorage"""
+
+    async def test_flush_persists_writes(self, cached_storage: CachedStorage, storage_key: StorageKey):
+        await cached_storage.set_state(storage_key, _TestStates.first)
+        await cached_storage.update_data(storage_key, {"bot_id": 3})
+        assert await cached_storage.storage.get_state(storage_key) is None  # is not flushed yet
+
+        await cached_storage.flush()
+
+        assert await cached_storage.storage.get_state(storage_key) == _TestStates.first.state
+        assert await cached_storage.storage.get_data(storage_key) == {"bot_id": 3}
+        assert cached_storage.get_metrics().dirty_keys == 0
+
+    async def test_flush_keeps_concurrent_external_write(
+        self, cached_storage: CachedStorage, storage_key: StorageKey, other_storage_key: StorageKey
+    ):
+        await cached_storage.set_data(storage_key, {"last_question_time": 1})
+        await cached_storage.flush()
+
+        await cached_storage.storage.set_data(storage_key, {})  # the write of the other process
+        await cached_storage.update_data(other_storage_key, {"bot_id": 3})
+        await cached_storage.flush()
+        cached_storage.entry_ttl = 0
+
+        assert await cached_storage.storage.get_data(storage_key) == {}
+        assert await cached_storage.get_data(storage_key) == {}
+
+
+class TestFsmStorageSweeper:
+    """Tests for the expiration of the SQL storage rows"""
+
+    async def test_sweep_deletes_expired_states(
+        self, sql_storage: AlchemyStorageAsync, storage_key: StorageKey, other_storage_key: StorageKey
+    ):
+        await sql_storage.set_state(storage_key, _TestStates.first)
+        await sql_storage.set_state(other_storage_key, _TestStates.second)
+        async with sql_storage.engine.begin() as conn:
+            await conn.execute(update(sql_storage.storage_table).values(last_touched=func.now() - timedelta(days=2)))
+
+        sweeper = FsmStorageSweeper(
+            sql_storage,
+            default_ttl=timedelta(days=30),
+            state_ttls={_TestStates.second.state: timedelta(days=1)},
+            interval=3600,
+            batch_size=1,
+        )
+
+        assert await sweeper.sweep() == 1
+        assert await sql_storage.get_state(storage_key) == _TestStates.first.state
+        assert await sql_storage.get_state(other_storage_key) is None
+
+    async def test_write_touches_row(self, sql_storage: AlchemyStorageAsync, storage_key: StorageKey):
+        await sql_storage.set_state(storage_key, _TestStates.first)
+        async with sql_storage.engine.begin() as conn:
+            await conn.execute(update(sql_storage.storage_table).values(last_touched=func.now() - timedelta(days=2)))
+
+        await sql_storage.update_data(storage_key, {"bot_id": 3})
+
+        assert await sql_storage.delete_expired(timedelta(days=1), {}, batch_size=10) == 0
+        assert await sql_storage.get_state(storage_key) == _TestStates.first.state